@@ -11,12 +11,135 @@ makes both the ``--json`` output and the tests trivial.
 
 from __future__ import annotations
 
+import os
 import re
-from collections import Counter, defaultdict
+from collections import Counter, deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Iterable, Iterator, Optional
 
 from .decompress import iter_streams
 from .detectors import DETECTORS, TX_DETECTORS
 
+# Every detector matches a run of at least _MIN_TOKEN ASCII letters/digits, and
+# its lookarounds only inspect letters/digits. A match can therefore never
+# straddle any other character, so a single pass that splits the text into
+# maximal alphanumeric runs ("tokens") finds every candidate; the per-detector
+# patterns then only run once per *distinct* token instead of over the text.
+_MIN_TOKEN = 14  # "bc1" + 11 chars, the shortest detector match
+_ALNUM = frozenset("0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz")
+_TOKEN = re.compile(rf"(?<![0-9A-Za-z])[0-9A-Za-z]{{{_MIN_TOKEN},}}")
+_SEPARATOR = re.compile(r"[^0-9A-Za-z]")
+# Tokens without any detector match are remembered (so repeats are skipped) up
+# to this many entries; the cache is dropped and rebuilt beyond that.
+_MISS_CACHE = 1 << 20
+
+CHUNK_CHARS = 8 << 20  # characters decoded and scanned per step
+CONTEXT_WIDTH = 50
+
+
+class _Matcher:
+    """Incremental token matcher with per-token and per-candidate memos."""
+
+    def __init__(self, tx_hashes: bool, context_width: Optional[int]):
+        detectors = DETECTORS + (TX_DETECTORS if tx_hashes else [])
+        self.labels = [d.label for d in detectors]
+        self._detectors = [
+            (label, re.compile(pattern), validator)
+            for label, pattern, validator in detectors
+        ]
+        self._width = context_width
+        self._matches: dict[str, list[tuple[str, str, bool]]] = {}
+        self._misses: set[str] = set()
+        self._valid: dict[tuple[str, str], bool] = {}
+        self.counts: dict[str, int] = {}  # token -> occurrences, first-seen order
+        self.contexts: dict[tuple[str, str], str] = {}
+
+    def _match_token(self, token: str, start: int, buf: str) -> list:
+        out = []
+        for label, regex, validator in self._detectors:
+            for m in regex.finditer(token):
+                value = m.group()
+                key = (label, value)
+                ok = self._valid.get(key)
+                if ok is None:
+                    ok = self._valid[key] = validator is None or bool(validator(value))
+                out.append((label, value, ok))
+                if self._width is not None and key not in self.contexts:
+                    i = start + m.start()
+                    w = self._width
+                    snippet = buf[max(0, i - w) : i + len(value) + w]
+                    self.contexts[key] = snippet.replace("\n", " ").replace("\r", " ")
+        return out
+
+    def feed(self, buf: str, pos: int, final: bool) -> int:
+        """Consume the tokens of ``buf[pos:]`` that are complete (and, with
+        context, followed by enough text); return where the next call resumes."""
+        limit = len(buf)
+        if not final:
+            tail = len(buf)
+            while tail > pos and buf[tail - 1] in _ALNUM:
+                tail -= 1  # a trailing run may continue in the next chunk
+            limit = min(tail, len(buf) - (self._width or 0))
+        counts = self.counts
+        for m in _TOKEN.finditer(buf, pos):
+            if m.end() > limit:
+                return m.start()
+            token = m.group()
+            n = counts.get(token)
+            if n is not None:
+                counts[token] = n + 1
+            elif token not in self._misses:
+                matches = self._match_token(token, m.start(), buf)
+                if matches:
+                    self._matches[token] = matches
+                    counts[token] = 1
+                else:
+                    if len(self._misses) >= _MISS_CACHE:
+                        self._misses.clear()
+                    self._misses.add(token)
+        return max(pos, limit)
+
+    def result(self) -> tuple[dict[str, Counter], dict[str, Counter]]:
+        found: dict[str, Counter] = {label: Counter() for label in self.labels}
+        rejected: dict[str, Counter] = {label: Counter() for label in self.labels}
+        for token, n in self.counts.items():
+            for label, value, ok in self._matches[token]:
+                (found if ok else rejected)[label][value] += n
+        return (
+            {k: c for k, c in found.items() if c},
+            {k: c for k, c in rejected.items() if c},
+        )
+
+
+def scan_chunks(
+    chunks: Iterable[str],
+    tx_hashes: bool = False,
+    context_width: Optional[int] = None,
+) -> tuple[dict[str, Counter], dict[str, Counter], dict[tuple[str, str], str]]:
+    """Like :func:`scan`, over text arriving in consecutive ``chunks``.
+
+    Only the unconsumed tail of the previous chunk is kept, so the input never
+    has to be one string. With ``context_width``, the third element maps each
+    ``(label, value)`` to the text around its first occurrence.
+    """
+    matcher = _Matcher(tx_hashes, context_width)
+    keep = context_width or 0
+    buf, pos = "", 0
+    held: list[str] = []  # chunks extending a run still open at the end of buf
+    for chunk in chunks:
+        if _SEPARATOR.search(chunk) is None and (
+            held or _SEPARATOR.search(buf, pos) is None
+        ):
+            held.append(chunk)  # the open run cannot end yet; don't rescan it
+            continue
+        cut = max(0, pos - keep)
+        buf = "".join([buf[cut:], *held, chunk])
+        held = []
+        pos = matcher.feed(buf, pos - cut, final=False)
+    matcher.feed("".join([buf, *held]), pos, final=True)
+    found, rejected = matcher.result()
+    return found, rejected, matcher.contexts
+
 
 def scan(
     text: str, tx_hashes: bool = False
@@ -27,30 +150,18 @@ def scan(
     (the bulk of them in a DB dump: hashes, ids, hex blobs). With ``tx_hashes``,
     format-level (unverifiable) tx-hash candidates are added too.
     """
-    detectors = DETECTORS + (TX_DETECTORS if tx_hashes else [])
-    found: dict[str, Counter] = defaultdict(Counter)
-    rejected: dict[str, Counter] = defaultdict(Counter)
-    for label, pattern, validator in detectors:
-        for match in re.findall(pattern, text):
-            if validator is None or validator(match):
-                found[label][match] += 1
-            else:
-                rejected[label][match] += 1
+    found, rejected, _ = scan_chunks([text], tx_hashes=tx_hashes)
     return found, rejected
 
 
-def context_lines(text: str, addr: str, width: int = 50) -> str:
-    i = text.find(addr)
-    snippet = text[max(0, i - width) : i + len(addr) + width]
-    return snippet.replace("\n", " ").replace("\r", " ")
-
-
-def _group_obj(counter: Counter, text: str, limit: int, context: bool) -> dict:
+def _group_obj(
+    label: str, counter: Counter, limit: int, contexts: Optional[dict]
+) -> dict:
     items = []
     for value, n in counter.most_common(limit or None):
         entry = {"value": value, "count": n}
-        if context:
-            entry["context"] = context_lines(text, value)
+        if contexts is not None:
+            entry["context"] = contexts.get((label, value), "")
         items.append(entry)
     return {
         "unique": len(counter),
@@ -60,6 +171,58 @@ def _group_obj(counter: Counter, text: str, limit: int, context: bool) -> dict:
     }
 
 
+def _text_chunks(source: "bytes | str") -> Iterator[str]:
+    # latin-1 maps every byte 0x00-0xFF to one code point, losslessly.
+    # ASCII runs (all address encodings are ASCII) survive intact, and
+    # non-text bytes become non-matching separators -> works on binaries.
+    if isinstance(source, bytes):
+        view = memoryview(source)
+        for pos in range(0, len(source), CHUNK_CHARS):
+            yield str(view[pos : pos + CHUNK_CHARS], "latin-1")
+        return
+    with open(source, "rb") as fh:  # undecompressed file: stream from disk
+        while block := fh.read(CHUNK_CHARS):
+            yield block.decode("latin-1")
+
+
+def _scan_stream(
+    label: str,
+    source: "bytes | str",
+    nbytes: int,
+    tx_hashes: bool,
+    context: bool,
+    hide_rejected: bool,
+    rejected_limit: int,
+) -> tuple[Optional[dict], dict[str, Counter]]:
+    """Scan one stream; return its report entry (None if quiet) and hits."""
+    results, rejected, contexts = scan_chunks(
+        _text_chunks(source),
+        tx_hashes=tx_hashes,
+        context_width=CONTEXT_WIDTH if context else None,
+    )
+    if not results and (hide_rejected or not rejected):
+        return None, results  # keep decompressed-but-empty streams quiet
+    ctx = contexts if context else None
+    stream_obj: dict = {
+        "stream": label,
+        "bytes": nbytes,
+        "validated": {k: _group_obj(k, c, 0, ctx) for k, c in results.items()},
+    }
+    if not hide_rejected and rejected:
+        stream_obj["rejected"] = {
+            k: _group_obj(k, c, rejected_limit, ctx) for k, c in rejected.items()
+        }
+    return stream_obj, results
+
+
+class _InlineFuture:
+    def __init__(self, value):
+        self._value = value
+
+    def result(self):
+        return self._value
+
+
 def build_report(
     paths: list[str],
     *,
@@ -70,58 +233,74 @@ def build_report(
     context: bool = False,
     hide_rejected: bool = False,
     rejected_limit: int = 20,
+    workers: int = 1,
 ) -> dict:
-    """Scan every path and return a JSON-serialisable report dict."""
+    """Scan every path and return a JSON-serialisable report dict.
+
+    With ``workers > 1`` the streams of all files are scanned in a process
+    pool; the report is identical to a serial run. At most ``2 * workers``
+    streams are queued for the pool at a time, so only a few decompressed
+    streams are held in memory however many files are scanned.
+    """
     global_seen: set[str] = set()  # distinct addresses across all files/streams
     global_tx: set[str] = set()  # distinct tx-hash candidates
     report: dict = {"files": []}
+    options = (tx_hashes, context, hide_rejected, rejected_limit)
+    pool: Optional[Executor] = ProcessPoolExecutor(workers) if workers > 1 else None
+    max_pending = 2 * workers if pool is not None else 0
+    pending: deque = deque()  # (file_entry, future) in input order
 
-    for path in paths:
-        try:
-            with open(path, "rb") as fh:
-                raw = fh.read()
-        except OSError as exc:
-            report["files"].append({"path": path, "error": str(exc)})
-            continue
+    def collect(file_entry, future):
+        stream_obj, results = future.result()
+        for kind, counter in results.items():
+            target = global_tx if kind.startswith("TX-hash") else global_seen
+            target.update(counter)
+        if stream_obj is not None:
+            file_entry["streams"].append(stream_obj)
 
-        if not decompress:
-            streams = [(path, raw)]
+    def submit(file_entry, label, source, nbytes):
+        if pool is None:
+            future = _InlineFuture(_scan_stream(label, source, nbytes, *options))
         else:
-            budget = [max_decompressed_mb * 1024 * 1024]
-            streams = list(iter_streams(raw, path, carve, budget))
-
-        file_entry: dict = {
-            "path": path,
-            "bytes": len(raw),
-            "stream_count": len(streams),
-            "streams": [],
-        }
-        for label, sdata in streams:
-            # latin-1 maps every byte 0x00-0xFF to one code point, losslessly.
-            # ASCII runs (all address encodings are ASCII) survive intact, and
-            # non-text bytes become non-matching separators -> works on binaries.
-            text = sdata.decode("latin-1")
-            results, rejected = scan(text, tx_hashes=tx_hashes)
-            for kind, counter in results.items():
-                target = global_tx if kind.startswith("TX-hash") else global_seen
-                target.update(counter)
-            if not results and (hide_rejected or not rejected):
-                continue  # keep decompressed-but-empty streams quiet
-
-            stream_obj: dict = {
-                "stream": label,
-                "bytes": len(sdata),
-                "validated": {
-                    k: _group_obj(c, text, 0, context) for k, c in results.items()
-                },
+            future = pool.submit(_scan_stream, label, source, nbytes, *options)
+        file_entry["stream_count"] += 1
+        pending.append((file_entry, future))
+        while len(pending) > max_pending:
+            collect(*pending.popleft())
+
+    try:
+        for path in paths:
+            try:
+                if decompress:
+                    with open(path, "rb") as fh:
+                        raw = fh.read()
+                    size = len(raw)
+                else:
+                    size = os.path.getsize(path)
+            except OSError as exc:
+                report["files"].append({"path": path, "error": str(exc)})
+                continue
+
+            file_entry: dict = {
+                "path": path,
+                "bytes": size,
+                "stream_count": 0,
+                "streams": [],
             }
-            if not hide_rejected and rejected:
-                stream_obj["rejected"] = {
-                    k: _group_obj(c, text, rejected_limit, context)
-                    for k, c in rejected.items()
-                }
-            file_entry["streams"].append(stream_obj)
-        report["files"].append(file_entry)
+            report["files"].append(file_entry)
+            if not decompress:
+                submit(file_entry, path, path, size)
+            else:
+                budget = [max_decompressed_mb * 1024 * 1024]
+                for label, sdata in iter_streams(raw, path, carve, budget):
+                    submit(file_entry, label, sdata, len(sdata))
+                del raw
+
+        while pending:
+            collect(*pending.popleft())
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
 
     report["summary"] = {
         "unique_valid_addresses": len(global_seen),
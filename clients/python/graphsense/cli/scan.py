@@ -61,6 +61,13 @@ from graphsense.address_scan.scanner import build_report, render_text
         "(SHA-256 file hashes, API tokens, session ids, ...) is picked up too."
     ),
 )
+@click.option(
+    "--workers",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Scan decompressed streams in this many processes.",
+)
 @click.option(
     "--json",
     "as_json",
@@ -76,6 +83,7 @@ def scan_for_addresses_command(
     carve: bool,
     max_decompressed_mb: int,
     tx_hashes: bool,
+    workers: int,
     as_json: bool,
 ) -> None:
     """Scan text/SQL file(s) for cryptocurrency addresses."""
@@ -96,6 +104,7 @@ def scan_for_addresses_command(
         context=context,
         hide_rejected=hide_rejected,
         rejected_limit=rejected_limit,
+        workers=workers,
     )
 
     for f in report["files"]:
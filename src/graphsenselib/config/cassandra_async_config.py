@@ -61,7 +61,12 @@ class CassandraConfig(BaseSettings):
         default=5, description="Retry interval in seconds when connection fails"
     )
     list_address_txs_ordered_legacy: bool = Field(
-        default=False, description="Use legacy address transaction ordering"
+        default=False,
+        description=(
+            "Use legacy address transaction ordering: re-query all "
+            "direction/asset streams per page instead of the k-way merge "
+            "over paged per-stream cursors"
+        ),
     )
     fanout_bounding_and_links_precheck_enabled: bool = Field(
         default=True,
@@ -109,6 +114,24 @@ class CassandraConfig(BaseSettings):
             return [ks]
         return list(ks)
 
+    immutable_cache_bytes: int = Field(
+        default=64 * 1024 * 1024,
+        description=(
+            "Byte budget of the process-wide cache for exchange rates, token "
+            "rates and block rows at or below the highest block, which never "
+            "change once written. 0 disables the cache."
+        ),
+    )
+
+    immutable_cache_warmup_blocks: int = Field(
+        default=0,
+        description=(
+            "On startup, load the exchange rates and block rows of this many "
+            "of the highest immutable blocks of every currency into the "
+            "immutable row cache. 0 disables the warm-up."
+        ),
+    )
+
     ignore_traces_not_found_in_list_txs: bool = Field(
         default=True,
         description="Ignore missing traces in list_address_txs for Ethereum-like currencies",
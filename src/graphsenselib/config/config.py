@@ -199,6 +199,62 @@ class IngestConfig(_WarnExtraModel):
     secondary_node_references: List[str] = Field(default_factory=lambda: [])
     raw_keyspace_file_sinks: Dict[str, FileSink] = Field(default_factory=lambda: {})
     source_max_workers: int = 5
+    pipeline_depth: int = Field(
+        default=2,
+        description=(
+            "Number of chunks each stage of the from-node ingest pipeline "
+            "(source read, transform) may run ahead of the sinks. Higher values "
+            "smooth out slow chunks at the cost of holding more chunks in memory."
+        ),
+    )
+    source_parallelism: int = Field(
+        default=1,
+        description=(
+            "Number of file chunks read from the node concurrently by the "
+            "from-node ingest pipeline. Only used for account chains (eth, trx); "
+            "UTXO sources resolve inputs from earlier chunks and always read "
+            "one chunk at a time."
+        ),
+    )
+    async_rpc: bool = Field(
+        default=False,
+        description=(
+            "Fetch JSON-RPC batches of the from-node ingest on a single asyncio "
+            "event loop with a shared keep-alive connection pool. The number of "
+            "requests in flight adapts to node latency instead of being fixed "
+            "by source_max_workers."
+        ),
+    )
+    rpc_target_batch_bytes: Optional[int] = Field(
+        default=None,
+        description=(
+            "Target response size in bytes per JSON-RPC batch for the eth/trx "
+            "block and receipt exporters. When set, batch size and worker count "
+            "adapt to measured response sizes, latencies and failures (a batch "
+            "that times out or hits a size limit is split instead of retried 15 "
+            "times). When unset, the fixed per-exporter batch sizes are used. "
+            "4194304 (4 MiB) is a good start."
+        ),
+    )
+    delta_background_compaction: bool = Field(
+        default=False,
+        description=(
+            "Compact and Z-order (on block_id / tx_hash) the Delta partitions "
+            "the from-node ingest has finished writing, on a background thread "
+            "of the ingest process, and vacuum files removed more than a day "
+            "ago every few compactions. Keeps the small files of chunk-wise "
+            "appends from piling up between optimize-deltalake runs."
+        ),
+    )
+    columnar_ingest: bool = Field(
+        default=False,
+        description=(
+            "Build the eth log table as Arrow columns from the RPC JSON "
+            "through to the Delta writer instead of one dict per log. Only "
+            "used when Delta is the only sink; other tables and networks stay "
+            "row based."
+        ),
+    )
     raw_ingest_staleness_threshold: Optional[int] = Field(
         default=None,
         description=(
@@ -677,6 +733,35 @@ class AppConfig(GoodConf):
         ),
     )
 
+    utxo_output_store_dir: Optional[str] = Field(
+        default=None,
+        description=(
+            "Directory for the on-disk UTXO output store used to resolve inputs "
+            "during RPC UTXO ingest at verbosity 2 (one SQLite file per currency). "
+            "When set, outputs that do not fit the in-memory tier are spilled to "
+            "disk instead of dropped, and the set survives restarts, so old-coin "
+            "spends rarely need getrawtransaction. Default None keeps the purely "
+            "in-memory cache."
+        ),
+    )
+
+    utxo_output_store_hot_txs: int = Field(
+        default=2**21,
+        description=(
+            "Number of txs kept in the in-memory tier of the on-disk UTXO output "
+            "store before the oldest half is spilled to disk."
+        ),
+    )
+
+    utxo_output_store_seed_from_delta: bool = Field(
+        default=False,
+        description=(
+            "Seed an empty on-disk UTXO output store from the transaction delta "
+            "table before an append run that does not start at genesis. Reads "
+            "the full transaction history once; subsequent runs reuse the file."
+        ),
+    )
+
     use_redis_locks: bool = Field(
         default=False,
         description="Use Redis for distributed locking instead of file locks.",
@@ -700,6 +785,26 @@ class AppConfig(GoodConf):
         ),
     )
 
+    delta_updater_wal_compression: Optional[str] = Field(
+        default=None,
+        description=(
+            "Compression of staged delta-update WAL payloads: lz4 (needs the "
+            "lz4 package), zstd (needs the zstandard package) or null (default) "
+            "to store them uncompressed. Only affects newly staged records; "
+            "replay detects the codec from the payload."
+        ),
+    )
+
+    delta_updater_entity_cache_size: int = Field(
+        default=500_000,
+        description=(
+            "Entries per map (address ids, address rows, cluster rows) of the "
+            "UTXO delta updater's cross-batch entity cache. 0 disables the "
+            "cache, so every batch reads its addresses and clusters from "
+            "Cassandra again. The --entity-cache-size CLI flag overrides this."
+        ),
+    )
+
     web: Optional[Dict] = Field(
         default=None,
         description="Optional REST API (gsrest) configuration. Read by the web app.",
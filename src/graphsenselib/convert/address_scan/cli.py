@@ -54,6 +54,13 @@ from .scanner import build_report, render_text
         "(SHA-256 file hashes, API tokens, session ids, ...) is picked up too."
     ),
 )
+@click.option(
+    "--workers",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Scan decompressed streams in this many processes.",
+)
 @click.option(
     "--json",
     "as_json",
@@ -69,6 +76,7 @@ def scan_for_addresses_cmd(
     carve: bool,
     max_decompressed_mb: int,
     tx_hashes: bool,
+    workers: int,
     as_json: bool,
 ) -> None:
     """Scan text/SQL file(s) for cryptocurrency addresses.
@@ -97,6 +105,7 @@ def scan_for_addresses_cmd(
         context=context,
         hide_rejected=hide_rejected,
         rejected_limit=rejected_limit,
+        workers=workers,
     )
 
     for f in report["files"]:
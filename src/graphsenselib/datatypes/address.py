@@ -2,6 +2,9 @@ from typing import Union
 
 from ..utils import hex_to_bytes
 
+# hex characters of the partition key of address_ids_by_address_suffix
+ADDRESS_SUFFIX_LENGTH = 4
+
 
 class AddressUtxo:
     def __init__(self, adr: Union[str], config):
@@ -91,6 +94,10 @@ class AddressAccount:
     def prefix(self) -> str:
         return self.hex.upper()[: self.prefix_length]
 
+    @property
+    def suffix(self) -> str:
+        return self.hex.upper()[-ADDRESS_SUFFIX_LENGTH:]
+
     @property
     def bytearray(self) -> bytearray:  # noqa
         return self.address_bytes  # ty: ignore[invalid-return-type]
@@ -1,7 +1,13 @@
+import logging
+from itertools import islice
 from typing import Iterable, Optional
 
+from ..datatypes.address import ADDRESS_SUFFIX_LENGTH
 from ..utils import hex_to_bytes, strip_0x
 from .analytics import RawDb, TransformedDb
+from .state import STATE_TABLE, build_address_suffix_index_row
+
+logger = logging.getLogger(__name__)
 
 
 class TransformedDbAccount(TransformedDb):
@@ -15,6 +21,47 @@ class TransformedDbAccount(TransformedDb):
             id_col="transaction_id",
         )
 
+    def backfill_address_suffix_index(self, batch_size: int = 10_000) -> int:
+        """Write the addresses created before the delta updater started
+        indexing them to ``address_ids_by_address_suffix``, then move the
+        ``address_suffix_index`` marker to address id 0 so address search
+        reads the suffix table for every address.
+
+        Scans all of ``address_ids_by_address_prefix``; addresses from the
+        current marker on are already indexed and skipped. Returns the
+        number of rows written."""
+        index = self.get_address_suffix_index()
+        if index is not None and index[0] == 0:
+            return 0
+        first_indexed, suffix_length = index or (None, ADDRESS_SUFFIX_LENGTH)
+
+        rows = iter(
+            self.select(
+                "address_ids_by_address_prefix",
+                columns=["address", "address_id"],
+                fetch_size=batch_size,
+            )
+        )
+        written = 0
+        while chunk := list(islice(rows, batch_size)):
+            items = [
+                {
+                    "address_suffix": bytes(row.address).hex().upper()[-suffix_length:],
+                    "address": row.address,
+                    "address_id": row.address_id,
+                }
+                for row in chunk
+                if first_indexed is None or row.address_id < first_indexed
+            ]
+            if items:
+                self.ingest("address_ids_by_address_suffix", items)
+                written += len(items)
+                logger.info(f"Indexed {written} addresses by suffix.")
+
+        # only once every older address is in the table
+        self.ingest(STATE_TABLE, [build_address_suffix_index_row(0, suffix_length)])
+        return written
+
 
 class RawDbAccount(RawDb):
     def get_logs_in_block(self, block: int, topic0=None, contract=None) -> Iterable:
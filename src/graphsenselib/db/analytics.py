@@ -17,10 +17,15 @@ from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple, Union
 
 import pandas as pd
 from cassandra import InvalidRequest, OperationTimedOut, Unavailable, WriteTimeout
+from cassandra.query import BatchStatement
 
 from graphsenselib.db.state import (
+    ADDRESS_SUFFIX_INDEX_KEY,
     FRESH_CLUSTERING_ACTIVE_KEY,
+    SECONDARY_GROUP_INDEX_KEY,
     STATE_TABLE,
+    parse_address_suffix_index_value,
+    parse_secondary_group_index_value,
 )
 from cassandra.cluster import NoHostAvailable
 from tenacity import (
@@ -42,6 +47,7 @@ from .cassandra import (
     build_insert_stmt,
     build_select_stmt,
     build_truncate_stmt,
+    group_statements_by_partition,
 )
 
 CONCURRENCY = 2000
@@ -113,6 +119,33 @@ class ApplyChangesResult:
     total_retry_wait_seconds: float
     warning_threshold: Optional[str] = None
     warning_text: Optional[str] = None
+    statements_retried: int = 0
+
+
+# Errors after which a non-atomic apply resubmits just the failed statements.
+RETRYABLE_WRITE_ERRORS = (WriteTimeout, OperationTimedOut, Unavailable, NoHostAvailable)
+
+
+class AimdConcurrency:
+    """Additive-increase / multiplicative-decrease in-flight limit for writes.
+
+    Every round with failures halves the limit (never below ``minimum``); every
+    clean round raises it by ``step`` (never above ``maximum``). Kept per
+    writer across ``apply_changes`` calls, so a struggling cluster is not hit
+    with full concurrency again on the next batch and recovers gradually.
+    """
+
+    def __init__(self, initial: int, minimum: int, maximum: int, step: int = 0):
+        self.maximum = max(1, maximum)
+        self.minimum = max(1, min(minimum, self.maximum))
+        self.step = step or max(1, self.maximum // 10)
+        self.current = max(self.minimum, min(initial, self.maximum))
+
+    def on_success(self):
+        self.current = min(self.maximum, self.current + self.step)
+
+    def on_failure(self):
+        self.current = max(self.minimum, self.current // 2)
 
 
 class KeyspaceConfig:
@@ -350,24 +383,37 @@ class DbWriterMixin:
         nr_retries=100,
         initial_concurrency: int = 100,
         min_concurrency: int = 5,
+        partition_batch_size: int = 8,
     ) -> ApplyChangesResult:
-        """Apply db changes and return retry/warning metadata."""
-        statements = [
-            (chng.get_cql_statement(keyspace=self.get_keyspace()), chng)
-            for chng in changes
-        ]
-        unique_statements = {stmt for stmt, _ in statements}
-
-        prepared_statements = {
-            stmt: self._db.get_prepared_statement(stmt) for stmt in unique_statements
-        }
-
-        change_stmts = [
-            prepared_statements[
-                chng.get_cql_statement(keyspace=self.get_keyspace())
-            ].bind(chng.data)
-            for chng in changes
-        ]
+        """Apply db changes and return retry/warning metadata.
+
+        ``atomic`` writes everything as one logged batch, retried as a whole.
+        Otherwise upserts to the same partition are packed into UNLOGGED batches
+        of up to ``partition_batch_size`` (see
+        :func:`~graphsenselib.db.cassandra.group_statements_by_partition`; 1
+        disables it) and submitted concurrently; after a round only the
+        statements that failed are resubmitted, and the in-flight limit follows
+        an :class:`AimdConcurrency` controller kept on the writer.
+        """
+        prepared_statements = {}
+
+        def bind(chng):
+            stmt = chng.get_cql_statement(keyspace=self.get_keyspace())
+            if stmt not in prepared_statements:
+                prepared_statements[stmt] = self._db.get_prepared_statement(stmt)
+            return prepared_statements[stmt].bind(chng.data)
+
+        change_stmts = [bind(chng) for chng in changes]
+
+        if not atomic:
+            return self._apply_statements_partial_retry(
+                changes,
+                change_stmts,
+                nr_retries,
+                initial_concurrency,
+                min_concurrency,
+                partition_batch_size,
+            )
 
         attempts_made = 0
         total_retry_wait_seconds = 0.0
@@ -378,9 +424,7 @@ class DbWriterMixin:
         # waited out (bounded by stop_after_attempt) instead of aborting a
         # half-flushed batch and leaving the keyspace inconsistent.
         for attempt in Retrying(
-            retry=retry_if_exception_type(
-                (WriteTimeout, OperationTimedOut, Unavailable, NoHostAvailable)
-            ),
+            retry=retry_if_exception_type(RETRYABLE_WRITE_ERRORS),
             reraise=True,
             stop=stop_after_attempt(nr_retries),
             wait=wait_exponential(multiplier=0.5, min=0.5, max=240),
@@ -389,26 +433,108 @@ class DbWriterMixin:
             # see https://tenacity.readthedocs.io/en/latest/#retrying-code-block
             with attempt:
                 attempts_made += 1
-                current_concurrency = max(
-                    min_concurrency,
-                    initial_concurrency // (2 ** (attempts_made - 1)),
-                )
                 if attempts_made > 1:
                     logger.warning(
                         "Applying changes ran into a write timeout. "
-                        f"Retrying {(nr_retries - attempts_made) + 1} more times "
-                        f"with concurrency={current_concurrency}."
-                    )
-                if atomic:
-                    self._db.execute_statements_atomic(change_stmts)
-                else:
-                    self._db.execute_statements(
-                        change_stmts, concurrency=current_concurrency
+                        f"Retrying {(nr_retries - attempts_made) + 1} more times."
                     )
+                self._db.execute_statements_atomic(change_stmts)
                 total_retry_wait_seconds = max(
                     total_retry_wait_seconds, float(attempt.retry_state.idle_for or 0.0)
                 )
 
+        return self._apply_changes_result(attempts_made, total_retry_wait_seconds)
+
+    def _apply_statements_partial_retry(
+        self,
+        changes: List[DbChange],
+        change_stmts: list,
+        nr_retries: int,
+        initial_concurrency: int,
+        min_concurrency: int,
+        partition_batch_size: int,
+    ) -> ApplyChangesResult:
+        controller = getattr(self, "_write_concurrency", None)
+        if controller is None or controller.maximum != initial_concurrency:
+            controller = AimdConcurrency(
+                initial_concurrency, min_concurrency, initial_concurrency
+            )
+            self._write_concurrency = controller
+
+        # Deletes stay single statements: a batch shares one write timestamp,
+        # so a delete batched with an upsert of the same row would win.
+        upserts = [
+            stmt
+            for stmt, chng in zip(change_stmts, changes)
+            if chng.action in (DbChangeType.NEW, DbChangeType.UPDATE)
+        ]
+        others = [
+            stmt
+            for stmt, chng in zip(change_stmts, changes)
+            if chng.action not in (DbChangeType.NEW, DbChangeType.UPDATE)
+        ]
+        pending = group_statements_by_partition(upserts, partition_batch_size) + others
+
+        attempts_made = 0
+        statements_retried = 0
+        total_retry_wait_seconds = 0.0
+        while pending:
+            attempts_made += 1
+            try:
+                errors = self._db.execute_statements_tracked(
+                    pending, concurrency=controller.current
+                )
+            except RETRYABLE_WRITE_ERRORS as e:
+                # Raised before any per-statement result (e.g. no host at all):
+                # nothing is known to be acked, so everything is resubmitted.
+                errors = [e] * len(pending)
+
+            failed = [
+                (unit, err) for unit, err in zip(pending, errors) if err is not None
+            ]
+            if not failed:
+                controller.on_success()
+                break
+
+            fatal = next(
+                (
+                    err
+                    for _, err in failed
+                    if not isinstance(err, RETRYABLE_WRITE_ERRORS)
+                ),
+                None,
+            )
+            if fatal is not None:
+                raise fatal
+            if attempts_made >= nr_retries:
+                raise failed[0][1]
+
+            controller.on_failure()
+            pending = [unit for unit, _ in failed]
+            n_failed = sum(
+                len(unit) if isinstance(unit, BatchStatement) else 1 for unit in pending
+            )
+            statements_retried += n_failed
+            delay = min(240.0, 0.5 * 2 ** (attempts_made - 1))
+            logger.warning(
+                f"Applying changes: {n_failed} statement(s) failed "
+                f"({type(failed[0][1]).__name__}); retrying only those "
+                f"{nr_retries - attempts_made} more times with "
+                f"concurrency={controller.current} in {delay:.1f}s."
+            )
+            time.sleep(delay)
+            total_retry_wait_seconds += delay
+
+        return self._apply_changes_result(
+            attempts_made, total_retry_wait_seconds, statements_retried
+        )
+
+    @staticmethod
+    def _apply_changes_result(
+        attempts_made: int,
+        total_retry_wait_seconds: float,
+        statements_retried: int = 0,
+    ) -> ApplyChangesResult:
         warning_threshold = None
         warning_text = None
         if total_retry_wait_seconds > 30:
@@ -424,6 +550,7 @@ class DbWriterMixin:
             total_retry_wait_seconds=total_retry_wait_seconds,
             warning_threshold=warning_threshold,
             warning_text=warning_text,
+            statements_retried=statements_retried,
         )
 
     def ensure_table_exists(
@@ -838,6 +965,29 @@ class TransformedDb(ABC, WithinKeyspace, DbReaderMixin, DbWriterMixin):
             return False
         return row is not None
 
+    def get_secondary_group_index_start(self) -> Optional[Tuple[int, int]]:
+        """(block_id, address_id) the secondary group occupancy index is
+        maintained from, None if the marker is missing (index never written or
+        pre-migration keyspace). See ``build_secondary_group_index_row``."""
+        try:
+            row = self.select_one_safe(
+                STATE_TABLE, where={"key": SECONDARY_GROUP_INDEX_KEY}
+            )
+        except InvalidRequest:
+            return None
+        return parse_secondary_group_index_value(row.value if row else None)
+
+    def get_address_suffix_index(self) -> Optional[Tuple[int, int]]:
+        """(address_id, suffix_length) of the address suffix index, None if
+        the marker is missing. See ``build_address_suffix_index_row``."""
+        try:
+            row = self.select_one_safe(
+                STATE_TABLE, where={"key": ADDRESS_SUFFIX_INDEX_KEY}
+            )
+        except InvalidRequest:
+            return None
+        return parse_address_suffix_index_value(row.value if row else None)
+
     def get_fresh_clusters_for_addresses(
         self, address_ids: List[int]
     ) -> List[Tuple[int, int]]:
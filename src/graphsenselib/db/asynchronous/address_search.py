@@ -0,0 +1,176 @@
+"""Query planning for address search expressions (``prefix[...postfix]``).
+
+Two tables of the transformed account keyspace index addresses by their
+hex characters, both clustered by address:
+
+* ``address_ids_by_address_prefix``, partitioned by the first
+  ``address_prefix_length`` characters;
+* ``address_ids_by_address_suffix``, partitioned by the last
+  ``suffix_length`` characters. The delta updater writes it from the address
+  id recorded in the ``address_suffix_index`` state marker on (see
+  ``build_address_suffix_index_row``).
+
+``plan_address_search`` turns an expression into lookups, each reading a
+range of addresses starting with the prefix from one or more partitions of
+one table, optionally post-filtered on the postfix:
+
+* a postfix of at least ``suffix_length`` characters reads one suffix
+  partition, one character shorter the 16 partitions it can end in. Only
+  rows matching both prefix and suffix are read, so e.g. ``0x33d05d...8f65``
+  is answered exactly, without a prefix length minimum;
+* otherwise, and for the addresses the suffix index does not cover, the
+  prefix partition is read (the 16 partitions for an eth prefix one
+  character short, as shown by tools like TRM). With a postfix at most
+  ``MAX_POSTFILTER_ROWS`` rows are filtered per partition, so huge prefix
+  ranges like ``0x00000`` stay bounded but can miss matches.
+
+``search_addresses`` runs the lookups concurrently and returns the matching
+addresses in ascending order.
+"""
+
+import asyncio
+from dataclasses import dataclass
+from typing import Awaitable, Callable, List, Optional, Sequence, Tuple
+
+ADDRESS_PREFIX_TABLE = "address_ids_by_address_prefix"
+ADDRESS_SUFFIX_TABLE = "address_ids_by_address_suffix"
+
+HEX_DIGITS = "0123456789abcdef"
+
+# rows of a prefix partition post-filtered for a postfix at most
+MAX_POSTFILTER_ROWS = 2_000
+FETCH_SIZE = 500
+
+
+@dataclass(frozen=True)
+class AddressLookup:
+    table: str
+    # partition keys (upper-case hex)
+    partitions: Tuple[str, ...]
+    # lower-case hex without 0x, may be empty
+    prefix: str
+    # post-filter on the end of the address, None if every row in range matches
+    postfix: Optional[str] = None
+    # rows read per partition at most, None: the whole range
+    max_rows: Optional[int] = None
+
+    @property
+    def partition_key(self) -> str:
+        if self.table == ADDRESS_SUFFIX_TABLE:
+            return "address_suffix"
+        return "address_prefix"
+
+
+def hex_prefix_range(prefix: str) -> Optional[Tuple[bytes, Optional[bytes]]]:
+    """[lower, upper) bounds of the blob addresses starting with the hex
+    ``prefix``; upper is None if no address is above the range."""
+    if not prefix:
+        return None
+    lower = bytes.fromhex(prefix + "0" * (len(prefix) % 2))
+    head = prefix.rstrip("f")
+    if not head:
+        return lower, None
+    upper = head[:-1] + HEX_DIGITS[HEX_DIGITS.index(head[-1]) + 1]
+    return lower, bytes.fromhex(upper + "0" * (len(upper) % 2))
+
+
+def plan_address_search(
+    prefix: str,
+    postfix: Optional[str],
+    prefix_length: int,
+    suffix_index: Optional[Tuple[int, int]],
+    limit: Optional[int],
+) -> List[AddressLookup]:
+    """Lookups answering ``prefix...postfix`` (lower-case hex without 0x).
+
+    ``suffix_index`` is the (address_id, suffix_length) of the
+    ``address_suffix_index`` marker, None if the suffix table is not
+    maintained."""
+    postfix = postfix or None
+    lookups = []
+    covered = False
+    if postfix is not None and suffix_index is not None:
+        first_address_id, suffix_length = suffix_index
+        if len(postfix) >= suffix_length:
+            partitions = (postfix[-suffix_length:].upper(),)
+        elif len(postfix) == suffix_length - 1:
+            partitions = tuple((c + postfix).upper() for c in HEX_DIGITS)
+        else:
+            partitions = ()
+        if partitions:
+            lookups.append(
+                AddressLookup(
+                    ADDRESS_SUFFIX_TABLE,
+                    partitions,
+                    prefix,
+                    postfix if len(postfix) > suffix_length else None,
+                )
+            )
+            covered = first_address_id == 0
+
+    if not covered:
+        if len(prefix) >= prefix_length:
+            partitions = (prefix[:prefix_length].upper(),)
+        elif len(prefix) == prefix_length - 1 and postfix is not None:
+            partitions = tuple((prefix + c).upper() for c in HEX_DIGITS)
+        else:
+            partitions = ()
+        if partitions:
+            lookups.append(
+                AddressLookup(
+                    ADDRESS_PREFIX_TABLE,
+                    partitions,
+                    prefix,
+                    postfix,
+                    MAX_POSTFILTER_ROWS if postfix is not None else limit,
+                )
+            )
+    return lookups
+
+
+ReadPage = Callable[
+    [AddressLookup, str, Optional[bytes], Optional[int]],
+    Awaitable[Tuple[Sequence[bytes], Optional[bytes]]],
+]
+
+
+async def search_addresses(
+    lookups: Sequence[AddressLookup], read_page: ReadPage, limit: Optional[int]
+) -> List[bytes]:
+    """Distinct addresses found by ``lookups``, ascending, at most ``limit``.
+
+    ``read_page(lookup, partition, paging_state, n)`` reads up to ``n`` rows
+    (None: all) of the lookup's range in ``partition`` from
+    ``paging_state`` and returns them with the paging state of the
+    following page. Lookups without a post-filter need a single read."""
+
+    async def scan(lookup: AddressLookup, partition: str) -> List[bytes]:
+        if lookup.postfix is None:
+            want = limit
+            if lookup.max_rows is not None:
+                want = lookup.max_rows if want is None else min(want, lookup.max_rows)
+            rows, _ = await read_page(lookup, partition, None, want)
+            return list(rows)
+
+        found: List[bytes] = []
+        read = 0
+        state = None
+        while True:
+            n = FETCH_SIZE
+            if lookup.max_rows is not None:
+                n = min(n, lookup.max_rows - read)
+            rows, state = await read_page(lookup, partition, state, n)
+            read += len(rows)
+            found.extend(a for a in rows if a.hex().endswith(lookup.postfix))
+            if (
+                state is None
+                or (limit is not None and len(found) >= limit)
+                or (lookup.max_rows is not None and read >= lookup.max_rows)
+            ):
+                return found
+
+    results = await asyncio.gather(
+        *(scan(lookup, p) for lookup in lookups for p in lookup.partitions)
+    )
+    addresses = sorted({a for rows in results for a in rows})
+    return addresses if limit is None else addresses[:limit]
@@ -0,0 +1,231 @@
+"""K-way merge of per-(direction, asset) address transaction streams.
+
+The address/cluster transactions tables are clustered by direction and asset
+(and, for eth-like networks, split into secondary id groups by block), so a
+listing ordered by tx id merges one ordered Cassandra query per direction and
+asset. Each such stream is a cursor:
+
+* the secondary group it currently reads (``None`` once exhausted), the
+  Cassandra paging state of the page holding its next row and the number of
+  rows of that page already returned (``skip``);
+* a stream is only fetched when the merge heap needs its next row, with a
+  fetch size capped by the rows still missing from the page; a drained group
+  continues in the next secondary group in listing order.
+
+The cursors of all streams form the page token, so a page costs one page
+read per stream instead of re-reading every stream up to the requested
+offset. Like the legacy listing, every returned row has a token resuming
+right after it, so callers can truncate a page and still continue where they
+stopped; the tokens are encoded on access (``MergePages``). Tokens are
+opaque, compressed and carry the ``MERGE_PAGE_PREFIX`` to tell them from the
+``tx_id[:secondary_id]:offset`` tokens of the legacy listing. They start
+with a fingerprint of the stream keys and tx id bounds they were issued for,
+so a token is rejected when the direction, asset or tx id range selection
+changes between pages, since the paging states only match their own query.
+"""
+
+import asyncio
+import base64
+import binascii
+import heapq
+import math
+import struct
+import zlib
+from collections.abc import Sequence as SequenceABC
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Hashable, List, Optional, Sequence, Tuple
+
+from graphsenselib.errors import BadUserInputException
+
+MERGE_PAGE_PREFIX = "m1."
+
+# secondary group (-1 when exhausted), skip, length of the paging state
+_CURSOR = struct.Struct(">iIH")
+# crc32 of the stream keys, ahead of the cursors
+_FINGERPRINT = struct.Struct(">I")
+
+
+@dataclass
+class StreamCursor:
+    s_d_group: Optional[int]
+    paging_state: Optional[bytes] = None
+    skip: int = 0
+
+
+FetchPage = Callable[
+    [int, StreamCursor, int], Awaitable[Tuple[Sequence[dict], Optional[bytes]]]
+]
+
+
+def is_merge_page(page: Optional[str]) -> bool:
+    return page is not None and page.startswith(MERGE_PAGE_PREFIX)
+
+
+Bounds = Tuple[Optional[int], Optional[int]]
+
+
+def _streams_fingerprint(streams: Sequence[Hashable], bounds: Bounds) -> int:
+    return zlib.crc32(repr((list(streams), tuple(bounds))).encode())
+
+
+def encode_merge_page(
+    cursors: Sequence[StreamCursor],
+    streams: Sequence[Hashable],
+    bounds: Bounds = (None, None),
+) -> str:
+    """Page token for ``cursors``, one per stream in ``streams`` (the keys
+    identifying the streams, e.g. ``(is_outgoing, asset)``), of the query
+    restricted to the tx id ``bounds`` (lower, upper)."""
+    buf = bytearray(_FINGERPRINT.pack(_streams_fingerprint(streams, bounds)))
+    for c in cursors:
+        state = c.paging_state or b""
+        group = -1 if c.s_d_group is None else c.s_d_group
+        buf += _CURSOR.pack(group, c.skip, len(state)) + state
+    token = base64.urlsafe_b64encode(zlib.compress(bytes(buf))).rstrip(b"=")
+    return MERGE_PAGE_PREFIX + token.decode("ascii")
+
+
+def decode_merge_page(
+    page: str, streams: Sequence[Hashable], bounds: Bounds = (None, None)
+) -> List[StreamCursor]:
+    error = BadUserInputException(
+        f"The requested next page token ({page}) is not formatted correctly. "
+        "Only use the next_page token found in the response."
+    )
+    token = page[len(MERGE_PAGE_PREFIX) :]
+    try:
+        buf = zlib.decompress(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+    except (binascii.Error, ValueError, zlib.error):
+        raise error
+    if len(buf) < _FINGERPRINT.size:
+        raise error
+    (fingerprint,) = _FINGERPRINT.unpack_from(buf)
+    if fingerprint != _streams_fingerprint(streams, bounds):
+        raise BadUserInputException(
+            f"The requested next page token ({page}) was issued for a different "
+            "direction, asset or tx id range selection. Repeat the request with "
+            "the parameters that returned the token."
+        )
+    cursors = []
+    pos = _FINGERPRINT.size
+    while pos < len(buf):
+        if pos + _CURSOR.size > len(buf):
+            raise error
+        group, skip, length = _CURSOR.unpack_from(buf, pos)
+        pos += _CURSOR.size
+        state = buf[pos : pos + length]
+        pos += length
+        if len(state) != length:
+            raise error
+        cursors.append(StreamCursor(None if group < 0 else group, state or None, skip))
+    if len(cursors) != len(streams):
+        raise error
+    return cursors
+
+
+class MergePages(SequenceABC):
+    """Page tokens of a merged listing, one per returned row: the token at
+    ``i`` resumes right after row ``i`` and is ``None`` if no rows are left.
+    Tokens are only encoded when accessed."""
+
+    def __init__(
+        self,
+        row_cursors: Sequence[Sequence[StreamCursor]],
+        streams: Sequence[Hashable],
+        bounds: Bounds = (None, None),
+    ):
+        self.row_cursors = row_cursors
+        self.streams = streams
+        self.bounds = bounds
+
+    def __len__(self) -> int:
+        return len(self.row_cursors)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        cursors = self.row_cursors[i]
+        if all(c.s_d_group is None for c in cursors):
+            return None
+        return encode_merge_page(cursors, self.streams, self.bounds)
+
+
+class _Stream:
+    def __init__(self, cursor: StreamCursor):
+        self.cursor = cursor
+        self.rows: Sequence[dict] = []
+        self.pos = 0
+        self.next_state: Optional[bytes] = None
+
+    def head(self) -> Optional[dict]:
+        return self.rows[self.pos] if self.pos < len(self.rows) else None
+
+    def snapshot(self, next_group) -> StreamCursor:
+        """Cursor of the first row not returned yet."""
+        c = self.cursor
+        if self.head() is not None:
+            return StreamCursor(c.s_d_group, c.paging_state, self.pos)
+        if c.s_d_group is None or not self.rows:
+            return c
+        if self.next_state is not None:
+            return StreamCursor(c.s_d_group, self.next_state)
+        return StreamCursor(next_group(c.s_d_group))
+
+
+async def merge_address_txs_streams(
+    cursors: Sequence[StreamCursor],
+    fetch_page: FetchPage,
+    next_group: Callable[[int], Optional[int]],
+    key: Callable[[dict], tuple],
+    fetch_size: int,
+    min_fetch_size: int,
+) -> Tuple[List[dict], List[List[StreamCursor]], bool]:
+    """Merge the streams at ``cursors`` by ``key`` (ascending) and return at
+    most ``fetch_size`` rows, for every row the cursors right after it and
+    whether all streams are exhausted.
+
+    ``fetch_page(i, cursor, n)`` reads up to ``n`` rows of stream ``i`` from
+    ``cursor.paging_state`` (``None``: from the start of the group) and
+    returns them with the paging state of the following page.
+    """
+    streams = [_Stream(c) for c in cursors]
+
+    async def fill(i: int, want: int):
+        s = streams[i]
+        while s.cursor.s_d_group is not None:
+            c = s.cursor
+            rows, next_state = await fetch_page(i, c, c.skip + want)
+            if c.skip < len(rows):
+                s.rows, s.pos, s.next_state = rows, c.skip, next_state
+                return
+            if next_state is not None:
+                s.cursor = StreamCursor(c.s_d_group, next_state, c.skip - len(rows))
+            else:
+                s.cursor = StreamCursor(next_group(c.s_d_group))
+        s.rows, s.pos, s.next_state = [], 0, None
+
+    live = [i for i, s in enumerate(streams) if s.cursor.s_d_group is not None]
+    first_want = max(min_fetch_size, math.ceil(fetch_size / max(len(live), 1)))
+    await asyncio.gather(*(fill(i, first_want) for i in live))
+
+    heap = [(key(s.head()), i) for i, s in enumerate(streams) if s.head() is not None]
+    heapq.heapify(heap)
+    # only the popped stream moves, the other cursors are shared between rows
+    current = [s.snapshot(next_group) for s in streams]
+    results: List[dict] = []
+    row_cursors: List[List[StreamCursor]] = []
+    while heap and len(results) < fetch_size:
+        _, i = heapq.heappop(heap)
+        s = streams[i]
+        results.append(s.head())
+        s.pos += 1
+        if s.head() is None and len(results) < fetch_size:
+            s.cursor = s.snapshot(next_group)
+            await fill(i, max(min_fetch_size, fetch_size - len(results)))
+        current[i] = s.snapshot(next_group)
+        row_cursors.append(list(current))
+        if s.head() is not None:
+            heapq.heappush(heap, (key(s.head()), i))
+
+    finished = all(c.s_d_group is None for c in current)
+    return results, row_cursors, finished
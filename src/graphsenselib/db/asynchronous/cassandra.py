@@ -3,7 +3,7 @@ import hashlib
 import logging
 import re
 import time
-from collections import UserDict, namedtuple
+from collections import UserDict, defaultdict, namedtuple
 from datetime import datetime
 from functools import partial
 from itertools import product
@@ -28,13 +28,30 @@ from cassandra.policies import (
 )
 from cassandra.protocol import ProtocolException
 from cassandra.query import SimpleStatement, ValueSequence, dict_factory
+from graphsenselib.db.asynchronous.address_search import (
+    hex_prefix_range,
+    plan_address_search,
+    search_addresses,
+)
+from graphsenselib.db.asynchronous.address_txs_merge import (
+    MergePages,
+    StreamCursor,
+    decode_merge_page,
+    is_merge_page,
+    merge_address_txs_streams,
+)
+from graphsenselib.db.asynchronous.immutable_cache import immutable_row_cache
 from graphsenselib.db.cassandra import GraphsenseRetryPolicy
 from graphsenselib.utils.accountmodel import hex_to_bytes
 from graphsenselib.config.cassandra_async_config import CassandraConfig
 from graphsenselib.db.state import (
+    ADDRESS_SUFFIX_INDEX_KEY,
     FRESH_CLUSTERING_ACTIVE_KEY,
     INGEST_COMPLETE_KEY,
+    SECONDARY_GROUP_INDEX_KEY,
     STATE_TABLE,
+    parse_address_suffix_index_value,
+    parse_secondary_group_index_value,
 )
 from graphsenselib.datatypes.abi import decode_logs_db
 from graphsenselib.utils.account import calculate_id_group_with_overflow
@@ -144,13 +161,21 @@ SEARCH_PAGE_SIZE = 100
 
 MAX_HEX_STRING_LENGTH = 64
 FETCH_SIZE_MIN = 100
-HEX_ALPHABET = "0123456789ABCDEF"
+OCCUPIED_SECONDARY_GROUPS_CACHE_SIZE = 100_000
 
 # Bound on concurrent per-row trace/log/timestamp lookups in
 # normalize_address_transactions — turns up to `pagesize` sequential round-trips
 # per page into bounded-concurrent ones on the hottest (address-txs) endpoint.
 MAX_ROW_LOOKUP_CONCURRENCY = 100
 
+# Heights per ``block_id IN`` query when list_rates/prefetch_rates read
+# uncached exchange rates. exchange_rates is partitioned by block_id alone, so
+# unlike the block table it cannot be read by block_id range.
+RATES_IN_QUERY_SIZE = 100
+
+# Seconds between the periodic immutable row cache stats log lines.
+IMMUTABLE_CACHE_LOG_INTERVAL = 600
+
 
 def _fresh_degrees_pending(row) -> bool:
     """A fresh_cluster_stats row lacking degrees.
@@ -656,6 +681,7 @@ class Cassandra:
         self.config = config
         self.tconfig = tconfig
         self.prepared_statements = {}
+        immutable_row_cache.resize(tconfig.immutable_cache_bytes)
         self.connect()
         self.parameters = NetworkParameters()
         self.get_cross_chain_pubkey_related_addresses_available = False
@@ -1013,6 +1039,7 @@ class Cassandra:
         return self.config["currencies"][currency][keyspace_type]
 
     def close(self):
+        self._log_immutable_cache_stats(force=True)
         self.cluster.shutdown()
 
     def execute(
@@ -1264,10 +1291,74 @@ class Cassandra:
 
         return stats
 
+    async def get_immutable_height(self, currency):
+        """Highest block whose rates and block rows are final (-1 if none).
+
+        Rows keyed by a block at or below it never change and may be kept in
+        ``immutable_row_cache`` for the lifetime of the process.
+        """
+        stats = await self.get_currency_statistics(currency)
+        if not stats or stats.get("no_blocks") is None:
+            return -1
+        return stats["no_blocks"] - 1
+
+    def _immutable_key(self, currency, keyspace_type, table, *key):
+        return (self.get_keyspace_mapping(currency, keyspace_type), table, *key)
+
+    async def _cache_immutable(self, currency, rows_by_height):
+        """Cache ``{height: (cache key, row)}`` entries at or below the
+        immutable height."""
+        self._log_immutable_cache_stats()
+        if not rows_by_height:
+            return
+        immutable_height = await self.get_immutable_height(currency)
+        for height, (key, row) in rows_by_height.items():
+            if height <= immutable_height:
+                immutable_row_cache.put(key, row)
+
+    def get_immutable_cache_stats(self):
+        """Size, hit/miss and eviction counters of the immutable row cache."""
+        return immutable_row_cache.stats()
+
+    def _log_immutable_cache_stats(self, force=False):
+        if not (force or immutable_row_cache.report_due(IMMUTABLE_CACHE_LOG_INTERVAL)):
+            return
+        s = immutable_row_cache.stats()
+        logger.info(
+            f"Immutable row cache: {s['entries']} rows, "
+            f"{s['bytes']}/{s['max_bytes']} bytes, hit rate {s['hit_rate']:.1%} "
+            f"({s['hits']} hits, {s['misses']} misses), "
+            f"{s['evictions']} evictions"
+        )
+
+    async def warm_immutable_cache(self, blocks):
+        """Prefetch the exchange rates and block rows of the ``blocks``
+        highest immutable heights of every configured currency."""
+        for currency in self.config["currencies"]:
+            top = await self.get_immutable_height(currency)
+            if top < 0:
+                continue
+            low = max(0, top - blocks + 1)
+            rates, block_rows = await asyncio.gather(
+                self.prefetch_rates(currency, low, top),
+                self.prefetch_blocks(currency, low, top),
+            )
+            logger.info(
+                f"Warmed immutable row cache for {currency} blocks "
+                f"{low}-{top}: {rates} rates, {block_rows} blocks"
+            )
+
     @eth
     async def get_block(self, currency, height):
+        return await self._get_block_row(currency, height)
+
+    async def _get_block_row(self, currency, height):
+        key = self._immutable_key(currency, "raw", "block", height)
+        row = immutable_row_cache.get(key)
+        if row is not None:
+            return row
         query = "SELECT * FROM block WHERE block_id_group = %s AND block_id = %s"
-        return (
+        row = (
             await self.execute_async(
                 currency,
                 "raw",
@@ -1275,13 +1366,56 @@ class Cassandra:
                 [self.get_block_id_group(currency, height), height],
             )
         ).one()
+        await self._cache_immutable(currency, {height: (key, row)})
+        return row
+
+    async def prefetch_blocks(self, currency, min_height, max_height):
+        """Load the block rows (and timestamps) of ``[min_height, max_height]``
+        into the immutable row cache with one ``block_id`` range scan per
+        block_id_group partition.
+
+        Heights above the immutable height are skipped. Returns the number
+        of rows loaded.
+        """
+        max_height = min(max_height, await self.get_immutable_height(currency))
+        query = (
+            "SELECT * FROM block WHERE block_id_group = %s "
+            "AND block_id >= %s AND block_id <= %s"
+        )
+        params = []
+        start = min_height
+        while start <= max_height:
+            group = self.get_block_id_group(currency, start)
+            end = start
+            while (
+                end < max_height and self.get_block_id_group(currency, end + 1) == group
+            ):
+                end += 1
+            params.append((group, start, end))
+            start = end + 1
+        rows = await self.concurrent_with_args(
+            currency, "raw", query, params, return_one=False
+        )
+        for row in rows:
+            height = row["block_id"]
+            immutable_row_cache.put(
+                self._immutable_key(currency, "raw", "block", height), row
+            )
+            immutable_row_cache.put(
+                self._immutable_key(currency, "raw", "block_timestamp", height),
+                {"timestamp": row["timestamp"]},
+            )
+        return len(rows)
 
-    @alru_cache(maxsize=10000)
     async def get_block_timestamp(self, currency, height):
+        key = self._immutable_key(currency, "raw", "block_timestamp", height)
+        row = immutable_row_cache.get(key)
+        if row is not None:
+            return row
         query = (
             "SELECT timestamp FROM block WHERE block_id_group = %s AND block_id = %s"
         )
-        return (
+        row = (
             await self.execute_async(
                 currency,
                 "raw",
@@ -1289,6 +1423,8 @@ class Cassandra:
                 [self.get_block_id_group(currency, height), height],
             )
         ).one()
+        await self._cache_immutable(currency, {height: (key, row)})
+        return row
 
     async def get_block_by_date_allow_filtering(self, currency, timestamp: int) -> int:
         query = "SELECT min(block_id) as block_id, timestamp FROM block WHERE timestamp >= %s allow filtering"
@@ -1321,14 +1457,59 @@ class Cassandra:
         tx_ids = sorted(list(set(tx_ids)))
         return await self.list_txs_by_ids(currency, tx_ids, include_token_txs=True)
 
-    @alru_cache(maxsize=1000)
     async def get_rates(self, currency, height):
+        key = self._immutable_key(currency, "transformed", "exchange_rates", height)
+        row = immutable_row_cache.get(key)
+        if row is not None:
+            return row
         query = "SELECT * FROM exchange_rates WHERE block_id = %s"
         result = await self.execute_async(currency, "transformed", query, [height])
         result = one(result)
         if result is None:
             return None
-        return self.markup_rates(currency, result)
+        row = self.markup_rates(currency, result)
+        await self._cache_immutable(currency, {height: (key, row)})
+        return row
+
+    async def _fetch_rates(self, currency, heights):
+        """Read the exchange rates of ``heights`` with multi-partition ``IN``
+        queries (exchange_rates is partitioned by block_id) and cache them.
+        Returns ``{height: row}`` for the heights that have rates."""
+        query = "SELECT * FROM exchange_rates WHERE block_id IN %s"
+        chunks = [
+            (ValueSequence(heights[i : i + RATES_IN_QUERY_SIZE]),)
+            for i in range(0, len(heights), RATES_IN_QUERY_SIZE)
+        ]
+        rows = await self.concurrent_with_args(
+            currency, "transformed", query, chunks, return_one=False
+        )
+        rows = {row["block_id"]: self.markup_rates(currency, row) for row in rows}
+        await self._cache_immutable(
+            currency,
+            {
+                height: (
+                    self._immutable_key(
+                        currency, "transformed", "exchange_rates", height
+                    ),
+                    row,
+                )
+                for height, row in rows.items()
+            },
+        )
+        return rows
+
+    async def prefetch_rates(self, currency, min_height, max_height):
+        """Load the exchange rates of ``[min_height, max_height]`` into the
+        immutable row cache, skipping cached heights and heights above the
+        immutable height. Returns the number of rows loaded."""
+        max_height = min(max_height, await self.get_immutable_height(currency))
+        heights = [
+            h
+            for h in range(min_height, max_height + 1)
+            if self._immutable_key(currency, "transformed", "exchange_rates", h)
+            not in immutable_row_cache
+        ]
+        return len(await self._fetch_rates(currency, heights)) if heights else 0
 
     async def get_token_rate(self, currency, token, block_id):
         """Per-block fiat rate for an unpegged token at or before `block_id`.
@@ -1336,19 +1517,38 @@ class Cassandra:
         Returns a labeled rates list ([{code, value}, ...]) or None when no
         rate exists (caller falls back to zero fiat). See the token_exchange_rates
         table populated by the delta-update from fetched per-token prices.
+
+        The delta-update writes a token's rates in block order, so the answer
+        is final (and cached) only once a rate above ``block_id`` exists; until
+        then a new row may still land between the current one and ``block_id``.
         """
+        key = self._immutable_key(
+            currency, "transformed", "token_exchange_rates", token.upper(), block_id
+        )
+        rates = immutable_row_cache.get(key)
+        if rates is not None:
+            return rates
         query = (
             "SELECT fiat_values FROM token_exchange_rates "
             "WHERE asset = %s AND block_id <= %s LIMIT 1"
         )
-        result = one(
-            await self.execute_async(
+        latest_query = (
+            "SELECT block_id FROM token_exchange_rates WHERE asset = %s LIMIT 1"
+        )
+        result, latest = await asyncio.gather(
+            self.execute_async(
                 currency, "transformed", query, [token.upper(), block_id]
-            )
+            ),
+            self.execute_async(currency, "transformed", latest_query, [token.upper()]),
         )
+        result = one(result)
         if result is None:
             return None
-        return self.markup_values(currency, result["fiat_values"])
+        rates = self.markup_values(currency, result["fiat_values"])
+        latest = one(latest)
+        if latest is not None and block_id < latest["block_id"]:
+            await self._cache_immutable(currency, {block_id: (key, rates)})
+        return rates
 
     async def get_latest_token_rate(self, currency, token):
         """Most recent per-block fiat rate for an unpegged token (for balances)."""
@@ -1370,8 +1570,19 @@ class Cassandra:
     #     return result
 
     async def list_rates(self, currency, heights):
-        aws = [self.get_rates(currency, h) for h in heights]
-        return await asyncio.gather(*aws)
+        rows = {}
+        missing = []
+        for h in dict.fromkeys(heights):
+            row = immutable_row_cache.get(
+                self._immutable_key(currency, "transformed", "exchange_rates", h)
+            )
+            if row is None:
+                missing.append(h)
+            else:
+                rows[h] = row
+        if missing:
+            rows.update(await self._fetch_rates(currency, missing))
+        return [rows.get(h) for h in heights]
 
     async def list_address_txs(
         self,
@@ -1880,6 +2091,85 @@ class Cassandra:
 
         return await self.finish_address(currency, result)
 
+    async def get_addresses(self, currency, addresses):
+        """Batch variant of get_address, e.g. for a /bulk request.
+
+        Address rows are read with one ``IN`` query per address_id_group
+        partition instead of one query per address. Returns
+        ``{address: finished row}`` for the addresses whose id and row exist;
+        the others are left out, so callers fall back to get_address for its
+        not-found handling.
+        """
+        if not addresses:
+            return {}
+        address_ids = await asyncio.gather(
+            *(self.get_address_id(currency, a) for a in addresses)
+        )
+        addresses_by_id = defaultdict(list)
+        for address, address_id in zip(addresses, address_ids):
+            if address_id is not None:
+                addresses_by_id[address_id].append(address)
+        if not addresses_by_id:
+            return {}
+
+        ids_by_group = defaultdict(list)
+        for address_id in addresses_by_id:
+            ids_by_group[self.get_id_group(currency, address_id)].append(address_id)
+        query = "SELECT * FROM address WHERE address_id_group = %s AND address_id IN %s"
+        rows = await self.concurrent_with_args(
+            currency,
+            "transformed",
+            query,
+            [(gid, ValueSequence(ids)) for gid, ids in ids_by_group.items()],
+            return_one=False,
+        )
+        rows = await self.finish_addresses(currency, rows)
+        return {
+            address: row
+            for row in rows
+            for address in addresses_by_id.get(row["address_id"], [])
+        }
+
+    async def get_address_cluster_ids(self, currency, addresses):
+        """Batch read of the legacy cluster ids of ``addresses``:
+        ``{address: (address_id, cluster_id)}``.
+
+        Like get_addresses, address rows are read with one ``IN`` query per
+        address_id_group partition; addresses whose id or row does not exist
+        are left out.
+        """
+        if not addresses:
+            return {}
+        address_ids = await asyncio.gather(
+            *(self.get_address_id(currency, a) for a in addresses)
+        )
+        addresses_by_id = defaultdict(list)
+        for address, address_id in zip(addresses, address_ids):
+            if address_id is not None:
+                addresses_by_id[address_id].append(address)
+        if not addresses_by_id:
+            return {}
+
+        ids_by_group = defaultdict(list)
+        for address_id in addresses_by_id:
+            ids_by_group[self.get_id_group(currency, address_id)].append(address_id)
+        query = (
+            "SELECT address_id, cluster_id FROM address "
+            "WHERE address_id_group = %s AND address_id IN %s"
+        )
+        rows = await self.concurrent_with_args(
+            currency,
+            "transformed",
+            query,
+            [(gid, ValueSequence(ids)) for gid, ids in ids_by_group.items()],
+            return_one=False,
+        )
+        return {
+            address: (row["address_id"], row["cluster_id"])
+            for row in rows
+            for address in addresses_by_id.get(row["address_id"], [])
+        }
+
     async def get_addresses_light(
         self, currency: str, addresses: list[str]
     ) -> dict[str, dict]:
@@ -2123,6 +2413,42 @@ class Cassandra:
             return to_public_fresh_cluster_id(address_id)
         return to_public_fresh_cluster_id(result["cluster_id"])
 
+    async def get_fresh_cluster_ids(self, currency, address_ids):
+        """Batch variant of get_fresh_cluster_id: ``{address_id: public id}``.
+
+        Reads ``fresh_address_cluster`` with one ``IN`` query per
+        address_id_group partition; all values are None when fresh
+        clustering is not active.
+        """
+        address_ids = list(dict.fromkeys(address_ids))
+        if not address_ids or not await self._fresh_clustering_active(currency):
+            return {address_id: None for address_id in address_ids}
+        ids_by_group = defaultdict(list)
+        for address_id in address_ids:
+            ids_by_group[self.get_id_group(currency, address_id)].append(address_id)
+        query = (
+            "SELECT address_id, cluster_id FROM fresh_address_cluster "
+            "WHERE address_id_group = %s AND address_id IN %s"
+        )
+        try:
+            rows = await self.concurrent_with_args(
+                currency,
+                "transformed",
+                query,
+                [(gid, ValueSequence(ids)) for gid, ids in ids_by_group.items()],
+                return_one=False,
+            )
+        except InvalidRequest:
+            # Table may not exist if fresh clustering has not been run yet
+            return {address_id: None for address_id in address_ids}
+        cluster_ids = {row["address_id"]: row["cluster_id"] for row in rows}
+        return {
+            address_id: to_public_fresh_cluster_id(
+                cluster_ids.get(address_id, address_id)
+            )
+            for address_id in address_ids
+        }
+
     async def list_address_links(
         self,
         currency,
@@ -2516,19 +2842,23 @@ class Cassandra:
                 final_results = final_results[:requested_pagesize]
                 # now we know which is the last item from results1 that made it into final_results
                 # so we can use that to get the page token from the last result
+                # (new_pages holds one token per row of results1_raw; merged
+                # listings only encode the one that is looked up)
                 last_row = final_results[-1]
-                result1_to_page_mapping = {
+                result1_to_page_index = {
                     (
                         row[tx_id],
                         row["tx_reference"] if is_eth_like(currency) else None,
-                    ): page
-                    for row, page in zip(results1_raw, new_pages)
+                    ): i
+                    for i, row in enumerate(results1_raw)
                 }
-                page = result1_to_page_mapping[
-                    (
-                        last_row[tx_id],
-                        last_row["tx_reference"] if is_eth_like(currency) else None,
-                    )
+                page = new_pages[
+                    result1_to_page_index[
+                        (
+                            last_row[tx_id],
+                            last_row["tx_reference"] if is_eth_like(currency) else None,
+                        )
+                    ]
                 ]
                 self.logger.debug(
                     f"early termination with {len(final_results)} results, page: {page}"
@@ -2551,28 +2881,12 @@ class Cassandra:
 
         return final_results, str(page) if page is not None else None
 
-    async def _list_matching_addresses_short_prefix_and_postfix_eth(
-        self, currency: str, prefix: str, postfix: str, limit: int
-    ):
-        res = []
-        for c in HEX_ALPHABET:
-            results = await self.list_matching_addresses(
-                currency, f"{prefix}{c}...{postfix}", limit=None
-            )
-            res.extend(results)
-            if len(res) >= limit:
-                break
-
-        return res[:limit]
-
     async def list_matching_addresses(
         self, currency, expression, limit: Optional[int] = 10
     ):
-        # Todo: the new postfix filtering is incomplete in scenarios where the item with the postfix is not in the
-        # results within the limit specified. A more complete solution would require a different querying approach.
-        # e.g. if a postfix is given we would need to iterate the entire result set.
-        # we don't do this now for performance reasons. (some prefixes are huge, eg 0x00000)
-
+        # Postfixes of trx (base58) and utxo addresses are only post-filtered
+        # on the first `limit` prefix matches; eth searches are planned over
+        # the prefix and suffix index tables, see address_search.
         parts = expression.split("...", 1)
         if len(parts) == 2:
             expression, postfix = parts
@@ -2598,17 +2912,64 @@ class Cassandra:
             if postfix is not None:
                 postfix = postfix.casefold()
 
-        if (
-            currency == "eth"
-            and len(strip_0x(expression)) == (prefix_lengths["address"] - 1)
-            and postfix is not None
-        ):
-            # Tools like TRM show addresses in with short prefixes but with postfixes
-            # e.g. 0x33d05d...8f65 we have to add special handling to also find these here.
-            return await self._list_matching_addresses_short_prefix_and_postfix_eth(
-                currency, expression, postfix, limit
+        if currency == "eth":
+            prefix = strip_0x(expression)
+            if not is_hexadecimal(prefix):
+                return []
+            if postfix is not None and not is_hexadecimal(postfix):
+                return []
+
+            # the suffix index marker is only read for postfix searches
+            suffix_index = (
+                await self._address_suffix_index(currency) if postfix else None
+            )
+            lookups = plan_address_search(
+                prefix,
+                postfix,
+                prefix_lengths["address"],
+                suffix_index,
+                limit,
             )
 
+            async def read_page(lookup, partition, paging_state, n):
+                query = (
+                    f"SELECT address FROM {lookup.table} "
+                    f"WHERE {lookup.partition_key} = %s"
+                )
+                params = [partition]
+                bounds = hex_prefix_range(lookup.prefix)
+                if bounds is not None:
+                    lower, upper = bounds
+                    query += " AND address >= %s"
+                    params.append(lower)
+                    if upper is not None:
+                        query += " AND address < %s"
+                        params.append(upper)
+                if lookup.postfix is None:
+                    # every row in range matches: a single LIMITed read
+                    if n is not None:
+                        query += " LIMIT %s"
+                        params.append(n)
+                    result = await self.execute_async(
+                        currency, "transformed", query, params
+                    )
+                    return [row["address"] for row in result.current_rows], None
+                result = await self.execute_async(
+                    currency,
+                    "transformed",
+                    query,
+                    params,
+                    paging_state=paging_state,
+                    fetch_size=n,
+                )
+                return (
+                    [row["address"] for row in result.current_rows],
+                    result.paging_state,
+                )
+
+            addresses = await search_addresses(lookups, read_page, limit)
+            return [address_to_user_format(currency, a) for a in addresses]
+
         if len(expression) < prefix_lengths["address"]:
             return []
         norm = identity2
@@ -3055,7 +3416,17 @@ class Cassandra:
             secondary_id_group = await self.get_id_secondary_group_eth(
                 currency, f"address_{direction}_relations", id_group
             )
-            sec_in = self.sec_in(secondary_id_group)
+            sec_groups = await self.get_occupied_secondary_groups(
+                currency,
+                f"address_{direction}_relations",
+                id_group,
+                id,
+                0,
+                secondary_id_group,
+            )
+            if not sec_groups:
+                return [], None
+            sec_in = ValueSequence(sec_groups)
             sec_condition = f" AND {this}_address_id_secondary_group in %s"
             base_parameters.append(sec_in)
 
@@ -3781,11 +4152,7 @@ class Cassandra:
             return expression
 
     async def get_block_eth(self, currency, height):
-        block_group = self.get_block_id_group(currency, height)
-        query = "SELECT * FROM block WHERE block_id_group = %s and block_id = %s"
-        return (
-            await self.execute_async(currency, "raw", query, [block_group, height])
-        ).one()
+        return await self._get_block_row(currency, height)
 
     # entity = address_id
 
@@ -3867,6 +4234,126 @@ class Cassandra:
         ).one()
         return 0 if result is None else result["max_secondary_id"]
 
+    async def _state_marker(self, currency, key, parse):
+        """Cached (60s TTL) read of the ``key`` marker of the transformed
+        keyspace's state table, parsed with ``parse``; ``parse(None)`` if
+        the marker or the table is missing."""
+        cache = getattr(self, "_state_marker_cache", None)
+        if cache is None:
+            cache = self._state_marker_cache = {}
+        hit = cache.get((currency, key))
+        now = time.monotonic()
+        if hit is not None and now - hit[1] < 60.0:
+            return hit[0]
+        try:
+            result = await self.execute_async(
+                currency,
+                "transformed",
+                f"SELECT value FROM {STATE_TABLE} WHERE key = %s",
+                [key],
+            )
+            row = one(result)
+            value = parse(row["value"] if row else None)
+        except InvalidRequest:
+            value = parse(None)
+        cache[(currency, key)] = (value, now)
+        return value
+
+    async def _secondary_group_index_start(self, currency) -> Optional[Tuple[int, int]]:
+        """(block_id, address_id) the delta updater maintains the
+        ``*_secondary_groups`` occupancy index from, None if it never did."""
+        return await self._state_marker(
+            currency, SECONDARY_GROUP_INDEX_KEY, parse_secondary_group_index_value
+        )
+
+    async def _address_suffix_index(self, currency) -> Optional[Tuple[int, int]]:
+        """(address_id, suffix_length) of ``address_ids_by_address_suffix``,
+        None if the delta updater does not maintain it."""
+        return await self._state_marker(
+            currency, ADDRESS_SUFFIX_INDEX_KEY, parse_address_suffix_index_value
+        )
+
+    async def _occupied_secondary_groups(
+        self, currency, table, column_prefix, id_group, id, version
+    ) -> Optional[Tuple[int, ...]]:
+        """Cached read of the occupancy index rows of address ``id``; None
+        if the ``*_secondary_groups`` table is missing. Entries are re-read
+        once ``version`` (last block of the keyspace) moved on."""
+        cache = getattr(self, "_occupied_secondary_groups_cache", None)
+        if cache is None:
+            cache = self._occupied_secondary_groups_cache = {}
+        key = (currency, table, column_prefix, id_group, id)
+        hit = cache.get(key)
+        if hit is not None and hit[1] == version:
+            return hit[0]
+        query = (
+            f"SELECT {column_prefix}address_id_secondary_group FROM "
+            f"{table}_secondary_groups WHERE {column_prefix}address_id_group = %s "
+            f"AND {column_prefix}address_id = %s"
+        )
+        try:
+            result = await self.execute_async(
+                currency, "transformed", query, [id_group, id], autopaging=True
+            )
+        except InvalidRequest:
+            value = None
+        else:
+            col = f"{column_prefix}address_id_secondary_group"
+            value = tuple(sorted(row[col] for row in result.current_rows))
+        cache.pop(key, None)
+        if len(cache) >= OCCUPIED_SECONDARY_GROUPS_CACHE_SIZE:
+            # drop the oldest entry, dicts keep insertion order
+            del cache[next(iter(cache))]
+        cache[key] = (value, version)
+        return value
+
+    async def get_occupied_secondary_groups(
+        self, currency, table, id_group, id, min_group, max_group
+    ) -> List[int]:
+        """Secondary groups in [min_group, max_group] of ``table``
+        (address_transactions or address_{incoming,outgoing}_relations) that
+        may hold rows of address ``id``.
+
+        Groups the occupancy index does not cover are always returned: for
+        address transactions (grouped by block) the groups before the index
+        start block, for relations (grouped by counterpart id) all groups of
+        addresses created before the index start.
+        """
+        every_group = list(range(min_group, max_group + 1))
+        start = await self._secondary_group_index_start(currency)
+        if start is None:
+            return every_group
+        start_block, start_address_id = start
+        if table == "address_transactions":
+            column_prefix = ""
+            if id >= start_address_id:
+                unindexed = []
+            else:
+                bucket = self.parameters[currency]["block_bucket_size_address_txs"]
+                first_indexed = -(-start_block // bucket)
+                unindexed = [g for g in every_group if g < first_indexed]
+        elif id >= start_address_id:
+            column_prefix = "dst_" if table == "address_incoming_relations" else "src_"
+            unindexed = []
+        else:
+            return every_group
+        if len(unindexed) == len(every_group):
+            return every_group
+
+        stats = await self.get_currency_statistics(currency)
+        occupied = await self._occupied_secondary_groups(
+            currency,
+            table,
+            column_prefix,
+            id_group,
+            id,
+            stats["no_blocks"] if stats else None,
+        )
+        if occupied is None:  # pre-migration keyspace
+            return every_group
+        lo = unindexed[-1] + 1 if unindexed else min_group
+        return unindexed + [g for g in occupied if lo <= g <= max_group]
+
     async def list_address_txs_ordered(
         self,
         network: str,
@@ -3897,7 +4384,8 @@ class Cassandra:
                 fetch only incoming, if None fetch both directions
             include_assets (Sequence[Tuple[str, bool]]): a list of tuples with
                 assets to include
-            page (Optional[int]): a page id (tx id bound)
+            page (Optional[str]): a page token from a previous call; merge
+                tokens (``address_txs_merge``) or legacy tx id bounds
             fetch_size (int): how much to fetch per page
             cols (Optional[Sequence[str]], optional): which columns to select
                 None means *
@@ -3925,8 +4413,17 @@ class Cassandra:
             block = get_block_from_tx_id(tx_id)
             return get_secondary_id_group_from_block(block)
 
+        # tx_ids lookups and legacy page tokens keep the re-querying listing
+        merged = (
+            tx_ids is None
+            and not self.tconfig.list_address_txs_ordered_legacy
+            and (page is None or is_merge_page(page))
+        )
+
         try:
-            if is_eth_like(network) and tx_ids is None:
+            if merged:
+                secondary_id = None
+            elif is_eth_like(network) and tx_ids is None:
                 (page, secondary_id, offset) = (
                     page.split(":") if page is not None else (None, None, None)
                 )
@@ -3971,16 +4468,65 @@ class Cassandra:
                 sec_max = min(sec_max, secondary_id_from_tx_id(tx_id_upper_bound))
 
             if tx_ids is None:
+                # only the groups the address has rows in, in listing order
+                sec_groups = await self.get_occupied_secondary_groups(
+                    network,
+                    "address_transactions",
+                    item_id_group,
+                    item_id,
+                    sec_min,
+                    sec_max,
+                )
+                if not ascending:
+                    sec_groups.reverse()
+                if not sec_groups:
+                    return [], [], True
+
                 # For pagination, we only need the current secondary_id
                 if secondary_id is not None:
                     item_id_secondary_group = [secondary_id]
                 else:
                     # Start with the appropriate secondary_id based on sort order
-                    item_id_secondary_group = [sec_max if not ascending else sec_min]
+                    item_id_secondary_group = [sec_groups[0]]
             else:
                 item_id_secondary_group = list(range(sec_min, sec_max + 1))
 
+        def get_next_secondary_id(current_secondary_id):
+            return next(
+                (
+                    g
+                    for g in sec_groups
+                    if (
+                        g > current_secondary_id
+                        if ascending
+                        else g < current_secondary_id
+                    )
+                ),
+                None,
+            )
+
         directions = [is_outgoing] if is_outgoing is not None else [False, True]
+
+        if merged:
+            if is_eth_like(network):
+                first_group, next_group = sec_groups[0], get_next_secondary_id
+            else:
+                first_group, next_group = 0, lambda g: None
+            return await self._list_address_txs_merged(
+                network,
+                node_type,
+                item_id,
+                item_id_group,
+                tx_id_lower_bound,
+                tx_id_upper_bound,
+                list(product(directions, include_assets)),
+                first_group,
+                next_group,
+                page,
+                fetch_size,
+                cols,
+                ascending,
+            )
         results = []
         pages_results = []  # each result gets a page so we can truncate and still know the page
         finished = False
@@ -4160,20 +4706,6 @@ class Cassandra:
                 # tx_ids case - no pagination needed
                 break
 
-            def get_next_secondary_id(
-                current_secondary_id, ascending, sec_min, sec_max
-            ):
-                if not ascending:
-                    next_secondary_id = current_secondary_id - 1
-                    if next_secondary_id < sec_min:
-                        return None
-                    return next_secondary_id
-                else:
-                    next_secondary_id = current_secondary_id + 1
-                    if next_secondary_id > sec_max:
-                        return None
-                    return next_secondary_id
-
             if is_eth_like(network):
                 more_pages_results = [
                     f"{page}:{current_secondary_id}:{offset}"
@@ -4192,9 +4724,7 @@ class Cassandra:
             if page is None:
                 # Current secondary_id_group is exhausted
                 if is_eth_like(network):
-                    current_secondary_id = get_next_secondary_id(
-                        current_secondary_id, ascending, sec_min, sec_max
-                    )
+                    current_secondary_id = get_next_secondary_id(current_secondary_id)
                     if current_secondary_id is None:
                         finished = True
                         break
@@ -4207,6 +4737,82 @@ class Cassandra:
 
         return results, pages_results, finished
 
+    async def _list_address_txs_merged(
+        self,
+        network: str,
+        node_type: NodeType,
+        item_id,
+        item_id_group: int,
+        tx_id_lower_bound: Optional[int],
+        tx_id_upper_bound: Optional[int],
+        streams: List[Tuple[bool, str]],
+        first_group: Optional[int],
+        next_group: Callable[[int], Optional[int]],
+        page: Optional[str],
+        fetch_size: int,
+        cols: Optional[Sequence[str]],
+        ascending: bool,
+    ) -> Tuple[Sequence[dict], Sequence[Optional[str]], bool]:
+        """k-way merge over one paged query per (direction, asset) stream, see
+        ``address_txs_merge``. Returns the rows, one page token per row
+        (resuming after that row) and whether the listing is finished."""
+        bounds = (tx_id_lower_bound, tx_id_upper_bound)
+        if page is None:
+            cursors = [StreamCursor(first_group) for _ in streams]
+        else:
+            cursors = decode_merge_page(page, streams, bounds)
+
+        # no LIMIT: streams are read page by page with Cassandra paging states
+        cql_stmt = build_select_address_txs_statement(
+            network,
+            node_type,
+            cols,
+            with_lower_bound=tx_id_lower_bound is not None,
+            with_upper_bound=tx_id_upper_bound is not None,
+            limit=None,
+            ascending=ascending,
+            with_tx_id=False,
+        )
+
+        async def fetch_page(i, cursor, n):
+            is_outgoing, asset = streams[i]
+            params = {
+                "id": item_id,
+                "g_id": item_id_group,
+                "tx_id_lower_bound": tx_id_lower_bound,
+                "tx_id_upper_bound": tx_id_upper_bound,
+                "s_d_group": cursor.s_d_group,
+                "currency": asset,
+                "is_outgoing": is_outgoing,
+            }
+            res = await self.execute_async(
+                network,
+                "transformed",
+                cql_stmt,
+                params,
+                paging_state=cursor.paging_state,
+                fetch_size=n,
+            )
+            return res.current_rows, res.paging_state
+
+        tx_id_key = get_tx_id_column_name(network)
+        if ascending:
+            key = partial(transaction_ordering_key, tx_id_key)
+        else:
+
+            def key(row):
+                return tuple(-k for k in transaction_ordering_key(tx_id_key, row))
+
+        results, row_cursors, finished = await merge_address_txs_streams(
+            cursors,
+            fetch_page,
+            next_group,
+            key,
+            fetch_size,
+            min_fetch_size=FETCH_SIZE_MIN,
+        )
+        return results, MergePages(row_cursors, streams, bounds), finished
+
     async def list_txs_by_node_type_eth(
         self,
         currency,
@@ -4784,9 +5390,6 @@ class Cassandra:
         row["rates"] = self.markup_values(currency, row["fiat_values"])
         return row
 
-    def sec_in(self, id):
-        return ValueSequence(range(0, id + 1))
-
     def log_missing(self, ids1, ids2, node_type, query, params):
         missing = []
         for id in ids2:
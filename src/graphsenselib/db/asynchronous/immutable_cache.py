@@ -0,0 +1,115 @@
+"""Process-wide cache for rows keyed by block that never change once written.
+
+Exchange rates, token rates and block rows at or below a keyspace's highest
+block are written once and never updated, so they can be served from memory
+for the lifetime of the process. The cache is shared by all ``Cassandra``
+instances (keys carry the keyspace name), bounded by an estimated byte
+budget and evicts least recently used rows first.
+"""
+
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+def estimate_size(value: Any) -> int:
+    """Rough deep size of a cached row in bytes."""
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(
+            estimate_size(k) + estimate_size(v) for k, v in value.items()
+        )
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(estimate_size(v) for v in value)
+    return sys.getsizeof(value)
+
+
+class ImmutableRowCache:
+    """LRU cache bounded by the estimated size of its rows.
+
+    ``None`` is never stored; ``get`` returns None on a miss.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._rows: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._reported = time.monotonic()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._rows.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._rows.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def __contains__(self, key: Hashable) -> bool:
+        # Membership checks do not count as lookups in the hit/miss stats.
+        with self._lock:
+            return key in self._rows
+
+    def put(self, key: Hashable, row: Any) -> None:
+        if row is None or self.max_bytes <= 0:
+            return
+        size = estimate_size(row)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._rows.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._rows[key] = (row, size)
+            self._bytes += size
+            self._evict()
+
+    def resize(self, max_bytes: int) -> None:
+        with self._lock:
+            self.max_bytes = max_bytes
+            self._evict()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._rows.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._rows),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+    def report_due(self, interval: float) -> bool:
+        """True at most once every ``interval`` seconds, for periodic stats
+        logging."""
+        now = time.monotonic()
+        with self._lock:
+            if now - self._reported < interval:
+                return False
+            self._reported = now
+            return True
+
+    def _evict(self) -> None:
+        while self._rows and self._bytes > max(self.max_bytes, 0):
+            _, (_, size) = self._rows.popitem(last=False)
+            self._bytes -= size
+            self.evictions += 1
+
+
+immutable_row_cache = ImmutableRowCache()
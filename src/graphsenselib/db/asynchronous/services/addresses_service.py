@@ -26,6 +26,7 @@ from .common import (
     cannonicalize_address,
     gather_bounded,
     get_address,
+    get_addresses,
     links_response,
     list_neighbors,
     try_get_cluster_id,
@@ -34,6 +35,8 @@ from .common import (
 from .entities_service import EntitiesService
 from .models import (
     Address,
+    AddressNeighborSearchResult,
+    AddressNeighborSearchStep,
     AddressTagResult,
     AddressTxs,
     CrossChainPubkeyRelatedAddresses,
@@ -45,6 +48,7 @@ from .models import (
     TagSummary,
     AddressTagQueryInput,
 )
+from .neighbor_search import NeighborSearchLimits, search_neighbors
 from .rates_service import RatesService
 from .tags_service import TagsService
 
@@ -368,6 +372,25 @@ class AddressesService:
             new_address_fallback=new_address_fallback,
         )
 
+    async def get_addresses(
+        self,
+        currency: str,
+        addresses: List[str],
+        tagstore_groups: List[str],
+        include_actors: bool = True,
+        new_address_fallback: bool = True,
+    ) -> List[Any]:
+        return await get_addresses(
+            self.db,
+            self.tagstore,
+            self.rates_service,
+            currency,
+            addresses,
+            tagstore_groups,
+            include_actors=include_actors,
+            new_address_fallback=new_address_fallback,
+        )
+
     async def list_tags_by_address(
         self,
         currency: str,
@@ -542,6 +565,47 @@ class AddressesService:
 
         return NeighborAddresses(next_page=paging_state, neighbors=relations)
 
+    async def search_address_neighbors(
+        self,
+        currency: str,
+        address: str,
+        direction: str,
+        tagstore_groups: List[str],
+        match_keywords: List[str],
+        prune_keywords: Optional[List[str]] = None,
+        limits: Optional[NeighborSearchLimits] = None,
+    ) -> AddressNeighborSearchResult:
+        result = await search_neighbors(
+            self.db,
+            self.tagstore,
+            currency,
+            address,
+            direction,
+            NodeType.ADDRESS,
+            tagstore_groups,
+            match_keywords,
+            prune_keywords=prune_keywords,
+            limits=limits,
+        )
+        return AddressNeighborSearchResult(
+            state=result.state,
+            paths=[
+                [
+                    AddressNeighborSearchStep(
+                        address=step.node,
+                        depth=step.depth,
+                        value=step.value,
+                        no_txs=step.no_transactions,
+                        keywords=step.keywords,
+                    )
+                    for step in path
+                ]
+                for path in result.paths
+            ],
+            nodes_visited=result.nodes_visited,
+            queries=result.queries,
+        )
+
     async def list_address_links(
         self,
         currency: str,
@@ -209,6 +209,9 @@ class TagstoreProtocol(Protocol):
     async def get_actors_by_subjectid(
         self, subject_id: str, groups: List[str]
     ) -> List[Any]: ...
+    async def get_actors_by_subjectids(
+        self, subject_ids: List[str], groups: List[str]
+    ) -> Dict[str, List[Any]]: ...
     async def get_labels_by_subjectid(
         self, subject_id: str, groups: List[str]
     ) -> List[str]: ...
@@ -224,6 +227,15 @@ class DatabaseProtocol(Protocol):
         self, currency: str, address_id: int
     ) -> Optional[int]: ...
     async def get_address(self, currency: str, address: str) -> Dict[str, Any]: ...
+    async def get_addresses(
+        self, currency: str, addresses: List[Any]
+    ) -> Dict[Any, Dict[str, Any]]: ...
+    async def get_fresh_cluster_ids(
+        self, currency: str, address_ids: List[int]
+    ) -> Dict[int, Optional[int]]: ...
+    async def get_address_cluster_ids(
+        self, currency: str, addresses: List[Any]
+    ) -> Dict[Any, tuple]: ...
     async def new_address(self, currency: str, address: str) -> Dict[str, Any]: ...
     async def list_neighbors(
         self,
@@ -389,6 +401,56 @@ async def try_get_tag_cluster_id(
     return returnv
 
 
+async def try_get_tag_cluster_ids(
+    db: DatabaseProtocol, network: str, addresses: List[str]
+) -> Dict[str, Optional[int]]:
+    """Batch variant of :func:`try_get_tag_cluster_id`: ``{address: public
+    cluster id}`` for tagstore lookups.
+
+    Address and legacy cluster ids are read with ``get_address_cluster_ids``,
+    fresh ids with one ``get_fresh_cluster_ids`` call, instead of two to four
+    reads per address. Addresses the batch read leaves out take the
+    per-address path for its not-found handling.
+    """
+    network_lower = network.lower()
+    result: Dict[str, Optional[int]] = {}
+    canonical: Dict[str, Any] = {}
+    for address in dict.fromkeys(addresses):
+        try:
+            canonical[address] = cannonicalize_address(network_lower, address)
+        except BadUserInputException:
+            result[address] = None
+
+    try:
+        rows = await db.get_address_cluster_ids(
+            network_lower, list(dict.fromkeys(canonical.values()))
+        )
+    except NetworkNotFoundException:
+        return {address: None for address in dict.fromkeys(addresses)}
+
+    fresh_ids: Dict[int, Optional[int]] = {}
+    if rows and not is_eth_like(network_lower):
+        fresh_ids = await db.get_fresh_cluster_ids(
+            network_lower, [address_id for address_id, _ in rows.values()]
+        )
+
+    missing = []
+    for address, address_canonical in canonical.items():
+        row = rows.get(address_canonical)
+        if row is None:
+            missing.append(address)
+            continue
+        address_id, cluster_id = row
+        fresh_id = fresh_ids.get(address_id)
+        result[address] = cluster_id if fresh_id is None else fresh_id
+
+    cluster_ids = await asyncio.gather(
+        *(try_get_tag_cluster_id(db, network, address) for address in missing)
+    )
+    result.update(zip(missing, cluster_ids))
+    return result
+
+
 # Cassandra stores tx counts and degrees as 32-bit `int`. Two writers fill
 # those columns and they used to disagree once a value passed 2**31: the Spark
 # full transform cast the true count (a Long) down with a plain cast, which
@@ -643,6 +705,103 @@ async def get_address(
     )
 
 
+async def get_addresses(
+    db: DatabaseProtocol,
+    tagstore: TagstoreProtocol,
+    rates_service: Any,
+    currency: str,
+    addresses: List[str],
+    tagstore_groups: List[str],
+    include_actors: bool = True,
+    new_address_fallback: bool = True,
+) -> List[Union[Address, Exception]]:
+    """Batch variant of get_address, used by the /bulk API.
+
+    Address rows, fresh cluster ids and actors are read for all addresses
+    together (grouped Cassandra reads, one tagstore query). Addresses the
+    batch read does not return go through get_address, so not-found and
+    new-address handling stay the same. Returns, per address, the Address or
+    the exception get_address would have raised.
+    """
+    results: List[Any] = [None] * len(addresses)
+    canonical = {}
+    for i, address in enumerate(addresses):
+        try:
+            address_canonical = cannonicalize_address(currency, address)
+            if len(address_canonical) == 0:
+                raise BadUserInputException(
+                    f"{address} does not look like a valid {currency} address"
+                )
+            canonical[i] = address_canonical
+        except Exception as e:
+            results[i] = e
+
+    rows = await db.get_addresses(currency, list(dict.fromkeys(canonical.values())))
+
+    actors: Dict[str, List[Any]] = {}
+    if include_actors and rows:
+        actors = await tagstore.get_actors_by_subjectids(
+            list({addresses[i] for i, c in canonical.items() if c in rows}),
+            tagstore_groups,
+        )
+
+    fresh_cluster_ids: Dict[int, Optional[int]] = {}
+    if rows and not is_eth_like(currency):
+        fresh_cluster_ids = await db.get_fresh_cluster_ids(
+            currency,
+            [
+                row["address_id"]
+                for row in rows.values()
+                if row.get("address_id") is not None
+            ],
+        )
+
+    rates = await rates_service.get_rates(currency) if rows else None
+    token_config = db.get_token_configuration(currency)
+    fallback = []
+    for i, address_canonical in canonical.items():
+        row = rows.get(address_canonical)
+        if row is None:
+            fallback.append(i)
+            continue
+        try:
+            results[i] = address_from_row(
+                currency,
+                row,
+                rates.rates,
+                token_config,
+                [
+                    labeled_item_ref_from_actor(a)
+                    for a in actors.get(addresses[i].strip(), [])
+                ]
+                if include_actors
+                else None,
+                fresh_cluster_id=fresh_cluster_ids.get(row.get("address_id")),
+            )
+        except Exception as e:
+            results[i] = e
+
+    single = await asyncio.gather(
+        *(
+            get_address(
+                db,
+                tagstore,
+                rates_service,
+                currency,
+                addresses[i],
+                tagstore_groups,
+                include_actors=include_actors,
+                new_address_fallback=new_address_fallback,
+            )
+            for i in fallback
+        ),
+        return_exceptions=True,
+    )
+    for i, result in zip(fallback, single):
+        results[i] = result
+    return results
+
+
 async def list_neighbors(
     db: DatabaseProtocol,
     currency: str,
@@ -193,6 +193,21 @@ class NeighborAddresses(BaseModel):
     neighbors: List[NeighborAddress]
 
 
+class AddressNeighborSearchStep(BaseModel):
+    address: str
+    depth: int
+    value: int
+    no_txs: Optional[int] = None
+    keywords: List[str] = Field(default_factory=list)
+
+
+class AddressNeighborSearchResult(BaseModel):
+    state: str
+    paths: List[List[AddressNeighborSearchStep]]
+    nodes_visited: int
+    queries: int
+
+
 class TxValue(BaseModel):
     address: List[str]
     value: Values
@@ -0,0 +1,324 @@
+"""Bounded multi-hop neighbor search over address / cluster relations.
+
+``Cassandra.list_neighbors`` only answers one hop. This module walks the
+relation graph in-process, starting at one node and following relations in
+one direction until a tagged node matching ``match_keywords`` is found:
+
+* every expansion is a single ``list_neighbors`` page of at most
+  ``max_breadth`` rows; edges below ``min_value`` (native units) are not
+  followed;
+* the frontier is a priority queue, ordered by depth then edge value
+  (``bfs``) or by edge value alone (``best_first``), and up to
+  ``concurrency`` nodes are expanded at once. Results are merged into the
+  shared visited set on the event loop, so a node is entered at most once;
+* the tags of newly seen nodes are looked up in one tagstore query per
+  expansion. Matching nodes end a path and are not expanded further, nodes
+  matching ``prune_keywords`` are not expanded;
+* a search stops when ``max_results`` paths were found, the frontier is
+  exhausted, ``max_queries`` (Cassandra plus tagstore queries) were spent or
+  ``time_budget_s`` elapsed. In-flight expansions are cancelled then. Both
+  kinds of query are checked against ``max_queries`` before they are issued;
+  nodes whose tag lookup no longer fits are entered untagged.
+"""
+
+import asyncio
+import heapq
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Literal, Optional, Protocol, Union
+
+from graphsenselib.datatypes.common import NodeType
+from graphsenselib.utils.address import address_to_user_format
+
+from .common import cannonicalize_address
+
+logger = logging.getLogger(__name__)
+
+NodeId = Union[str, int]
+
+
+class NeighborSearchDatabaseProtocol(Protocol):
+    async def list_neighbors(
+        self,
+        currency: str,
+        id: NodeId,
+        is_outgoing: bool,
+        node_type: NodeType,
+        targets: Optional[List[NodeId]],
+        page: Optional[str],
+        pagesize: Optional[int],
+    ) -> tuple: ...
+
+
+class NeighborSearchTagstoreProtocol(Protocol):
+    async def get_tags_by_subjectids(
+        self,
+        subject_ids: List[str],
+        groups: List[str],
+        network: Optional[str] = None,
+    ) -> Dict[str, List[Any]]: ...
+    async def get_best_cluster_tags_for_clusters(
+        self, cluster_ids: List[int], network: str, groups: List[str]
+    ) -> Dict[int, Any]: ...
+
+
+@dataclass
+class NeighborSearchLimits:
+    max_depth: int = 5
+    max_breadth: int = 200
+    min_value: int = 0
+    max_results: Optional[int] = None
+    max_queries: int = 1_000
+    time_budget_s: float = 5.0
+    concurrency: int = 8
+    strategy: Literal["bfs", "best_first"] = "bfs"
+
+
+@dataclass
+class NeighborPathStep:
+    node: NodeId
+    depth: int
+    value: int
+    no_transactions: Optional[int]
+    keywords: List[str] = field(default_factory=list)
+
+
+@dataclass
+class NeighborSearchResult:
+    # "done" (frontier exhausted or max_results reached), "timeout" or
+    # "query_budget_exhausted"
+    state: str
+    paths: List[List[NeighborPathStep]]
+    nodes_visited: int
+    queries: int
+
+
+def _tag_keywords(tag) -> Iterable[str]:
+    yield tag.label
+    if tag.actor:
+        yield tag.actor
+    yield from tag.concepts
+
+
+def _matches(keywords: List[str], wanted: frozenset) -> bool:
+    return any(k.lower() in wanted for k in keywords)
+
+
+class _NeighborSearch:
+    def __init__(
+        self,
+        db: NeighborSearchDatabaseProtocol,
+        tagstore: Optional[NeighborSearchTagstoreProtocol],
+        currency: str,
+        node_type: NodeType,
+        direction: str,
+        tagstore_groups: List[str],
+        match_keywords: List[str],
+        prune_keywords: List[str],
+        limits: NeighborSearchLimits,
+    ):
+        self.db = db
+        self.tagstore = tagstore
+        self.currency = currency
+        self.node_type = node_type
+        self.is_outgoing = "out" in direction
+        self.that = "dst" if self.is_outgoing else "src"
+        self.tagstore_groups = tagstore_groups
+        self.match_keywords = frozenset(k.lower() for k in match_keywords)
+        self.prune_keywords = frozenset(k.lower() for k in prune_keywords)
+        self.limits = limits
+        self.queries = 0
+        self.lookups_skipped = False
+        self.visited: set = set()
+        self.steps: Dict[NodeId, NeighborPathStep] = {}
+        self.parents: Dict[NodeId, Optional[NodeId]] = {}
+        self.results: List[NodeId] = []
+        self._frontier: list = []
+        self._seq = 0
+
+    def _push(self, node: NodeId, depth: int, value: int):
+        if self.limits.strategy == "best_first":
+            priority = (-value, depth)
+        else:
+            priority = (depth, -value)
+        self._seq += 1
+        heapq.heappush(self._frontier, (priority, self._seq, node, depth))
+
+    def _node_id(self, row: Dict[str, Any]) -> NodeId:
+        if self.node_type == NodeType.ADDRESS:
+            # None when list_neighbors could not resolve the address id
+            address = row[f"{self.that}_address"]
+            return address and address_to_user_format(self.currency, address)
+        return row[f"{self.that}_cluster_id"]
+
+    async def _keywords(self, nodes: List[NodeId]) -> Dict[NodeId, List[str]]:
+        if self.tagstore is None or not nodes:
+            return {}
+        if self.queries >= self.limits.max_queries:
+            # the budget was spent by concurrent expansions: enter the nodes
+            # untagged rather than going over it
+            self.lookups_skipped = True
+            return {}
+        self.queries += 1
+        if self.node_type == NodeType.ADDRESS:
+            tags = await self.tagstore.get_tags_by_subjectids(
+                nodes, self.tagstore_groups, network=self.currency.upper()
+            )
+            return {
+                n: [k for t in tags.get(n, []) for k in _tag_keywords(t)] for n in nodes
+            }
+        best = await self.tagstore.get_best_cluster_tags_for_clusters(
+            nodes, self.currency.upper(), self.tagstore_groups
+        )
+        return {n: list(_tag_keywords(best[n])) for n in nodes if n in best}
+
+    async def _expand(self, node: NodeId, depth: int) -> List[NeighborPathStep]:
+        self.queries += 1
+        rows, _ = await self.db.list_neighbors(
+            self.currency,
+            node,
+            self.is_outgoing,
+            self.node_type,
+            targets=None,
+            page=None,
+            pagesize=self.limits.max_breadth,
+        )
+        steps = {}
+        for row in rows or []:
+            value = row["value"].value
+            if value < self.limits.min_value:
+                continue
+            neighbor = self._node_id(row)
+            if neighbor is None or neighbor in self.visited:
+                continue
+            if neighbor not in steps or steps[neighbor].value < value:
+                steps[neighbor] = NeighborPathStep(
+                    node=neighbor,
+                    depth=depth + 1,
+                    value=value,
+                    no_transactions=row.get("no_transactions"),
+                )
+        keywords = await self._keywords(list(steps))
+        for neighbor, step in steps.items():
+            # the node id itself is a keyword, so addresses can be searched for
+            step.keywords = [str(neighbor), *keywords.get(neighbor, [])]
+        return sorted(steps.values(), key=lambda s: -s.value)
+
+    def _merge(self, parent: NodeId, steps: List[NeighborPathStep]) -> bool:
+        """Enter the new neighbors of ``parent``; True once enough results."""
+        for step in steps:
+            if step.node in self.visited:
+                continue
+            self.visited.add(step.node)
+            self.steps[step.node] = step
+            self.parents[step.node] = parent
+            if _matches(step.keywords, self.match_keywords):
+                self.results.append(step.node)
+                if (
+                    self.limits.max_results is not None
+                    and len(self.results) >= self.limits.max_results
+                ):
+                    return True
+            elif step.depth < self.limits.max_depth and not _matches(
+                step.keywords, self.prune_keywords
+            ):
+                self._push(step.node, step.depth, step.value)
+        return False
+
+    def _path(self, node: NodeId) -> List[NeighborPathStep]:
+        path = []
+        while node is not None:
+            path.append(self.steps[node])
+            node = self.parents[node]
+        return path[::-1]
+
+    async def run(self, start: NodeId) -> NeighborSearchResult:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.limits.time_budget_s
+        self.visited.add(start)
+        self.steps[start] = NeighborPathStep(
+            node=start, depth=0, value=0, no_transactions=None
+        )
+        self.parents[start] = None
+        self._push(start, 0, 0)
+
+        pending: Dict[asyncio.Task, NodeId] = {}
+        state = "done"
+        try:
+            while self._frontier or pending:
+                while (
+                    self._frontier
+                    and len(pending) < self.limits.concurrency
+                    and self.queries < self.limits.max_queries
+                ):
+                    _, _, node, depth = heapq.heappop(self._frontier)
+                    pending[asyncio.ensure_future(self._expand(node, depth))] = node
+                if not pending:
+                    state = "query_budget_exhausted"
+                    break
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    state = "timeout"
+                    break
+                done, _ = await asyncio.wait(
+                    pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    state = "timeout"
+                    break
+                enough = False
+                # merge in scheduling order, so results do not depend on
+                # which of several concurrent expansions returned first
+                for task in [t for t in pending if t in done]:
+                    parent = pending.pop(task)
+                    enough = self._merge(parent, task.result()) or enough
+                if enough:
+                    break
+            else:
+                if self.lookups_skipped:
+                    # nodes entered without their tags may have been matches
+                    state = "query_budget_exhausted"
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+        return NeighborSearchResult(
+            state=state,
+            paths=[self._path(node) for node in self.results],
+            nodes_visited=len(self.visited),
+            queries=self.queries,
+        )
+
+
+async def search_neighbors(
+    db: NeighborSearchDatabaseProtocol,
+    tagstore: Optional[NeighborSearchTagstoreProtocol],
+    currency: str,
+    start: NodeId,
+    direction: str,
+    node_type: NodeType,
+    tagstore_groups: List[str],
+    match_keywords: List[str],
+    prune_keywords: Optional[List[str]] = None,
+    limits: Optional[NeighborSearchLimits] = None,
+) -> NeighborSearchResult:
+    """Search the neighbors of ``start`` up to ``limits.max_depth`` hops away
+    for nodes whose tags (label, actor, concepts) or id match one of
+    ``match_keywords`` (case-insensitive). Returns one path from ``start``
+    per match, in the order the matches were found."""
+    if node_type == NodeType.ADDRESS:
+        start = address_to_user_format(currency, cannonicalize_address(currency, start))
+    search = _NeighborSearch(
+        db,
+        tagstore,
+        currency,
+        node_type,
+        direction,
+        tagstore_groups,
+        match_keywords,
+        prune_keywords or [],
+        limits or NeighborSearchLimits(),
+    )
+    return await search.run(start)
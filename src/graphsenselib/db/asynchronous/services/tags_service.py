@@ -14,6 +14,7 @@ from .common import (
     cannonicalize_address,
     try_get_cluster_id,
     try_get_tag_cluster_id,
+    try_get_tag_cluster_ids,
 )
 from ....utils.rest_utils import is_eth_like
 from .models import (
@@ -120,6 +121,8 @@ class TagsService:
         self.db = db
         self.concepts_service = concepts_cache_service
         self.logger = logger
+        # digests of recurring tag sets, see get_tag_summaries_by_subject_ids
+        self._tag_digest_cache = None
 
     def _address_tag_from_public_tag(
         self,
@@ -435,10 +438,14 @@ class TagsService:
         # address cluster_id resolution runs unbounded against Cassandra:
         # the driver multiplexes concurrent requests over its own
         # connection-and-stream pool and is not the saturation point for
-        # this workload — bounding it here only adds latency.
+        # this workload — bounding it here only adds latency. Cluster ids are
+        # resolved in batches, and all digests are computed in one
+        # compute_tag_digests call that reuses digests of recurring tag sets
+        # (exchange clusters) within and across calls.
         try:
             from graphsenselib.tagstore.algorithms.tag_digest import (
-                compute_tag_digest,
+                compute_tag_digests,
+                TagDigestCache,
                 TagDigestComputationConfig,
             )
         except ImportError as e:
@@ -471,18 +478,13 @@ class TagsService:
         n_clusters = 0
         if include_best_cluster_tag and not is_eth_like(network):
             t_cassandra = time.perf_counter()
-            cluster_ids = await asyncio.gather(
-                *[
-                    try_get_tag_cluster_id(self.db, network, addr)
-                    for addr in unique_canon
-                ]
-            )
+            cluster_ids = await try_get_tag_cluster_ids(self.db, network, unique_canon)
             d_cassandra = time.perf_counter() - t_cassandra
 
             addr_to_cluster: Dict[str, int] = {
-                addr: cid
-                for addr, cid in zip(unique_canon, cluster_ids)
-                if cid is not None
+                addr: cluster_ids[addr]
+                for addr in unique_canon
+                if cluster_ids.get(addr) is not None
             }
             unique_cluster_ids = list(dict.fromkeys(addr_to_cluster.values()))
             n_clusters = len(unique_cluster_ids)
@@ -509,11 +511,17 @@ class TagsService:
             )
         )
 
-        summaries_by_canon: Dict[str, TagSummary] = {}
-        for canon in unique_canon:
-            tags = tags_by_subject.get(canon, [])
-            digest = compute_tag_digest(tags, config=config)
-            summaries_by_canon[canon] = self._tag_summary_from_tag_digest(digest)
+        if self._tag_digest_cache is None:
+            self._tag_digest_cache = TagDigestCache()
+        digests = compute_tag_digests(
+            {canon: tags_by_subject.get(canon, []) for canon in unique_canon},
+            config=config,
+            cache=self._tag_digest_cache,
+        )
+        summaries_by_canon: Dict[str, TagSummary] = {
+            canon: self._tag_summary_from_tag_digest(digest)
+            for canon, digest in digests.items()
+        }
         d_digest = time.perf_counter() - t_digest
 
         d_total = time.perf_counter() - t_total
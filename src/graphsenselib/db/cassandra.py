@@ -28,6 +28,7 @@ from cassandra.connection import ConnectionShutdown
 from cassandra.query import (
     UNSET_VALUE,
     BatchStatement,
+    BatchType,
     BoundStatement,
     PreparedStatement,
     SimpleStatement,
@@ -141,6 +142,48 @@ class GraphsenseRetryPolicy(RetryPolicy):
         return (self.RETHROW, None)
 
 
+def group_statements_by_partition(
+    statements: List[BoundStatement], max_batch_size: int = 8
+) -> List[Union[BoundStatement, BatchStatement]]:
+    """Pack bound statements that target the same partition into small
+    UNLOGGED batches.
+
+    A single-partition unlogged batch is applied as one mutation and, because
+    the batch takes over the routing key of its statements, the token-aware
+    policy sends it straight to a replica that owns the partition — one
+    round trip instead of ``len(batch)``. Statements without a routing key
+    (e.g. not prepared against known metadata) and partitions with a single
+    statement are passed through unchanged. Input order is kept within each
+    partition; ``max_batch_size <= 1`` disables grouping.
+
+    Only use it for plain upserts: all statements of a batch share one write
+    timestamp, which would let a delete in the same batch win over an insert
+    of the same row.
+    """
+    if max_batch_size <= 1:
+        return list(statements)
+    units = []
+    by_partition = {}
+    for stmt in statements:
+        key = stmt.routing_key
+        if key is None:
+            units.append(stmt)
+            continue
+        by_partition.setdefault((stmt.keyspace, key), []).append(stmt)
+    for group in by_partition.values():
+        for i in range(0, len(group), max_batch_size):
+            chunk = group[i : i + max_batch_size]
+            if len(chunk) == 1:
+                units.append(chunk[0])
+                continue
+            batch = BatchStatement(batch_type=BatchType.UNLOGGED)
+            for stmt in chunk:
+                batch.add(stmt)
+            batch.is_idempotent = all(stmt.is_idempotent for stmt in chunk)
+            units.append(batch)
+    return units
+
+
 def normalize_cql_statement(stmt: str) -> str:
     return remove_multi_whitespace(stmt.lower().strip()).rstrip(";")
 
@@ -709,6 +752,24 @@ class CassandraDb:
             concurrency=concurrency,
         )
 
+    @needs_session
+    def execute_statements_tracked(
+        self,
+        statements: List[Union[BoundStatement, BatchStatement]],
+        concurrency: int = 100,
+    ) -> List[Optional[Exception]]:
+        """Execute statements concurrently without stopping at the first
+        failure. Returns, in input order, None for every statement that was
+        acknowledged and the exception for every one that was not, so callers
+        can resubmit just the failures."""
+        results = execute_concurrent(
+            self.session,
+            [(stmt, None) for stmt in statements],
+            raise_on_first_error=False,
+            concurrency=concurrency,
+        )
+        return [None if success else result for success, result in results]
+
     @needs_session
     def execute_statements_async(
         self, statements: List[BoundStatement], concurrency=100
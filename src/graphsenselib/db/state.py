@@ -12,12 +12,15 @@ populated `summary_statistics` table — see
 `find_latest_transformed_keyspace`.
 """
 
+import json
 from datetime import datetime, timezone
-
+from typing import Optional, Tuple
 
 STATE_TABLE = "state"
 INGEST_COMPLETE_KEY = "ingest_complete"
 FRESH_CLUSTERING_ACTIVE_KEY = "fresh_clustering_active"
+SECONDARY_GROUP_INDEX_KEY = "secondary_group_index"
+ADDRESS_SUFFIX_INDEX_KEY = "address_suffix_index"
 
 
 def build_ingest_complete_row() -> dict:
@@ -65,3 +68,60 @@ def mark_fresh_clustering_active(db) -> None:
     db.by_ks_type("transformed").ingest(
         STATE_TABLE, [build_fresh_clustering_active_row()]
     )
+
+
+def build_secondary_group_index_row(block_id: int, address_id: int) -> dict:
+    """Marker row: the account delta updater maintains the per-address
+    ``*_secondary_groups`` occupancy index from ``block_id`` on.
+
+    Address transactions of blocks before ``block_id`` and relations of
+    addresses with an id below ``address_id`` (created before the updater
+    started indexing) are not indexed; readers fall back to walking all
+    secondary groups for them. A backfill of the index sets both to 0.
+    """
+    now = datetime.now(timezone.utc)
+    return {
+        "key": SECONDARY_GROUP_INDEX_KEY,
+        "value": json.dumps({"block_id": block_id, "address_id": address_id}),
+        "updated_at": now,
+    }
+
+
+def parse_secondary_group_index_value(
+    value: Optional[str],
+) -> Optional[Tuple[int, int]]:
+    """(block_id, address_id) the occupancy index starts at, see
+    :func:`build_secondary_group_index_row`."""
+    if value is None:
+        return None
+    start = json.loads(value)
+    return int(start["block_id"]), int(start["address_id"])
+
+
+def build_address_suffix_index_row(address_id: int, suffix_length: int) -> dict:
+    """Marker row: the account delta updater writes every address with an id
+    from ``address_id`` on to ``address_ids_by_address_suffix``, partitioned
+    by its last ``suffix_length`` hex characters.
+
+    Addresses created before the updater started indexing are not in the
+    table; address search still scans the prefix table for them until
+    ``graphsense-cli delta-update backfill-address-suffix-index`` indexes
+    them and sets ``address_id`` to 0.
+    """
+    now = datetime.now(timezone.utc)
+    return {
+        "key": ADDRESS_SUFFIX_INDEX_KEY,
+        "value": json.dumps({"address_id": address_id, "suffix_length": suffix_length}),
+        "updated_at": now,
+    }
+
+
+def parse_address_suffix_index_value(
+    value: Optional[str],
+) -> Optional[Tuple[int, int]]:
+    """(address_id, suffix_length) of the address suffix index, see
+    :func:`build_address_suffix_index_row`."""
+    if value is None:
+        return None
+    index = json.loads(value)
+    return int(index["address_id"]), int(index["suffix_length"])
@@ -2,7 +2,13 @@ import click
 
 from ..cli.common import require_currency, require_environment
 from ..schema import GraphsenseSchemas
-from .deltaupdater import patch_exchange_rates, state, update, validate
+from .deltaupdater import (
+    backfill_address_suffix_index,
+    patch_exchange_rates,
+    state,
+    update,
+    validate,
+)
 
 
 @click.group()
@@ -98,6 +104,14 @@ def delta():
     "interactive yes/no confirmation before replaying the staged values "
     "verbatim. Requires the WAL to be enabled.",
 )
+@click.option(
+    "--entity-cache-size",
+    type=int,
+    default=None,
+    help="Entries per map of the utxo updater's cross-batch address/cluster "
+    "cache; 0 disables it. Overrides the delta_updater_entity_cache_size "
+    "config value (default 500000).",
+)
 def deltaupdate(
     env,
     currency,
@@ -114,6 +128,7 @@ def deltaupdate(
     parallel_workers,
     enable_wal,
     force_wal_replay,
+    entity_cache_size,
 ):
     """Updates the transformend keyspace for new data in raw, if possible.
     \f
@@ -147,6 +162,7 @@ def deltaupdate(
         parallel_workers=parallel_workers,
         enable_wal=enable_wal,
         force_wal_replay=force_wal_replay,
+        entity_cache_size=entity_cache_size,
     )
 
 
@@ -197,3 +213,31 @@ def pexchangerates(env: str, currency: str, block: int):
         block (int): block to patch
     """
     patch_exchange_rates(env, currency, block)
+
+
+@delta.command("backfill-address-suffix-index")
+@require_environment()
+@require_currency()
+@click.option(
+    "--batch-size",
+    type=int,
+    default=10_000,
+    help="Addresses read and written per batch.",
+)
+def backfill_suffix_index(env: str, currency: str, batch_size: int):
+    """Adds the addresses the delta updater did not index to the address
+    suffix index (eth only), so prefix...postfix address searches find
+    every address.
+    \f
+
+    Args:
+        env (str): Env to work on
+        currency (str): Currency to work on
+        batch_size (int): Addresses per batch
+    """
+    if currency != "eth":
+        raise click.BadParameter(
+            "The address suffix index is only maintained for eth.",
+            param_hint="currency",
+        )
+    backfill_address_suffix_index(env, currency, batch_size)
@@ -269,6 +269,7 @@ def update(
     parallel_workers: int = 1,
     enable_wal: Optional[bool] = None,
     force_wal_replay: bool = False,
+    entity_cache_size: Optional[int] = None,
 ):
     with DbFactory().from_config(env, currency) as db:
         config = get_config()
@@ -277,6 +278,10 @@ def update(
             enable_wal if enable_wal is not None else config.delta_updater_wal_enabled
         )
         logger.info(f"Delta update WAL: {'enabled' if wal_enabled else 'disabled'}")
+        if entity_cache_size is None:
+            entity_cache_size = config.delta_updater_entity_cache_size
+        if entity_cache_size <= 0:
+            logger.info("Delta update entity cache: disabled")
         if force_wal_replay and not wal_enabled:
             logger.warning(
                 "--force-wal-replay has no effect while the WAL is disabled; "
@@ -403,6 +408,8 @@ def update(
                                 forward_fill_rates=forward_fill_rates,
                                 parallel_pool=parallel_pool,
                                 wal_enabled=wal_enabled,
+                                wal_compression=config.delta_updater_wal_compression,
+                                entity_cache_size=entity_cache_size,
                             ),
                             batch_size=write_batch_size,
                         )
@@ -429,3 +436,16 @@ def patch_exchange_rates(env: str, currency: str, block: int):
         )
 
         db.transformed.ingest("exchange_rates", ers)
+
+
+def backfill_address_suffix_index(env: str, currency: str, batch_size: int):
+    with DbFactory().from_config(env, currency) as db:
+        index = db.transformed.get_address_suffix_index()
+        if index is not None and index[0] == 0:
+            console.print("The address suffix index already covers every address.")
+            return
+        written = db.transformed.backfill_address_suffix_index(batch_size=batch_size)
+        console.print(
+            f"Indexed {written} addresses by suffix, address search now reads "
+            "the suffix index for every address."
+        )
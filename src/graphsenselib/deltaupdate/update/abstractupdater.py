@@ -205,6 +205,7 @@ class UpdateStrategy(AbstractUpdateStrategy):
         self._run_id = make_run_id()
         self._wal = None
         self._wal_enabled = False
+        self._wal_compression = None
 
     def get_forward_fill_rate(self):
         return
@@ -258,7 +259,12 @@ class UpdateStrategy(AbstractUpdateStrategy):
             from graphsenselib import __version__
             from graphsenselib.deltaupdate.wal import DeltaWal
 
-            self._wal = DeltaWal(self._db.transformed, self._run_id, __version__)
+            self._wal = DeltaWal(
+                self._db.transformed,
+                self._run_id,
+                __version__,
+                compression=self._wal_compression,
+            )
             self._wal.ensure_schema()
         return self._wal
 
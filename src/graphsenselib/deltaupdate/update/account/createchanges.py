@@ -1,7 +1,7 @@
 import logging
 from collections import defaultdict
 from datetime import datetime
-from typing import Any, Callable, Dict, List, NamedTuple, Tuple
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
 
 from graphsenselib.db import DbChange
 from graphsenselib.deltaupdate.update.abstractupdater import TABLE_NAME_DELTA_HISTORY
@@ -267,6 +267,7 @@ def prepare_entities_for_ingest(
     new_rel_out: dict,
     id_bucket_size: int,
     get_address_prefix: Callable[[str], Tuple[str, str]],
+    get_address_suffix: Optional[Callable[[str], str]] = None,
 ) -> Tuple[List[DbChange], int]:
     changes = []
     int_signed_32_max = 2147483647
@@ -368,9 +369,42 @@ def prepare_entities_for_ingest(
                     },
                 )
             )
+            if get_address_suffix is not None:
+                changes.append(
+                    DbChange.new(
+                        table="address_ids_by_address_suffix",
+                        data={
+                            "address": address,
+                            "address_id": int_ident,
+                            "address_suffix": get_address_suffix(update.identifier),
+                        },
+                    )
+                )
     return changes, nr_new_entities
 
 
+def prepare_secondary_group_index_for_ingest(
+    tablename: str,
+    column_prefix: str,
+    occupied: Iterable[Tuple[int, int, int]],
+) -> List[DbChange]:
+    """
+    Rows of the per-address secondary group occupancy index ``tablename``
+    for (address_id_group, address_id, secondary group) triples
+    """
+    return [
+        DbChange.new(
+            table=tablename,
+            data={
+                f"{column_prefix}address_id_group": address_id_group,
+                f"{column_prefix}address_id": address_id,
+                f"{column_prefix}address_id_secondary_group": secondary_group,
+            },
+        )
+        for address_id_group, address_id, secondary_group in sorted(set(occupied))
+    ]
+
+
 def prepare_entity_txs_for_ingest(
     delta: List[RawEntityTxAccount],
     id_bucket_size: int,
@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import Iterable, List, Optional, Union
 
 import pandas as pd
 from pydantic import BaseModel
@@ -18,6 +18,11 @@ class BlockchainAdapter:
     def dict_to_dataclass(self, data_dict):
         return self.datamodel.model_validate(data_dict)
 
+    def source_columns(self) -> List[str]:
+        """Raw table columns the datamodel is built from (before renaming)."""
+        renamed_from = {new: old for old, new in self.name_remapping.items()}
+        return [renamed_from.get(f, f) for f in self.datamodel.model_fields]
+
     def process_fields(self, data_object):
         # Check if the object is an instance of a dataclass
         for field_name, field_processor in self.field_processing.items():
@@ -124,7 +129,9 @@ class EthTraceAdapter(BlockchainAdapter):
     datamodel = EthTrace
 
 
-def eth_withdrawal_traces_from_lake_blocks(blocks_df: pd.DataFrame) -> List[EthTrace]:
+def eth_withdrawal_traces_from_lake_blocks(
+    blocks: Union[pd.DataFrame, Iterable[dict]],
+) -> List[EthTrace]:
     """Synthesize reward-style traces from EIP-4895 validator withdrawals.
 
     The delta lake keeps withdrawals nested on its block table (address as
@@ -134,12 +141,16 @@ def eth_withdrawal_traces_from_lake_blocks(blocks_df: pd.DataFrame) -> List[EthT
     no address_transactions entry). Must produce traces identical to the
     Cassandra rows written by
     `graphsenselib.ingest.account.eth_withdrawals_to_reward_traces`.
+
+    ``blocks`` are block rows as dicts (delta updater) or a data frame.
     """
     traces: List[EthTrace] = []
-    if "withdrawals" not in blocks_df.columns:
-        return traces
-    for row in blocks_df[["block_id", "withdrawals"]].itertuples(index=False):
-        withdrawals = row.withdrawals
+    if isinstance(blocks, pd.DataFrame):
+        if "withdrawals" not in blocks.columns:
+            return traces
+        blocks = blocks[["block_id", "withdrawals"]].to_dict(orient="records")
+    for row in blocks:
+        withdrawals = row.get("withdrawals")
         # NULL list values surface as None, float NaN, or pd.NA depending on
         # the reader (duckdb fetchdf yields pd.NA); all mean "no withdrawals".
         if (
@@ -151,7 +162,7 @@ def eth_withdrawal_traces_from_lake_blocks(blocks_df: pd.DataFrame) -> List[EthT
         for i, w in enumerate(withdrawals):
             traces.append(
                 EthTrace(
-                    block_id=int(row.block_id),
+                    block_id=int(row["block_id"]),
                     tx_hash=None,
                     trace_index=WITHDRAWAL_TRACE_INDEX_OFFSET + i,
                     from_address=None,
@@ -4,21 +4,28 @@ from collections import defaultdict
 from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional, Tuple
 
-import numpy as np
 import pandas as pd
 
 from graphsenselib.config.config import DeltaUpdaterConfig
+from graphsenselib.datatypes.address import ADDRESS_SUFFIX_LENGTH
 from graphsenselib.db import DbChange
+from graphsenselib.db.state import (
+    STATE_TABLE,
+    build_address_suffix_index_row,
+    build_secondary_group_index_row,
+)
 from graphsenselib.deltaupdate.update.abstractupdater import (
     TABLE_NAME_DELTA_HISTORY,
     UpdateStrategy,
 )
+from graphsenselib.deltaupdate.update.account import parallelio
 from graphsenselib.deltaupdate.update.account.createchanges import (
     get_bookkeeping_changes,
     prepare_balances_for_ingest,
     prepare_entities_for_ingest,
     prepare_entity_txs_for_ingest,
     prepare_relations_for_ingest,
+    prepare_secondary_group_index_for_ingest,
     prepare_token_exchange_rates_for_ingest,
     prepare_txs_for_ingest,
 )
@@ -56,7 +63,6 @@ from graphsenselib.deltaupdate.update.account.modelsraw import (
     TrxTransactionAdapter,
     eth_withdrawal_traces_from_lake_blocks,
 )
-from graphsenselib.deltaupdate.update.account import parallelio
 from graphsenselib.deltaupdate.update.account.tokens import ERC20Decoder
 from graphsenselib.deltaupdate.update.generic import Action, ApplicationStrategy, Tx
 from graphsenselib.deltaupdate.update.utxo.update import apply_changes
@@ -95,6 +101,22 @@ DEFAULT_SUMMARY_STATISTICS = MutableNamedTuple(
 )
 
 
+def delta_read_columns(currency: str) -> Dict[str, List[str]]:
+    """Columns read from each raw delta table; the rest are never decoded."""
+    if currency == "trx":
+        transaction_adapter, trace_adapter = TrxTransactionAdapter(), TrxTraceAdapter()
+    else:
+        transaction_adapter = AccountTransactionAdapter()
+        trace_adapter = EthTraceAdapter()
+    return {
+        "block": AccountBlockAdapter().source_columns() + ["withdrawals"],
+        "transaction": transaction_adapter.source_columns(),
+        "trace": trace_adapter.source_columns(),
+        "log": AccountLogAdapter().source_columns(),
+        "fee": ["tx_hash", "fee"],
+    }
+
+
 class UpdateStrategyAccount(UpdateStrategy):
     def __init__(
         self,
@@ -107,9 +129,11 @@ class UpdateStrategyAccount(UpdateStrategy):
         forward_fill_rates: bool = False,
         parallel_pool=None,
         wal_enabled: bool = False,
+        wal_compression: Optional[str] = None,
     ):
         super().__init__(db, du_config.currency, forward_fill_rates=forward_fill_rates)
         self._wal_enabled = wal_enabled
+        self._wal_compression = wal_compression
         self.du_config = du_config
         crash_file = (
             "/tmp/account_deltaupdate_"
@@ -129,6 +153,15 @@ class UpdateStrategyAccount(UpdateStrategy):
         self.changes = None
         self.bookkeeping_changes = None
         self._parallel_pool = parallel_pool
+        self._secondary_group_index_start = (
+            self._db.transformed.get_secondary_group_index_start()
+        )
+        # address search by suffix only serves hex (eth) addresses
+        self._address_suffix_index = (
+            self._db.transformed.get_address_suffix_index()
+            if self.currency == "eth"
+            else None
+        )
         self.application_strategy = application_strategy
         logger.info(f"Updater running in {application_strategy} mode.")
         self.crash_recoverer = CrashRecoverer(crash_file)
@@ -195,21 +228,28 @@ class UpdateStrategyAccount(UpdateStrategy):
             # because the latter drops the `WITH CLUSTERING ORDER BY (block_id
             # DESC)` clause that the serving nearest-/latest-rate queries rely on.
 
+    def _read_delta_table(
+        self, dt_connector: DeltaTableConnector, table: str, block_ids: List[int]
+    ):
+        return dt_connector.get_table(
+            table, block_ids, columns=delta_read_columns(self.currency)[table]
+        )
+
     def get_block_data(self, dt_connector: DeltaTableConnector, block_ids: List[int]):
         """Fetch block, transaction, trace, and log data sequentially."""
         time_start = time.time()
-        blocks = dt_connector.get(("block", block_ids), pd.DataFrame())
+        blocks = self._read_delta_table(dt_connector, "block", block_ids)
         logger.debug(f"Got {len(blocks)} blocks in {time.time() - time_start} seconds.")
         time_start = time.time()
-        txs = dt_connector.get(("transaction", block_ids), pd.DataFrame())
+        txs = self._read_delta_table(dt_connector, "transaction", block_ids)
         logger.debug(
             f"Got {len(txs)} transactions in {time.time() - time_start} seconds."
         )
         time_start = time.time()
-        traces = dt_connector.get(("trace", block_ids), pd.DataFrame())
+        traces = self._read_delta_table(dt_connector, "trace", block_ids)
         logger.debug(f"Got {len(traces)} traces in {time.time() - time_start} seconds.")
         time_start = time.time()
-        logs = dt_connector.get(("log", block_ids), pd.DataFrame())
+        logs = self._read_delta_table(dt_connector, "log", block_ids)
         logger.debug(f"Got {len(logs)} logs in {time.time() - time_start} seconds.")
         return txs, traces, logs, blocks
 
@@ -219,28 +259,11 @@ class UpdateStrategyAccount(UpdateStrategy):
         """Fetch block, transaction, trace, and log data in parallel."""
         time_start = time.time()
 
-        def fetch_blocks():
-            return dt_connector.get(("block", block_ids), pd.DataFrame())
-
-        def fetch_transactions():
-            return dt_connector.get(("transaction", block_ids), pd.DataFrame())
-
-        def fetch_traces():
-            return dt_connector.get(("trace", block_ids), pd.DataFrame())
-
-        def fetch_logs():
-            return dt_connector.get(("log", block_ids), pd.DataFrame())
-
         with ThreadPoolExecutor(max_workers=4) as executor:
-            blocks_future = executor.submit(fetch_blocks)
-            txs_future = executor.submit(fetch_transactions)
-            traces_future = executor.submit(fetch_traces)
-            logs_future = executor.submit(fetch_logs)
-
-            blocks = blocks_future.result()
-            txs = txs_future.result()
-            traces = traces_future.result()
-            logs = logs_future.result()
+            blocks, txs, traces, logs = executor.map(
+                lambda table: self._read_delta_table(dt_connector, table, block_ids),
+                ["block", "transaction", "trace", "log"],
+            )
 
         logger.debug(
             f"Got {len(blocks)} blocks, {len(txs)} transactions, "
@@ -251,8 +274,8 @@ class UpdateStrategyAccount(UpdateStrategy):
 
     def get_fee_data(self, dt_connector: DeltaTableConnector, block_ids: List[int]):
         time_start = time.time()
-        fees = dt_connector.get(("fee", block_ids), pd.DataFrame())
-        logger.debug(f"Got {len(fees)} traces in {time.time() - time_start} seconds.")
+        fees = self._read_delta_table(dt_connector, "fee", block_ids)
+        logger.debug(f"Got {len(fees)} fees in {time.time() - time_start} seconds.")
         return fees
 
     def process_batch_impl_hook(self, batch: List[int]) -> Tuple[Action, Optional[int]]:
@@ -291,7 +314,7 @@ class UpdateStrategyAccount(UpdateStrategy):
             )
             self._timing_delta_lake += time.time() - t_fetch_start
 
-            block_ids_got = set(blocks["block_id"].unique())
+            block_ids_got = set(blocks.column("block_id").to_pylist())
             block_ids_expected = set(batch)
             if block_ids_got != block_ids_expected:
                 missing_blocks = block_ids_expected - block_ids_got
@@ -323,6 +346,8 @@ class UpdateStrategyAccount(UpdateStrategy):
             if self.crash_recoverer.is_in_recovery_mode():
                 raise Exception("Batch mode is not allowed in recovery mode.")
 
+            interpreter = tableconnector.interpreter
+            transaction_rows = interpreter.interpret_rows(transactions, "transaction")
             if self.currency == "trx":
                 trace_adapter = TrxTraceAdapter()
                 transaction_adapter = TrxTransactionAdapter()
@@ -330,61 +355,50 @@ class UpdateStrategyAccount(UpdateStrategy):
                 t_fetch_start = time.time()
                 fees = self.get_fee_data(tableconnector, batch)
                 self._timing_delta_lake += time.time() - t_fetch_start
-                # merge fees into transactions
-                # cast tx_hash of both to bytes so it can be hashed
-                assert fees.empty == transactions.empty
+                # merge fees into transactions (left join on tx_hash)
+                assert (len(fees) == 0) == (len(transaction_rows) == 0)
                 # to be 100% clean would have to add empty fee fields in the case where
                 # there are transactions but no fees
-
-                if not transactions.empty:
-                    transactions["tx_hash"] = transactions["tx_hash"].apply(
-                        lambda x: bytes(x)
-                    )
-                    fees["tx_hash"] = fees["tx_hash"].apply(lambda x: bytes(x))
-                    # assuming no fees -> no transactions
-                    transactions = pd.merge(
-                        transactions,
-                        fees,
-                        on="tx_hash",
-                        how="left",
-                        suffixes=("", "_y"),
+                fee_by_tx = dict(
+                    zip(
+                        fees.column("tx_hash").to_pylist(),
+                        fees.column("fee").to_pylist(),
                     )
+                )
+                for row in transaction_rows:
+                    row["fee"] = fee_by_tx.get(row["tx_hash"])
 
             elif self.currency == "eth":
                 trace_adapter = EthTraceAdapter()
                 transaction_adapter = AccountTransactionAdapter()
 
-            # preprocess
-            if not logs.empty:
-                logs["topics"] = logs["topics"].apply(
-                    lambda x: list(x) if x is not None else []
-                )
-            # replace np.nan with None
-            transactions.replace({pd.NA: None}, inplace=True)
-            traces.replace({pd.NA: None}, inplace=True)
+            log_rows = interpreter.interpret_rows(logs, "log")
+            for row in log_rows:
+                if row["topics"] is None:
+                    row["topics"] = []
+            block_rows = interpreter.interpret_rows(blocks, "block")
 
-            # i havent found out why in some cases pd.NA doesnt work
-            blocks[["base_fee_per_gas"]] = blocks[["base_fee_per_gas"]].replace(
-                {np.nan: None}
-            )
             logger.debug("Converting to dataclasses")
             # convert dictionaries to dataclasses and unify naming
             log_adapter = AccountLogAdapter()
             block_adapter = AccountBlockAdapter()
-            traces = trace_adapter.df_to_renamed_dataclasses(traces)
+            traces = trace_adapter.dicts_to_renamed_dataclasses(
+                interpreter.interpret_rows(traces, "trace")
+            )
             traces = trace_adapter.process_fields_in_list(traces)
             if self.currency == "eth":
                 # EIP-4895 validator withdrawals live on the lake's block
                 # table; credit them like pre-merge reward traces.
-                traces.extend(eth_withdrawal_traces_from_lake_blocks(blocks))
-            transactions = transaction_adapter.df_to_dataclasses(transactions)
+                traces.extend(eth_withdrawal_traces_from_lake_blocks(block_rows))
+            transactions = transaction_adapter.dicts_to_dataclasses(transaction_rows)
 
-            logs = log_adapter.df_to_dataclasses(logs)
-            blocks = block_adapter.df_to_dataclasses(blocks)
+            logs = log_adapter.dicts_to_dataclasses(log_rows)
+            blocks = block_adapter.dicts_to_dataclasses(block_rows)
             blocks = block_adapter.process_fields_in_list(blocks)
             logger.debug("Converting to dataclasses done")
 
             changes = []
+            first_new_address_id = self.highest_address_id + 1
 
             (tx_changes, nr_new_addresses, nr_new_address_relations) = self.get_changes(
                 transactions, traces, logs, blocks, rates
@@ -415,6 +429,33 @@ class UpdateStrategyAccount(UpdateStrategy):
             )
             logger.debug("Bookkeeping changes done")
 
+            if self._secondary_group_index_start is None:
+                # first batch writing the secondary group occupancy index;
+                # readers trust it for blocks / addresses from here on
+                self._secondary_group_index_start = (min(batch), first_new_address_id)
+                bookkeeping_changes.append(
+                    DbChange.new(
+                        table=STATE_TABLE,
+                        data=build_secondary_group_index_row(
+                            *self._secondary_group_index_start
+                        ),
+                    )
+                )
+
+            if self.currency == "eth" and self._address_suffix_index is None:
+                self._address_suffix_index = (
+                    first_new_address_id,
+                    ADDRESS_SUFFIX_LENGTH,
+                )
+                bookkeeping_changes.append(
+                    DbChange.new(
+                        table=STATE_TABLE,
+                        data=build_address_suffix_index_row(
+                            *self._address_suffix_index
+                        ),
+                    )
+                )
+
             # Store changes to be written
             # They are applied at the end of the batch in
             # persist_updater_progress; bookkeeping is kept separate so the
@@ -491,6 +532,9 @@ class UpdateStrategyAccount(UpdateStrategy):
             address = tdb.to_db_address(address_str)
             return (address.db_encoding, address.prefix)
 
+        def get_address_suffix(address_str):
+            return tdb.to_db_address(address_str).suffix
+
         hash_to_id = {
             tx.tx_hash: self.consume_transaction_id_composite(
                 tx.block_id, tx.transaction_index
@@ -997,6 +1041,7 @@ class UpdateStrategyAccount(UpdateStrategy):
                 new_rels_out,
                 id_bucket_size,
                 get_address_prefix,
+                get_address_suffix if self.currency == "eth" else None,
             )
             changes += entity_changes
 
@@ -1078,6 +1123,14 @@ class UpdateStrategyAccount(UpdateStrategy):
         changes_secondary_atx = get_max_secondary_changes(
             secondary_group_data, tablename, grp_col, sec_col
         )
+        changes_occupancy = prepare_secondary_group_index_for_ingest(
+            "address_transactions_secondary_groups",
+            "",
+            (
+                (grp, tx.identifier, sec)
+                for tx, (grp, sec) in zip(new_entity_txs, secondary_group_data)
+            ),
+        )
 
         tablename = "address_outgoing_relations_secondary_ids"
         grp_col, sec_col = "src_address_id_group", "src_address_id_secondary_group"
@@ -1094,6 +1147,14 @@ class UpdateStrategyAccount(UpdateStrategy):
         changes_secondary_aor = get_max_secondary_changes(
             secondary_group_data, tablename, grp_col, sec_col
         )
+        changes_occupancy += prepare_secondary_group_index_for_ingest(
+            "address_outgoing_relations_secondary_groups",
+            "src_",
+            (
+                (grp, address_hash_to_id[tx.src_identifier], sec)
+                for tx, (grp, sec) in zip(relation_updates, secondary_group_data)
+            ),
+        )
 
         tablename = "address_incoming_relations_secondary_ids"
         grp_col, sec_col = "dst_address_id_group", "dst_address_id_secondary_group"
@@ -1111,9 +1172,18 @@ class UpdateStrategyAccount(UpdateStrategy):
         changes_secondary_air = get_max_secondary_changes(
             secondary_group_data, tablename, grp_col, sec_col
         )
+        changes_occupancy += prepare_secondary_group_index_for_ingest(
+            "address_incoming_relations_secondary_groups",
+            "dst_",
+            (
+                (grp, address_hash_to_id[tx.dst_identifier], sec)
+                for tx, (grp, sec) in zip(relation_updates, secondary_group_data)
+            ),
+        )
 
         changes = []
         changes += changes_secondary_atx
         changes += changes_secondary_aor
         changes += changes_secondary_air
+        changes += changes_occupancy
         return changes
@@ -1,4 +1,5 @@
 import logging
+from typing import Optional
 
 from graphsenselib.deltaupdate.update.account.accountlegacy import (
     UpdateStrategyAccountLegacy,
@@ -12,6 +13,7 @@ from ...db import AnalyticsDb
 from .abstractupdater import AbstractUpdateStrategy
 from .account import UpdateStrategyAccount
 from .utxo import UpdateStrategyUtxo
+from .utxo.entitycache import DEFAULT_ENTITY_CACHE_SIZE
 
 logger = logging.getLogger(__name__)
 
@@ -30,6 +32,8 @@ class UpdaterFactory:
         forward_fill_rates: bool = False,
         parallel_pool=None,
         wal_enabled: bool = False,
+        wal_compression: Optional[str] = None,
+        entity_cache_size: int = DEFAULT_ENTITY_CACHE_SIZE,
     ) -> AbstractUpdateStrategy:
         currency = du_config.currency
         schema_type = currency_to_schema_type[currency]
@@ -64,6 +68,8 @@ class UpdaterFactory:
                 forward_fill_rates=forward_fill_rates,
                 parallel_pool=parallel_pool,
                 wal_enabled=wal_enabled,
+                wal_compression=wal_compression,
+                entity_cache_size=entity_cache_size,
             )
         if (schema_type == "account" or schema_type == "account_trx") and version == 1:
             return UpdateStrategyAccountLegacy(
@@ -84,6 +90,7 @@ class UpdaterFactory:
                 forward_fill_rates=forward_fill_rates,
                 parallel_pool=parallel_pool,
                 wal_enabled=wal_enabled,
+                wal_compression=wal_compression,
             )
         else:
             raise Exception(f"Unsupported schema type {schema_type} or {version}")
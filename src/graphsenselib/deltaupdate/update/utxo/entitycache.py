@@ -0,0 +1,186 @@
+"""Cross-batch cache of address ids and address / cluster rows for the UTXO
+delta updater.
+
+Tip following touches the same hot (exchange, pool) addresses in almost every
+block, and each batch used to resolve all of them from Cassandra again. The
+updater is the only writer of the ``address`` / ``cluster`` tables while it
+holds the keyspace lock, so the rows it read plus the changes it applied
+itself are exactly what Cassandra holds:
+
+* address ids never change once assigned and are cached as soon as they are
+  read;
+* address and cluster rows are cached when read and, after a batch commits,
+  overwritten write-through with the rows that batch wrote. Rows a batch
+  computes are *staged* and only become visible after the caller confirms the
+  commit (:meth:`EntityRowCache.commit`); a failed or partial commit must
+  :meth:`EntityRowCache.invalidate` instead.
+
+Each map is an LRU bounded by ``max_entries``; ``max_entries <= 0`` disables
+caching (every lookup falls through to the fetch function).
+"""
+
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional
+
+from graphsenselib.db import DbChange
+from graphsenselib.db.parallel import PlainRow, flatten_value
+
+DEFAULT_ENTITY_CACHE_SIZE = 500_000
+
+
+class _Lru:
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        value = self._data.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: Hashable, value: Any):
+        if value is None or self.max_entries <= 0:
+            return
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+
+    def clear(self):
+        self._data.clear()
+
+
+def _row_dict(row) -> dict:
+    if row is None:
+        return {}
+    if isinstance(row, PlainRow):
+        return dict(row._data)
+    return dict(flatten_value(row)._data)
+
+
+class EntityRowCache:
+    def __init__(self, max_entries: int = DEFAULT_ENTITY_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._address_ids = _Lru(max_entries)
+        self._address_rows = _Lru(max_entries)
+        self._cluster_rows = _Lru(max_entries)
+        self._pending_ids: Dict[Hashable, int] = {}
+        self._pending_addresses: Dict[int, PlainRow] = {}
+        self._pending_clusters: Dict[int, PlainRow] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    @staticmethod
+    def _cached_fetch(
+        lru: _Lru, keys: Iterable[Hashable], fetch: Callable[[List], Dict]
+    ) -> Dict:
+        out = {}
+        misses = []
+        for key in keys:
+            value = lru.get(key)
+            if value is None:
+                misses.append(key)
+            else:
+                out[key] = value
+        if misses:
+            fetched = fetch(misses)
+            for key, value in fetched.items():
+                lru.put(key, value)
+            out.update(fetched)
+        return out
+
+    def get_address_ids(
+        self, addresses: Iterable[Hashable], fetch: Callable[[List], Dict]
+    ) -> Dict[Hashable, Optional[int]]:
+        """Map each address to its address_id (None if unknown), fetching only
+        the addresses not cached. Unknown addresses are never cached."""
+        return self._cached_fetch(self._address_ids, addresses, fetch)
+
+    def get_address_rows(
+        self, address_ids: Iterable[int], fetch: Callable[[List], Dict]
+    ) -> Dict[int, Any]:
+        return self._cached_fetch(self._address_rows, address_ids, fetch)
+
+    def get_cluster_rows(
+        self, cluster_ids: Iterable[int], fetch: Callable[[List], Dict]
+    ) -> Dict[int, Any]:
+        return self._cached_fetch(self._cluster_rows, cluster_ids, fetch)
+
+    def stage(
+        self,
+        changes: List[DbChange],
+        address_ids: Dict[Hashable, int],
+        address_rows: Dict[int, Any],
+        cluster_rows: Dict[int, Any],
+    ):
+        """Record the rows ``changes`` will write once committed.
+
+        ``address_rows`` / ``cluster_rows`` are the rows the changes were
+        computed against (None for new entities); ``address`` and ``cluster``
+        changes only carry the columns they set, so they are laid over them.
+        """
+        if not self.enabled:
+            return
+        self._pending_ids.update(address_ids)
+        for change in changes:
+            if change.table == "address":
+                aid = change.data["address_id"]
+                base = self._pending_addresses.get(aid) or address_rows.get(aid)
+                self._pending_addresses[aid] = PlainRow(
+                    {**_row_dict(base), **change.data}
+                )
+            elif change.table == "cluster":
+                cid = change.data["cluster_id"]
+                base = self._pending_clusters.get(cid) or cluster_rows.get(cid)
+                self._pending_clusters[cid] = PlainRow(
+                    {**_row_dict(base), **change.data}
+                )
+
+    def commit(self):
+        """The staged changes were acknowledged; make their rows visible."""
+        for address, aid in self._pending_ids.items():
+            self._address_ids.put(address, aid)
+        for aid, row in self._pending_addresses.items():
+            self._address_rows.put(aid, row)
+        for cid, row in self._pending_clusters.items():
+            self._cluster_rows.put(cid, row)
+        self._discard_pending()
+
+    def invalidate(self):
+        """Drop everything, e.g. after a failed commit, a WAL replay or a
+        re-cluster: the next batch reads from Cassandra again."""
+        self._address_ids.clear()
+        self._address_rows.clear()
+        self._cluster_rows.clear()
+        self._discard_pending()
+
+    def _discard_pending(self):
+        self._pending_ids = {}
+        self._pending_addresses = {}
+        self._pending_clusters = {}
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            f"{name}_{stat}": value
+            for name, lru in (
+                ("address_ids", self._address_ids),
+                ("address_rows", self._address_rows),
+                ("cluster_rows", self._cluster_rows),
+            )
+            for stat, value in (
+                ("size", len(lru)),
+                ("hits", lru.hits),
+                ("misses", lru.misses),
+            )
+        }
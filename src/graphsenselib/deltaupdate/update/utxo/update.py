@@ -29,6 +29,10 @@ from graphsenselib.deltaupdate.update.generic import (
     prepare_txs_for_ingest,
 )
 from graphsenselib.deltaupdate.update.utxo import parallelio
+from graphsenselib.deltaupdate.update.utxo.entitycache import (
+    DEFAULT_ENTITY_CACHE_SIZE,
+    EntityRowCache,
+)
 from graphsenselib.rates import convert_to_fiat
 from graphsenselib.utils import DataObject as MutableNamedTuple
 from graphsenselib.utils import group_by
@@ -703,6 +707,7 @@ def get_transaction_changes(
     collect_cluster_inputs: bool = False,
     timings: Optional[Dict[str, float]] = None,
     pool=None,
+    cache: Optional[EntityRowCache] = None,
 ) -> Tuple[List[DbChange], int, int, int, int, List[List[int]], Dict[int, EntityDelta]]:
     """Main function to transform a list of transactions from the raw
     keyspace to changes to the transformed db.
@@ -722,8 +727,14 @@ def get_transaction_changes(
         their own section, so the split is exact.
         pool (ParallelDbPool): when given, reads are fanned out to worker
         processes (driver row deserialization is client-CPU-bound).
+        cache (EntityRowCache): when given, address ids and address / cluster
+        rows are served from it where possible, and the rows the returned
+        changes write are staged into it; the caller commits or invalidates
+        it depending on whether the changes were applied.
     """
     tdb = db.transformed
+    if cache is None:
+        cache = EntityRowCache(max_entries=0)
 
     """
         Add pseudo inputs for coinbase txs
@@ -780,7 +791,10 @@ def get_transaction_changes(
         accumulate_phase(timings, "cassandra_read"),
         LoggerScope.debug(logger, f"Checking existence for {len_addr} addresses") as _,
     ):
-        addr_ids = parallelio.fetch_address_ids(tdb, pool, list(addresses))
+        addr_ids = cache.get_address_ids(
+            addresses,
+            lambda misses: parallelio.fetch_address_ids(tdb, pool, misses),
+        )
 
         del addresses
 
@@ -828,7 +842,10 @@ def get_transaction_changes(
         existing_addr_ids = [
             addr_id for addr_id in addr_ids.values() if addr_id is not None
         ]
-        addresses_resolved = parallelio.fetch_address_rows(tdb, pool, existing_addr_ids)
+        addresses_resolved = cache.get_address_rows(
+            existing_addr_ids,
+            lambda misses: parallelio.fetch_address_rows(tdb, pool, misses),
+        )
         del existing_addr_ids
 
         addresses = {
@@ -925,14 +942,13 @@ def get_transaction_changes(
         accumulate_phase(timings, "cassandra_read"),
         LoggerScope.debug(logger, "Reading clusters for addresses") as _,
     ):
-        clusters_resolved = parallelio.fetch_cluster_rows(
-            tdb,
-            pool,
-            [
+        clusters_resolved = cache.get_cluster_rows(
+            {
                 address.cluster_id
                 for adr, (addr_id, address) in addresses.items()
                 if address is not None
-            ],
+            },
+            lambda misses: parallelio.fetch_cluster_rows(tdb, pool, misses),
         )
 
         def get_resolved_cluster(address_tuple):
@@ -1115,6 +1131,17 @@ def get_transaction_changes(
             nr_new_entities_created[mode] = nr_new_entities
             del nr_new_entities
 
+        cache.stage(
+            changes,
+            address_ids={adr: aid for adr, (aid, *_) in addresses_with_cluster.items()},
+            address_rows={
+                aid: address for aid, address, _, _ in addresses_with_cluster.values()
+            },
+            cluster_rows={
+                cid: cluster for _, _, cid, cluster in addresses_with_cluster.values()
+            },
+        )
+
     # Resolve via a None-returning lookup (not address_to_address_id, which raises):
     # multisig / multi-address inputs are dropped by filter_inoutputs upstream and
     # so have no address_id — resolve_address_id_sets drops those addresses.
@@ -1767,9 +1794,16 @@ class UpdateStrategyUtxo(UpdateStrategy):
         forward_fill_rates: bool = False,
         parallel_pool=None,
         wal_enabled: bool = False,
+        wal_compression: Optional[str] = None,
+        entity_cache_size: int = DEFAULT_ENTITY_CACHE_SIZE,
     ):
         super().__init__(db, currency, forward_fill_rates=forward_fill_rates)
         self._wal_enabled = wal_enabled
+        self._wal_compression = wal_compression
+        # Address ids and address/cluster rows kept across batches; see
+        # entitycache. Any pending WAL record is replayed before the updater is
+        # built, so the cache always starts from the replayed state.
+        self.entity_cache = EntityRowCache(entity_cache_size)
         crash_file = (
             "/tmp/utxo_deltaupdate_"
             f"{self._db.raw.get_keyspace()}_{self._db.transformed.get_keyspace()}"
@@ -1808,28 +1842,34 @@ class UpdateStrategyUtxo(UpdateStrategy):
             # process_batch and reaches here with self.changes == None.)
             # No-op when the WAL is disabled.
             self._stage_wal(self.changes, bookkeeping)
-            if self._parallel_pool is not None and not atomic:
-                # Shard the data writes across the worker pool; only write
-                # the bookkeeping rows (summary statistics, delta history)
-                # after every data shard has been acked, so a torn batch can
-                # never look completed.
-                apply_changes(
-                    self._db,
-                    self.changes,
-                    self._pedantic,
-                    try_atomic_writes=False,
-                    pool=self._parallel_pool,
-                )
-                apply_changes(
-                    self._db, bookkeeping, self._pedantic, try_atomic_writes=False
-                )
-            else:
-                apply_changes(
-                    self._db,
-                    self.changes + bookkeeping,
-                    self._pedantic,
-                    try_atomic_writes=atomic,
-                )
+            try:
+                if self._parallel_pool is not None and not atomic:
+                    # Shard the data writes across the worker pool; only write
+                    # the bookkeeping rows (summary statistics, delta history)
+                    # after every data shard has been acked, so a torn batch can
+                    # never look completed.
+                    apply_changes(
+                        self._db,
+                        self.changes,
+                        self._pedantic,
+                        try_atomic_writes=False,
+                        pool=self._parallel_pool,
+                    )
+                    apply_changes(
+                        self._db, bookkeeping, self._pedantic, try_atomic_writes=False
+                    )
+                else:
+                    apply_changes(
+                        self._db,
+                        self.changes + bookkeeping,
+                        self._pedantic,
+                        try_atomic_writes=atomic,
+                    )
+            except Exception:
+                # Partially applied at worst: nothing cached can be trusted.
+                self.entity_cache.invalidate()
+                raise
+            self.entity_cache.commit()
             if self._wal_enabled:
                 self.wal.clear()
             self.changes = None
@@ -1943,6 +1983,10 @@ class UpdateStrategyUtxo(UpdateStrategy):
             )
             return
 
+        # Re-clustering writes around the batch pipeline; don't let rows cached
+        # before it outlive it.
+        self.entity_cache.invalidate()
+
         if not _check_gs_clustering():
             logger.warning("gs_clustering not available, skipping fresh clustering")
             return
@@ -2051,6 +2095,7 @@ class UpdateStrategyUtxo(UpdateStrategy):
                 collect_cluster_inputs=collect_cluster_inputs,
                 timings=timings,
                 pool=self._parallel_pool,
+                cache=self.entity_cache,
             )
 
             last_block_processed = batch[-1]
@@ -2137,6 +2182,7 @@ class UpdateStrategyUtxo(UpdateStrategy):
                                 lambda: self.consume_address_id(),
                                 lambda: self.consume_cluster_id(),
                                 collect_cluster_inputs=collect_cluster_inputs,
+                                cache=self.entity_cache,
                             )
                             last_block_processed = tx.block_id
                             runtime_seconds = int(time.time() - self.batch_start_time)
@@ -2176,7 +2222,9 @@ class UpdateStrategyUtxo(UpdateStrategy):
                                 self._pedantic,
                                 try_atomic_writes=True,
                             )
+                            self.entity_cache.commit()
                 except Exception as e:
+                    self.entity_cache.invalidate()
                     assert self.crash_recoverer.is_in_recovery_mode()
                     logger.error(
                         "Entering recovery mode. Recovery hint written "
@@ -2218,6 +2266,9 @@ class UpdateStrategyUtxo(UpdateStrategy):
                 f"{len(clustering_changes)} db changes staged"
             )
 
+        if self.entity_cache.enabled:
+            logger.debug(f"Entity cache: {self.entity_cache.stats()}")
+
         self._timing_cassandra_read += timings.get("cassandra_read", 0.0)
         self._timing_transform += timings.get("transform", 0.0)
         self._timing_persist += timings.get("persist", 0.0)
@@ -17,13 +17,22 @@ across independent container runs (a container-local file would vanish with the
 container). The payload is chunked because Cassandra dislikes multi-MB cells, and
 a header row written *last* commits the record (the DB analogue of an atomic
 temp-file rename).
+
+Chunks are produced by a streaming encoder (optionally lz4/zstd compressed) and
+written concurrently; the header is only written once every chunk write is
+acknowledged. Loading reads chunk windows concurrently, verifies the checksum
+over the stored bytes and decodes chunk by chunk, so neither side ever holds the
+whole payload twice. The codec is recognised from the payload's frame magic, so
+records written uncompressed (or by older versions) stay readable.
 """
 
 import datetime as _dt
 import hashlib
 import logging
+from collections import deque
 from dataclasses import dataclass
-from typing import Callable, List, Optional
+from itertools import chain
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
 
 import msgpack
 
@@ -41,6 +50,17 @@ WAL_TABLE_NAME = "delta_updater_wal"
 # soft limits while keeping the chunk count small for typical batches.
 _CHUNK_SIZE = 512 * 1024
 
+# Chunk writes / chunk-window reads kept in flight against Cassandra, and the
+# number of chunks fetched per range read.
+_MAX_IN_FLIGHT = 16
+_READ_WINDOW = 4
+
+# Payload compression for newly staged records. Readers detect the codec from
+# the frame magic, so this only affects stage().
+WAL_COMPRESSION_CODECS = ("lz4", "zstd")
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+_LZ4_FRAME_MAGIC = b"\x04\x22\x4d\x18"
+
 # Clustering index of the sentinel header row. Data chunks use idx >= 0; the
 # header is written last and its presence marks the record as committed.
 _HEADER_IDX = -1
@@ -60,9 +80,9 @@ _HEADER_IDX = -1
 #         them natively. Encoded as a decimal string so the value is preserved
 #         exactly and rebinds to varint identically on replay.
 # numpy scalars (pandas-derived) collapse to their Python scalar via .item().
-# An unrecognized type raises at encode time (loud, before any write) rather
-# than being silently dropped — add a new ext code here if a new domain type
-# ever enters DbChange.data.
+# An unrecognized type raises at encode time (loud, before the record is
+# committed) rather than being silently dropped — add a new ext code here if a
+# new domain type ever enters DbChange.data.
 _EXT_DATETIME = 1
 _EXT_DELTAVALUE = 2
 _EXT_TXREFERENCE = 3
@@ -119,23 +139,155 @@ def _unpackb(payload: bytes):
     return msgpack.unpackb(payload, raw=False, ext_hook=_ext_hook)
 
 
-def encode_changes(changes: List[DbChange]) -> bytes:
-    """Serialize a list of DbChange into a bytes payload (msgpack)."""
-    encoded = []
+def _check_walable(changes: Iterable[DbChange]) -> None:
     for c in changes:
         if c.action == DbChangeType.TRUNCATE:
             # TRUNCATE is not idempotent and must never be replayed.
             raise ValueError("TRUNCATE changes must not enter the WAL.")
-        encoded.append([c.action.value, c.table, c.data])
-    return _packb(encoded)
+
+
+def _iter_packed(changes: List[DbChange]) -> Iterator[bytes]:
+    """msgpack-encode ``changes`` piecewise. The concatenation is byte-identical
+    to ``_packb([[action, table, data], ...])``."""
+    packer = msgpack.Packer(use_bin_type=True, default=_default)
+    yield packer.pack_array_header(len(changes))
+    for c in changes:
+        yield packer.pack([c.action.value, c.table, c.data])
+
+
+def _compressor(compression: Optional[str]):
+    """Return a ``(header, compress, flush)`` triple for ``compression`` or None
+    for a plain payload. The codec libraries are optional dependencies."""
+    if not compression:
+        return None
+    if compression == "lz4":
+        try:
+            import lz4.frame
+        except ImportError as e:
+            raise ImportError(
+                "WAL compression 'lz4' requires the lz4 package "
+                "(pip install lz4), or disable delta_updater_wal_compression."
+            ) from e
+        c = lz4.frame.LZ4FrameCompressor()
+        return c.begin(), c.compress, c.flush
+    if compression == "zstd":
+        try:
+            import zstandard
+        except ImportError as e:
+            raise ImportError(
+                "WAL compression 'zstd' requires the zstandard package "
+                "(pip install zstandard), or disable "
+                "delta_updater_wal_compression."
+            ) from e
+        c = zstandard.ZstdCompressor().compressobj()
+        return b"", c.compress, c.flush
+    raise ValueError(
+        f"Unknown WAL compression {compression!r}; "
+        f"expected one of {WAL_COMPRESSION_CODECS} or none."
+    )
+
+
+def _decompressor(head: bytes):
+    """Pick a streaming decompress function from the first payload bytes;
+    None for a plain msgpack payload."""
+    if head.startswith(_LZ4_FRAME_MAGIC):
+        import lz4.frame
+
+        return lz4.frame.LZ4FrameDecompressor().decompress
+    if head.startswith(_ZSTD_MAGIC):
+        try:
+            import zstandard
+        except ImportError as e:
+            raise ImportError(
+                "The pending WAL record is zstd-compressed; install the "
+                "zstandard package to replay it."
+            ) from e
+        return zstandard.ZstdDecompressor().decompressobj().decompress
+    return None
+
+
+def iter_encoded_chunks(
+    changes: List[DbChange],
+    compression: Optional[str] = None,
+    chunk_size: int = _CHUNK_SIZE,
+) -> Iterator[bytes]:
+    """Stream the (optionally compressed) payload of ``changes`` as chunks of
+    at most ``chunk_size`` bytes. Only about one chunk is buffered at a time."""
+    _check_walable(changes)
+    codec = _compressor(compression)
+    buf = bytearray()
+    pieces = _iter_packed(changes)
+    if codec is not None:
+        header, compress, flush = codec
+        pieces = chain([header], map(compress, pieces), _lazy(flush))
+    for piece in pieces:
+        buf += piece
+        while len(buf) >= chunk_size:
+            yield bytes(buf[:chunk_size])
+            del buf[:chunk_size]
+    if buf:
+        yield bytes(buf)
+
+
+def _lazy(fn: Callable[[], bytes]) -> Iterator[bytes]:
+    yield fn()
+
+
+def decode_chunks(chunks: Iterable[bytes]) -> List[DbChange]:
+    """Inverse of :func:`iter_encoded_chunks`; the codec is detected from the
+    first chunk. Changes are unpacked as chunks arrive, so the decompressed
+    payload is never materialized in full. Raises ValueError on a malformed
+    payload."""
+    unpacker = msgpack.Unpacker(raw=False, ext_hook=_ext_hook, max_buffer_size=0)
+    decompress = None
+    remaining = None
+    changes = []
+    empty = True
+    try:
+        for chunk in chunks:
+            if empty:
+                decompress = _decompressor(chunk)
+                empty = False
+            unpacker.feed(decompress(chunk) if decompress else chunk)
+            if remaining is None:
+                try:
+                    remaining = unpacker.read_array_header()
+                except msgpack.OutOfData:
+                    continue
+            while remaining:
+                try:
+                    action, table, data = unpacker.unpack()
+                except msgpack.OutOfData:
+                    break
+                changes.append(
+                    DbChange(action=DbChangeType(action), table=table, data=data)
+                )
+                remaining -= 1
+        if empty:
+            return []
+        if remaining != 0:
+            raise ValueError("Malformed WAL payload: truncated.")
+        try:
+            unpacker.unpack()
+        except msgpack.OutOfData:
+            return changes
+        raise ValueError("Malformed WAL payload: trailing data.")
+    except (ValueError, ImportError):
+        raise
+    except Exception as e:
+        # lz4 / zstd / msgpack report corrupt input with assorted types.
+        raise ValueError(f"Malformed WAL payload: {e!r}") from e
+
+
+def encode_changes(changes: List[DbChange]) -> bytes:
+    """Serialize a list of DbChange into a bytes payload (msgpack)."""
+    _check_walable(changes)
+    return b"".join(_iter_packed(changes))
 
 
 def decode_changes(payload: bytes) -> List[DbChange]:
     """Inverse of :func:`encode_changes`."""
-    return [
-        DbChange(action=DbChangeType(action), table=table, data=data)
-        for action, table, data in _unpackb(payload)
-    ]
+    return decode_chunks([payload])
 
 
 @dataclass(frozen=True)
@@ -159,12 +311,21 @@ class DeltaWal:
     stays storage-only and free of import cycles with the update strategies.
     """
 
-    def __init__(self, transformed_db, run_id: str, code_version: str):
+    def __init__(
+        self,
+        transformed_db,
+        run_id: str,
+        code_version: str,
+        compression: Optional[str] = None,
+    ):
         self._tdb = transformed_db
         self._db = transformed_db._db  # raw CassandraDb for parametrized exec
         self._keyspace = transformed_db.get_keyspace()
         self._run_id = run_id
         self._code_version = code_version
+        # Fail fast on an unknown codec or a missing codec library.
+        _compressor(compression)
+        self._compression = compression or None
 
     # -- schema ----------------------------------------------------------------
 
@@ -218,6 +379,72 @@ class DeltaWal:
             "checksum": r.checksum,
         }
 
+    def _await(self, cql: str, params: list, future):
+        try:
+            return future.result()
+        except Exception as e:
+            # Re-issue through the synchronous path, which rides out transient
+            # errors with backoff; chunk writes and reads are idempotent.
+            logger.debug(f"Async WAL statement failed ({e!r}); retrying.")
+            return self._exec(cql, params)
+
+    def _write_chunks(
+        self, streams: Iterable[Iterable[bytes]]
+    ) -> Tuple[List[int], str]:
+        """Write the chunks of each stream under consecutive chunk indices with
+        up to ``_MAX_IN_FLIGHT`` writes outstanding. Returns the per-stream
+        chunk counts and the sha256 over all stored bytes once every write is
+        acknowledged."""
+        insert = (
+            f"INSERT INTO {self._table()} (keyspace_marker, chunk_idx, payload) "
+            f"VALUES (?, ?, ?)"
+        )
+        prep = self._db.get_prepared_statement(insert)
+        digest = hashlib.sha256()
+        pending = deque()
+        counts = []
+        idx = 0
+        for stream in streams:
+            n = 0
+            for chunk in stream:
+                digest.update(chunk)
+                params = [self._keyspace, idx, chunk]
+                future = self._db.execute_statement_async(prep.bind(params), None)
+                pending.append((params, future))
+                if len(pending) >= _MAX_IN_FLIGHT:
+                    self._await(insert, *pending.popleft())
+                idx += 1
+                n += 1
+            counts.append(n)
+        while pending:
+            self._await(insert, *pending.popleft())
+        return counts, digest.hexdigest()
+
+    def _read_chunks(self, total: int) -> dict:
+        """Fetch chunks ``0..total-1`` in windows of ``_READ_WINDOW`` with up to
+        ``_MAX_IN_FLIGHT`` range reads outstanding."""
+        select = (
+            f"SELECT chunk_idx, payload FROM {self._table()} "
+            f"WHERE keyspace_marker=? AND chunk_idx>=? AND chunk_idx<?"
+        )
+        prep = self._db.get_prepared_statement(select)
+        by_idx = {}
+        pending = deque()
+
+        def collect():
+            for r in self._await(select, *pending.popleft()):
+                by_idx[r.chunk_idx] = r.payload
+
+        for lo in range(0, total, _READ_WINDOW):
+            params = [self._keyspace, lo, min(lo + _READ_WINDOW, total)]
+            future = self._db.execute_statement_async(prep.bind(params), None)
+            pending.append((params, future))
+            if len(pending) >= _MAX_IN_FLIGHT:
+                collect()
+        while pending:
+            collect()
+        return by_idx
+
     def _delete_partition(self) -> None:
         self._exec(
             f"DELETE FROM {self._table()} WHERE keyspace_marker=?", [self._keyspace]
@@ -232,27 +459,24 @@ class DeltaWal:
     def stage(self, record: WalRecord) -> None:
         """Durably persist the record before any of it is applied.
 
-        Writes data chunks first, then the header row last. A crash before the
-        header lands leaves headerless chunks that :meth:`recover` sweeps; since
-        staging completes before the caller applies anything, no data was
-        written in that case.
+        Writes data chunks first (concurrently, streamed from the encoder), then
+        the header row last, only after every chunk write is acknowledged. A
+        crash before the header lands leaves headerless chunks that
+        :meth:`recover` sweeps; since staging completes before the caller
+        applies anything, no data was written in that case.
         """
+        # Reject unreplayable changes before touching the partition.
+        _check_walable(record.changes)
+        _check_walable(record.bookkeeping)
         # Start from a clean partition (drops any swept-but-not-cleared chunks).
         self._delete_partition()
 
-        data_blob = encode_changes(record.changes)
-        book_blob = encode_changes(record.bookkeeping)
-        data_chunks = _split(data_blob)
-        book_chunks = _split(book_blob)
-        all_chunks = data_chunks + book_chunks
-        checksum = hashlib.sha256(data_blob + book_blob).hexdigest()
-
-        insert = (
-            f"INSERT INTO {self._table()} (keyspace_marker, chunk_idx, payload) "
-            f"VALUES (?, ?, ?)"
+        (n_data_chunks, n_book_chunks), checksum = self._write_chunks(
+            [
+                iter_encoded_chunks(record.changes, self._compression),
+                iter_encoded_chunks(record.bookkeeping, self._compression),
+            ]
         )
-        for i, chunk in enumerate(all_chunks):
-            self._exec(insert, [self._keyspace, i, chunk])
 
         # Header row written LAST = commit point.
         self._exec(
@@ -266,8 +490,8 @@ class DeltaWal:
                 record.code_version,
                 record.block_lo,
                 record.block_hi,
-                len(data_chunks),
-                len(book_chunks),
+                n_data_chunks,
+                n_book_chunks,
                 checksum,
             ],
         )
@@ -304,32 +528,26 @@ class DeltaWal:
         n_data = header["n_data_chunks"]
         n_book = header["n_book_chunks"]
         total = n_data + n_book
-        rows = list(
-            self._exec(
-                f"SELECT chunk_idx, payload FROM {self._table()} "
-                f"WHERE keyspace_marker=? AND chunk_idx>=? AND chunk_idx<?",
-                [self._keyspace, 0, total],
-            )
-        )
-        by_idx = {r.chunk_idx: r.payload for r in rows}
+        by_idx = self._read_chunks(total)
         if len(by_idx) != total:
             raise ValueError(
                 f"WAL payload is incomplete: expected {total} chunks, "
                 f"found {len(by_idx)}."
             )
-        blob = b"".join(by_idx[i] for i in range(total))
-        if hashlib.sha256(blob).hexdigest() != header["checksum"]:
+        chunks = [by_idx[i] for i in range(total)]
+        digest = hashlib.sha256()
+        for chunk in chunks:
+            digest.update(chunk)
+        if digest.hexdigest() != header["checksum"]:
             raise ValueError("WAL payload checksum mismatch.")
 
-        data_blob = b"".join(by_idx[i] for i in range(0, n_data))
-        book_blob = b"".join(by_idx[i] for i in range(n_data, total))
         return WalRecord(
             run_id=header["run_id"],
             code_version=header["code_version"],
             block_lo=header["block_lo"],
             block_hi=header["block_hi"],
-            changes=decode_changes(data_blob) if data_blob else [],
-            bookkeeping=decode_changes(book_blob) if book_blob else [],
+            changes=decode_chunks(chunks[:n_data]),
+            bookkeeping=decode_chunks(chunks[n_data:]),
         )
 
     def clear(self) -> None:
@@ -377,9 +595,3 @@ class DeltaWal:
         self.clear()
         logger.info("WAL replay complete; keyspace is consistent.")
         return True
-
-
-def _split(blob: bytes) -> List[bytes]:
-    if not blob:
-        return []
-    return [blob[i : i + _CHUNK_SIZE] for i in range(0, len(blob), _CHUNK_SIZE)]
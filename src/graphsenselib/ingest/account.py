@@ -33,6 +33,7 @@ from .rpc_eth import (
     BlockExporter,
     BlockReceiptExporter,
     ReceiptExporter,
+    create_rpc_client,
     enrich_transactions as _enrich_transactions,
     get_block_range_for_date,
 )
@@ -80,6 +81,8 @@ class AccountStreamerAdapter:
         max_workers_blockstransactions: Optional[int] = None,
         batch_size_receiptslogs: Optional[int] = None,
         max_workers_receiptslogs: Optional[int] = None,
+        target_batch_bytes: Optional[int] = None,
+        columnar_logs: bool = False,
     ) -> None:
         self.client = client
         self.batch_size = batch_size
@@ -103,16 +106,20 @@ class AccountStreamerAdapter:
             client,
             batch_size=batch_size_blockstransactions or 50,
             max_workers=max_workers_blockstransactions or 20,
+            target_batch_bytes=target_batch_bytes,
         )
         self._receipt_exporter = ReceiptExporter(
             client,
             batch_size=batch_size_receiptslogs or 50,
             max_workers=max_workers_receiptslogs or 20,
+            target_batch_bytes=target_batch_bytes,
         )
         self._block_receipt_exporter = BlockReceiptExporter(
             client,
             batch_size=batch_size_blockstransactions or 20,
             max_workers=max_workers_blockstransactions or 10,
+            target_batch_bytes=target_batch_bytes,
+            columnar_logs=columnar_logs,
         )
         self._trace_exporter = TraceExporter(
             client=client,
@@ -120,6 +127,13 @@ class AccountStreamerAdapter:
             max_workers=max_workers or 20,
         )
 
+    def describe_batching(self) -> str:
+        """Current batch size and worker count per exporter, for logging."""
+        return (
+            f"blocks[{self._block_exporter.describe_batching()}] "
+            f"block_receipts[{self._block_receipt_exporter.describe_batching()}]"
+        )
+
     def export_blocks_and_transactions(
         self,
         start_block: int,
@@ -189,6 +203,7 @@ class TronStreamerAdapter(AccountStreamerAdapter):
         max_workers_blockstransactions: Optional[int] = None,
         batch_size_receiptslogs: Optional[int] = None,
         max_workers_receiptslogs: Optional[int] = None,
+        target_batch_bytes: Optional[int] = None,
     ) -> None:
         super().__init__(
             client,
@@ -198,6 +213,7 @@ class TronStreamerAdapter(AccountStreamerAdapter):
             max_workers_blockstransactions,
             batch_size_receiptslogs,
             max_workers_receiptslogs,
+            target_batch_bytes,
         )
         self.grpc_endpoint = grpc_endpoint
 
@@ -730,8 +746,8 @@ def print_block_info(
         logger.info(f"Last ingested block: {last_ingested_block:,}")
 
 
-def get_connection_from_url(provider_uri: str, provider_timeout=600):
-    return BatchRpcClient(provider_uri, timeout=provider_timeout)
+def get_connection_from_url(provider_uri: str, provider_timeout=600, async_rpc=False):
+    return create_rpc_client(provider_uri, provider_timeout, async_rpc=async_rpc)
 
 
 def ingest(
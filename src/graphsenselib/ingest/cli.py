@@ -448,6 +448,12 @@ def _run_new_ingest(
         s3_credentials = config.get_s3_credentials(pdc.s3_config)
 
     source_max_workers = ic.source_max_workers if ic is not None else None
+    pipeline_depth = ic.pipeline_depth if ic is not None else 2
+    source_parallelism = ic.source_parallelism if ic is not None else 1
+    async_rpc = ic.async_rpc if ic is not None else False
+    rpc_target_batch_bytes = ic.rpc_target_batch_bytes if ic is not None else None
+    background_compaction = ic.delta_background_compaction if ic is not None else False
+    columnar = ic.columnar_ingest if ic is not None else False
 
     export_delta(
         currency=currency,
@@ -464,6 +470,12 @@ def _run_new_ingest(
         previous_day=previous_day,
         info=info,
         source_max_workers=source_max_workers,
+        pipeline_depth=pipeline_depth,
+        source_parallelism=source_parallelism,
+        async_rpc=async_rpc,
+        rpc_target_batch_bytes=rpc_target_batch_bytes,
+        background_compaction=background_compaction,
+        columnar=columnar,
     )
 
 
@@ -0,0 +1,150 @@
+"""Columnar (Arrow) eth logs for delta-only ingest.
+
+With ``ingest_config.columnar_ingest`` the eth log table never exists as
+Python dicts:
+
+- source: the block receipt exporter gathers the logs of each RPC batch
+  column by column straight from the JSON (``rpc_eth.LogColumns``) and
+  :func:`logs_table` turns the chunk into one ``pyarrow.Table``;
+- transform: :func:`prepare_logs_arrow` derives the Delta ``log`` columns
+  with Arrow/numpy kernels (hex to bytes, renames, partition, topic0);
+- sink: ``DeltaTableWriter`` writes the table as it is.
+
+Logs are the largest eth table by row count. The other tables and networks
+stay row based: their transforms join receipts into transactions, do uint256
+arithmetic and rewrite nested inputs/outputs. Cassandra ingests rows, so the
+mode only applies when Delta is the only sink.
+"""
+
+from typing import Dict, List
+
+import numpy as np
+import pyarrow as pa
+
+from ..schema.resources.parquet.account import ACCOUNT_SCHEMA_RAW
+
+# Columns of rpc_eth.LogColumns, named like the fields of parse_log_json.
+RAW_LOG_SCHEMA = pa.schema(
+    [
+        ("log_index", pa.int64()),
+        ("transaction_hash", pa.string()),
+        ("transaction_index", pa.int64()),
+        ("block_hash", pa.string()),
+        ("block_number", pa.int64()),
+        ("address", pa.string()),
+        ("data", pa.string()),
+        ("topics", pa.list_(pa.string())),
+    ]
+)
+
+_HEX_DIGITS = np.full(256, 255, dtype=np.uint8)
+for _i, _c in enumerate(b"0123456789abcdef"):
+    _HEX_DIGITS[_c] = _i
+for _i, _c in enumerate(b"ABCDEF"):
+    _HEX_DIGITS[_c] = 10 + _i
+
+
+def logs_table(columns: Dict[str, List]) -> pa.Table:
+    """Raw log table (``RAW_LOG_SCHEMA``) of a chunk, ordered by block and
+    log index like the row exporter."""
+    table = pa.Table.from_pydict(
+        {name: columns[name] for name in RAW_LOG_SCHEMA.names}, schema=RAW_LOG_SCHEMA
+    )
+    return table.sort_by([("block_number", "ascending"), ("log_index", "ascending")])
+
+
+def hex_to_binary(arr) -> pa.Array:
+    """Decode (``0x``-prefixed) hex strings to binary in one numpy pass over
+    the string buffer; ``"0x"`` becomes ``b""`` and nulls stay null."""
+    if isinstance(arr, pa.ChunkedArray):
+        arr = arr.combine_chunks()
+    n = len(arr)
+    _, offsets_buf, data_buf = arr.buffers()
+    offsets = np.frombuffer(offsets_buf, dtype=np.int32)[
+        arr.offset : arr.offset + n + 1
+    ]
+    offsets = offsets.astype(np.int64)
+    chars = (
+        np.frombuffer(data_buf, dtype=np.uint8)[offsets[0] : offsets[-1]]
+        if n and data_buf is not None
+        else np.zeros(0, dtype=np.uint8)
+    )
+    starts = offsets[:-1] - offsets[0]
+    lengths = np.diff(offsets)
+
+    prefixed = lengths >= 2
+    at = starts[prefixed]
+    prefixed[prefixed] = (chars[at] == ord("0")) & (chars[at + 1] == ord("x"))
+    digits = lengths - 2 * prefixed
+    if (digits % 2).any():
+        raise ValueError("Hex string of odd length")
+
+    keep = np.ones(len(chars), dtype=bool)
+    keep[starts[prefixed]] = False
+    keep[starts[prefixed] + 1] = False
+    nibbles = _HEX_DIGITS[chars[keep]]
+    if (nibbles == 255).any():
+        raise ValueError("Non-hex character in hex string")
+    out = (nibbles[0::2] << 4) | nibbles[1::2]
+
+    out_offsets = np.zeros(n + 1, dtype=np.int32)
+    np.cumsum(digits // 2, out=out_offsets[1:])
+    validity = None
+    if arr.null_count:
+        valid = arr.is_valid().to_numpy(zero_copy_only=False)
+        validity = pa.py_buffer(np.packbits(valid, bitorder="little"))
+    return pa.Array.from_buffers(
+        pa.binary(),
+        n,
+        [validity, pa.py_buffer(out_offsets), pa.py_buffer(out.tobytes())],
+        null_count=arr.null_count,
+    )
+
+
+def _fixed(arr: pa.Array, width: int) -> pa.Array:
+    return arr.cast(pa.binary(width))
+
+
+def prepare_logs_arrow(logs: pa.Table, partition_size: int) -> pa.Table:
+    """Columnar ``account.prepare_logs_inplace`` for the Delta ``log`` table:
+    same columns and values, in ``ACCOUNT_SCHEMA_RAW["log"]``."""
+    schema = ACCOUNT_SCHEMA_RAW["log"]
+    if logs.num_rows == 0:
+        return schema.empty_table()
+
+    block_id = logs.column("block_number").combine_chunks()
+    partition = pa.array(
+        block_id.to_numpy(zero_copy_only=False) // partition_size, pa.int32()
+    )
+
+    # null topics are empty list slots, i.e. no topics like in the row path
+    topics = logs.column("topics").combine_chunks()
+    topic_offsets = topics.offsets.to_numpy()
+    flat_topics = hex_to_binary(topics.values[topic_offsets[0] : topic_offsets[-1]])
+    # topic0 is the first topic, or b"" (the "0x" of the row path) without one
+    has_topic = np.diff(topic_offsets) > 0
+    if has_topic.any():
+        first = pa.array(topic_offsets[:-1] - topic_offsets[0], mask=~has_topic)
+        topic0 = flat_topics.take(first).fill_null(b"")
+    else:
+        topic0 = pa.array([b""] * len(topics), pa.binary())
+
+    columns = {
+        "partition": partition,
+        "block_id": block_id.cast(pa.int32()),
+        "block_hash": _fixed(hex_to_binary(logs.column("block_hash")), 32),
+        "address": _fixed(hex_to_binary(logs.column("address")), 20),
+        "data": hex_to_binary(logs.column("data")),
+        "topics": pa.ListArray.from_arrays(
+            pa.array(topic_offsets - topic_offsets[0], pa.int32()),
+            _fixed(flat_topics, 32),
+        ),
+        "topic0": topic0,
+        "tx_hash": _fixed(hex_to_binary(logs.column("transaction_hash")), 32),
+        "log_index": logs.column("log_index").cast(pa.int16()),
+        "transaction_index": logs.column("transaction_index").cast(pa.int32()),
+    }
+    table = pa.Table.from_pydict(
+        {name: columns[name] for name in schema.names}, schema=schema
+    )
+    return table.sort_by([("block_id", "ascending"), ("log_index", "ascending")])
@@ -122,6 +122,15 @@ class Source(ABC):
             f"{type(self).__name__} does not implement get_last_block_yesterday"
         )
 
+    def commit(self, end_block: int) -> None:
+        """Called once every sink committed the blocks up to ``end_block``;
+        sources that read ahead release state kept for a restart here."""
+        return None
+
+    def close(self) -> None:
+        """Called once after the run; releases connections held by the source."""
+        return None
+
     def validate_blockrange(
         self, start_block: int, end_block: int, backoff: int
     ) -> Tuple[int, int]:
@@ -197,6 +206,10 @@ class Sink(ABC):
         does not track resume state (or has no data yet)."""
         return None
 
+    def close(self) -> None:
+        """Called once after the run; stops background work of the sink."""
+        return None
+
     def discard_writes_after_highest_block(self) -> None:
         """Append-mode crash-recovery hook, called once before resuming.
 
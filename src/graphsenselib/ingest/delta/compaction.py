@@ -0,0 +1,249 @@
+"""Background compaction of the Delta tables written by ``DeltaDumpWriter``.
+
+Appending one file chunk at a time leaves one small parquet file per chunk
+and table, and every reader of the raw Delta tables pays for opening them.
+``DeltaCompactionScheduler`` runs next to the writer in the ingest process:
+
+* the writer reports the partition of every write (``notify`` only enqueues,
+  it never blocks on compaction);
+* once a newer partition is written, all older partitions of that table are
+  closed. Closed partitions holding at least ``min_small_files`` files below
+  ``small_file_bytes`` are compacted and Z-ordered on the table's
+  ``zorder_columns`` (block_id / tx_hash), one partition per commit;
+* every ``vacuum_every`` compactions of a table, files removed more than
+  ``vacuum_retention_hours`` ago are vacuumed. The retention must stay above
+  the duration of a single write: a vacuum sees the files of an uncommitted
+  append as unreferenced.
+
+The open partition is never touched, so compaction commits do not conflict
+with the writer's appends. A failed compaction is logged and retried when
+the next partition closes.
+"""
+
+import logging
+import queue
+import threading
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+)
+
+import pydantic
+
+try:
+    import pyarrow as pa
+except ImportError:  # no ingest dependencies, DeltaDumpWriter refuses to start
+    pass
+
+if TYPE_CHECKING:
+    from deltalake import DeltaTable
+
+logger = logging.getLogger(__name__)
+
+MB = 1024 * 1024
+SMALL_FILE_BYTES = 64 * MB
+
+
+class CompactionPolicy(pydantic.BaseModel):
+    small_file_bytes: int = SMALL_FILE_BYTES
+    min_small_files: int = 8
+    target_size: int = 512 * MB
+    max_concurrent_tasks: int = 4
+    zorder_columns: Sequence[str] = ("block_id", "tx_hash")
+    vacuum_every: int = 8
+    vacuum_retention_hours: int = 24
+
+
+class PartitionFileStats(NamedTuple):
+    files: int
+    bytes: int
+    small_files: int
+    small_bytes: int
+
+
+def partition_file_stats(
+    table: "DeltaTable", small_file_bytes: int = SMALL_FILE_BYTES
+) -> Dict[Optional[int], PartitionFileStats]:
+    """Number and size of the active files of ``table`` per partition (None
+    for unpartitioned tables), from the add actions of the current version."""
+    actions = pa.table(table.get_add_actions(flatten=True))
+    sizes = actions.column("size_bytes").to_pylist()
+    if "partition.partition" in actions.column_names:
+        partitions = [
+            None if p is None else int(p)
+            for p in actions.column("partition.partition").to_pylist()
+        ]
+    else:
+        partitions = [None] * len(sizes)
+
+    acc: Dict[Optional[int], List[int]] = {}
+    for partition, size in zip(partitions, sizes):
+        files, total, small, small_total = acc.setdefault(partition, [0, 0, 0, 0])
+        is_small = size < small_file_bytes
+        acc[partition] = [
+            files + 1,
+            total + size,
+            small + is_small,
+            small_total + (size if is_small else 0),
+        ]
+    return {p: PartitionFileStats(*v) for p, v in acc.items()}
+
+
+def table_file_stats(
+    table: "DeltaTable", small_file_bytes: int = SMALL_FILE_BYTES
+) -> PartitionFileStats:
+    """Totals of :func:`partition_file_stats` over all partitions."""
+    stats = partition_file_stats(table, small_file_bytes).values()
+    if not stats:
+        return PartitionFileStats(0, 0, 0, 0)
+    return PartitionFileStats(*map(sum, zip(*stats)))
+
+
+_STOP = object()
+
+
+class DeltaCompactionScheduler:
+    """Compacts closed partitions of the tables in ``zorder_columns`` (table
+    name -> columns to Z-order on) on a background thread.
+
+    ``open_table`` returns a fresh ``DeltaTable`` for a table name; it is
+    only called on the scheduler thread."""
+
+    def __init__(
+        self,
+        open_table: Callable[[str], "DeltaTable"],
+        zorder_columns: Dict[str, List[str]],
+        policy: Optional[CompactionPolicy] = None,
+        writer_properties=None,
+    ) -> None:
+        self.open_table = open_table
+        self.zorder_columns = zorder_columns
+        self.policy = policy or CompactionPolicy()
+        self.writer_properties = writer_properties
+        self._queue: "queue.Queue" = queue.Queue()
+        self._open_partition: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, int]] = {
+            name: {
+                "files": 0,
+                "bytes": 0,
+                "small_files": 0,
+                "compactions": 0,
+                "files_removed": 0,
+                "files_added": 0,
+                "files_vacuumed": 0,
+                "errors": 0,
+            }
+            for name in zorder_columns
+        }
+        self._thread = threading.Thread(
+            target=self._run, name="delta-compaction", daemon=True
+        )
+        self._thread.start()
+
+    def notify(self, table_name: str, partition: int) -> None:
+        """``table_name`` was written in ``partition``; never blocks."""
+        if table_name not in self.zorder_columns:
+            return
+        previous = self._open_partition.get(table_name)
+        if previous is not None and partition <= previous:
+            return
+        # the first write of a run also closes what earlier runs left behind
+        self._open_partition[table_name] = partition
+        self._queue.put((table_name, partition))
+
+    def join(self) -> None:
+        """Block until every compaction queued so far has run."""
+        self._queue.join()
+
+    def close(self) -> None:
+        """Finish the running compaction and stop the thread. Queued ones are
+        dropped; the next run picks their partitions up on its first write."""
+        while True:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                break
+            self._queue.task_done()
+        self._queue.put(_STOP)
+        self._thread.join()
+        for table_name, stats in self.stats().items():
+            logger.info(f"Delta compaction stats for {table_name}: {stats}")
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Per table: active files / bytes / small files as of the last scan
+        and counters of the compactions, vacuums and failures so far."""
+        with self._lock:
+            return {name: dict(stats) for name, stats in self._stats.items()}
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                self._queue.task_done()
+                return
+            table_name, open_partition = item
+            try:
+                self.compact_closed_partitions(table_name, open_partition)
+            except Exception as e:
+                with self._lock:
+                    self._stats[table_name]["errors"] += 1
+                logger.warning(
+                    f"Background compaction of {table_name} failed, "
+                    f"retrying once the next partition closes: {e}"
+                )
+            finally:
+                self._queue.task_done()
+
+    def compact_closed_partitions(self, table_name: str, open_partition: int) -> None:
+        policy = self.policy
+        table = self.open_table(table_name)
+        per_partition = partition_file_stats(table, policy.small_file_bytes)
+        candidates = sorted(
+            p
+            for p, s in per_partition.items()
+            if p is not None
+            and p < open_partition
+            and s.files > 1
+            and s.small_files >= policy.min_small_files
+        )
+        for partition in candidates:
+            metrics = table.optimize.z_order(
+                self.zorder_columns[table_name],
+                partition_filters=[("partition", "=", str(partition))],
+                target_size=policy.target_size,
+                max_concurrent_tasks=policy.max_concurrent_tasks,
+                writer_properties=self.writer_properties,
+            )
+            logger.info(
+                f"Compacted {table_name} partition {partition}: "
+                f"{metrics['numFilesRemoved']} -> {metrics['numFilesAdded']} files"
+            )
+            with self._lock:
+                stats = self._stats[table_name]
+                stats["compactions"] += 1
+                stats["files_removed"] += metrics["numFilesRemoved"]
+                stats["files_added"] += metrics["numFilesAdded"]
+                vacuum = (
+                    policy.vacuum_every > 0
+                    and stats["compactions"] % policy.vacuum_every == 0
+                )
+            if vacuum:
+                vacuumed = table.vacuum(
+                    retention_hours=policy.vacuum_retention_hours,
+                    enforce_retention_duration=False,
+                    dry_run=False,
+                )
+                with self._lock:
+                    self._stats[table_name]["files_vacuumed"] += len(vacuumed)
+
+        totals = table_file_stats(table, policy.small_file_bytes)
+        with self._lock:
+            self._stats[table_name].update(
+                files=totals.files, bytes=totals.bytes, small_files=totals.small_files
+            )
@@ -2,7 +2,7 @@ import logging
 import os
 import time
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Optional, cast
 
 try:
     import deltalake as dl
@@ -35,6 +35,7 @@ from ...schema.resources.parquet.account_trx import (
 from ...schema.resources.parquet.utxo import UTXO_SCHEMA_RAW
 from ..common import BlockRangeContent, Sink
 from ..transform import _finalize_inplace
+from .compaction import CompactionPolicy, DeltaCompactionScheduler
 
 logger = logging.getLogger(__name__)
 
@@ -194,10 +195,12 @@ class DeltaTableWriter:
             raise ValueError(f"Invalid mode: {mode}")
 
         self.current_partition = -1
+        # partition of the last append / overwrite, None before the first
+        self.last_partition = None
 
     def write_delta(
         self,
-        data: List[dict],
+        data: "List[dict] | pa.Table",
     ) -> None:
         time_write_start = time.time()
         logger.debug(f"Writing table {self.table_name}")
@@ -213,16 +216,20 @@ class DeltaTableWriter:
         else:
             Path(table_path).mkdir(parents=True, exist_ok=True)
 
-        fields_in_data = [list(d.keys()) for d in data]
-        unique_fields = {item for sublist in fields_in_data for item in sublist}
-        table = pa.Table.from_pylist(mapping=data, schema=self.schema)
-
-        fields_not_covered = unique_fields - set(table.column_names)
-        if fields_not_covered:
-            logger.debug(
-                f"Fields {fields_not_covered} in table {self.table_name}"
-                f" not covered by schema (ignored)."
-            )
+        if isinstance(data, pa.Table):
+            # columnar ingest, already in the table schema
+            table = data.select(self.schema.names).cast(self.schema)
+        else:
+            fields_in_data = [list(d.keys()) for d in data]
+            unique_fields = {item for sublist in fields_in_data for item in sublist}
+            table = pa.Table.from_pylist(mapping=data, schema=self.schema)
+
+            fields_not_covered = unique_fields - set(table.column_names)
+            if fields_not_covered:
+                logger.debug(
+                    f"Fields {fields_not_covered} in table {self.table_name}"
+                    f" not covered by schema (ignored)."
+                )
 
         if self.s3_credentials:
             storage_options = {
@@ -308,6 +315,7 @@ class DeltaTableWriter:
                         fraction /= 2
                     else:
                         raise e
+            self.last_partition = partition
 
             logger.debug(
                 f"Writing {len(table)} records in mode {self.mode} "
@@ -475,6 +483,7 @@ class DeltaDumpWriter(Sink):
         s3_credentials: Optional[dict] = None,
         write_mode: str = "overwrite",
         finalize_int_cols: Optional[dict] = None,
+        compaction_policy: Optional[CompactionPolicy] = None,
     ) -> None:
         if not _has_ingest_dependencies:
             raise ImportError(
@@ -497,6 +506,43 @@ class DeltaDumpWriter(Sink):
             table_config.table_name: self.create_table_writer(table_config)
             for table_config in self.db_write_config.table_configs
         }
+        self.compaction = (
+            self.create_compaction_scheduler(compaction_policy)
+            if compaction_policy is not None
+            else None
+        )
+
+    def create_compaction_scheduler(
+        self, policy: CompactionPolicy
+    ) -> DeltaCompactionScheduler:
+        if self.s3_credentials:
+            storage_options = {
+                "AWS_ALLOW_HTTP": "true",
+                "AWS_S3_ALLOW_UNSAFE_RENAME": "false",
+                "AWS_CONDITIONAL_PUT": "etag",
+                "AWS_EC2_METADATA_DISABLED": "true",
+                "timeout": "300s",
+            }
+            storage_options.update(self.s3_credentials)
+        else:
+            storage_options = {}
+
+        def open_table(table_name: str) -> "DeltaTable":
+            return DeltaTable(
+                f"{self.directory}/{table_name}", storage_options=storage_options
+            )
+
+        zorder_columns = {}
+        for cfg in self.db_write_config.table_configs:
+            if cfg.blockindep or not cfg.partition_cols:
+                continue
+            schema = cast("pa.Schema", cfg.table_schema)
+            columns = [c for c in policy.zorder_columns if c in schema.names]
+            if columns:
+                zorder_columns[cfg.table_name] = columns
+        return DeltaCompactionScheduler(
+            open_table, zorder_columns, policy, writer_properties=_WRITER_PROPERTIES
+        )
 
     def create_table_writer(self, table_config: TableWriteConfig):
         if table_config.blockindep:
@@ -513,9 +559,15 @@ class DeltaDumpWriter(Sink):
             s3_credentials=self.s3_credentials,
         )
 
-    def write_table(self, table_name: str, rows: List[dict]):
+    def write_table(self, table_name: str, rows: "List[dict] | pa.Table"):
         writer = self.writers[table_name]
         writer.write_delta(rows)
+        if self.compaction is not None and writer.last_partition is not None:
+            self.compaction.notify(table_name, writer.last_partition)
+
+    def close(self) -> None:
+        if self.compaction is not None:
+            self.compaction.close()
 
     def lock_name(self) -> str:
         return self._lock_name
@@ -527,6 +579,10 @@ class DeltaDumpWriter(Sink):
             # Skip Cassandra-only tables that have no delta writer
             if table_name not in self.writers:
                 continue
+            if isinstance(rows, pa.Table):
+                # columnar ingest: final Delta columns already
+                self.write_table(table_name, rows)
+                continue
             # Shallow copy to avoid mutating shared data
             rows = [dict(r) for r in rows]
             int_cols = self.finalize_int_cols.get(table_name, [])
@@ -611,7 +667,11 @@ FINALIZE_INT_COLS_MAP = {
 class DeltaDumpSinkFactory:  # todo could be a function
     @staticmethod
     def create_writer(
-        network: str, s3_credentials: Optional[dict], write_mode: str, directory: str
+        network: str,
+        s3_credentials: Optional[dict],
+        write_mode: str,
+        directory: str,
+        compaction_policy: Optional[CompactionPolicy] = None,
     ) -> DeltaDumpWriter:
         db_write_config = CONFIG_MAP.get(network)
         if not db_write_config:
@@ -626,4 +686,5 @@ class DeltaDumpSinkFactory:  # todo could be a function
             write_mode=write_mode,
             directory=directory,
             finalize_int_cols=finalize_int_cols,
+            compaction_policy=compaction_policy,
         )
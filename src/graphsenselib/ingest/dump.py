@@ -18,9 +18,15 @@ from graphsenselib.ingest.utxo import (
     ingest_summary_statistics_cassandra as ingest_summary_statistics_cassandra_utxo,
 )
 from graphsenselib.ingest.cassandra.sink import CassandraSink
+from graphsenselib.ingest.delta.compaction import CompactionPolicy
 from graphsenselib.ingest.delta.sink import DeltaDumpSinkFactory
 from graphsenselib.ingest.ingestrunner import IngestRunner
 from graphsenselib.ingest.source import SourceETH, SourceTRX, SourceUTXO
+from graphsenselib.ingest.utxo_output_store import (
+    DiskOutputStore,
+    create_output_store,
+    seed_output_store_from_delta,
+)
 from graphsenselib.ingest.transform import (
     TransformerETH,
     TransformerTRX,
@@ -33,6 +39,7 @@ from ..config import get_reorg_backoff_blocks
 from ..config.config import get_config
 
 _DEFAULT_VERBOSITY = {"btc": 3, "bch": 3, "ltc": 2, "zec": 2}
+UTXO_CURRENCIES = ("btc", "ltc", "bch", "zec")
 
 
 class NothingToIngestError(SystemExit):
@@ -53,6 +60,8 @@ def _create_trx(
     provider_timeout,
     partition_batch_size,
     source_max_workers=None,
+    async_rpc=False,
+    rpc_target_batch_bytes=None,
     **kw,
 ):
     source = SourceTRX(
@@ -60,20 +69,32 @@ def _create_trx(
         grpc_provider_uri=grpc_provider_uri,
         provider_timeout=provider_timeout,
         max_workers=source_max_workers,
+        async_rpc=async_rpc,
+        target_batch_bytes=rpc_target_batch_bytes,
     )
     transformer = TransformerTRX(partition_batch_size, "trx")
     return source, transformer
 
 
 def _create_eth(
-    provider_uri, provider_timeout, partition_batch_size, source_max_workers=None, **kw
+    provider_uri,
+    provider_timeout,
+    partition_batch_size,
+    source_max_workers=None,
+    async_rpc=False,
+    rpc_target_batch_bytes=None,
+    columnar=False,
+    **kw,
 ):
     source = SourceETH(
         provider_uri=provider_uri,
         provider_timeout=provider_timeout,
         max_workers=source_max_workers,
+        async_rpc=async_rpc,
+        target_batch_bytes=rpc_target_batch_bytes,
+        columnar_logs=columnar,
     )
-    transformer = TransformerETH(partition_batch_size, "eth")
+    transformer = TransformerETH(partition_batch_size, "eth", columnar=columnar)
     return source, transformer
 
 
@@ -84,6 +105,7 @@ def _create_utxo(
     currency,
     db,
     source_max_workers=None,
+    async_rpc=False,
     **kw,
 ):
     config = get_config()
@@ -95,6 +117,15 @@ def _create_utxo(
     fail_on_unresolved_inputs = (
         config.fail_on_unresolved_inputs and not config.fill_unresolved_inputs
     )
+    # The output store is only consulted when the source resolves inputs
+    # itself (verbosity < 3); don't create a file nobody reads.
+    output_store = None
+    if resolve_inputs and verbosity < 3:
+        output_store = create_output_store(
+            currency,
+            store_dir=config.utxo_output_store_dir,
+            hot_entries=config.utxo_output_store_hot_txs,
+        )
 
     source = SourceUTXO(
         provider_uri=provider_uri,
@@ -104,6 +135,8 @@ def _create_utxo(
         resolve_inputs=resolve_inputs,
         max_workers=source_max_workers,
         fail_on_unresolved_inputs=fail_on_unresolved_inputs,
+        output_store=output_store,
+        async_rpc=async_rpc,
     )
     transformer = TransformerUTXO(
         partition_batch_size,
@@ -147,6 +180,34 @@ PARTITIONSIZES = {
 }
 
 
+def _seed_output_store(
+    source, directory, start_block, partition_batch_size, s3_credentials
+):
+    """Fill an empty on-disk UTXO output store from delta before resuming.
+
+    Only runs when enabled via ``utxo_output_store_seed_from_delta``; without
+    it a resumed verbosity-2 ingest resolves every pre-existing output via
+    getrawtransaction until the store has warmed up.
+    """
+    if start_block == 0 or not get_config().utxo_output_store_seed_from_delta:
+        return
+    exporter = getattr(source, "fast_exporter", None)
+    store = exporter.output_store if exporter is not None else None
+    if not isinstance(store, DiskOutputStore) or len(store) > 0:
+        return
+    logger.info(
+        f"Seeding empty output store {store.path} from delta "
+        f"up to block {start_block - 1:,}"
+    )
+    seed_output_store_from_delta(
+        store,
+        directory,
+        start_block - 1,
+        partition_batch_size,
+        s3_credentials=s3_credentials,
+    )
+
+
 def _diverged_sinks(sink_heights):
     """Return (target, laggards) when registered sinks disagree, else (None, []).
 
@@ -254,7 +315,12 @@ def _catch_up_diverged_sinks(
         logger.warning(
             f"Catching up {sink.name}: blocks {h_plus:,}–{target:,} ({gap:,} blocks)"
         )
-        catchup = IngestRunner(runner.partition_batch_size, runner.file_batch_size)
+        catchup = IngestRunner(
+            runner.partition_batch_size,
+            runner.file_batch_size,
+            pipeline_depth=runner.pipeline_depth,
+            source_parallelism=runner.source_parallelism,
+        )
         catchup.addSource(source)
         catchup.addTransformer(transformer)
         catchup.addSink(sink)
@@ -289,6 +355,12 @@ def export_delta(
     info: bool = False,
     file_batch_size: Optional[int] = None,
     source_max_workers: Optional[int] = None,
+    pipeline_depth: int = 2,
+    source_parallelism: int = 1,
+    async_rpc: bool = False,
+    rpc_target_batch_bytes: Optional[int] = None,
+    background_compaction: bool = False,
+    columnar: bool = False,
 ):
     if currency not in PIPELINE_REGISTRY:
         raise ValueError(f"{currency} not supported by ingest module")
@@ -319,7 +391,26 @@ def export_delta(
     provider_uri = first_or_default(sources, lambda x: x.startswith("http"))
     grpc_provider_uri = first_or_default(sources, lambda x: x.startswith("grpc"))
 
-    runner = IngestRunner(partition_batch_size, file_batch_size)
+    if currency in UTXO_CURRENCIES and source_parallelism > 1:
+        # Input resolution of chunk N depends on the outputs of chunks < N.
+        logger.info(
+            f"Ignoring source_parallelism={source_parallelism} for {currency}; "
+            "UTXO sources read one chunk at a time."
+        )
+        source_parallelism = 1
+    if columnar and (currency != "eth" or db is not None):
+        # Arrow tables only reach the Delta sink; Cassandra ingests rows.
+        logger.info(
+            f"Ignoring columnar_ingest for {currency}; it only applies to eth "
+            "ingests into Delta alone."
+        )
+        columnar = False
+    runner = IngestRunner(
+        partition_batch_size,
+        file_batch_size,
+        pipeline_depth=pipeline_depth,
+        source_parallelism=source_parallelism,
+    )
 
     factory = PIPELINE_REGISTRY[currency]
     source, transformer = factory(
@@ -330,6 +421,9 @@ def export_delta(
         currency=currency,
         db=db,
         source_max_workers=source_max_workers,
+        async_rpc=async_rpc,
+        rpc_target_batch_bytes=rpc_target_batch_bytes,
+        columnar=columnar,
     )
 
     runner.addSource(source)
@@ -339,7 +433,11 @@ def export_delta(
     delta_sink = None
     if directory is not None:
         delta_sink = DeltaDumpSinkFactory.create_writer(
-            currency, s3_credentials, write_mode, directory
+            currency,
+            s3_credentials,
+            write_mode,
+            directory,
+            compaction_policy=CompactionPolicy() if background_compaction else None,
         )
         runner.addSink(delta_sink)
 
@@ -354,6 +452,13 @@ def export_delta(
             name = sink.lock_name()
             if name is not None:
                 lock_stack.enter_context(create_lock(name, disabled=lock_disabled))
+        # Release the source's connections (RPC event loop, gRPC channel) on
+        # every exit path, including --info and nothing-to-ingest.
+        lock_stack.callback(source.close)
+        # closed before the locks are released, so a background compaction
+        # is finished while the ingest still holds the table
+        for sink in runner.sinks:
+            lock_stack.callback(sink.close)
 
         backoff = get_reorg_backoff_blocks(currency)
 
@@ -450,14 +555,16 @@ def export_delta(
         logger.info(
             f"Partition batch size: {partition_batch_size}, "
             f"file batch size: {file_batch_size}, "
-            f"source_max_workers: {source_max_workers or 10}"
+            f"source_max_workers: {source_max_workers or 10}, "
+            f"pipeline_depth: {runner.pipeline_depth}, "
+            f"source_parallelism: {runner.source_parallelism}"
         )
 
         # Pre-write UTXO configuration so TransformerUTXO can read bucket
         # sizes from the configuration table during the first-ever ingest.
         # The configuration contains only constants (bucket sizes), so
         # writing before and after is idempotent and safe.
-        if db is not None and currency in ["btc", "ltc", "bch", "zec"]:
+        if db is not None and currency in UTXO_CURRENCIES:
             ingest_configuration_cassandra_utxo(
                 db,
                 UTXO_BLOCK_BUCKET_SIZE,
@@ -465,11 +572,12 @@ def export_delta(
                 UTXO_TX_BUCKET_SIZE,
             )
 
-        actual_last_block = runner.run(start_block, end_block)
+        if directory is not None and currency in UTXO_CURRENCIES:
+            _seed_output_store(
+                source, directory, start_block, partition_batch_size, s3_credentials
+            )
 
-        # Close source to release any held resources (e.g., gRPC channels)
-        if hasattr(source, "close"):
-            source.close()
+        actual_last_block = runner.run(start_block, end_block)
 
         # Write/update Cassandra configuration and summary statistics AFTER
         # data so that stats reflect the actual ingested range.
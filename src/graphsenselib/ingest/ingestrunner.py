@@ -1,4 +1,9 @@
+import queue
+import threading
+import time
+from collections import deque
 from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime
 
 from graphsenselib.ingest.common import Sink, Source, Transformer
@@ -18,15 +23,79 @@ AVG_BLOCKTIME = {
     "bch": 10 * 60,
 }
 
+# How often blocked queue operations re-check the stop flag.
+_QUEUE_POLL_S = 0.2
+
+_END = object()
+
+
+class _StageError:
+    def __init__(self, exc: BaseException):
+        self.exc = exc
+
+
+@dataclass
+class StageStats:
+    """Per-stage counters of the ingest pipeline.
+
+    ``busy_s`` is time spent doing work, ``wait_in_s`` time blocked waiting
+    for input from the upstream stage (starved), ``wait_out_s`` time blocked
+    on a full downstream queue (backpressure).
+    """
+
+    name: str
+    items: int = 0
+    blocks: int = 0
+    busy_s: float = 0.0
+    wait_in_s: float = 0.0
+    wait_out_s: float = 0.0
+
+    def summary(self) -> str:
+        blks_per_s = f"{self.blocks / self.busy_s:.1f}" if self.busy_s > 0 else "inf"
+        return (
+            f"{self.name}: {self.items} chunks busy={self.busy_s:.1f}s "
+            f"({blks_per_s} blks/s) wait_in={self.wait_in_s:.1f}s "
+            f"wait_out={self.wait_out_s:.1f}s"
+        )
+
 
 class IngestRunner:
-    def __init__(self, partition_batch_size: int, file_batch_size: int):
+    """Reads, transforms and writes a block range chunk by chunk.
+
+    ``run`` is a three-stage pipeline connected by bounded queues:
+
+    1. source: reads file chunks in block order, ``source_parallelism`` reads
+       in flight (keep 1 for stateful sources such as UTXO, whose input
+       resolution depends on earlier chunks).
+    2. transform: applies the transformers in block order on one thread
+       (UTXO transformers allocate tx ids sequentially).
+    3. write: the main thread hands each chunk to all sinks concurrently and
+       waits until every sink committed it before dispatching the next one.
+
+    ``pipeline_depth`` bounds each queue, so at most ``2 * pipeline_depth``
+    chunks are held in memory ahead of the writers and a slow sink throttles
+    the source (backpressure). Writing one chunk at a time keeps the sinks at
+    most one chunk apart, so the per-sink commit tracking and the ctrl-c
+    semantics (stop at a chunk boundary committed to every sink) are the same
+    as for a serial run.
+    """
+
+    def __init__(
+        self,
+        partition_batch_size: int,
+        file_batch_size: int,
+        pipeline_depth: int = 2,
+        source_parallelism: int = 1,
+    ):
         self.source = None
         self.transformers = []
         self.sinks = []
         self.partition_batch_size = partition_batch_size
         self.file_batch_size = file_batch_size
+        self.pipeline_depth = max(1, pipeline_depth)
+        self.source_parallelism = max(1, source_parallelism)
         self._sink_last_block: dict[str, int] = {}
+        self.stage_stats: dict[str, StageStats] = {}
 
     def addSource(self, source: Source):
         self.source = source
@@ -52,6 +121,7 @@ class IngestRunner:
         for sink in self.sinks:
             sink.write(data)
             logger.debug("Wrote to a sink")
+        source.commit(end_block)
 
         return data
 
@@ -68,128 +138,266 @@ class IngestRunner:
 
         return data
 
-    def _transform_and_write(self, data, file_chunk):
-        """Apply transformers and write to sinks.
+    def _transform(self, data):
+        for transformer in self.transformers:
+            data = transformer.transform(data)
+        return data
+
+    def _write_to_sinks(self, data, file_chunk, executor=None):
+        """Write one chunk to all sinks, concurrently if an executor is given.
 
         Tracks which sinks succeeded per chunk. If a sink fails, reports
         which sinks already committed so operators can diagnose inconsistencies.
         """
-        for transformer in self.transformers:
-            data = transformer.transform(data)
+        sink_stats = self.stage_stats.setdefault("sinks", StageStats("sinks"))
+        t0 = time.monotonic()
+        sink_names = [type(sink).__name__ for sink in self.sinks]
+        if executor is None or len(self.sinks) < 2:
+            outcomes = []
+            for sink in self.sinks:
+                try:
+                    sink.write(data)
+                except Exception as e:
+                    outcomes.append(e)
+                    break
+                outcomes.append(None)
+        else:
+            futures = [executor.submit(sink.write, data) for sink in self.sinks]
+            outcomes = [f.exception() for f in futures]
 
         committed_sinks = []
-        for sink in self.sinks:
-            sink_name = type(sink).__name__
-            try:
-                sink.write(data)
-            except Exception:
-                if committed_sinks:
-                    logger.error(
-                        f"Sink {sink_name} failed for blocks "
-                        f"{file_chunk[0]:,}–{file_chunk[1]:,}. "
-                        f"Already committed to: {committed_sinks}. "
-                        f"Per-sink state: {self._sink_last_block}"
-                    )
-                raise
-            committed_sinks.append(sink_name)
-            self._sink_last_block[sink_name] = file_chunk[1]
+        error = None
+        for sink_name, outcome in zip(sink_names, outcomes):
+            if outcome is None:
+                committed_sinks.append(sink_name)
+                self._sink_last_block[sink_name] = file_chunk[1]
+            elif error is None:
+                error = (sink_name, outcome)
+        sink_stats.items += 1
+        sink_stats.blocks += file_chunk[1] - file_chunk[0] + 1
+        sink_stats.busy_s += time.monotonic() - t0
+
+        if error is not None:
+            sink_name, exc = error
+            if committed_sinks:
+                logger.error(
+                    f"Sink {sink_name} failed for blocks "
+                    f"{file_chunk[0]:,}–{file_chunk[1]:,}. "
+                    f"Already committed to: {committed_sinks}. "
+                    f"Per-sink state: {self._sink_last_block}"
+                )
+            raise exc
 
         return data
 
+    def _transform_and_write(self, data, file_chunk):
+        """Apply transformers and write to sinks (serial path)."""
+        return self._write_to_sinks(self._transform(data), file_chunk)
+
+    def _put(self, q, item, stop, stats):
+        t0 = time.monotonic()
+        while not stop.is_set():
+            try:
+                q.put(item, timeout=_QUEUE_POLL_S)
+                break
+            except queue.Full:
+                continue
+        stats.wait_out_s += time.monotonic() - t0
+        return not stop.is_set()
+
+    def _get(self, q, stop, stats):
+        t0 = time.monotonic()
+        while True:
+            try:
+                item = q.get(timeout=_QUEUE_POLL_S)
+                break
+            except queue.Empty:
+                if stop.is_set():
+                    item = _END
+                    break
+        stats.wait_in_s += time.monotonic() - t0
+        return item
+
+    def _source_stage(self, file_chunks, out_q, stop):
+        """Read chunks in order, keeping ``source_parallelism`` reads in flight."""
+        stats = self.stage_stats["source"]
+        source = self.source
+        assert source is not None
+        try:
+            with ThreadPoolExecutor(
+                max_workers=self.source_parallelism,
+                thread_name_prefix="ingest-source",
+            ) as executor:
+                pending = deque()
+                chunks = iter(file_chunks)
+                while not stop.is_set():
+                    while len(pending) < self.source_parallelism:
+                        chunk = next(chunks, None)
+                        if chunk is None:
+                            break
+                        pending.append(
+                            (
+                                chunk,
+                                time.monotonic(),
+                                executor.submit(
+                                    source.read_blockrange, chunk[0], chunk[1]
+                                ),
+                            )
+                        )
+                    if not pending:
+                        break
+                    chunk, t_submit, future = pending.popleft()
+                    data = future.result()
+                    stats.items += 1
+                    stats.blocks += chunk[1] - chunk[0] + 1
+                    stats.busy_s += time.monotonic() - t_submit
+                    if not self._put(out_q, (chunk, data), stop, stats):
+                        break
+                for _, _, future in pending:
+                    future.cancel()
+        except BaseException as e:
+            self._put(out_q, _StageError(e), stop, stats)
+            return
+        self._put(out_q, _END, stop, stats)
+
+    def _transform_stage(self, in_q, out_q, stop):
+        stats = self.stage_stats["transform"]
+        try:
+            while True:
+                item = self._get(in_q, stop, stats)
+                if item is _END or isinstance(item, _StageError):
+                    self._put(out_q, item, stop, stats)
+                    return
+                chunk, data = item
+                t0 = time.monotonic()
+                data = self._transform(data)
+                stats.items += 1
+                stats.blocks += chunk[1] - chunk[0] + 1
+                stats.busy_s += time.monotonic() - t0
+                if not self._put(out_q, (chunk, data), stop, stats):
+                    return
+        except BaseException as e:
+            self._put(out_q, _StageError(e), stop, stats)
+
+    def _log_stage_stats(self):
+        logger.info(
+            "[pipeline] "
+            + "  |  ".join(stats.summary() for stats in self.stage_stats.values())
+        )
+
     def run(self, start_block, end_block):
         assert self.source is not None
-        source = self.source
-        partitions = split_blockrange(
-            (start_block, end_block), self.partition_batch_size
+        partitions = list(
+            split_blockrange((start_block, end_block), self.partition_batch_size)
         )
+        # Chunks never straddle a partition, so the last chunk of each
+        # partition marks where "Processed partition" is logged.
+        file_chunks = []
+        partition_ends = {}
+        for partition in partitions:
+            chunks = list(split_blockrange(partition, self.file_batch_size))
+            file_chunks.extend(chunks)
+            partition_ends[chunks[-1]] = partition
         avg_blocktime = AVG_BLOCKTIME[self.transformers[0].network]
 
         last_block_id = start_block
         last_block_date = None
 
-        with graceful_ctlc_shutdown() as check_shutdown_initialized:
-            stop_requested = False
-            for partition in partitions:
-                file_chunks = list(split_blockrange(partition, self.file_batch_size))
-
-                # Prefetch: overlap source read of chunk N+1 with
-                # transform+write of chunk N. Source reads are thread-safe
-                # (HTTP clients use thread-local sessions, gRPC uses
-                # multiplexed channels).
-                with ThreadPoolExecutor(max_workers=1) as prefetch_executor:
-                    prefetch_future = None
-
-                    for i, file_chunk in enumerate(file_chunks):
-                        start_chunk_time = datetime.now()
-
-                        # Get data: from prefetch or read synchronously
-                        if prefetch_future is not None:
-                            data = prefetch_future.result()
-                        else:
-                            data = source.read_blockrange(file_chunk[0], file_chunk[1])
-
-                        # Start prefetching next chunk while we
-                        # transform + write the current one
-                        if i + 1 < len(file_chunks):
-                            next_chunk = file_chunks[i + 1]
-                            prefetch_future = prefetch_executor.submit(
-                                source.read_blockrange,
-                                next_chunk[0],
-                                next_chunk[1],
-                            )
-                        else:
-                            prefetch_future = None
-
-                        # Transform + write current chunk
-                        data = self._transform_and_write(data, file_chunk)
-
-                        blocks = data.table_contents["block"]
-                        last_block = sorted(blocks, key=lambda x: x["block_id"])[-1]
-                        last_block_id = last_block["block_id"]
-                        last_block_ts = last_block["timestamp"]
-                        last_block_date = parse_timestamp(last_block_ts)
+        self.stage_stats = {
+            name: StageStats(name) for name in ("source", "transform", "sinks")
+        }
+        stop = threading.Event()
+        read_q = queue.Queue(maxsize=self.pipeline_depth)
+        transformed_q = queue.Queue(maxsize=self.pipeline_depth)
+        # Source reads are thread-safe (HTTP clients use thread-local
+        # sessions, gRPC uses multiplexed channels).
+        stages = [
+            threading.Thread(
+                target=self._source_stage,
+                args=(file_chunks, read_q, stop),
+                name="ingest-source-stage",
+                daemon=True,
+            ),
+            threading.Thread(
+                target=self._transform_stage,
+                args=(read_q, transformed_q, stop),
+                name="ingest-transform-stage",
+                daemon=True,
+            ),
+        ]
+
+        with (
+            graceful_ctlc_shutdown() as check_shutdown_initialized,
+            ThreadPoolExecutor(
+                max_workers=max(1, len(self.sinks)), thread_name_prefix="ingest-sink"
+            ) as sink_executor,
+        ):
+            for stage in stages:
+                stage.start()
+            last_commit_time = datetime.now()
+            try:
+                while True:
+                    item = self._get(transformed_q, stop, self.stage_stats["sinks"])
+                    if item is _END:
+                        break
+                    if isinstance(item, _StageError):
+                        raise item.exc
+                    file_chunk, data = item
+
+                    data = self._write_to_sinks(data, file_chunk, sink_executor)
+                    self.source.commit(file_chunk[1])
+
+                    blocks = data.table_contents["block"]
+                    last_block = sorted(blocks, key=lambda x: x["block_id"])[-1]
+                    last_block_id = last_block["block_id"]
+                    last_block_ts = last_block["timestamp"]
+                    last_block_date = parse_timestamp(last_block_ts)
+
+                    # Throughput of the whole pipeline: time since the
+                    # previous chunk was committed, not just the write.
+                    now = datetime.now()
+                    speed = (file_chunk[1] - file_chunk[0] + 1) / max(
+                        (now - last_commit_time).total_seconds(), 1e-6
+                    )
+                    last_commit_time = now
 
-                        speed = (file_chunk[1] - file_chunk[0] + 1) / (
-                            datetime.now() - start_chunk_time
-                        ).total_seconds()
+                    network_s_per_ingest_s = speed * avg_blocktime
 
-                        network_s_per_ingest_s = speed * avg_blocktime
+                    logger.info(
+                        f"Written blocks: {file_chunk[0]:,} - {file_chunk[1]:,} "
+                        f"""[{
+                            last_block_date.strftime(GRAPHSENSE_DEFAULT_DATETIME_FORMAT)
+                        }] """
+                        f"({speed:.1f} blks/s) ({network_s_per_ingest_s:.1f} "
+                        f"network_s/s) "
+                    )
 
+                    partition = partition_ends.get(file_chunk)
+                    if partition is not None:
+                        partition_start = (
+                            partition[0] // self.partition_batch_size
+                        ) * self.partition_batch_size
                         logger.info(
-                            f"Written blocks: {file_chunk[0]:,} - {file_chunk[1]:,} "
-                            f"""[{
-                                last_block_date.strftime(
-                                    GRAPHSENSE_DEFAULT_DATETIME_FORMAT
-                                )
-                            }] """
-                            f"({speed:.1f} blks/s) ({network_s_per_ingest_s:.1f} "
-                            f"network_s/s) "
+                            f"Processed partition {partition_start:,} - "
+                            f"{partition[1]:,}"
                         )
-
-                        # Poll the shutdown flag per file-chunk, not just per
-                        # partition. Each chunk above is already durably
-                        # committed to the sinks, so breaking here is safe and
-                        # stays responsive even for large partitions (trx's are
-                        # 100k blocks = 100 chunks).
-                        if check_shutdown_initialized():
-                            logger.info(
-                                f"Got shutdown signal, stopping after block "
-                                f"{last_block_id:,}"
-                            )
-                            if prefetch_future is not None:
-                                prefetch_future.cancel()
-                            stop_requested = True
-                            break
-
-                if stop_requested:
-                    break
-
-                partition_start = (
-                    partition[0] // self.partition_batch_size
-                ) * self.partition_batch_size
-                logger.info(
-                    f"Processed partition {partition_start:,} - {partition[1]:,}"
-                )
+                        self._log_stage_stats()
+
+                    # Poll the shutdown flag per file-chunk. The chunk above
+                    # is already durably committed to every sink and the next
+                    # one has not been dispatched, so breaking here is safe.
+                    # Chunks still queued in the source/transform stages are
+                    # discarded.
+                    if check_shutdown_initialized():
+                        logger.info(
+                            f"Got shutdown signal, stopping after block "
+                            f"{last_block_id:,}"
+                        )
+                        break
+            finally:
+                stop.set()
+                for stage in stages:
+                    stage.join()
 
             if last_block_date is not None:
                 logger.info(
@@ -197,6 +405,7 @@ class IngestRunner:
                     f"{start_block:,} - {last_block_id:,} "
                     f" ({last_block_date.strftime(GRAPHSENSE_DEFAULT_DATETIME_FORMAT)})"
                 )
+                self._log_stage_stats()
             else:
                 logger.info("No blocks were processed.")
 
@@ -4,12 +4,16 @@ Replaces ethereum-etl's ExportBlocksJob and ExportReceiptsJob with direct
 batch JSON-RPC calls. Output dict format is identical to ethereum-etl's mappers.
 """
 
+import asyncio
+import concurrent.futures
 import logging
 import threading
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
+from typing import Any, List
 
+import httpx
 import orjson
 import requests
 
@@ -88,8 +92,23 @@ class BatchRpcClient:
 
     def make_batch_request(self, rpc_requests, max_retries=15):
         """POST a JSON-RPC batch and return list of responses."""
+        return self.make_batch_request_sized(rpc_requests, max_retries)[0]
+
+    def make_batch_request_sized(
+        self, rpc_requests, max_retries=15, max_size_errors=None
+    ):
+        """Like :meth:`make_batch_request`, also returning the response size.
+
+        With ``max_size_errors``, gives up once that many attempts failed for
+        size-related reasons (see :func:`_is_size_related_error`) so the
+        caller can split the batch; other errors keep the ``max_retries``
+        budget.
+
+        Returns (responses, response_bytes).
+        """
         session = self._get_session()
         last_error: Exception = Exception("no retries attempted")
+        size_errors = 0
         for attempt in range(max_retries):
             try:
                 response = session.post(
@@ -102,12 +121,16 @@ class BatchRpcClient:
                 result = orjson.loads(response.content)
                 if not isinstance(result, list):
                     result = [result]
-                return result
+                return result, len(response.content)
             except Exception as e:
                 last_error = e
                 if self._is_connection_error(e):
                     self._reset_session()
                     session = self._get_session()
+                if max_size_errors is not None and _is_size_related_error(e):
+                    size_errors += 1
+                    if size_errors >= max_size_errors:
+                        raise
                 if attempt < max_retries - 1:
                     wait = min(2**attempt, 30)
                     logger.warning(
@@ -161,6 +184,547 @@ class BatchRpcClient:
         result = self.make_request("eth_blockNumber", [])
         return int(result, 16)
 
+    def close(self):
+        """Close the calling thread's session (worker sessions die with their
+        threads)."""
+        self._reset_session()
+
+
+class AdaptiveConcurrencyLimit:
+    """AIMD limit on in-flight requests, driven by observed latency.
+
+    The baseline is a slowly rising minimum of recent latencies. While
+    responses come back within ``latency_tolerance`` times the baseline the
+    limit grows by one per round of requests (additive increase). Slower
+    responses shrink it by 10%, errors and timeouts halve it.
+    """
+
+    def __init__(self, initial=8, minimum=1, maximum=64, latency_tolerance=2.0):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.latency_tolerance = latency_tolerance
+        self.limit = float(min(max(initial, minimum), maximum))
+        self.in_flight = 0
+        self._baseline = None
+        self._cond = None
+
+    def _condition(self):
+        # Created lazily so it binds to the loop that uses it.
+        if self._cond is None:
+            self._cond = asyncio.Condition()
+        return self._cond
+
+    def detach(self):
+        """Drop the condition bound to a closed loop, and the requests that
+        were in flight on it, so the next loop gets a fresh one. The learned
+        limit and baseline are kept."""
+        self._cond = None
+        self.in_flight = 0
+
+    async def acquire(self):
+        cond = self._condition()
+        async with cond:
+            await cond.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+
+    async def release(self, latency, ok):
+        cond = self._condition()
+        async with cond:
+            self.in_flight -= 1
+            self._update(latency, ok)
+            cond.notify_all()
+
+    def _update(self, latency, ok):
+        if not ok:
+            self.limit = max(self.minimum, self.limit / 2)
+            return
+        if self._baseline is None:
+            self._baseline = latency
+        else:
+            self._baseline = min(latency, self._baseline * 1.05)
+        if latency > self._baseline * self.latency_tolerance:
+            self.limit = max(self.minimum, self.limit * 0.9)
+        else:
+            self.limit = min(self.maximum, self.limit + 1 / self.limit)
+
+
+class AsyncBatchRpcClient:
+    """JSON-RPC batch client running on one asyncio event loop.
+
+    Drop-in for :class:`BatchRpcClient` (same ``make_batch_request`` /
+    ``make_request`` and retry/backoff contract), but all requests share one
+    keep-alive httpx connection pool on a background event loop thread, and
+    the number of requests in flight adapts to node latency
+    (:class:`AdaptiveConcurrencyLimit`). Exporters detect it in
+    :func:`run_rpc_batches` and submit all batches at once instead of
+    spreading them over a ThreadPoolExecutor.
+    """
+
+    def __init__(self, provider_uri, timeout=600, max_in_flight=64):
+        self.provider_uri = provider_uri
+        self.timeout = timeout
+        self.limiter = AdaptiveConcurrencyLimit(maximum=max_in_flight)
+        self._max_connections = max_in_flight
+        self._client = None
+        self._loop = None
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def _get_loop(self):
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(
+                    target=loop.run_forever, name="async-rpc-loop", daemon=True
+                )
+                thread.start()
+                self._loop = loop
+                self._thread = thread
+            return self._loop
+
+    def _get_client(self):
+        # Only called on the loop thread.
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self._max_connections,
+                    max_keepalive_connections=self._max_connections,
+                ),
+                headers={"Content-Type": "application/json"},
+            )
+        return self._client
+
+    async def _reset_client(self, client=None):
+        """Close and discard the shared client.
+
+        With ``client``, only if it is still the current one: concurrent
+        requests failing on the same closed client then reset it once.
+        """
+        if client is not None and client is not self._client:
+            return
+        client, self._client = self._client, None
+        if client is not None:
+            try:
+                await client.aclose()
+            except Exception:
+                pass
+
+    async def _post(self, payload, label, max_retries):
+        return (await self._post_sized(payload, label, max_retries))[0]
+
+    async def _post_sized(self, payload, label, max_retries, max_size_errors=None):
+        body = orjson.dumps(payload)
+        last_error: Exception = Exception("no retries attempted")
+        size_errors = 0
+        for attempt in range(max_retries):
+            await self.limiter.acquire()
+            t0 = time.monotonic()
+            ok = False
+            client = self._get_client()
+            try:
+                response = await client.post(self.provider_uri, content=body)
+                response.raise_for_status()
+                result = orjson.loads(response.content)
+                ok = True
+                return result, len(response.content)
+            except Exception as e:
+                last_error = e
+                # The pool drops broken connections by itself; other requests
+                # are still in flight on this client, so it is only replaced
+                # once it can no longer send.
+                if client.is_closed:
+                    await self._reset_client(client)
+                if max_size_errors is not None and _is_size_related_error(e):
+                    size_errors += 1
+                    if size_errors >= max_size_errors:
+                        raise
+            finally:
+                await self.limiter.release(time.monotonic() - t0, ok)
+            if attempt < max_retries - 1:
+                wait = min(2**attempt, 30)
+                logger.warning(
+                    f"{label} retry {attempt + 1}/{max_retries}: {last_error}. "
+                    f"Waiting {wait}s."
+                )
+                await asyncio.sleep(wait)
+        raise last_error
+
+    async def batch_request(self, rpc_requests, max_retries=15):
+        """Coroutine version of :meth:`make_batch_request`."""
+        return (await self.batch_request_sized(rpc_requests, max_retries))[0]
+
+    async def batch_request_sized(
+        self, rpc_requests, max_retries=15, max_size_errors=None
+    ):
+        """Coroutine version of :meth:`make_batch_request_sized`."""
+        result, nbytes = await self._post_sized(
+            rpc_requests, "Batch RPC", max_retries, max_size_errors
+        )
+        if not isinstance(result, list):
+            result = [result]
+        return result, nbytes
+
+    def _submit(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self._get_loop())
+
+    def make_batch_request(self, rpc_requests, max_retries=15):
+        """POST a JSON-RPC batch and return list of responses."""
+        return self._submit(self.batch_request(rpc_requests, max_retries)).result()
+
+    def make_batch_request_sized(
+        self, rpc_requests, max_retries=15, max_size_errors=None
+    ):
+        """POST a JSON-RPC batch, return (responses, response_bytes).
+
+        See :meth:`BatchRpcClient.make_batch_request_sized`.
+        """
+        return self._submit(
+            self.batch_request_sized(rpc_requests, max_retries, max_size_errors)
+        ).result()
+
+    def make_request(self, method, params, max_retries=15):
+        """Single JSON-RPC call with retries. Returns the 'result' field."""
+        payload = {"jsonrpc": "2.0", "method": method, "params": params, "id": 1}
+        data = self._submit(self._post(payload, f"RPC {method}", max_retries)).result()
+        if data.get("error") is not None:
+            raise ValueError(f"RPC error for {method}: {data['error']}")
+        return data["result"]
+
+    def get_latest_block_number(self):
+        """eth_blockNumber -> int."""
+        result = self.make_request("eth_blockNumber", [])
+        return int(result, 16)
+
+    async def _fetch_split(self, item, build, sizer, budget=None):
+        """Fetch one batch; with a sizer, split it in halves when it fails
+        for size-related reasons (see :func:`_is_size_related_error`).
+
+        Returns a list of (sub_item, responses, rpc_seconds).
+        """
+        if sizer is None:
+            t0 = time.monotonic()
+            results = await self.batch_request(build(item))
+            return [(item, results, time.monotonic() - t0)]
+        t0 = time.monotonic()
+        try:
+            results, nbytes = await self.batch_request_sized(
+                build(item), max_size_errors=_split_size_errors(item, budget)
+            )
+            _check_batch_limit_error(results)
+        except Exception as e:
+            budget = budget or _SplitBudget()
+            left, right = _split_failed_batch(item, e, sizer, budget)
+            return await self._fetch_split(left, build, sizer, budget) + (
+                await self._fetch_split(right, build, sizer, budget)
+            )
+        rpc_s = time.monotonic() - t0
+        sizer.observe(len(item), nbytes, rpc_s)
+        return [(item, results, rpc_s)]
+
+    def run_batches(self, items, build, parse, sizer=None):
+        """Send all batches at once; parse on the calling thread as they land.
+
+        See :func:`run_rpc_batches`.
+        """
+        futures = [
+            self._submit(self._fetch_split(item, build, sizer)) for item in items
+        ]
+        index = {f: i for i, f in enumerate(futures)}
+        outputs: List[List[Any]] = [[] for _ in items]
+        try:
+            for future in concurrent.futures.as_completed(futures):
+                outputs[index[future]] = [
+                    parse(sub, results, rpc_s)
+                    for sub, results, rpc_s in future.result()
+                ]
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+        return [out for parts in outputs for out in parts]
+
+    def close(self):
+        """Close the connection pool, stop the event loop and join its thread.
+
+        Safe to call more than once; a later request starts a new loop (and
+        the limiter a new condition on it).
+        """
+        with self._lock:
+            loop, self._loop = self._loop, None
+            thread, self._thread = self._thread, None
+        if loop is None or thread is None:
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self._reset_client(), loop).result()
+        finally:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.close()
+            self.limiter.detach()
+
+
+class AdaptiveBatchSizer:
+    """Chooses JSON-RPC batch size and worker count from observed batches.
+
+    The batch size targets ``target_bytes`` of response payload, using a
+    moving average of the bytes per requested item, and never more than
+    doubles between observations (without a known response size, fast
+    batches double it). Batches slower than ``target_seconds`` shrink it in
+    proportion. A failed batch halves the batch size and the
+    worker count; workers grow back by one per batch that finishes in under
+    a quarter of the latency target.
+    """
+
+    def __init__(
+        self,
+        batch_size,
+        max_workers,
+        target_bytes=4 * 2**20,
+        target_seconds=10.0,
+        min_batch_size=1,
+        max_batch_size=None,
+    ):
+        self.min_batch_size = min_batch_size
+        self.max_batch_size = max_batch_size or 4 * batch_size
+        self.max_workers_limit = max_workers
+        self.target_bytes = target_bytes
+        self.target_seconds = target_seconds
+        self.batch_size = batch_size
+        self.max_workers = max_workers
+        self._bytes_per_item = None
+        self._lock = threading.Lock()
+
+    def _clamp(self, size):
+        return int(max(self.min_batch_size, min(self.max_batch_size, size)))
+
+    def observe(self, n_items, response_bytes, seconds):
+        """Record a successful batch of ``n_items`` items."""
+        if n_items <= 0:
+            return
+        with self._lock:
+            size = float(self.batch_size)
+            if response_bytes is not None:
+                per_item = response_bytes / n_items
+                if self._bytes_per_item is None:
+                    self._bytes_per_item = per_item
+                else:
+                    self._bytes_per_item = 0.7 * self._bytes_per_item + 0.3 * per_item
+                size = self.target_bytes / max(self._bytes_per_item, 1.0)
+            if seconds > self.target_seconds:
+                size = min(size, n_items * self.target_seconds / seconds)
+            elif seconds < self.target_seconds / 4:
+                if response_bytes is None:
+                    size = 2 * self.batch_size
+                if self.max_workers < self.max_workers_limit:
+                    self.max_workers += 1
+            self.batch_size = self._clamp(min(size, 2 * self.batch_size))
+
+    def observe_failure(self, n_items):
+        """Record a batch of ``n_items`` items that failed or timed out."""
+        with self._lock:
+            self.batch_size = self._clamp(min(self.batch_size, n_items // 2))
+            self.max_workers = max(1, self.max_workers // 2)
+
+    def describe(self):
+        return f"batch={self.batch_size} workers={self.max_workers}"
+
+
+# Leaves of a split tree give up after a few size-related failures: a half
+# that keeps timing out means the node is in trouble and the whole tree should
+# give up rather than retry every item.
+_SPLIT_LEAF_RETRIES = 5
+# Wall-clock budget for one failing batch and all of its halves.
+_SPLIT_BUDGET_SECONDS = 15 * 60
+
+# Substrings of node/proxy error messages that point at a batch or response
+# size limit (geth, erigon, nethermind, nginx, cloud RPC gateways).
+_SIZE_LIMIT_MESSAGES = (
+    "too large",
+    "too big",
+    "size limit",
+    "batch limit",
+    "response size",
+)
+
+
+class RpcBatchLimitError(Exception):
+    """The node rejected a whole batch because of its size."""
+
+
+class _SplitBudget:
+    """Bounds the time spent on one failing batch and all of its halves."""
+
+    def __init__(self, max_seconds=_SPLIT_BUDGET_SECONDS):
+        self.deadline = time.monotonic() + max_seconds
+
+    def exhausted(self):
+        return time.monotonic() > self.deadline
+
+
+def _mentions_size_limit(text):
+    text = text.lower()
+    return "rate limit" not in text and any(m in text for m in _SIZE_LIMIT_MESSAGES)
+
+
+def _is_size_related_error(error):
+    """Whether splitting the batch can help, i.e. the failure is a read
+    timeout, a truncated or oversized response, or a payload limit.
+
+    Connection refused, authentication and other node failures return False:
+    smaller batches would fail the same way.
+    """
+    if isinstance(
+        error,
+        (
+            requests.exceptions.ConnectTimeout,
+            httpx.ConnectTimeout,
+            httpx.PoolTimeout,
+        ),
+    ):
+        return False
+    if isinstance(
+        error,
+        (
+            RpcBatchLimitError,
+            TimeoutError,
+            concurrent.futures.TimeoutError,
+            requests.exceptions.Timeout,
+            httpx.TimeoutException,
+            # body cut off mid-stream, typical for huge responses
+            requests.exceptions.ChunkedEncodingError,
+            httpx.RemoteProtocolError,
+        ),
+    ):
+        return True
+    response = getattr(error, "response", None)
+    if isinstance(error, (requests.HTTPError, httpx.HTTPStatusError)) and (
+        response is not None
+    ):
+        if response.status_code == 413:
+            return True
+        if response.status_code in (401, 403, 404, 429):
+            return False
+        try:
+            return _mentions_size_limit(response.text)
+        except Exception:
+            return False
+    return "IncompleteRead" in str(error)
+
+
+def _check_batch_limit_error(results):
+    """Raise :class:`RpcBatchLimitError` if the node answered a batch with a
+    single batch-level error about its size."""
+    if len(results) == 1 and isinstance(results[0], dict):
+        error = results[0].get("error")
+        if (
+            error is not None
+            and results[0].get("id") is None
+            and _mentions_size_limit(str(error))
+        ):
+            raise RpcBatchLimitError(str(error))
+
+
+def _split_size_errors(item, budget=None):
+    # Multi-item batches get one retry after a size-related failure before
+    # being split; single items keep the client's full retry budget unless
+    # they are part of a split tree. Other errors always get the full budget.
+    if len(item) > 1:
+        return 2
+    return None if budget is None else _SPLIT_LEAF_RETRIES
+
+
+def _split_failed_batch(item, error, sizer, budget):
+    if len(item) <= 1 or not _is_size_related_error(error):
+        raise error
+    if budget.exhausted():
+        logger.error(
+            f"Batch of {len(item)} RPC requests failed ({error}) and the "
+            f"split budget of {_SPLIT_BUDGET_SECONDS}s is used up; giving up."
+        )
+        raise error
+    sizer.observe_failure(len(item))
+    mid = len(item) // 2
+    logger.warning(
+        f"Batch of {len(item)} RPC requests failed ({error}); "
+        f"splitting into {mid} + {len(item) - mid}. Now {sizer.describe()}."
+    )
+    return item[:mid], item[mid:]
+
+
+def _batch_request_sized(client, rpc_requests, max_size_errors):
+    if isinstance(client, (BatchRpcClient, AsyncBatchRpcClient)):
+        return client.make_batch_request_sized(
+            rpc_requests, max_size_errors=max_size_errors
+        )
+    return client.make_batch_request(rpc_requests), None
+
+
+def _fetch_split(client, item, build, parse, sizer, budget=None):
+    t0 = time.monotonic()
+    try:
+        results, nbytes = _batch_request_sized(
+            client, build(item), _split_size_errors(item, budget)
+        )
+        _check_batch_limit_error(results)
+    except Exception as e:
+        budget = budget or _SplitBudget()
+        left, right = _split_failed_batch(item, e, sizer, budget)
+        return _fetch_split(client, left, build, parse, sizer, budget) + (
+            _fetch_split(client, right, build, parse, sizer, budget)
+        )
+    rpc_s = time.monotonic() - t0
+    sizer.observe(len(item), nbytes, rpc_s)
+    return [parse(item, results, rpc_s)]
+
+
+def chunk_items(items, batch_size):
+    return [items[i : i + batch_size] for i in range(0, len(items), batch_size)]
+
+
+def create_rpc_client(provider_uri, timeout=600, async_rpc=False):
+    """Return the RPC client used by the exporters (see ``ingest_config.async_rpc``)."""
+    if async_rpc:
+        return AsyncBatchRpcClient(provider_uri, timeout=timeout)
+    return BatchRpcClient(provider_uri, timeout=timeout)
+
+
+def run_rpc_batches(client, items, build, parse, max_workers, sizer=None):
+    """Fetch and parse one JSON-RPC batch per item, concurrently.
+
+    ``build(item)`` returns the batch's request list and
+    ``parse(item, results, rpc_seconds)`` turns the responses into the
+    exporter's output. Returns the parsed outputs in the order of ``items``.
+
+    With an :class:`AsyncBatchRpcClient` all batches go out on the shared
+    event loop under its adaptive in-flight limit and ``max_workers`` is
+    ignored; otherwise each batch runs on a ThreadPoolExecutor worker.
+
+    With an :class:`AdaptiveBatchSizer` each batch is reported to the sizer,
+    and a batch that still times out or hits a size limit after one retry is
+    split in halves (so an item may yield several outputs) instead of
+    exhausting the retry budget. Other errors are retried with the client's
+    full budget and backoff, then raised; a split tree gives up after
+    ``_SPLIT_BUDGET_SECONDS``.
+    """
+    if isinstance(client, AsyncBatchRpcClient):
+        return client.run_batches(items, build, parse, sizer=sizer)
+
+    if sizer is None:
+
+        def fetch(item):
+            t0 = time.monotonic()
+            results = client.make_batch_request(build(item))
+            return [parse(item, results, time.monotonic() - t0)]
+
+    else:
+
+        def fetch(item):
+            return _fetch_split(client, item, build, parse, sizer)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return [out for parts in executor.map(fetch, items) for out in parts]
+
 
 # ---------------------------------------------------------------------------
 # Field validation at parse level
@@ -467,6 +1031,45 @@ def parse_log_json(json_log):
     }
 
 
+class LogColumns:
+    """Logs gathered column by column from the RPC JSON, with the fields of
+    :func:`parse_log_json` (minus ``type``) and no per-log dict; see
+    ``ingest.columnar``."""
+
+    FIELDS = (
+        "log_index",
+        "transaction_hash",
+        "transaction_index",
+        "block_hash",
+        "block_number",
+        "address",
+        "data",
+        "topics",
+    )
+
+    def __init__(self):
+        self.columns = {name: [] for name in self.FIELDS}
+
+    def add(self, json_log):
+        validate_rpc_fields(json_log.keys(), _LOG_KNOWN_KEYS, _LOG_BLACKLIST, "log")
+        c = self.columns
+        c["log_index"].append(hex_to_dec(json_log.get("logIndex")))
+        c["transaction_hash"].append(json_log.get("transactionHash"))
+        c["transaction_index"].append(hex_to_dec(json_log.get("transactionIndex")))
+        c["block_hash"].append(json_log.get("blockHash"))
+        c["block_number"].append(hex_to_dec(json_log.get("blockNumber")))
+        c["address"].append(json_log.get("address"))
+        c["data"].append(json_log.get("data"))
+        c["topics"].append(json_log.get("topics") or [])
+
+    def extend(self, other: "LogColumns"):
+        for name, values in other.columns.items():
+            self.columns[name].extend(values)
+
+    def __len__(self):
+        return len(self.columns["log_index"])
+
+
 # ---------------------------------------------------------------------------
 # Transaction enrichment
 # ---------------------------------------------------------------------------
@@ -518,26 +1121,59 @@ def enrich_transactions(transactions, receipts):
 # ---------------------------------------------------------------------------
 
 
-class BlockExporter:
-    """Export blocks and transactions via batch eth_getBlockByNumber calls."""
+class _BatchExporter:
+    """Common batching for the exporters below.
 
-    def __init__(self, client, batch_size=50, max_workers=20):
+    Batch size and worker count are fixed unless ``target_batch_bytes`` is
+    set, in which case an :class:`AdaptiveBatchSizer` tunes both from the
+    observed response sizes and latencies, starting at the given values.
+    """
+
+    def __init__(self, client, batch_size, max_workers, target_batch_bytes=None):
         self.client = client
         self.batch_size = batch_size
         self.max_workers = max_workers
+        self.sizer = (
+            AdaptiveBatchSizer(batch_size, max_workers, target_bytes=target_batch_bytes)
+            if target_batch_bytes
+            else None
+        )
+
+    def _batches(self, items):
+        size = self.sizer.batch_size if self.sizer is not None else self.batch_size
+        return chunk_items(items, size)
+
+    def _run_batches(self, batches, build, parse):
+        workers = self.sizer.max_workers if self.sizer is not None else self.max_workers
+        return run_rpc_batches(
+            self.client, batches, build, parse, workers, sizer=self.sizer
+        )
+
+    def describe_batching(self):
+        if self.sizer is not None:
+            return self.sizer.describe()
+        return f"batch={self.batch_size} workers={self.max_workers}"
+
+
+class BlockExporter(_BatchExporter):
+    """Export blocks and transactions via batch eth_getBlockByNumber calls."""
+
+    def __init__(self, client, batch_size=50, max_workers=20, target_batch_bytes=None):
+        super().__init__(client, batch_size, max_workers, target_batch_bytes)
 
-    def _fetch_batch(self, block_numbers):
-        """Fetch a batch of blocks with full transactions."""
-        rpc_requests = [
+    @staticmethod
+    def _build_batch(block_numbers, detailed=True):
+        return [
             {
                 "jsonrpc": "2.0",
                 "method": "eth_getBlockByNumber",
-                "params": [hex(bn), True],
+                "params": [hex(bn), detailed],
                 "id": bn,
             }
             for bn in block_numbers
         ]
-        results = self.client.make_batch_request(rpc_requests)
+
+    def _parse_batch(self, block_numbers, results, rpc_seconds=None):
         result_map = {r["id"]: r for r in results}
 
         blocks = []
@@ -562,18 +1198,7 @@ class BlockExporter:
 
         return blocks, transactions
 
-    def _fetch_batch_headers(self, block_numbers):
-        """Fetch block headers without transactions (detailed=false)."""
-        rpc_requests = [
-            {
-                "jsonrpc": "2.0",
-                "method": "eth_getBlockByNumber",
-                "params": [hex(bn), False],
-                "id": bn,
-            }
-            for bn in block_numbers
-        ]
-        results = self.client.make_batch_request(rpc_requests)
+    def _parse_batch_headers(self, block_numbers, results, rpc_seconds=None):
         result_map = {r["id"]: r for r in results}
 
         blocks = []
@@ -597,25 +1222,18 @@ class BlockExporter:
         """
         block_numbers = list(range(start_block, end_block + 1))
 
-        batches = [
-            block_numbers[i : i + self.batch_size]
-            for i in range(0, len(block_numbers), self.batch_size)
-        ]
+        batches = self._batches(block_numbers)
 
         all_blocks_by_num = {}
         all_txs_by_block = {}
 
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            futures = {
-                executor.submit(self._fetch_batch, batch_bns): batch_bns
-                for batch_bns in batches
-            }
-            for future in as_completed(futures):
-                batch_blocks, batch_txs = future.result()
-                for b in batch_blocks:
-                    all_blocks_by_num[b["number"]] = b
-                for tx in batch_txs:
-                    all_txs_by_block.setdefault(tx["block_number"], []).append(tx)
+        for batch_blocks, batch_txs in self._run_batches(
+            batches, self._build_batch, self._parse_batch
+        ):
+            for b in batch_blocks:
+                all_blocks_by_num[b["number"]] = b
+            for tx in batch_txs:
+                all_txs_by_block.setdefault(tx["block_number"], []).append(tx)
 
         # Reassemble in block order
         blocks = []
@@ -636,37 +1254,30 @@ class BlockExporter:
         """
         block_numbers = list(range(start_block, end_block + 1))
 
-        batches = [
-            block_numbers[i : i + self.batch_size]
-            for i in range(0, len(block_numbers), self.batch_size)
-        ]
+        batches = self._batches(block_numbers)
 
         all_blocks_by_num = {}
 
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            futures = {
-                executor.submit(self._fetch_batch_headers, batch_bns): batch_bns
-                for batch_bns in batches
-            }
-            for future in as_completed(futures):
-                batch_blocks = future.result()
-                for b in batch_blocks:
-                    all_blocks_by_num[b["number"]] = b
+        for batch_blocks in self._run_batches(
+            batches,
+            lambda bns: self._build_batch(bns, detailed=False),
+            self._parse_batch_headers,
+        ):
+            for b in batch_blocks:
+                all_blocks_by_num[b["number"]] = b
 
         return [all_blocks_by_num[bn] for bn in range(start_block, end_block + 1)]
 
 
-class ReceiptExporter:
+class ReceiptExporter(_BatchExporter):
     """Export receipts and logs via batch eth_getTransactionReceipt calls."""
 
-    def __init__(self, client, batch_size=50, max_workers=20):
-        self.client = client
-        self.batch_size = batch_size
-        self.max_workers = max_workers
+    def __init__(self, client, batch_size=50, max_workers=20, target_batch_bytes=None):
+        super().__init__(client, batch_size, max_workers, target_batch_bytes)
 
-    def _fetch_batch(self, tx_hashes):
-        """Fetch receipts for a batch of transaction hashes."""
-        rpc_requests = [
+    @staticmethod
+    def _build_batch(tx_hashes):
+        return [
             {
                 "jsonrpc": "2.0",
                 "method": "eth_getTransactionReceipt",
@@ -675,7 +1286,8 @@ class ReceiptExporter:
             }
             for idx, tx_hash in enumerate(tx_hashes)
         ]
-        results = self.client.make_batch_request(rpc_requests)
+
+    def _parse_batch(self, tx_hashes, results, rpc_seconds=None):
         result_map = {r["id"]: r for r in results}
 
         receipts = []
@@ -706,23 +1318,16 @@ class ReceiptExporter:
         """
         tx_hashes = list(transaction_hashes)
 
-        batches = [
-            tx_hashes[i : i + self.batch_size]
-            for i in range(0, len(tx_hashes), self.batch_size)
-        ]
+        batches = self._batches(tx_hashes)
 
         all_receipts = []
         all_logs = []
 
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            futures = {
-                executor.submit(self._fetch_batch, batch_hashes): batch_hashes
-                for batch_hashes in batches
-            }
-            for future in as_completed(futures):
-                batch_receipts, batch_logs = future.result()
-                all_receipts.extend(batch_receipts)
-                all_logs.extend(batch_logs)
+        for batch_receipts, batch_logs in self._run_batches(
+            batches, self._build_batch, self._parse_batch
+        ):
+            all_receipts.extend(batch_receipts)
+            all_logs.extend(batch_logs)
 
         # Sort receipts by (block_number, transaction_index)
         all_receipts.sort(key=lambda r: (r["block_number"], r["transaction_index"]))
@@ -732,21 +1337,29 @@ class ReceiptExporter:
         return all_receipts, all_logs
 
 
-class BlockReceiptExporter:
+class BlockReceiptExporter(_BatchExporter):
     """Export receipts and logs via batch eth_getBlockReceipts calls.
 
     Uses 1 RPC call per block instead of 1 per transaction, which is
-    significantly faster for blocks with many transactions.
+    significantly faster for blocks with many transactions. With
+    ``columnar_logs`` the logs are returned as one Arrow table instead of
+    dicts (see ``ingest.columnar``).
     """
 
-    def __init__(self, client, batch_size=20, max_workers=10):
-        self.client = client
-        self.batch_size = batch_size
-        self.max_workers = max_workers
-
-    def _fetch_batch(self, block_numbers):
-        """Fetch receipts for a batch of blocks."""
-        rpc_requests = [
+    def __init__(
+        self,
+        client,
+        batch_size=20,
+        max_workers=10,
+        target_batch_bytes=None,
+        columnar_logs=False,
+    ):
+        super().__init__(client, batch_size, max_workers, target_batch_bytes)
+        self.columnar_logs = columnar_logs
+
+    @staticmethod
+    def _build_batch(block_numbers):
+        return [
             {
                 "jsonrpc": "2.0",
                 "method": "eth_getBlockReceipts",
@@ -755,11 +1368,11 @@ class BlockReceiptExporter:
             }
             for bn in block_numbers
         ]
-        results = self.client.make_batch_request(rpc_requests)
+
+    @staticmethod
+    def _json_receipts(block_numbers, results):
         result_map = {r["id"]: r for r in results}
 
-        receipts = []
-        logs = []
         for bn in block_numbers:
             r = result_map.get(bn)
             if r is None:
@@ -770,13 +1383,25 @@ class BlockReceiptExporter:
             if block_receipts is None:
                 # Empty block or block not found — treat as no receipts
                 continue
+            yield from block_receipts
+
+    def _parse_batch(self, block_numbers, results, rpc_seconds=None):
+        receipts = []
+        logs = []
+        for json_receipt in self._json_receipts(block_numbers, results):
+            receipts.append(parse_receipt_json(json_receipt))
+            for json_log in json_receipt.get("logs") or []:
+                logs.append(parse_log_json(json_log))
 
-            for json_receipt in block_receipts:
-                receipt = parse_receipt_json(json_receipt)
-                receipts.append(receipt)
+        return receipts, logs
 
-                for json_log in json_receipt.get("logs") or []:
-                    logs.append(parse_log_json(json_log))
+    def _parse_batch_columnar(self, block_numbers, results, rpc_seconds=None):
+        receipts = []
+        logs = LogColumns()
+        for json_receipt in self._json_receipts(block_numbers, results):
+            receipts.append(parse_receipt_json(json_receipt))
+            for json_log in json_receipt.get("logs") or []:
+                logs.add(json_log)
 
         return receipts, logs
 
@@ -784,27 +1409,23 @@ class BlockReceiptExporter:
         """Export receipts and logs for a block range.
 
         Returns (receipts, logs) with the same dict format as
-        ReceiptExporter.export_receipts_and_logs().
+        ReceiptExporter.export_receipts_and_logs(), or the logs as one Arrow
+        table with ``columnar_logs``.
         """
         block_numbers = list(range(start_block, end_block + 1))
 
-        batches = [
-            block_numbers[i : i + self.batch_size]
-            for i in range(0, len(block_numbers), self.batch_size)
-        ]
+        batches = self._batches(block_numbers)
+        if self.columnar_logs:
+            return self._export_columnar(batches)
 
         all_receipts = []
         all_logs = []
 
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            futures = {
-                executor.submit(self._fetch_batch, batch_bns): batch_bns
-                for batch_bns in batches
-            }
-            for future in as_completed(futures):
-                batch_receipts, batch_logs = future.result()
-                all_receipts.extend(batch_receipts)
-                all_logs.extend(batch_logs)
+        for batch_receipts, batch_logs in self._run_batches(
+            batches, self._build_batch, self._parse_batch
+        ):
+            all_receipts.extend(batch_receipts)
+            all_logs.extend(batch_logs)
 
         # Sort receipts by (block_number, transaction_index)
         all_receipts.sort(key=lambda r: (r["block_number"], r["transaction_index"]))
@@ -813,6 +1434,22 @@ class BlockReceiptExporter:
 
         return all_receipts, all_logs
 
+    def _export_columnar(self, batches):
+        from graphsenselib.ingest.columnar import logs_table
+
+        all_receipts = []
+        all_logs = LogColumns()
+
+        for batch_receipts, batch_logs in self._run_batches(
+            batches, self._build_batch, self._parse_batch_columnar
+        ):
+            all_receipts.extend(batch_receipts)
+            all_logs.extend(batch_logs)
+
+        all_receipts.sort(key=lambda r: (r["block_number"], r["transaction_index"]))
+        # logs_table sorts by (block_number, log_index)
+        return all_receipts, logs_table(all_logs.columns)
+
 
 # ---------------------------------------------------------------------------
 # Block range for date (replaces EthService.get_block_range_for_date)
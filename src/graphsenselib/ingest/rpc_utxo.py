@@ -19,9 +19,14 @@ Verbosity levels:
 import hashlib
 import logging
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Optional
 
-from graphsenselib.ingest.rpc_eth import BatchRpcClient, validate_rpc_fields
+from graphsenselib.ingest.rpc_eth import (
+    create_rpc_client,
+    run_rpc_batches,
+    validate_rpc_fields,
+)
+from graphsenselib.ingest.utxo_output_store import MemoryOutputStore, OutputStore
 from graphsenselib.utils.pubkey_to_address import base58check_encode, hash160
 
 logger = logging.getLogger(__name__)
@@ -597,7 +602,6 @@ def _parse_btc_block_and_txs(raw_block, network="btc"):
 
 
 _GETRAWTX_BATCH_SIZE = 50
-_MAX_OUTPUT_CACHE_ENTRIES = 2**23  # ~8M txs
 
 # Cache entry tuple layout (avoids dict overhead, saves ~200 bytes per entry)
 _CE_VALUE = 0
@@ -629,8 +633,9 @@ class BtcBlockExporter:
     sequentially within a single connection, which is slower for heavy blocks.
 
     When verbosity < 3, inputs lack value/addresses/type. If
-    ``resolve_inputs=True`` (default), the exporter resolves them via
-    batched ``getrawtransaction`` calls after block fetching.
+    ``resolve_inputs=True`` (default), the exporter resolves them from its
+    output store and falls back to batched ``getrawtransaction`` calls for
+    outputs the store does not know.
     """
 
     def __init__(
@@ -642,8 +647,11 @@ class BtcBlockExporter:
         resolve_inputs=True,
         network="btc",
         fail_on_unresolved_inputs=True,
+        output_store: Optional[OutputStore] = None,
+        async_rpc=False,
+        defer_spends=False,
     ):
-        self.client = BatchRpcClient(provider_uri, timeout=timeout)
+        self.client = create_rpc_client(provider_uri, timeout, async_rpc=async_rpc)
         self.max_workers = max_workers
         self.verbosity = verbosity
         self.resolve_inputs = resolve_inputs
@@ -651,12 +659,34 @@ class BtcBlockExporter:
         # Network code (btc/ltc/bch/zec) selects address version bytes when a
         # node omits the address for a P2PK output (see _p2pk_address_from_script).
         self.network = network
-        # Cumulative output cache across batches for input resolution.
-        # Maps tx_hash → {output_index → {value, addresses, type, script_hex}}.
+        # Cumulative output store across batches for input resolution.
+        # Maps tx_hash → {output_index → cache entry tuple}.
         # When blocks are processed in small batches, inputs in batch N may
-        # reference outputs from batch M<N. The cache ensures those outputs
+        # reference outputs from batch M<N. The store ensures those outputs
         # are available without requiring getrawtransaction (which needs txindex).
-        self._output_cache = {}
+        # Defaults to the in-memory store; see utxo_output_store.DiskOutputStore
+        # for a bounded, persistent alternative.
+        self._output_store = (
+            output_store if output_store is not None else MemoryOutputStore()
+        )
+        # When set, spent outputs stay in the store until commit_spends covers
+        # the chunk that spent them (see OutputStore.defer_spend).
+        self.defer_spends = defer_spends
+
+    @property
+    def output_store(self) -> OutputStore:
+        return self._output_store
+
+    def commit_spends(self, end_block):
+        """Evict the outputs spent by exported chunks up to ``end_block``."""
+        self._output_store.commit(end_block)
+
+    def close(self):
+        """Persist and release the output store and the RPC client."""
+        try:
+            self._output_store.close()
+        finally:
+            self.client.close()
 
     def get_current_block_number(self):
         """Get the current block height from the node."""
@@ -686,21 +716,26 @@ class BtcBlockExporter:
             hashes.append(r["result"])
         return hashes
 
+    def _build_getblock(self, block_hash):
+        return [
+            {
+                "jsonrpc": "2.0",
+                "method": "getblock",
+                "params": [block_hash, self.verbosity],
+                "id": 0,
+            }
+        ]
+
     def _fetch_single_block(self, block_hash):
         """Fetch a single block via getblock(hash, verbosity) and parse it.
 
         Returns (block, txs, rpc_seconds, parse_seconds).
         """
-        rpc_request = {
-            "jsonrpc": "2.0",
-            "method": "getblock",
-            "params": [block_hash, self.verbosity],
-            "id": 0,
-        }
         t0 = time.monotonic()
-        results = self.client.make_batch_request([rpc_request])
-        t_rpc = time.monotonic() - t0
+        results = self.client.make_batch_request(self._build_getblock(block_hash))
+        return self._parse_single_block(block_hash, results, time.monotonic() - t0)
 
+    def _parse_single_block(self, block_hash, results, t_rpc):
         r = results[0]
         if "error" in r and r["error"] is not None:
             raise ValueError(f"RPC error for getblock({block_hash}): {r['error']}")
@@ -727,8 +762,8 @@ class BtcBlockExporter:
 
         output_map = {}
 
-        def fetch_chunk(chunk):
-            rpc_requests = [
+        def build_chunk(chunk):
+            return [
                 {
                     "jsonrpc": "2.0",
                     "method": "getrawtransaction",
@@ -737,7 +772,8 @@ class BtcBlockExporter:
                 }
                 for idx, h in enumerate(chunk)
             ]
-            results = self.client.make_batch_request(rpc_requests)
+
+        def parse_chunk(chunk, results, rpc_seconds):
             chunk_map = {}
             for r in results:
                 if r.get("error") or not r.get("result"):
@@ -764,26 +800,31 @@ class BtcBlockExporter:
                 chunk_map[raw_tx["txid"]] = by_index
             return chunk_map
 
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            futures = [executor.submit(fetch_chunk, c) for c in chunks]
-            for f in as_completed(futures):
-                output_map.update(f.result())
+        for chunk_map in run_rpc_batches(
+            self.client, chunks, build_chunk, parse_chunk, self.max_workers
+        ):
+            output_map.update(chunk_map)
 
         return output_map
 
-    def _resolve_unresolved_inputs(self, transactions):
+    def _resolve_unresolved_inputs(self, transactions, end_block=None):
         """Resolve inputs that lack value/addresses (verbosity 2).
 
         Uses a three-tier resolution strategy:
-        1. Cumulative output cache from previous batches (free).
+        1. Cumulative output store from previous batches (free, or one
+           batched disk read for a :class:`DiskOutputStore`).
         2. Within-batch outputs (free).
         3. Batch getrawtransaction for remaining unknowns (requires txindex).
 
-        The cumulative cache (``self._output_cache``) persists across calls so
+        The output store (``self._output_store``) persists across calls so
         that outputs from earlier batches are available when blocks are
-        processed in small chunks.
+        processed in small chunks. With ``defer_spends`` the spent outputs
+        are recorded for the chunk ending at ``end_block`` (required then)
+        instead of being evicted right away.
         """
-        # Phase 1: add current batch outputs to cumulative cache
+        if self.defer_spends and end_block is None:
+            raise ValueError("end_block is required when spends are deferred")
+        # Phase 1: add current batch outputs to cumulative store
         for tx in transactions:
             by_index = {}
             for out in tx["outputs"]:
@@ -793,21 +834,22 @@ class BtcBlockExporter:
                     out["type"],
                     out.get("script_hex"),
                 )
-            self._output_cache[tx["hash"]] = by_index
+            self._output_store.add_outputs(tx["hash"], by_index)
 
-        # Collect unresolved spent tx hashes not in cache
-        unresolved = set()
+        # Collect spent tx hashes and find those the store does not know
+        spent_txs = set()
         for tx in transactions:
             for inp in tx["inputs"]:
                 sth = inp["spent_transaction_hash"]
-                if inp["value"] is None and sth and sth not in self._output_cache:
-                    unresolved.add(sth)
+                if inp["value"] is None and sth:
+                    spent_txs.add(sth)
+        unresolved = spent_txs - self._output_store.prefetch(spent_txs)
 
         # Phase 2: fetch remaining from node (needs txindex)
         t0 = time.monotonic()
         if unresolved:
             fetched = self._batch_getrawtransaction(unresolved)
-            self._output_cache.update(fetched)
+            self._output_store.update(fetched)
         t_fetch = time.monotonic() - t0
 
         # Phase 3: apply resolution, evict spent outputs, recompute values
@@ -819,7 +861,7 @@ class BtcBlockExporter:
                 if inp["value"] is None and inp["spent_transaction_hash"]:
                     sth = inp["spent_transaction_hash"]
                     idx = inp["spent_output_index"]
-                    resolved = self._output_cache.get(sth, {}).get(idx)
+                    resolved = self._output_store.get(sth, idx)
                     if resolved:
                         inp["value"] = resolved[_CE_VALUE]
                         inp["addresses"] = resolved[_CE_ADDRESSES]
@@ -837,25 +879,16 @@ class BtcBlockExporter:
                 if not tx["is_coinbase"]:
                     tx["fee"] = input_value - tx["output_value"]
 
-        # Evict spent outputs to bound cache to UTXO set size.
-        # Each output can only be spent once, so removing it is safe.
-        for sth, idx in spent_keys:
-            by_idx = self._output_cache.get(sth)
-            if by_idx is not None:
-                by_idx.pop(idx, None)
-                if not by_idx:
-                    del self._output_cache[sth]
-
-        # Trim cache if it exceeds the max size to prevent unbounded growth.
-        if len(self._output_cache) > _MAX_OUTPUT_CACHE_ENTRIES:
-            excess = len(self._output_cache) - _MAX_OUTPUT_CACHE_ENTRIES // 2
-            keys_to_remove = list(self._output_cache.keys())[:excess]
-            for k in keys_to_remove:
-                del self._output_cache[k]
-            logger.warning(
-                f"Output cache exceeded {_MAX_OUTPUT_CACHE_ENTRIES} entries, "
-                f"trimmed {excess} oldest entries"
-            )
+        # Evict spent outputs to bound the store to the UTXO set size.
+        # Each output can only be spent once, so removing it is safe once
+        # the spending chunk is written.
+        if end_block is not None and self.defer_spends:
+            self._output_store.defer_spend(end_block, spent_keys)
+        else:
+            self._output_store.spend(spent_keys)
+
+        # Enforce the store's memory bound (trim or spill to disk).
+        self._output_store.trim()
 
         # Inputs still unresolved after all three phases keep value/addresses =
         # None. Writing them null silently corrupts fees, balances, address
@@ -893,7 +926,7 @@ class BtcBlockExporter:
         logger.info(
             f"[source-timing] input resolution: {len(unresolved)} txs fetched "
             f"in {t_fetch:.2f}s, {n_resolved} inputs resolved, "
-            f"cache size: {len(self._output_cache)} txs"
+            f"cache size: {self._output_store.describe()}"
         )
 
     def export_blocks_and_transactions(self, start_block, end_block):
@@ -914,18 +947,18 @@ class BtcBlockExporter:
         total_rpc_s = 0.0
         total_parse_s = 0.0
 
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            futures = {
-                executor.submit(self._fetch_single_block, bh): bn
-                for bn, bh in zip(block_numbers, hashes)
-            }
-            for future in as_completed(futures):
-                block, txs, t_rpc, t_parse = future.result()
-                total_rpc_s += t_rpc
-                total_parse_s += t_parse
-                all_blocks_by_num[block["number"]] = block
-                for tx in txs:
-                    all_txs_by_block.setdefault(tx["block_number"], []).append(tx)
+        for block, txs, t_rpc, t_parse in run_rpc_batches(
+            self.client,
+            hashes,
+            self._build_getblock,
+            self._parse_single_block,
+            self.max_workers,
+        ):
+            total_rpc_s += t_rpc
+            total_parse_s += t_parse
+            all_blocks_by_num[block["number"]] = block
+            for tx in txs:
+                all_txs_by_block.setdefault(tx["block_number"], []).append(tx)
 
         # Reassemble in block order
         t0_reassemble = time.monotonic()
@@ -945,7 +978,7 @@ class BtcBlockExporter:
         t_resolve = 0.0
         if self.resolve_inputs and self.verbosity < 3 and transactions:
             t0_resolve = time.monotonic()
-            self._resolve_unresolved_inputs(transactions)
+            self._resolve_unresolved_inputs(transactions, end_block)
             t_resolve = time.monotonic() - t0_resolve
 
         dt = t_blocks + t_resolve
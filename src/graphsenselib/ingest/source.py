@@ -34,13 +34,21 @@ def split_blockrange(
 
 class SourceTRX(Source):
     def __init__(
-        self, provider_uri, grpc_provider_uri, provider_timeout, max_workers=None
+        self,
+        provider_uri,
+        grpc_provider_uri,
+        provider_timeout,
+        max_workers=None,
+        async_rpc=False,
+        target_batch_bytes=None,
     ):
         self.provider_uri = provider_uri
         self.grpc_provider_uri = grpc_provider_uri
         self.provider_timeout = provider_timeout
         w = max_workers or 10
-        self.client = get_connection_from_url(provider_uri, provider_timeout)
+        self.client = get_connection_from_url(
+            provider_uri, provider_timeout, async_rpc=async_rpc
+        )
         # The adapter is only used for export_block_headers (lightweight HTTP).
         # All heavy lifting (txs, traces, fees, receipts, logs) goes through
         # the gRPC combined exporter.
@@ -51,6 +59,7 @@ class SourceTRX(Source):
             max_workers_blockstransactions=5,
             batch_size_receiptslogs=100,
             max_workers_receiptslogs=5,
+            target_batch_bytes=target_batch_bytes,
         )
         self.grpc_exporter = TronCombinedGrpcExporter(
             grpc_endpoint=grpc_provider_uri,
@@ -58,8 +67,9 @@ class SourceTRX(Source):
         )
 
     def close(self):
-        """Release held resources (gRPC channel)."""
+        """Release held resources (gRPC channel, RPC client)."""
         self.grpc_exporter.close()
+        self.client.close()
 
     def get_last_block_yesterday(self) -> int:
         return account_get_last_block_yesterday(self.client)
@@ -127,6 +137,7 @@ class SourceTRX(Source):
             f"{len(fees) if fees else 0} fees, "
             f"{len(receipts)} rcpts, {len(logs)} logs)"
             + (f"  fallback={t_fallback:.2f}s" if t_fallback > 0 else "")
+            + f"  {self.adapter.describe_batching()}"
         )
 
         data = {
@@ -151,17 +162,30 @@ class SourceTRX(Source):
 
 
 class SourceETH(Source):
-    def __init__(self, provider_uri, provider_timeout, max_workers=None):
+    def __init__(
+        self,
+        provider_uri,
+        provider_timeout,
+        max_workers=None,
+        async_rpc=False,
+        target_batch_bytes=None,
+        columnar_logs=False,
+    ):
         self.provider_uri = provider_uri
         self.provider_timeout = provider_timeout
         w = max_workers or 10
-        self.client = get_connection_from_url(provider_uri, provider_timeout)
+        self.client = get_connection_from_url(
+            provider_uri, provider_timeout, async_rpc=async_rpc
+        )
         self.adapter = EthStreamerAdapter(
             self.client,
             batch_size_blockstransactions=20,
             max_workers_blockstransactions=w,
             batch_size_receiptslogs=100,
             max_workers_receiptslogs=w,
+            target_batch_bytes=target_batch_bytes,
+            # logs as one Arrow table per chunk, see ingest.columnar
+            columnar_logs=columnar_logs,
         )
         self.fast_trace_exporter = TraceExporter(
             client=self.client,
@@ -169,6 +193,10 @@ class SourceETH(Source):
             max_workers=w,
         )
 
+    def close(self):
+        """Release the RPC client (shared with the trace exporter)."""
+        self.client.close()
+
     def get_last_block_yesterday(self) -> int:
         return account_get_last_block_yesterday(self.client)
 
@@ -220,7 +248,7 @@ class SourceETH(Source):
                 f"blocks={t_blocks:.2f}s  "
                 f"receipts={t_receipts:.2f}s ({len(receipts)} rcpts, {len(logs)} logs)  "
                 f"traces={t_traces:.2f}s ({len(traces)} traces)  "
-                f"txs={len(txs)}"
+                f"txs={len(txs)}  {self.adapter.describe_batching()}"
             )
 
             data = {
@@ -271,7 +299,7 @@ class SourceETH(Source):
             f"blocks={t_blocks:.2f}s  "
             f"receipts={t_receipts:.2f}s ({len(receipts)} rcpts, {len(logs)} logs)  "
             f"traces_wait={t_traces_wait:.2f}s ({len(traces)} traces)  "
-            f"txs={len(txs)}"
+            f"txs={len(txs)}  {self.adapter.describe_batching()}"
         )
 
         data = {
@@ -303,6 +331,8 @@ class SourceUTXO(Source):
         resolve_inputs=True,
         max_workers=None,
         fail_on_unresolved_inputs=True,
+        output_store=None,
+        async_rpc=False,
     ):
         self.fast_exporter = BtcBlockExporter(
             provider_uri=provider_uri,
@@ -312,11 +342,22 @@ class SourceUTXO(Source):
             resolve_inputs=resolve_inputs,
             network=network,
             fail_on_unresolved_inputs=fail_on_unresolved_inputs,
+            output_store=output_store,
+            async_rpc=async_rpc,
+            defer_spends=True,
         )
         # Keep legacy adapter for get_last_synced_block (uses getblockcount)
         self._provider_uri = provider_uri
         self._provider_timeout = provider_timeout
 
+    def close(self):
+        """Persist the exporter's output store (if on disk), release its client."""
+        self.fast_exporter.close()
+
+    def commit(self, end_block):
+        # Outputs spent by chunks that are not written yet stay resolvable.
+        self.fast_exporter.commit_spends(end_block)
+
     def get_last_block_yesterday(self) -> int:
         return utxo_get_last_block_yesterday(
             self.fast_exporter, self.get_last_synced_block()
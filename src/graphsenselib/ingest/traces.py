@@ -9,11 +9,11 @@ The output dict format is identical to ethereum-etl's trace_mapper.trace_to_dict
 
 import logging
 from collections import defaultdict
-from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from graphsenselib.ingest.rpc_eth import (
     BatchRpcClient,
     hex_to_dec,
+    run_rpc_batches,
     validate_rpc_fields,
 )
 
@@ -255,7 +255,7 @@ class TraceExporter:
     Key improvements over ethereum-etl's ExportTracesJob:
     - Configurable trace_batch_size (blocks per JSON-RPC batch) instead of 1
     - Direct JSON -> output dict (no intermediate domain objects)
-    - Concurrent batch execution via ThreadPoolExecutor
+    - Concurrent batch execution (see rpc_eth.run_rpc_batches)
     """
 
     def __init__(
@@ -273,13 +273,9 @@ class TraceExporter:
         self.trace_batch_size = trace_batch_size
         self.max_workers = max_workers
 
-    def _fetch_traces_for_blocks(self, block_numbers):
-        """Fetch traces for a batch of blocks via a single batch JSON-RPC call.
-
-        Returns dict mapping block_number -> list of trace dicts,
-        preserving the trace_block response order within each block.
-        """
-        rpc_requests = [
+    @staticmethod
+    def _build_trace_batch(block_numbers):
+        return [
             {
                 "jsonrpc": "2.0",
                 "method": "trace_block",
@@ -289,12 +285,20 @@ class TraceExporter:
             for bn in block_numbers
         ]
 
+    def _fetch_traces_for_blocks(self, block_numbers):
+        """Fetch traces for a batch of blocks via a single batch JSON-RPC call.
+
+        Returns dict mapping block_number -> list of trace dicts,
+        preserving the trace_block response order within each block.
+        """
         # make_batch_request already retries transient failures with exponential
         # backoff (and resets the session on connection errors); do NOT wrap it in
         # a second retry loop — that nests to max_retries^2 attempts (~225) and can
         # hammer a dead endpoint for over an hour before failing.
-        results = self.client.make_batch_request(rpc_requests)
+        results = self.client.make_batch_request(self._build_trace_batch(block_numbers))
+        return self._parse_trace_batch(block_numbers, results)
 
+    def _parse_trace_batch(self, block_numbers, results, rpc_seconds=None):
         if not isinstance(results, list):
             results = [results]
 
@@ -327,16 +331,14 @@ class TraceExporter:
 
         all_traces_by_block = {}
 
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            futures = {
-                executor.submit(
-                    self._fetch_traces_for_blocks, batch_blocks
-                ): batch_blocks
-                for batch_blocks in batches
-            }
-            for future in as_completed(futures):
-                block_traces = future.result()
-                all_traces_by_block.update(block_traces)
+        for block_traces in run_rpc_batches(
+            self.client,
+            batches,
+            self._build_trace_batch,
+            self._parse_trace_batch,
+            self.max_workers,
+        ):
+            all_traces_by_block.update(block_traces)
 
         # Concatenate in block order, preserving trace_block order within
         all_traces = []
@@ -421,6 +421,11 @@ class TransformerTRX(Transformer):
 
 
 class TransformerETH(Transformer):
+    def __init__(self, partition_batch_size: int, network: str, columnar=False):
+        super().__init__(partition_batch_size, network)
+        # logs arrive as an Arrow table (SourceETH columnar_logs)
+        self.columnar = columnar
+
     def transform(self, block_range_content: BlockRangeContent) -> BlockRangeContent:
         t_total = time.monotonic()
         data = block_range_content.table_contents
@@ -450,14 +455,21 @@ class TransformerETH(Transformer):
         t_prep_traces = time.monotonic() - t0
 
         t0 = time.monotonic()
-        prepare_logs_inplace(logs, BLOCK_BUCKET_SIZE, self.partition_batch_size)
+        if self.columnar:
+            from graphsenselib.ingest.columnar import prepare_logs_arrow
+
+            # sorted by (block_id, log_index) as well
+            logs = prepare_logs_arrow(logs, self.partition_batch_size)
+        else:
+            prepare_logs_inplace(logs, BLOCK_BUCKET_SIZE, self.partition_batch_size)
         t_prep_logs = time.monotonic() - t0
 
         t0 = time.monotonic()
         txs.sort(key=lambda x: (x["block_id"], x["transaction_index"]))
         blocks.sort(key=lambda x: x["block_id"])
         traces.sort(key=lambda x: (x["block_id"], x["trace_index"]))
-        logs.sort(key=lambda x: (x["block_id"], x["log_index"]))
+        if not self.columnar:
+            logs.sort(key=lambda x: (x["block_id"], x["log_index"]))
         t_sort = time.monotonic() - t0
 
         t_transform_total = time.monotonic() - t_total
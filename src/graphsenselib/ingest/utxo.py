@@ -4,8 +4,9 @@ from collections import OrderedDict
 from collections.abc import Iterable
 from datetime import datetime, timezone
 from operator import itemgetter
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple, Union
 
+import numpy as np
 from methodtools import lru_cache as mlru_cache
 
 from ..config import GRAPHSENSE_DEFAULT_DATETIME_FORMAT, get_reorg_backoff_blocks
@@ -534,6 +535,107 @@ def parse_script(s: str, network: str = "btc") -> Tuple[Optional[List[str]], str
     )
 
 
+# Canonical fixed-shape scripts, matched by parse_scripts on the whole chunk
+# at once: (type, script length, {offset: byte}, allowed values of the first
+# payload byte or None, payload slice, needs segwit). Anything else
+# (multisig, nulldata, non-canonical pushes, malformed keys) goes through
+# parse_script. None of these shapes can match an earlier template in
+# parse_script's order, so the fast path yields the same result.
+_FIXED_SCRIPT_TEMPLATES = (
+    (
+        "p2pkh",
+        25,
+        {0: 0x76, 1: 0xA9, 2: 0x14, 23: 0x88, 24: 0xAC},
+        None,
+        (3, 23),
+        False,
+    ),
+    ("p2sh", 23, {0: 0xA9, 1: 0x14, 22: 0x87}, None, (2, 22), False),
+    ("p2pk", 35, {0: 0x21, 34: 0xAC}, (0x02, 0x03), (1, 34), False),
+    ("p2pk", 67, {0: 0x41, 66: 0xAC}, (0x04, 0x06, 0x07), (1, 66), False),
+    ("p2wpkhv0", 22, {0: 0x00, 1: 0x14}, None, (2, 22), True),
+    ("p2wshv0", 34, {0: 0x00, 1: 0x20}, None, (2, 34), True),
+)
+
+_SCRIPT_PARSE_ERRORS = (UnknownScriptType, UnknownAddressType, P2pkParserException)
+
+
+def parse_scripts(
+    scripts: List[str], network: str = "btc"
+) -> List[Union[Tuple[Optional[List[str]], str], Exception]]:
+    """Batched :func:`parse_script` for all scripts of a chunk.
+
+    The scripts are decoded into one buffer and the canonical P2PKH, P2SH,
+    P2PK and P2WPKH/P2WSH shapes are classified with array compares over
+    that buffer; addresses are derived once per distinct payload. The
+    remaining scripts are parsed one by one with :func:`parse_script`.
+
+    Args:
+        scripts (List[str]): scripts in binary hex format
+        network (str): chain code selecting the address version bytes
+
+    Returns:
+        List: per script, the ``(addresses, type)`` tuple parse_script
+            returns, or the UnknownScriptType/UnknownAddressType/
+            P2pkParserException it raised. Other errors propagate.
+    """
+    from graphsenselib.utils.pubkey_to_address import (
+        base58check_encode_many,
+        bech32_segwit_encode_many,
+        hash160,
+    )
+
+    results: List = [None] * len(scripts)
+    hexes = [s[2:] if s.startswith("0x") else s for s in scripts]
+    try:
+        buf = np.frombuffer(bytes.fromhex("".join(hexes)), dtype=np.uint8)
+    except ValueError:
+        buf = None
+    if buf is not None and all(len(h) % 2 == 0 for h in hexes):
+        params = _NETWORK_SCRIPT_PARAMS.get(network, _NETWORK_SCRIPT_PARAMS["btc"])
+        encoders = {
+            "p2pkh": lambda ds: base58check_encode_many(params["p2pkh"], ds),
+            "p2sh": lambda ds: base58check_encode_many(params["p2sh"], ds),
+            "p2pk": lambda ds: base58check_encode_many(
+                params["p2pkh"], [hash160(d) for d in ds]
+            ),
+            "p2wpkhv0": lambda ds: bech32_segwit_encode_many(
+                params["bech32_hrp"], 0, ds
+            ),
+            "p2wshv0": lambda ds: bech32_segwit_encode_many(
+                params["bech32_hrp"], 0, ds
+            ),
+        }
+        lengths = np.fromiter((len(h) // 2 for h in hexes), np.int64, len(hexes))
+        offsets = np.concatenate(([0], np.cumsum(lengths)[:-1])).astype(np.int64)
+        raw = buf.tobytes()
+        for stype, size, fixed, first, (lo, hi), segwit in _FIXED_SCRIPT_TEMPLATES:
+            if segwit and params["bech32_hrp"] is None:
+                continue
+            idx = np.flatnonzero(lengths == size)
+            if idx.size == 0:
+                continue
+            mask = np.ones(idx.size, dtype=bool)
+            for pos, value in fixed.items():
+                mask &= buf[offsets[idx] + pos] == value
+            if first is not None:
+                mask &= np.isin(buf[offsets[idx] + lo], first)
+            matched = idx[mask].tolist()
+            payloads = [raw[start + lo : start + hi] for start in offsets[idx[mask]]]
+            unique = list(dict.fromkeys(payloads))
+            address_of = dict(zip(unique, encoders[stype](unique)))
+            for i, payload in zip(matched, payloads):
+                results[i] = ([address_of[payload]], stype)
+
+    for i, s in enumerate(scripts):
+        if results[i] is None:
+            try:
+                results[i] = parse_script(s, network)
+            except _SCRIPT_PARSE_ERRORS as exception:
+                results[i] = exception
+    return results
+
+
 def enrich_txs(
     txs: Iterable,
     resolver: Optional[OutputResolverBase],
@@ -562,38 +664,38 @@ def enrich_txs(
     # an example is block (801379, tx at index 2 spends tx at index 12)
     # we circumvent this issue by pre-populating the cache.
 
+    nonstandard = []
     for tx in txs:
-        # process outputs
         for o in tx["outputs"]:
             if o["addresses"]:
                 if o["addresses"][0] and o["addresses"][0].startswith("bitcoincash:"):
                     o["addresses"] = [bch_address_to_legacy(a) for a in o["addresses"]]
 
                 if o["addresses"][0] and o["addresses"][0].startswith("nonstandard"):
-                    try:
-                        address_list, scripttype = parse_script(
-                            o["script_hex"], network
-                        )
-                        o["addresses"] = (
-                            address_list if address_list else o["addresses"]
-                        )
-                        o["type"] = scripttype
-                    except (
-                        UnknownScriptType,
-                        UnknownAddressType,
-                        P2pkParserException,
-                    ) as exception:
-                        logger.warning(
-                            f"{exception}: cannot parse output script {o}"
-                            f" from tx {tx.get('hash')}"
-                        )
-                if not input_reference_only:
-                    assert resolver is not None
+                    nonstandard.append((tx, o))
+
+    parsed = parse_scripts([o["script_hex"] for _, o in nonstandard], network)
+    for (tx, o), result in zip(nonstandard, parsed):
+        if isinstance(result, Exception):
+            logger.warning(
+                f"{result}: cannot parse output script {o} from tx {tx.get('hash')}"
+            )
+            continue
+        address_list, scripttype = result
+        o["addresses"] = address_list if address_list else o["addresses"]
+        o["type"] = scripttype
+
+    if not input_reference_only:
+        assert resolver is not None
+        for tx in txs:
+            for o in tx["outputs"]:
+                if o["addresses"]:
                     resolver.add_output(tx["hash"], o)
 
     # Normalize prevout-resolved input addresses (verbosity 3 / getrawtransaction).
     # Always pop prevout_script_hex to clean up; only normalize when inputs
     # won't be overwritten by the resolver below.
+    nonstandard = []
     for tx in txs:
         for i in tx["inputs"]:
             prevout_hex = i.pop("prevout_script_hex", None)
@@ -608,19 +710,19 @@ def enrich_txs(
                 i["addresses"] = [bch_address_to_legacy(a) for a in i["addresses"]]
             # Nonstandard (P2PK etc.) → parse via prevout scriptPubKey
             if prevout_hex and i.get("type") == "nonstandard":
-                try:
-                    address_list, scripttype = parse_script(prevout_hex, network)
-                    i["addresses"] = address_list if address_list else i["addresses"]
-                    i["type"] = scripttype
-                except (
-                    UnknownScriptType,
-                    UnknownAddressType,
-                    P2pkParserException,
-                ) as exception:
-                    logger.warning(
-                        f"{exception}: cannot parse prevout script for"
-                        f" input {i} in tx {tx.get('hash')}"
-                    )
+                nonstandard.append((tx, i, prevout_hex))
+
+    parsed = parse_scripts([h for _, _, h in nonstandard], network)
+    for (tx, i, _), result in zip(nonstandard, parsed):
+        if isinstance(result, Exception):
+            logger.warning(
+                f"{result}: cannot parse prevout script for"
+                f" input {i} in tx {tx.get('hash')}"
+            )
+            continue
+        address_list, scripttype = result
+        i["addresses"] = address_list if address_list else i["addresses"]
+        i["type"] = scripttype
 
     if input_reference_only:
         pass
@@ -0,0 +1,448 @@
+"""Output stores used by BtcBlockExporter to resolve spent inputs.
+
+At verbosity 2 the node does not return the spent output (value, addresses,
+type) with each input, so the exporter keeps the outputs it has seen and looks
+them up when they are spent. Anything the store cannot answer costs a
+``getrawtransaction`` round trip (which also needs ``txindex=1``).
+
+Two implementations share one interface:
+
+- :class:`MemoryOutputStore`: a plain dict, trimmed by dropping the oldest
+  half once it passes ``max_entries``. Nothing survives a restart.
+- :class:`DiskOutputStore`: a bounded in-memory hot tier backed by an on-disk
+  SQLite UTXO set. Old outputs are spilled to disk instead of dropped, so RSS
+  stays roughly constant and the set survives restarts. The set can be seeded
+  from the ``transaction`` delta table (:func:`seed_output_store_from_delta`).
+
+Spends can be deferred per chunk (:meth:`OutputStore.defer_spend`) and
+applied once the chunk is committed to the sinks (:meth:`OutputStore.commit`).
+The ingest pipeline reads chunks ahead of the sinks; evicting their spent
+outputs right away would lose them for good if the run fails before those
+chunks are written, and the inputs of the chunks re-read on restart could
+then not be resolved.
+
+Cache entries are the compact tuples built by
+``rpc_utxo._make_cache_entry``: ``(value, addresses, type, script_hex)``.
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import msgpack
+
+logger = logging.getLogger(__name__)
+
+# Max host parameters per SQLite statement (SQLITE_MAX_VARIABLE_NUMBER is
+# 32766 on current builds, but 999 on old ones).
+_SQLITE_IN_CHUNK = 900
+
+OutputsByIndex = Dict[int, tuple]
+
+
+class OutputStore(ABC):
+    """Maps tx_hash → {output_index → cache entry} for input resolution."""
+
+    def __init__(self):
+        # end block of a read chunk → outputs it spends, see defer_spend
+        self._pending_spends: Dict[int, List[Tuple[str, int]]] = {}
+        self._pending_lock = threading.Lock()
+
+    @abstractmethod
+    def add_outputs(self, tx_hash: str, by_index: OutputsByIndex) -> None:
+        pass
+
+    def update(self, outputs: Dict[str, OutputsByIndex]) -> None:
+        for tx_hash, by_index in outputs.items():
+            self.add_outputs(tx_hash, by_index)
+
+    @abstractmethod
+    def prefetch(self, tx_hashes: Iterable[str]) -> Set[str]:
+        """Make outputs of ``tx_hashes`` available to :meth:`get`.
+
+        Returns the subset of hashes the store knows about; the rest has to
+        be fetched from the node.
+        """
+
+    @abstractmethod
+    def get(self, tx_hash: str, index: int) -> Optional[tuple]:
+        pass
+
+    @abstractmethod
+    def spend(self, keys: Iterable[Tuple[str, int]]) -> None:
+        """Evict spent outputs. Each output can only be spent once."""
+
+    def defer_spend(self, end_block: int, keys: Iterable[Tuple[str, int]]) -> None:
+        """Record the outputs spent by the chunk ending at ``end_block``; they
+        stay available until :meth:`commit` covers the chunk."""
+        with self._pending_lock:
+            self._pending_spends.setdefault(end_block, []).extend(keys)
+
+    def commit(self, end_block: int) -> None:
+        """Evict the deferred spends of all chunks up to ``end_block``."""
+        with self._pending_lock:
+            done = [b for b in self._pending_spends if b <= end_block]
+            keys = [k for b in sorted(done) for k in self._pending_spends.pop(b)]
+        if keys:
+            self.spend(keys)
+
+    @property
+    def pending_spends(self) -> int:
+        """Number of deferred spends not committed yet."""
+        with self._pending_lock:
+            return sum(len(keys) for keys in self._pending_spends.values())
+
+    def trim(self) -> None:
+        """Enforce the store's memory bound. Called once per batch."""
+
+    def describe(self) -> str:
+        return f"{len(self)} outputs"
+
+    def close(self) -> None:
+        pass
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """Number of unspent outputs held."""
+
+
+class MemoryOutputStore(OutputStore):
+    """``max_entries`` bounds the number of txs kept."""
+
+    def __init__(self, max_entries: int = 2**23):
+        super().__init__()
+        self.max_entries = max_entries
+        self._outputs: Dict[str, OutputsByIndex] = {}
+        self._n_outputs = 0
+
+    def add_outputs(self, tx_hash, by_index):
+        previous = self._outputs.get(tx_hash)
+        if previous is not None:
+            self._n_outputs -= len(previous)
+        self._outputs[tx_hash] = by_index
+        self._n_outputs += len(by_index)
+
+    def prefetch(self, tx_hashes):
+        return {h for h in tx_hashes if h in self._outputs}
+
+    def get(self, tx_hash, index):
+        by_index = self._outputs.get(tx_hash)
+        return by_index.get(index) if by_index is not None else None
+
+    def spend(self, keys):
+        # Commits come from the writer thread while the source thread reads
+        # and trims, so entries may vanish between the lookups below.
+        for tx_hash, index in keys:
+            by_index = self._outputs.get(tx_hash)
+            if by_index is not None:
+                if by_index.pop(index, None) is not None:
+                    self._n_outputs -= 1
+                if not by_index:
+                    self._outputs.pop(tx_hash, None)
+
+    def trim(self):
+        if len(self._outputs) > self.max_entries:
+            excess = len(self._outputs) - self.max_entries // 2
+            for k in list(self._outputs.keys())[:excess]:
+                by_index = self._outputs.pop(k, None)
+                if by_index is not None:
+                    self._n_outputs -= len(by_index)
+            logger.warning(
+                f"Output cache exceeded {self.max_entries} txs, "
+                f"trimmed {excess} oldest txs"
+            )
+
+    def describe(self):
+        return f"{len(self._outputs)} txs ({self._n_outputs} outputs)"
+
+    def __len__(self):
+        return self._n_outputs
+
+
+def _pack_entry(entry: tuple) -> bytes:
+    return msgpack.packb(entry, use_bin_type=True)
+
+
+def _unpack_entry(blob: bytes) -> tuple:
+    return tuple(msgpack.unpackb(blob, raw=False))
+
+
+class DiskOutputStore(OutputStore):
+    """Hot in-memory tier over a persistent SQLite UTXO set.
+
+    The hot tier holds up to ``hot_entries`` txs in insertion order. When it
+    overflows, the oldest half is spilled to disk in one transaction.
+    :meth:`prefetch` copies requested txs from disk into the hot tier, so
+    lookups during a batch never touch SQLite. Their rows stay on disk until
+    the outputs are spent, so spilling them again needs no write.
+
+    Durability: disk writes are committed on spill and on :meth:`close`; a
+    row is only deleted when its output is spent, which the ingest pipeline
+    defers until the spending chunk is written. After a crash the file
+    rolls back to the last commit; outputs that only lived in the hot tier
+    are then resolved via RPC again, and stale (already spent) rows are
+    harmless since they are never looked up a second time.
+    """
+
+    def __init__(self, path: str, hot_entries: int = 2**21, mmap_bytes=2**30):
+        super().__init__()
+        self.path = path
+        self.hot_entries = hot_entries
+        self._hot: Dict[str, OutputsByIndex] = {}
+        # Hot txs whose unspent outputs also have rows on disk.
+        self._on_disk: Set[str] = set()
+        # Outputs of hot txs that are not on disk (yet).
+        self._hot_outputs = 0
+        self._lock = threading.Lock()
+        dirname = os.path.dirname(path)
+        if dirname:
+            os.makedirs(dirname, exist_ok=True)
+        # Accessed from the IngestRunner prefetch thread, serialized by _lock.
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(f"PRAGMA mmap_size={int(mmap_bytes)}")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS outputs ("
+            " tx_hash BLOB NOT NULL,"
+            " output_index INTEGER NOT NULL,"
+            " entry BLOB NOT NULL,"
+            " PRIMARY KEY (tx_hash, output_index)"
+            ") WITHOUT ROWID"
+        )
+        self._db.commit()
+        self._disk_outputs = self._db.execute(
+            "SELECT COUNT(*) FROM outputs"
+        ).fetchone()[0]
+
+    @property
+    def disk_outputs(self) -> int:
+        """Approximate number of outputs on disk (exact after open)."""
+        return self._disk_outputs
+
+    def add_outputs(self, tx_hash, by_index):
+        with self._lock:
+            previous = self._hot.get(tx_hash)
+            if previous is not None and tx_hash not in self._on_disk:
+                self._hot_outputs -= len(previous)
+            self._hot[tx_hash] = by_index
+            self._on_disk.discard(tx_hash)
+            self._hot_outputs += len(by_index)
+
+    def prefetch(self, tx_hashes):
+        with self._lock:
+            found = set()
+            missing = []
+            for h in tx_hashes:
+                if h in self._hot:
+                    found.add(h)
+                else:
+                    missing.append(h)
+            found.update(self._load_from_disk(missing))
+            return found
+
+    def get(self, tx_hash, index):
+        with self._lock:
+            by_index = self._hot.get(tx_hash)
+            if by_index is None:
+                self._load_from_disk([tx_hash])
+                by_index = self._hot.get(tx_hash)
+            return by_index.get(index) if by_index is not None else None
+
+    def spend(self, keys):
+        disk_keys = []
+        with self._lock:
+            for tx_hash, index in keys:
+                by_index = self._hot.get(tx_hash)
+                on_disk = by_index is None or tx_hash in self._on_disk
+                if on_disk:
+                    disk_keys.append((bytes.fromhex(tx_hash), index))
+                if by_index is None:
+                    continue
+                if by_index.pop(index, None) is not None and not on_disk:
+                    self._hot_outputs -= 1
+                if not by_index:
+                    del self._hot[tx_hash]
+                    self._on_disk.discard(tx_hash)
+            if disk_keys:
+                cur = self._db.executemany(
+                    "DELETE FROM outputs WHERE tx_hash = ? AND output_index = ?",
+                    disk_keys,
+                )
+                self._disk_outputs -= max(cur.rowcount, 0)
+
+    def trim(self):
+        with self._lock:
+            if len(self._hot) > self.hot_entries:
+                n_spill = len(self._hot) - self.hot_entries // 2
+                self._spill(list(self._hot.keys())[:n_spill])
+
+    def seed(self, rows: Iterable[Tuple[str, int, tuple]]) -> int:
+        """Write (tx_hash, output_index, entry) rows straight to disk."""
+        with self._lock:
+            cur = self._db.executemany(
+                "INSERT OR REPLACE INTO outputs VALUES (?, ?, ?)",
+                (
+                    (bytes.fromhex(tx_hash), index, _pack_entry(entry))
+                    for tx_hash, index, entry in rows
+                ),
+            )
+            self._db.commit()
+            n = max(cur.rowcount, 0)
+            self._disk_outputs += n
+            return n
+
+    def flush(self):
+        """Spill the whole hot tier to disk and commit."""
+        with self._lock:
+            self._spill(list(self._hot.keys()))
+
+    def describe(self):
+        return (
+            f"{len(self._hot)} txs in memory, ~{self._disk_outputs} outputs on "
+            f"disk, {self.pending_spends} spends pending"
+        )
+
+    def close(self):
+        self.flush()
+        with self._lock:
+            self._db.close()
+
+    def __len__(self):
+        return self._hot_outputs + self._disk_outputs
+
+    def _spill(self, tx_hashes):
+        if not tx_hashes:
+            self._db.commit()
+            return
+        t0 = time.monotonic()
+        rows = []
+        for h in tx_hashes:
+            by_index = self._hot.pop(h)
+            if h in self._on_disk:
+                # Unspent outputs are still on disk, spent ones were deleted.
+                self._on_disk.discard(h)
+                continue
+            key = bytes.fromhex(h)
+            self._hot_outputs -= len(by_index)
+            for index, entry in by_index.items():
+                rows.append((key, index, _pack_entry(entry)))
+        self._db.executemany("INSERT OR REPLACE INTO outputs VALUES (?, ?, ?)", rows)
+        self._db.commit()
+        self._disk_outputs += len(rows)
+        logger.info(
+            f"Spilled {len(tx_hashes)} txs ({len(rows)} outputs) to "
+            f"{self.path} in {time.monotonic() - t0:.2f}s"
+        )
+
+    def _load_from_disk(self, tx_hashes) -> Set[str]:
+        """Copy rows of ``tx_hashes`` from disk into the hot tier.
+
+        The rows stay on disk: deleting them here would commit with the next
+        spill while the outputs only live in memory, and a crash would then
+        lose them from both tiers.
+        """
+        found = set()
+        for i in range(0, len(tx_hashes), _SQLITE_IN_CHUNK):
+            keys = [bytes.fromhex(h) for h in tx_hashes[i : i + _SQLITE_IN_CHUNK]]
+            placeholders = ",".join("?" * len(keys))
+            rows = self._db.execute(
+                "SELECT tx_hash, output_index, entry FROM outputs "
+                f"WHERE tx_hash IN ({placeholders})",
+                keys,
+            ).fetchall()
+            if not rows:
+                continue
+            for key, index, blob in rows:
+                h = key.hex()
+                self._hot.setdefault(h, {})[index] = _unpack_entry(blob)
+                found.add(h)
+        self._on_disk.update(found)
+        return found
+
+
+def create_output_store(
+    network: str,
+    store_dir: Optional[str] = None,
+    hot_entries: int = 2**21,
+    max_memory_entries: int = 2**23,
+) -> OutputStore:
+    if store_dir is None:
+        return MemoryOutputStore(max_entries=max_memory_entries)
+    path = os.path.join(store_dir, f"{network}_outputs.sqlite")
+    store = DiskOutputStore(path, hot_entries=hot_entries)
+    logger.info(f"Using on-disk output store {path} ({store.describe()})")
+    return store
+
+
+def seed_output_store_from_delta(
+    store: DiskOutputStore,
+    directory: str,
+    end_block: int,
+    partition_size: int,
+    s3_credentials: Optional[dict] = None,
+) -> int:
+    """Rebuild the UTXO set up to and including ``end_block`` from delta.
+
+    Reads the ``transaction`` table partition by partition in block order:
+    outputs of a partition are inserted first, then everything spent in that
+    partition is deleted, so the file never grows much past the UTXO set.
+    Returns the number of unspent outputs written.
+    """
+    import pyarrow.compute as pc
+    from deltalake import DeltaTable
+
+    if s3_credentials:
+        storage_options = {
+            "AWS_ALLOW_HTTP": "true",
+            "AWS_S3_ALLOW_UNSAFE_RENAME": "false",
+            "AWS_CONDITIONAL_PUT": "etag",
+        }
+        storage_options.update(s3_credentials)
+    else:
+        storage_options = {}
+
+    dataset = DeltaTable(
+        f"{directory}/transaction", storage_options=storage_options
+    ).to_pyarrow_dataset()
+
+    t0 = time.monotonic()
+    for partition in range(end_block // partition_size + 1):
+        flt = (pc.field("partition") == partition) & (pc.field("block_id") <= end_block)
+        spent = []
+        for batch in dataset.to_batches(
+            columns=["tx_hash", "outputs", "inputs"], filter=flt
+        ):
+            rows = []
+            for tx_hash, outputs, inputs in zip(
+                batch.column("tx_hash").to_pylist(),
+                batch.column("outputs").to_pylist(),
+                batch.column("inputs").to_pylist(),
+            ):
+                h = tx_hash.hex()
+                for o in outputs or []:
+                    needs_script = not o["addresses"] or o["type"] == "nonstandard"
+                    entry = (
+                        o["value"],
+                        o["addresses"],
+                        o["type"],
+                        o["script_hex"] if needs_script else None,
+                    )
+                    rows.append((h, o["index"], entry))
+                for i in inputs or []:
+                    if i["spent_transaction_hash"] is not None:
+                        spent.append(
+                            (i["spent_transaction_hash"].hex(), i["spent_output_index"])
+                        )
+            store.seed(rows)
+        store.spend(spent)
+        store.flush()
+        logger.info(
+            f"Seeded output store from delta partition {partition} "
+            f"({store.describe()}, {time.monotonic() - t0:.0f}s)"
+        )
+    return store.disk_outputs
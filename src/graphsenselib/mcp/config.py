@@ -206,7 +206,7 @@ class GSMCPConfig(BaseSettings):
         default=None,
         description=(
             "External proprietary search_neighbors forward. When unset, the tool "
-            "is not registered."
+            "runs the in-process address neighbor search instead."
         ),
     )
 
@@ -7,6 +7,7 @@ from typing import Any
 
 from graphsenselib.mcp.config import GSMCPConfig
 from graphsenselib.mcp.curation import CurationFile, CurationError
+from graphsenselib.mcp.tools.search_neighbors import register_local
 
 logger = logging.getLogger(__name__)
 
@@ -38,8 +39,9 @@ def register_custom_tools(
 
     Every tool listed under curation.consolidated_tools is registered via its
     module:callable reference. External tools (e.g. search_neighbors) are
-    registered only if both enabled in curation AND configured in
-    GSMCPConfig.
+    registered only if enabled in curation; search_neighbors forwards to the
+    external service when configured in GSMCPConfig and falls back to the
+    in-process address neighbor search otherwise.
     """
     for tool in curation.consolidated_tools:
         register_fn = _resolve(tool.module)
@@ -52,10 +54,11 @@ def register_custom_tools(
             continue
         if name == "search_neighbors":
             if config.search_neighbors is None:
-                logger.warning(
-                    "external tool 'search_neighbors' is enabled in curation but "
-                    "GS_MCP_SEARCH_NEIGHBORS__* is not configured; skipping."
+                logger.info(
+                    "GS_MCP_SEARCH_NEIGHBORS__* is not configured; registering "
+                    "'search_neighbors' against the in-process neighbor search."
                 )
+                register_local(mcp, app, stack)
                 continue
             register_fn = _resolve(spec.module)
             register_fn(mcp, config.search_neighbors, stack)
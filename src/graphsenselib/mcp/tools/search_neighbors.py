@@ -11,6 +11,12 @@ import httpx
 from fastmcp.exceptions import ToolError
 
 from graphsenselib.mcp.config import SearchNeighborsConfig
+from graphsenselib.mcp.tools.consolidated import _get_json, _make_client, _validate_id
+from graphsenselib.web.service.addresses_service import (
+    MAX_SEARCH_BREADTH,
+    MAX_SEARCH_DEPTH,
+    MAX_SEARCH_TIME,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -179,3 +185,81 @@ def register(mcp, config: SearchNeighborsConfig, stack: AsyncExitStack) -> None:
         task_id = await client.start_search(network, params)
         logger.info("started upstream search task %s", task_id)
         return await client.poll(task_id)
+
+
+def register_local(mcp, app, stack: AsyncExitStack) -> None:
+    """Attach a search_neighbors tool backed by the app's own
+    `search_address_neighbors` route, for deployments without the external
+    search service. Same signature as the forwarding tool.
+    """
+
+    @mcp.tool(tags={"gs_address-level", "gs_neighbors", "gs_tracing"})
+    async def search_neighbors(
+        network: str,
+        start_address: str,
+        direction: Literal["in", "out"] = "out",
+        search_type: Literal[
+            "quicklock",
+            "addr_only",
+            "utxo_links_only",
+            "chronological_links_only",
+            "last_links_only",
+        ] = "addr_only",
+        match_keywords: Optional[list[str]] = None,
+        prune_keywords: Optional[list[str]] = None,
+        max_search_depth: int = 5,
+        max_search_breadth: int = 200,
+        search_time_seconds: int = 5,
+        max_nr_results: Optional[int] = None,
+    ) -> dict[str, Any]:
+        """Search the transaction graph for neighbors of an address that match
+        specific labels or categories (e.g. "exchange", "mixer"). Returns one
+        path from the start address per match.
+
+        Args:
+            network: Network identifier, lowercase (e.g. "btc", "eth", "trx").
+            start_address: Address to start the search from.
+            direction: "out" = outgoing funds, "in" = incoming funds.
+            search_type: Only "addr_only" (trace the address graph) is
+                supported by this deployment.
+            match_keywords: Categories/labels/addresses to find (required).
+            prune_keywords: Categories/labels/addresses to stop exploring at.
+            max_search_depth: Maximum hops from the start address (capped
+                at 10).
+            max_search_breadth: Max neighbours explored per hop (capped at
+                1000).
+            search_time_seconds: Search timeout (capped at 60).
+            max_nr_results: Stop after finding N results (optional).
+
+        Returns:
+            The search `state` ("done", "timeout" or
+            "query_budget_exhausted") and the discovered paths.
+        """
+        _validate_network(network)
+        _validate_id("start_address", start_address)
+        if search_type != "addr_only":
+            raise ToolError(
+                f"search_type {search_type!r} is not available here; use 'addr_only'."
+            )
+        if not match_keywords:
+            raise ToolError("match_keywords must name at least one keyword.")
+
+        params: dict[str, Any] = {
+            "direction": direction,
+            "match_keywords": ",".join(match_keywords),
+            "depth": max(1, min(max_search_depth, MAX_SEARCH_DEPTH)),
+            "breadth": max(1, min(max_search_breadth, MAX_SEARCH_BREADTH)),
+            "search_time_seconds": max(1, min(search_time_seconds, MAX_SEARCH_TIME)),
+        }
+        if prune_keywords:
+            params["prune_keywords"] = ",".join(prune_keywords)
+        if max_nr_results:
+            params["max_results"] = max_nr_results
+
+        client = _make_client(app)
+        async with client:
+            return await _get_json(
+                client,
+                f"/{network}/addresses/{start_address}/search",
+                params=params,
+            )
@@ -11,6 +11,7 @@ directly.
 
 from __future__ import annotations
 
+from functools import lru_cache
 from typing import Any, Dict, Iterable, List, Optional
 
 from graphsenselib.utils.ec import is_valid_secp256k1_pubkey, secp256k1_compress
@@ -30,6 +31,11 @@ _DEFAULT_CHAIN_ID = {
 # ---------------------------------------------------------------------------
 
 
+# Hot keys (exchange wallets, miners) sign many inputs per batch; their curve
+# validation is cached per executor process.
+_COMPRESSED_CACHE_SIZE = 1 << 16
+
+
 def _to_compressed(pubkey: bytes) -> Optional[bytes]:
     """Return ``pubkey`` as a 33-byte compressed secp256k1 key, or None.
 
@@ -39,21 +45,28 @@ def _to_compressed(pubkey: bytes) -> Optional[bytes]:
     """
     if not pubkey:
         return None
-    if len(pubkey) == 33 and pubkey[0] in (0x02, 0x03):
+    if (len(pubkey) == 33 and pubkey[0] in (0x02, 0x03)) or (
+        len(pubkey) == 65 and pubkey[0] == 0x04
+    ):
+        return _validated_key(bytes(pubkey))
+    return None
+
+
+@lru_cache(maxsize=_COMPRESSED_CACHE_SIZE)
+def _validated_key(pubkey: bytes) -> Optional[bytes]:
+    if len(pubkey) == 33:
         try:
             if not is_valid_secp256k1_pubkey(pubkey):
                 return None
         except Exception:
             return None
-        return bytes(pubkey)
-    if len(pubkey) == 65 and pubkey[0] == 0x04:
-        try:
-            if not is_valid_secp256k1_pubkey(pubkey):
-                return None
-            return secp256k1_compress(bytes(pubkey))
-        except Exception:
+        return pubkey
+    try:
+        if not is_valid_secp256k1_pubkey(pubkey):
             return None
-    return None
+        return secp256k1_compress(pubkey)
+    except Exception:
+        return None
 
 
 # ---------------------------------------------------------------------------
@@ -237,6 +250,17 @@ def extract_pubkeys_utxo(inputs: Iterable[Dict[str, Any]]) -> List[bytes]:
     return out
 
 
+def extract_pubkeys_utxo_column(
+    inputs_column: Iterable[Optional[Iterable[Dict[str, Any]]]],
+) -> List[List[bytes]]:
+    """Column variant of :func:`extract_pubkeys_utxo` (one list per tx).
+
+    Meant for a whole Arrow batch (``column.to_pylist()``); keys repeated
+    within and across batches are validated once via the key cache.
+    """
+    return [extract_pubkeys_utxo(inputs) for inputs in inputs_column]
+
+
 _OP_CHECKSIG = 0xAC
 
 
@@ -292,6 +316,13 @@ def extract_pubkeys_utxo_outputs(outputs: Iterable[Dict[str, Any]]) -> List[byte
     return out
 
 
+def extract_pubkeys_utxo_outputs_column(
+    outputs_column: Iterable[Optional[Iterable[Dict[str, Any]]]],
+) -> List[List[bytes]]:
+    """Column variant of :func:`extract_pubkeys_utxo_outputs` (one list per tx)."""
+    return [extract_pubkeys_utxo_outputs(outputs) for outputs in outputs_column]
+
+
 # ---------------------------------------------------------------------------
 # Account model: ECDSA recovery from (v, r, s) + reconstructed msg_hash
 # ---------------------------------------------------------------------------
@@ -9,15 +9,15 @@ Pipeline per run, all under one ``SparkSession``:
 1. Read ``last_processed_block`` for this network from ``<pubkey_delta>/state``.
 2. Read source delta ``transaction`` for ``(last, end_block]``, extract
    compressed pubkeys via a pandas UDF (UTXO or account variant chosen by
-   currency), distinct.
+   currency; UTXO chains extract a whole Arrow batch at a time), distinct.
 3. Append the ``(pubkey, network)`` pairs to ``<pubkey_delta>/observed``
    (partitioned by network). Append-only: duplicates from re-observed hot
    keys are tolerated by detection and removed periodically by
    ``compact_observed``.
 4. Find pubkeys seen on >= 2 networks and not yet in
    ``<pubkey_delta>/materialized``; derive their addresses for every chain
-   that ``convert_pubkey_to_addresses`` supports via a pandas UDF; write
-   the resulting ``(address, pubkey)`` rows to Cassandra.
+   that ``convert_pubkey_to_addresses`` supports, a whole Arrow batch at a
+   time; write the resulting ``(address, pubkey)`` rows to Cassandra.
 5. Append the just-materialised pubkeys to ``<pubkey_delta>/materialized``
    and bump the state row.
 """
@@ -61,62 +61,30 @@ BCH_FORK_BLOCK = chain_forks["bch"]["fork_block"]
 DERIVATION_CHAINS = ("btc", "doge", "ltc", "zec", "eth", "trx", "bch")
 
 
-def _materialised_addresses_schema():
-    """Return-type schema for the address-derivation pandas UDF."""
-    from pyspark.sql.types import (
-        ArrayType,
-        StringType,
-        StructField,
-        StructType,
-    )
-
-    return ArrayType(StructType([StructField("address", StringType(), nullable=False)]))
-
-
-def _extract_pubkeys_udf_utxo():
-    """Pandas UDF: array<input-struct> -> array<binary>.
-
-    Returns one row of compressed-pubkey blobs per input tx. Callers
-    explode the result to one (pubkey, …) row per signing key.
-    """
-    from pyspark.sql import functions as F
-    from pyspark.sql.types import ArrayType, BinaryType
-
-    from graphsenselib.pubkey.extract import extract_pubkeys_utxo
-
-    @F.udf(returnType=ArrayType(BinaryType()))
-    def _udf(inputs):
-        if inputs is None:
-            return []
-        as_dicts = [
-            i.asDict(recursive=True) if hasattr(i, "asDict") else i for i in inputs
-        ]
-        return list(extract_pubkeys_utxo(as_dicts))
-
-    return _udf
-
+def _extract_pubkeys_utxo_arrow(batches):
+    """mapInArrow: batches of ``(inputs, outputs)`` -> batches of ``pubkey``.
 
-def _extract_pubkeys_udf_utxo_outputs():
-    """Pandas UDF: array<output-struct> -> array<binary>.
-
-    P2PK / bare-P2MS reveal their keys in the output script, so those are
-    extracted from outputs in addition to the input-side keys.
+    Input-side keys (P2PKH, P2WPKH, P2SH/P2WSH multisig, …) and output-side
+    keys (P2PK, bare P2MS) of the whole batch, deduplicated within the batch.
     """
-    from pyspark.sql import functions as F
-    from pyspark.sql.types import ArrayType, BinaryType
-
-    from graphsenselib.pubkey.extract import extract_pubkeys_utxo_outputs
+    import pyarrow as pa
 
-    @F.udf(returnType=ArrayType(BinaryType()))
-    def _udf(outputs):
-        if outputs is None:
-            return []
-        as_dicts = [
-            o.asDict(recursive=True) if hasattr(o, "asDict") else o for o in outputs
-        ]
-        return list(extract_pubkeys_utxo_outputs(as_dicts))
+    from graphsenselib.pubkey.extract import (
+        extract_pubkeys_utxo_column,
+        extract_pubkeys_utxo_outputs_column,
+    )
 
-    return _udf
+    for batch in batches:
+        keys = {}
+        for per_tx in extract_pubkeys_utxo_column(batch.column("inputs").to_pylist()):
+            keys.update(dict.fromkeys(per_tx))
+        for per_tx in extract_pubkeys_utxo_outputs_column(
+            batch.column("outputs").to_pylist()
+        ):
+            keys.update(dict.fromkeys(per_tx))
+        yield pa.RecordBatch.from_arrays(
+            [pa.array(list(keys), type=pa.binary())], names=["pubkey"]
+        )
 
 
 def _extract_pubkey_udf_account(currency: str):
@@ -140,44 +108,36 @@ def _extract_pubkey_udf_account(currency: str):
     return _udf
 
 
-def _derive_addresses_udf(chains: Iterable[str]):
-    """UDF: compressed-pubkey bytes -> array<struct<address>>.
+def _derive_addresses_arrow(chains: Iterable[str]):
+    """mapInArrow function: batches of ``pubkey`` -> ``(address, pubkey)`` rows.
 
-    Calls ``convert_pubkey_to_addresses`` and flattens its nested
-    ``{currency: {form: address}}`` shape into a single list of address
-    strings. Errors (e.g. an off-curve key that snuck through) yield an
-    empty list rather than failing the whole batch.
+    Derives every address ``convert_pubkey_to_addresses`` yields for
+    ``chains`` for a whole batch at once (``derive_addresses_many``: bulk
+    hashing and base58/bech32/cashaddr encoding). A key with no derivable
+    address (e.g. an off-curve key that snuck through) produces no rows
+    rather than failing the batch.
     """
-    from pyspark.sql import functions as F
-
-    from graphsenselib.utils.pubkey_to_address import convert_pubkey_to_addresses
-
     chain_list = list(chains)
 
-    @F.udf(returnType=_materialised_addresses_schema())
-    def _udf(pubkey_bytes):
-        if pubkey_bytes is None:
-            return []
-        try:
-            pk_hex = bytes(pubkey_bytes).hex()
-            all_addrs = convert_pubkey_to_addresses(pk_hex, currencies=chain_list)
-        except Exception:
-            return []
-        out = []
-        seen = set()
-        for forms in all_addrs.values():
-            if not isinstance(forms, dict):
-                continue
-            for key, val in forms.items():
-                if key == "error":
-                    continue
-                if not isinstance(val, str) or not val or val in seen:
-                    continue
-                seen.add(val)
-                out.append({"address": val})
-        return out
+    def _map(batches):
+        import pyarrow as pa
+
+        from graphsenselib.utils.pubkey_to_address import derive_addresses_many
+
+        for batch in batches:
+            pubkeys = batch.column("pubkey").to_pylist()
+            addresses, owners = [], []
+            for pubkey, derived in zip(
+                pubkeys, derive_addresses_many(pubkeys, chain_list)
+            ):
+                addresses.extend(derived)
+                owners.extend([pubkey] * len(derived))
+            yield pa.RecordBatch.from_arrays(
+                [pa.array(addresses, type=pa.string()), pa.array(owners, pa.binary())],
+                names=["address", "pubkey"],
+            )
 
-    return _udf
+    return _map
 
 
 class PubkeyUpdate:
@@ -269,8 +229,6 @@ class PubkeyUpdate:
         tx_df = self._read_source_transactions(start_block, end_block)
 
         if self.currency in UTXO_CURRENCIES:
-            in_udf = _extract_pubkeys_udf_utxo()
-            out_udf = _extract_pubkeys_udf_utxo_outputs()
             # Ship only the fields each extractor reads (inputs: script_hex +
             # txinwitness; outputs: script_hex). The raw structs also carry
             # spent_transaction_hash, addresses, value, type, … which would
@@ -287,11 +245,12 @@ class PubkeyUpdate:
                 F.col("outputs"),
                 lambda o: F.struct(o["script_hex"].alias("script_hex")),
             )
-            in_keys = tx_df.select(F.explode(in_udf(slim_inputs)).alias("pubkey"))
-            out_keys = tx_df.select(F.explode(out_udf(slim_outputs)).alias("pubkey"))
-            # Union input- and output-side keys; the trailing dropDuplicates
-            # collapses keys that appear in both (e.g. a P2PK output later spent).
-            pubkeys = in_keys.unionByName(out_keys)
+            # Input- and output-side keys come from one Arrow pass per batch;
+            # the trailing dropDuplicates collapses keys across batches (e.g.
+            # a P2PK output spent in a later block).
+            pubkeys = tx_df.select(
+                slim_inputs.alias("inputs"), slim_outputs.alias("outputs")
+            ).mapInArrow(_extract_pubkeys_utxo_arrow, "pubkey binary")
         elif self.currency in ACCOUNT_CURRENCIES:
             sig_struct = F.struct(
                 F.col("tx_hash"),
@@ -476,21 +435,16 @@ def detect_and_materialise_cross_chain(
         return
     logger.info(f"Materialising {count} newly cross-chain pubkey(s).")
 
-    derive_udf = _derive_addresses_udf(DERIVATION_CHAINS)
     out_rows = (
-        to_write.select(
-            F.col("pubkey"),
-            F.explode(derive_udf(F.col("pubkey"))).alias("addr_struct"),
-        )
-        .select(
-            F.col("addr_struct.address").alias("address"),
-            F.col("pubkey").alias("pubkey"),
+        to_write.select("pubkey")
+        .mapInArrow(
+            _derive_addresses_arrow(DERIVATION_CHAINS), "address string, pubkey binary"
         )
         .cache()
     )
 
-    # Only pubkeys that produced >=1 address count as "materialised". explode()
-    # already dropped keys whose derivation yields nothing (off-curve/special,
+    # Only pubkeys that produced >=1 address count as "materialised". The
+    # derivation emits no rows for keys that yield nothing (off-curve/special,
     # e.g. the secp256k1 generator point), so they are absent from out_rows.
     # Marking only the derived keys means an undrivable key is neither silently
     # recorded as done nor lost: it surfaces in the warning below and is retried
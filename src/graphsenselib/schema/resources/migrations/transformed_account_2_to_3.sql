@@ -0,0 +1,6 @@
+CREATE TABLE IF NOT EXISTS address_ids_by_address_suffix (
+    address_suffix text,
+    address blob,
+    address_id int,
+    PRIMARY KEY (address_suffix, address)
+);
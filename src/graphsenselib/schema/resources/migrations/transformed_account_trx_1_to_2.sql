@@ -0,0 +1,20 @@
+CREATE TABLE IF NOT EXISTS address_transactions_secondary_groups (
+    address_id_group int,
+    address_id int,
+    address_id_secondary_group int,
+    PRIMARY KEY (address_id_group, address_id, address_id_secondary_group)
+);
+
+CREATE TABLE IF NOT EXISTS address_incoming_relations_secondary_groups (
+    dst_address_id_group int,
+    dst_address_id int,
+    dst_address_id_secondary_group int,
+    PRIMARY KEY (dst_address_id_group, dst_address_id, dst_address_id_secondary_group)
+);
+
+CREATE TABLE IF NOT EXISTS address_outgoing_relations_secondary_groups (
+    src_address_id_group int,
+    src_address_id int,
+    src_address_id_secondary_group int,
+    PRIMARY KEY (src_address_id_group, src_address_id, src_address_id_secondary_group)
+);
@@ -55,6 +55,13 @@ CREATE TABLE address_ids_by_address_prefix (
     PRIMARY KEY (address_prefix, address)
 );
 
+CREATE TABLE address_ids_by_address_suffix (
+    address_suffix text,
+    address blob,
+    address_id int,
+    PRIMARY KEY (address_suffix, address)
+);
+
 CREATE TABLE block_transactions(
     block_id_group int,
     block_id int,
@@ -78,6 +85,13 @@ CREATE TABLE address_transactions_secondary_ids (
     max_secondary_id int
 );
 
+CREATE TABLE address_transactions_secondary_groups (
+    address_id_group int,
+    address_id int,
+    address_id_secondary_group int,
+    PRIMARY KEY (address_id_group, address_id, address_id_secondary_group)
+);
+
 CREATE TABLE address (
     address_id_group int,
     address_id int,
@@ -116,6 +130,13 @@ CREATE TABLE address_incoming_relations_secondary_ids (
     max_secondary_id int
 );
 
+CREATE TABLE address_incoming_relations_secondary_groups (
+    dst_address_id_group int,
+    dst_address_id int,
+    dst_address_id_secondary_group int,
+    PRIMARY KEY (dst_address_id_group, dst_address_id, dst_address_id_secondary_group)
+);
+
 CREATE TABLE address_outgoing_relations (
     src_address_id_group int,
     src_address_id_secondary_group int,
@@ -132,6 +153,13 @@ CREATE TABLE address_outgoing_relations_secondary_ids (
     max_secondary_id int
 );
 
+CREATE TABLE address_outgoing_relations_secondary_groups (
+    src_address_id_group int,
+    src_address_id int,
+    src_address_id_secondary_group int,
+    PRIMARY KEY (src_address_id_group, src_address_id, src_address_id_secondary_group)
+);
+
 CREATE TABLE summary_statistics (
     id int PRIMARY KEY,
     timestamp int,
@@ -30,7 +30,12 @@ from graphsenselib.tagpack.tagpack import (
     get_uri_for_tagpack,
 )
 from graphsenselib.tagpack.tagpack_schema import TagPackSchema, ValidationError
-from graphsenselib.tagpack.tagstore import InsertTagpackWorker, TagStore
+from graphsenselib.tagpack.tagstore import (
+    InsertTagpackWorker,
+    TagStore,
+    init_prepare_worker,
+    prepare_in_worker,
+)
 from graphsenselib.tagpack.utils import strip_empty, normalize_id
 from graphsenselib.tagpack.constants import (
     CONFIG_FILE,
@@ -68,6 +73,11 @@ def _timed_phase(name: str):
 
 DEFAULT_ACTORPACK_URL = "https://raw.githubusercontent.com/graphsense/graphsense-tagpacks/master/actors/graphsense.actorpack.yaml"
 
+# Cluster-mapping feeder: addresses resolved per pipelined lookup chunk, and
+# chunks handled by one worker (one Cassandra + Postgres session) in a row.
+CLUSTER_MAPPING_CHUNK_SIZE = 5_000
+CLUSTER_MAPPING_CHUNKS_PER_WORKPACKAGE = 20
+
 
 def override_postgres_url(url):
     def_url, url_msg = read_url_from_env()
@@ -1060,8 +1070,19 @@ def insert_tagpack(
     )
 
     if n_processes != 1:
-        with Pool(processes=n_processes) as pool:
-            results = list(pool.imap_unordered(worker, packs, chunksize=10))
+        # parse/validate in the pool; this process is the only DB writer and
+        # keeps the connection, the parsing processes get the worker once
+        with Pool(
+            processes=n_processes,
+            initializer=init_prepare_worker,
+            initargs=(worker,),
+        ) as pool:
+            results = [
+                worker.write(prepared)
+                for prepared in pool.imap_unordered(
+                    prepare_in_worker, packs, chunksize=10
+                )
+            ]
     else:
         # process data in the main process, makes debugging easier
         results = [worker(p) for p in packs]
@@ -1806,7 +1827,9 @@ def check_cluster_mapping_staleness(
     return overall, per_network
 
 
-def insert_cluster_mapping_wp(network, ks_mapping, args, batch, fresh):
+def insert_cluster_mapping_wp(
+    network, ks_mapping, args, batch, fresh, chunk_size=CLUSTER_MAPPING_CHUNK_SIZE
+):
     tagstore = TagStore(args.url, args.schema)
     gs = GraphSense(
         args.db_nodes,
@@ -1814,25 +1837,27 @@ def insert_cluster_mapping_wp(network, ks_mapping, args, batch, fresh):
         username=args.cassandra_username,
         password=args.cassandra_password,
     )
+    n_mappings = 0
     if gs.keyspace_for_network_exists(network):
-        clusters = gs.get_address_clusters(batch, network, fresh=False)
-        clusters["network"] = network
-        tagstore.insert_cluster_mappings(clusters, fresh=False)
-        if fresh:
-            # Dual-write during migration: fresh-marked networks map the same
-            # addresses against the fresh membership into the *_v2 relations,
-            # so legacy-id readers (v1) and fresh-id readers (v2) both stay
-            # current until the legacy cluster tables are retired.
-            fresh_clusters = gs.get_address_clusters(batch, network, fresh=True)
-            fresh_clusters["network"] = network
-            tagstore.insert_cluster_mappings(fresh_clusters, fresh=True)
+        # Dual-write during migration: fresh-marked networks map the same
+        # addresses against the fresh membership into the *_v2 relations,
+        # so legacy-id readers (v1) and fresh-id readers (v2) both stay
+        # current until the legacy cluster tables are retired.
+        for regime in (False, True) if fresh else (False,):
+            # mapping chunks go to the tagstore as soon as they are resolved
+            for clusters in gs.iter_address_clusters(
+                batch, network, fresh=regime, chunk_size=chunk_size
+            ):
+                clusters["network"] = network
+                tagstore.insert_cluster_mappings(clusters, fresh=regime)
+                if not regime:
+                    n_mappings += len(clusters)
     else:
-        clusters = []
         logger.error(
             "At least one of the configured keyspaces"
             f" for network {network} does not exist."
         )
-    return (network, len(clusters))
+    return (network, n_mappings)
 
 
 def load_ks_mapping(args):
@@ -1894,7 +1919,7 @@ def insert_cluster_mapping(
     ks_file,
     use_gs_lib_config_env,
     update,
-    batch_size=5_000,
+    batch_size=CLUSTER_MAPPING_CHUNK_SIZE,
 ):
     # Use the module-level class instead
     args = ClusterMappingArgs(
@@ -1932,12 +1957,23 @@ def insert_cluster_mapping(
         )
         sys.exit(1)
 
+    # Each work package streams its addresses through one pipelined lookup
+    # in batch_size chunks, so packages can be much larger than a batch.
     workpackages = []
     for network, data in df.groupby("network"):
         if gs.contains_keyspace_mapping(network):
-            for batch in _split_into_chunks(data, batch_size):
+            for batch in _split_into_chunks(
+                data, batch_size * CLUSTER_MAPPING_CHUNKS_PER_WORKPACKAGE
+            ):
                 workpackages.append(
-                    (network, ks_mapping, args, batch, network in fresh_networks)
+                    (
+                        network,
+                        ks_mapping,
+                        args,
+                        batch,
+                        network in fresh_networks,
+                        batch_size,
+                    )
                 )
 
     nr_workers = int(cpu_count() / 2)
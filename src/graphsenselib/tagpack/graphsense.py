@@ -1,13 +1,15 @@
 # -*- coding: utf-8 -*-
 # flake8: noqa: T201
-from typing import Optional
+import time
+from collections import deque
+from typing import Callable, Iterable, Iterator, NamedTuple, Optional
 
 import numpy as np
 from cassandra.auth import PlainTextAuthProvider
 from cassandra.cluster import Cluster
 from cassandra.concurrent import execute_concurrent_with_args
 from cassandra.query import dict_factory
-from pandas import DataFrame
+from pandas import DataFrame, Series
 from pandas import pandas as pd
 from tenacity import (
     before_sleep_log,
@@ -91,6 +93,20 @@ def eth_address_to_hex_str(address):
     return "0x" + address.hex()
 
 
+def eth_addresses_from_hex(addresses: Series) -> list:
+    """Column-wise :func:`eth_address_from_hex`: bytes, or None if invalid."""
+    hex_parts = addresses.str[2:].str.lower()
+    valid = hex_parts.str.fullmatch(r"(?:[0-9a-f]{2})*").fillna(False)
+    out = []
+    for address, h, ok in zip(addresses, hex_parts, valid):
+        if ok:
+            out.append(bytes.fromhex(h))
+        else:
+            logger.warning(f"can't convert to hex {address}")
+            out.append(None)
+    return out
+
+
 def eth_address_from_hex(address):
     # eth addresses are case insensitive
     try:
@@ -104,11 +120,68 @@ def eth_address_from_hex(address):
 _CONCURRENCY = 100
 _MAX_QUERY_EXECUTION_ATTEMPTS = 3
 
+_ADDRESS_ID_QUERY = (
+    "SELECT address, address_id "
+    "FROM address_ids_by_address_prefix "
+    "WHERE address_prefix=? and address=?"
+)
+_CLUSTER_DEFINER_QUERY = (
+    "SELECT address_id as cluster_id, "
+    "address as cluster_defining_address FROM address "
+    "WHERE address_id_group=? and address_id=?"
+)
+
 
 class QueryExecutionError(Exception):
     pass
 
 
+class _Lookup(NamedTuple):
+    statement: object
+    parameters: tuple
+    # receives the result rows, returns the lookups that depend on them
+    on_rows: Callable[[list], Optional[Iterable["_Lookup"]]]
+
+
+def _run_pipelined(session, lookups: Iterable[_Lookup], max_in_flight: int):
+    """Execute ``lookups`` and all follow-up lookups with bounded concurrency.
+
+    Follow-ups are issued before further input lookups, so a chain (address
+    -> cluster id -> cluster) completes early and the window never fills with
+    work whose results must be buffered. A failing request is retried up to
+    ``_MAX_QUERY_EXECUTION_ATTEMPTS`` times with exponential backoff.
+    """
+    lookups = iter(lookups)
+    follow_ups = deque()
+    in_flight = deque()
+    while True:
+        while len(in_flight) < max_in_flight:
+            if follow_ups:
+                lookup, attempt = follow_ups.popleft()
+            else:
+                lookup, attempt = next(lookups, None), 0
+                if lookup is None:
+                    break
+            future = session.execute_async(lookup.statement, lookup.parameters)
+            in_flight.append((future, lookup, attempt))
+        if not in_flight:
+            return
+
+        future, lookup, attempt = in_flight.popleft()
+        try:
+            rows = list(future.result())
+        except Exception as e:
+            if attempt + 1 >= _MAX_QUERY_EXECUTION_ATTEMPTS:
+                raise QueryExecutionError(
+                    f"statement failed after {attempt + 1} attempts: {e}"
+                ) from e
+            logger.warning(f"Retrying failed lookup {lookup.parameters}: {e}")
+            time.sleep(min(2.0, 0.2 * 2**attempt))
+            follow_ups.appendleft((lookup, attempt + 1))
+            continue
+        follow_ups.extend((f, 0) for f in lookup.on_rows(rows) or ())
+
+
 class GraphSense(object):
     def __init__(
         self,
@@ -228,78 +301,69 @@ class GraphSense(object):
         else:
             return False
 
-    def get_address_ids(self, df: DataFrame, network: str) -> DataFrame:
-        """Get address ids for all passed addresses"""
-        self._check_passed_params(df, network, "address")
-
-        keyspace = self.ks_map[network]["transformed"]
-        ks_config = self._query_keyspace_config(keyspace)
-        self.session.set_keyspace(keyspace)
+    def _address_id_parameters(
+        self, addresses: Series, network: str, ks_config: dict
+    ) -> DataFrame:
+        """(address_prefix, address) lookup keys of ``address_ids_by_address_prefix``.
 
-        df_temp = df[["address"]].copy()
-        df_temp = df_temp.drop_duplicates()
+        Column-wise string ops instead of per-row lambdas; unconvertible
+        addresses are dropped.
+        """
+        df_temp = DataFrame({"address": addresses.drop_duplicates()})
+        prefix_length = ks_config["address_prefix_length"]
 
         if network == "TRX":
-            # convert t-style to evm
-            df_temp["address"] = df_temp["address"].apply(try_convert_tron_to_eth)
-
+            # convert t-style to evm; base58check has no column-wise form
+            df_temp["address"] = [
+                try_convert_tron_to_eth(a) for a in df_temp["address"]
+            ]
             # filter non convertible addresses
             df_temp = df_temp[df_temp["address"].notnull()]
 
-            df_temp["address_prefix"] = df_temp["address"].str[
-                2 : 2 + ks_config["address_prefix_length"]
-            ]
-            df_temp["address_prefix"] = df_temp["address_prefix"].apply(
-                lambda x: x.upper()
-            )
-            df_temp["address"] = df_temp["address"].apply(
-                lambda x: eth_address_from_hex(x)
+        if network in ("TRX", "ETH"):
+            df_temp["address_prefix"] = (
+                df_temp["address"].str[2 : 2 + prefix_length].str.upper()
             )
+            df_temp["address"] = eth_addresses_from_hex(df_temp["address"])
 
             # the last step can fail two, eg, wrongly encoded addresses
             # so we filter again filter non convertible addresses
             df_temp = df_temp[df_temp["address"].notnull()]
+        else:
+            a = df_temp["address"]
+            if "bech_32_prefix" in ks_config:
+                a = a.str.replace(ks_config["bech_32_prefix"], "", regex=False)
+            df_temp["address_prefix"] = a.str[:prefix_length]
 
-        elif network == "ETH":
-            df_temp["address_prefix"] = df_temp["address"].str[
-                2 : 2 + ks_config["address_prefix_length"]
-            ]
-            df_temp["address_prefix"] = df_temp["address_prefix"].apply(
-                lambda x: x.upper()
-            )
+        return df_temp[["address_prefix", "address"]]
 
-            df_temp["address"] = df["address"].apply(lambda x: eth_address_from_hex(x))
+    def _to_display_addresses(self, addresses: list, network: str) -> list:
+        if network == "ETH":
+            return [eth_address_to_hex_str(a) for a in addresses]
+        if network == "TRX":
+            # convert evm to t-style address
+            return [try_convert_to_tron(a) for a in addresses]
+        return addresses
 
-            # the last step can fail two, eg, wrongly encoded addresses
-            # so we filter again filter non convertible addresses
-            df_temp = df_temp[df_temp["address"].notnull()]
-        else:
-            if "bech_32_prefix" in ks_config:
-                df_temp["a"] = df_temp["address"].apply(
-                    lambda x: x.replace(ks_config["bech_32_prefix"], "")
-                )
+    def get_address_ids(self, df: DataFrame, network: str) -> DataFrame:
+        """Get address ids for all passed addresses"""
+        self._check_passed_params(df, network, "address")
 
-            df_temp["address_prefix"] = df_temp["a"].str[
-                : ks_config["address_prefix_length"]
-            ]
+        keyspace = self.ks_map[network]["transformed"]
+        ks_config = self._query_keyspace_config(keyspace)
+        self.session.set_keyspace(keyspace)
 
-        query = (
-            "SELECT address, address_id "
-            + "FROM address_ids_by_address_prefix "
-            + "WHERE address_prefix=? and address=?"
-        )
+        df_temp = self._address_id_parameters(df["address"], network, ks_config)
 
-        statement = self.session.prepare(query)
-        parameters = df_temp[["address_prefix", "address"]].to_records(index=False)
+        statement = self.session.prepare(_ADDRESS_ID_QUERY)
+        parameters = df_temp.to_records(index=False)
 
         result = self._execute_query(statement, parameters)
 
         if len(result) > 0:
-            if network == "ETH":
-                result["address"] = result["address"].apply(eth_address_to_hex_str)
-            elif network == "TRX":
-                # convert evm to t-style address
-                result["address"] = result["address"].apply(try_convert_to_tron)
+            result["address"] = self._to_display_addresses(
+                result["address"].tolist(), network
+            )
 
         return result
 
@@ -365,12 +429,7 @@ class GraphSense(object):
             df_temp["address_id"] / ks_config["bucket_size"]
         ).astype(int)
 
-        query = (
-            "SELECT address_id as cluster_id, "
-            "address as cluster_defining_address FROM address "
-            + "WHERE address_id_group=? and address_id=?"
-        )
-        statement = self.session.prepare(query)
+        statement = self.session.prepare(_CLUSTER_DEFINER_QUERY)
         parameters = df_temp[["address_id_group", "address_id"]].to_records(index=False)
 
         return self._execute_query(statement, parameters)
@@ -387,34 +446,14 @@ class GraphSense(object):
         """
         self._check_passed_params(df, network, "address")
 
-        addresses = df.copy()
-
-        if network == "ETH":
-            # tagpacks include invalid ETH addresses, ignore those
-            addresses.drop(
-                addresses[~addresses.address.str.startswith("0x")].index, inplace=True
-            )
-            addresses.rename(columns={"address": "checksum_address"}, inplace=True)
-            addresses.loc[:, "address"] = addresses["checksum_address"].str.lower()
-        elif network == "TRX":
-            addresses.rename(columns={"address": "checksum_address"}, inplace=True)
-            addresses.loc[:, "address"] = addresses["checksum_address"]
+        addresses = _cluster_lookup_input(df, network)
 
         df_address_ids = self.get_address_ids(addresses, network)
         if len(df_address_ids) == 0:
             return DataFrame()
 
         if is_eth_like(network):
-            df_address_ids["cluster_id"] = df_address_ids["address_id"]
-            df_address_ids["no_addresses"] = 1
-
-            result = df_address_ids.merge(addresses, on="address")
-
-            result.drop("address", axis="columns", inplace=True)
-            result.rename(columns={"checksum_address": "address"}, inplace=True)
-            result["cluster_defining_address"] = result["address"]
-
-            return result
+            return _account_clusters(df_address_ids, addresses)
 
         df_cluster_ids = self.get_cluster_ids(df_address_ids, network, fresh=fresh)
         if len(df_cluster_ids) == 0:
@@ -432,76 +471,128 @@ class GraphSense(object):
         if len(df_address_clusters) == 0:
             return DataFrame()
 
-        result = (
-            df_address_ids.merge(df_cluster_ids, on="address_id", how="left")
-            .merge(df_address_clusters, on="cluster_id", how="left")
-            .merge(df_cluster_definers, on="cluster_id", how="left")
+        return _merge_address_clusters(
+            df_address_ids,
+            df_cluster_ids,
+            df_address_clusters,
+            df_cluster_definers,
+            network,
         )
 
-        # Fresh clustering persists only multi-member clusters, so an address
-        # with no fresh_address_cluster row is its own singleton cluster:
-        # cluster_id == address_id, one member, self-defining. Mirrors the
-        # account-model branch above. In the legacy scheme address.cluster_id
-        # is always set, so this is a no-op there.
-        missing = result["cluster_id"].isna()
-        if missing.any():
-            result.loc[missing, "cluster_id"] = result.loc[missing, "address_id"]
-            result.loc[missing, "no_addresses"] = 1
-            result.loc[missing, "cluster_defining_address"] = result.loc[
-                missing, "address"
-            ]
-        result["cluster_id"] = result["cluster_id"].astype(int)
-
-        # A resolved cluster_id can still lack a stats row, leaving no_addresses
-        # NaN here. A single such row in a 5k batch used to abort the whole
-        # multiprocess run on the int cast below (IntCastingNaNError). Classify
-        # and log each so a full run reveals the mechanism: either the cluster
-        # table has no row for that id ("no_cluster_row"), or a row exists whose
-        # no_addresses column is NULL ("row_present_null_no_addresses").
-        size_missing = result["no_addresses"].isna()
-        if size_missing.any():
-            have_stats = (
-                set()
-                if df_address_clusters.empty
-                else set(df_address_clusters["cluster_id"].tolist())
+    def iter_address_clusters(
+        self,
+        df: DataFrame,
+        network: str,
+        fresh: bool = False,
+        chunk_size: int = 5_000,
+        max_in_flight: int = _CONCURRENCY,
+    ) -> Iterator[DataFrame]:
+        """Streaming :meth:`get_address_clusters`, one frame per chunk.
+
+        The address-id, cluster-id, cluster-stats and definer reads of a chunk
+        run as one pipelined stage: each result immediately issues the reads
+        that depend on it, with at most ``max_in_flight`` requests
+        outstanding, instead of four sequential rounds over the whole input.
+        Only one chunk of results is held in memory at a time.
+        """
+        self._check_passed_params(df, network, "address")
+        accounts = is_eth_like(network)
+
+        keyspace = self.ks_map[network]["transformed"]
+        ks_config = self._query_keyspace_config(keyspace)
+        self.session.set_keyspace(keyspace)
+        bucket_size = ks_config["bucket_size"]
+
+        address_stmt = self.session.prepare(_ADDRESS_ID_QUERY)
+        if not accounts:
+            cluster_id_stmt = self.session.prepare(_cluster_id_query(fresh))
+            stats_stmt = self.session.prepare(_cluster_stats_query(fresh))
+            definer_stmt = self.session.prepare(_CLUSTER_DEFINER_QUERY)
+
+        addresses = _cluster_lookup_input(df, network)
+        for start in range(0, len(addresses), chunk_size):
+            chunk = addresses.iloc[start : start + chunk_size]
+            id_rows, cluster_id_rows, stats_rows, definer_rows = [], [], [], []
+            seen_clusters = set()
+
+            def on_cluster_id(rows):
+                follow_ups = []
+                for row in rows:
+                    cluster_id_rows.append(row)
+                    cid = row["cluster_id"]
+                    if cid is None or cid in seen_clusters:
+                        continue
+                    seen_clusters.add(cid)
+                    key = (cid // bucket_size, cid)
+                    follow_ups.append(_Lookup(stats_stmt, key, stats_rows.extend))
+                    follow_ups.append(_Lookup(definer_stmt, key, definer_rows.extend))
+                return follow_ups
+
+            def on_address_id(rows):
+                follow_ups = []
+                for row in rows:
+                    id_rows.append(row)
+                    if not accounts:
+                        aid = row["address_id"]
+                        key = (aid // bucket_size, aid)
+                        follow_ups.append(_Lookup(cluster_id_stmt, key, on_cluster_id))
+                return follow_ups
+
+            parameters = self._address_id_parameters(
+                chunk["address"], network, ks_config
             )
-            n_no_row = n_null_col = 0
-            for r in result.loc[size_missing].itertuples(index=False):
-                cid = int(r.cluster_id)
-                row_present = cid in have_stats
-                n_null_col += row_present
-                n_no_row += not row_present
-                logger.warning(
-                    "cluster-mapping NULL size: network=%s address=%s "
-                    "address_id=%s cluster_id=%s self_ref=%s reason=%s",
-                    network,
-                    r.address,
-                    int(r.address_id),
-                    cid,
-                    int(r.address_id) == cid,
-                    "row_present_null_no_addresses"
-                    if row_present
-                    else "no_cluster_row",
-                )
-            logger.warning(
-                "cluster-mapping NULL size summary: network=%s count=%s "
-                "no_cluster_row=%s row_present_null_no_addresses=%s",
+            _run_pipelined(
+                self.session,
+                (
+                    _Lookup(address_stmt, key, on_address_id)
+                    for key in parameters.itertuples(index=False, name=None)
+                ),
+                max_in_flight,
+            )
+
+            result = self._assemble_address_clusters(
+                chunk,
                 network,
-                int(size_missing.sum()),
-                n_no_row,
-                n_null_col,
+                fresh,
+                DataFrame.from_dict(id_rows),
+                DataFrame.from_dict(cluster_id_rows),
+                DataFrame.from_dict(stats_rows),
+                DataFrame.from_dict(definer_rows),
             )
+            if not result.empty:
+                yield result
 
-        # Keep the real cluster id and store the unknown size as NULL — not a
-        # fabricated 1, which the `gs_cluster_no_addr = 1` singleton branch of
-        # the cluster-tag views would then wrongly fold the cluster's tags into.
-        result["no_addresses"] = pd.Series(
-            [None if pd.isna(v) else int(v) for v in result["no_addresses"]],
-            index=result.index,
-            dtype=object,
+    def _assemble_address_clusters(
+        self,
+        addresses: DataFrame,
+        network: str,
+        fresh: bool,
+        df_address_ids: DataFrame,
+        df_cluster_ids: DataFrame,
+        df_address_clusters: DataFrame,
+        df_cluster_definers: DataFrame,
+    ) -> DataFrame:
+        """The :meth:`get_address_clusters` result from already-read frames."""
+        if len(df_address_ids) == 0:
+            return DataFrame()
+        df_address_ids["address"] = self._to_display_addresses(
+            df_address_ids["address"].tolist(), network
+        )
+        if is_eth_like(network):
+            return _account_clusters(df_address_ids, addresses)
+        if len(df_cluster_ids) == 0:
+            if fresh:
+                return self._as_singleton_clusters(df_address_ids)
+            return DataFrame()
+        if len(df_address_clusters) == 0:
+            return DataFrame()
+        return _merge_address_clusters(
+            df_address_ids,
+            df_cluster_ids,
+            df_address_clusters,
+            df_cluster_definers,
+            network,
         )
-
-        return result
 
     def _as_singleton_clusters(self, df_address_ids: DataFrame) -> DataFrame:
         """Map every passed address to its own singleton cluster.
@@ -516,3 +607,110 @@ class GraphSense(object):
         result["no_addresses"] = 1
         result["cluster_defining_address"] = result["address"]
         return result
+
+
+def _cluster_lookup_input(df: DataFrame, network: str) -> DataFrame:
+    """Tagged addresses in lookup form; account networks keep the original
+    spelling in ``checksum_address``."""
+    addresses = df.copy()
+
+    if network == "ETH":
+        # tagpacks include invalid ETH addresses, ignore those
+        addresses.drop(
+            addresses[~addresses.address.str.startswith("0x")].index, inplace=True
+        )
+        addresses.rename(columns={"address": "checksum_address"}, inplace=True)
+        addresses.loc[:, "address"] = addresses["checksum_address"].str.lower()
+    elif network == "TRX":
+        addresses.rename(columns={"address": "checksum_address"}, inplace=True)
+        addresses.loc[:, "address"] = addresses["checksum_address"]
+    return addresses
+
+
+def _account_clusters(df_address_ids: DataFrame, addresses: DataFrame) -> DataFrame:
+    """Account model: every address is its own cluster."""
+    df_address_ids["cluster_id"] = df_address_ids["address_id"]
+    df_address_ids["no_addresses"] = 1
+
+    result = df_address_ids.merge(addresses, on="address")
+
+    result.drop("address", axis="columns", inplace=True)
+    result.rename(columns={"checksum_address": "address"}, inplace=True)
+    result["cluster_defining_address"] = result["address"]
+
+    return result
+
+
+def _merge_address_clusters(
+    df_address_ids: DataFrame,
+    df_cluster_ids: DataFrame,
+    df_address_clusters: DataFrame,
+    df_cluster_definers: DataFrame,
+    network: str,
+) -> DataFrame:
+    result = (
+        df_address_ids.merge(df_cluster_ids, on="address_id", how="left")
+        .merge(df_address_clusters, on="cluster_id", how="left")
+        .merge(df_cluster_definers, on="cluster_id", how="left")
+    )
+
+    # Fresh clustering persists only multi-member clusters, so an address
+    # with no fresh_address_cluster row is its own singleton cluster:
+    # cluster_id == address_id, one member, self-defining. Mirrors the
+    # account-model branch above. In the legacy scheme address.cluster_id
+    # is always set, so this is a no-op there.
+    missing = result["cluster_id"].isna()
+    if missing.any():
+        result.loc[missing, "cluster_id"] = result.loc[missing, "address_id"]
+        result.loc[missing, "no_addresses"] = 1
+        result.loc[missing, "cluster_defining_address"] = result.loc[missing, "address"]
+    result["cluster_id"] = result["cluster_id"].astype(int)
+
+    # A resolved cluster_id can still lack a stats row, leaving no_addresses
+    # NaN here. A single such row in a 5k batch used to abort the whole
+    # multiprocess run on the int cast below (IntCastingNaNError). Classify
+    # and log each so a full run reveals the mechanism: either the cluster
+    # table has no row for that id ("no_cluster_row"), or a row exists whose
+    # no_addresses column is NULL ("row_present_null_no_addresses").
+    size_missing = result["no_addresses"].isna()
+    if size_missing.any():
+        have_stats = (
+            set()
+            if df_address_clusters.empty
+            else set(df_address_clusters["cluster_id"].tolist())
+        )
+        n_no_row = n_null_col = 0
+        for r in result.loc[size_missing].itertuples(index=False):
+            cid = int(r.cluster_id)
+            row_present = cid in have_stats
+            n_null_col += row_present
+            n_no_row += not row_present
+            logger.warning(
+                "cluster-mapping NULL size: network=%s address=%s "
+                "address_id=%s cluster_id=%s self_ref=%s reason=%s",
+                network,
+                r.address,
+                int(r.address_id),
+                cid,
+                int(r.address_id) == cid,
+                "row_present_null_no_addresses" if row_present else "no_cluster_row",
+            )
+        logger.warning(
+            "cluster-mapping NULL size summary: network=%s count=%s "
+            "no_cluster_row=%s row_present_null_no_addresses=%s",
+            network,
+            int(size_missing.sum()),
+            n_no_row,
+            n_null_col,
+        )
+
+    # Keep the real cluster id and store the unknown size as NULL — not a
+    # fabricated 1, which the `gs_cluster_no_addr = 1` singleton branch of
+    # the cluster-tag views would then wrongly fold the cluster's tags into.
+    result["no_addresses"] = pd.Series(
+        [None if pd.isna(v) else int(v) for v in result["no_addresses"]],
+        index=result.index,
+        dtype=object,
+    )
+
+    return result
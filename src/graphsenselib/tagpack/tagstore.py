@@ -1,19 +1,20 @@
 # -*- coding: utf-8 -*-
 # flake8: noqa: T201
+import io
 import json
 import math
 import textwrap
 import time
 from datetime import datetime
 from functools import wraps
-from typing import List, Dict, Optional
+from typing import Dict, Iterable, List, NamedTuple, Optional
 
 import numpy as np
 from graphsenselib.utils.bch import bch_address_to_legacy as to_legacy_address
 from psycopg2 import connect
 from psycopg2.errors import DeadlockDetected
 from psycopg2.extensions import AsIs, register_adapter
-from psycopg2.extras import execute_batch, execute_values
+from psycopg2.extras import execute_batch
 
 from graphsenselib.tagpack import ValidationError
 from graphsenselib.tagpack.constants import KNOWN_NETWORKS
@@ -58,6 +59,144 @@ def _normalize_db_value(value):
     return value
 
 
+# Column order of the tuples built by _get_tag.
+TAG_COLUMNS = (
+    "label",
+    "source",
+    "identifier",
+    "asset",
+    "network",
+    "is_cluster_definer",
+    "confidence",
+    "lastmod",
+    "context",
+    "tagpack",
+    "actor",
+    "tag_type",
+    "tag_subject",
+)
+
+
+def _copy_field(value) -> str:
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, float) and value.is_integer():
+        # pandas turns nullable int columns into floats; COPY rejects "1.0"
+        # for integer columns where a bound parameter was cast implicitly
+        value = int(value)
+    return '"' + str(value).replace('"', '""') + '"'
+
+
+class CopyRowStream(io.TextIOBase):
+    """File-like CSV view of an iterable of row tuples for ``copy_expert``.
+
+    Rows are encoded lazily, so COPY streams arbitrarily many rows without
+    materialising the payload. Strings are always quoted, so only an unquoted
+    ``\\N`` is NULL.
+    """
+
+    def __init__(self, rows: Iterable[tuple]):
+        self._rows = iter(rows)
+        self._buffer = ""
+
+    def readable(self):
+        return True
+
+    def read(self, size=-1):
+        while size < 0 or len(self._buffer) < size:
+            row = next(self._rows, None)
+            if row is None:
+                break
+            self._buffer += ",".join(_copy_field(v) for v in row) + "\n"
+        if size < 0:
+            size = len(self._buffer)
+        out, self._buffer = self._buffer[:size], self._buffer[size:]
+        return out
+
+
+def create_tagpack_id(prefix, rel_path):
+    return ":".join([prefix, rel_path]) if prefix else rel_path
+
+
+class PreparedTagPack(NamedTuple):
+    """Row data of one tagpack, ready for :meth:`TagStore.write_tagpack`.
+
+    Plain tuples only, so it is cheap to ship from a parsing process to the
+    single writer.
+    """
+
+    tagpack_id: str
+    header: tuple  # (id, title, description, creator, uri, acl_group)
+    lastmod: Optional[datetime]
+    tags: List[tuple]  # in TAG_COLUMNS order
+    addresses: List[tuple]  # (network, address)
+    concepts: List[list]  # per tag: [(concept_id, annotation), ...]
+
+
+def prepare_tagpack(
+    tagpack,
+    tagpack_id: str,
+    is_public: bool,
+    tag_type_default,
+    lastmod: Optional[datetime],
+    actor_resolve_mapping=None,
+) -> PreparedTagPack:
+    h = _get_header(tagpack, tagpack_id)
+    header = (
+        h.get("id"),
+        h.get("title"),
+        h.get("description"),
+        h.get("creator"),
+        tagpack.uri,
+        "public" if is_public else "private",
+    )
+
+    tag_data = []
+    address_data = []
+    tag_concepts = []
+    seen_tag_keys = set()
+    skipped_count = 0
+    for tag in tagpack.get_unique_tags():
+        tag_tuple = _get_tag(tag, tagpack_id, tag_type_default, actor_resolve_mapping)
+        # Extract unique key from tag_tuple: (identifier, network, label, source)
+        # Tuple indices: 0=label, 1=source, 2=identifier, 4=network
+        unique_key = (tag_tuple[2], tag_tuple[4], tag_tuple[0], tag_tuple[1])
+
+        if unique_key in seen_tag_keys:
+            # Duplicate in incoming payload, skip it
+            identifier, network, label, source = unique_key
+            context = tag.all_fields.get("context")
+            logger.warning(
+                "Duplicate tag in incoming tagpack payload, skipping insertion: "
+                "label=%s, identifier=%s, network=%s, source=%s, context=%s",
+                label,
+                identifier,
+                network,
+                source,
+                context,
+            )
+            skipped_count += 1
+            continue
+
+        seen_tag_keys.add(unique_key)
+        tag_data.append(tag_tuple)
+        adr_and_net = _get_network_and_address(tag)
+        if adr_and_net is not None:
+            address_data.append(adr_and_net)
+        tag_concepts.append(_get_tag_concepts(tag))
+
+    if skipped_count > 0:
+        logger.info(
+            f"Skipped {skipped_count} tag(s) for tagpack {tagpack_id} "
+            "because they were duplicates in the incoming payload"
+        )
+    return PreparedTagPack(
+        tagpack_id, header, lastmod, tag_data, address_data, tag_concepts
+    )
+
+
 class InsertTagpackWorker:
     def __init__(
         self,
@@ -89,9 +228,14 @@ class InsertTagpackWorker:
         self.actor_resolve_mapping = actor_resolve_mapping
 
     def __call__(self, data):
+        return self.write(self.prepare(data))
+
+    def prepare(self, data):
+        """Parse and validate one tagpack into row data (no DB access).
+
+        Runs in the parsing processes; the result goes to :meth:`write`.
+        """
         i, tp = data
-        if not self.tagstore:
-            self.tagstore = TagStore(self.url, self.db_schema)
         (
             tagpack_file,
             headerfile_dir,
@@ -115,25 +259,58 @@ class InsertTagpackWorker:
             if self.validate_tagpack:
                 tagpack.validate()
 
-            self.tagstore.insert_tagpack(
+            prepared = prepare_tagpack(
                 tagpack,
+                create_tagpack_id(default_prefix, relpath),
                 self.public,
                 self.tag_type_default,
-                self.force
-                or (
-                    self.updateMode and exists_in_db
-                ),  # force insert if in update mode and exists
                 lastmod,
-                default_prefix,
-                relpath,
                 actor_resolve_mapping=self.actor_resolve_mapping,
             )
-            logger.info(f"{i} {tagpack_file}: PROCESSED {len(tagpack.tags)} Tags")
-            return 1, len(tagpack.tags)
+        except Exception as e:
+            logger.error(f"{i} {tagpack_file}: FAILED - {e}")
+            return i, tagpack_file, None, False, 0
+        # force insert if in update mode and exists
+        force_insert = self.force or (self.updateMode and exists_in_db)
+        return i, tagpack_file, prepared, force_insert, len(tagpack.tags)
+
+    def write(self, prepared):
+        """Write a result of :meth:`prepare`; runs in the single writer."""
+        i, tagpack_file, tagpack, force_insert, n_tags = prepared
+        if tagpack is None:
+            return 0, 0
+        if not self.tagstore:
+            self.tagstore = TagStore(self.url, self.db_schema)
+        try:
+            self.tagstore.write_tagpack(tagpack, force_insert)
+            logger.info(f"{i} {tagpack_file}: PROCESSED {n_tags} Tags")
+            return 1, n_tags
         except Exception as e:
             logger.error(f"{i} {tagpack_file}: FAILED - {e}")
             return 0, 0
 
+    def __getstate__(self):
+        # Parsing processes get the worker without the writer's connection.
+        state = self.__dict__.copy()
+        state["tagstore"] = None
+        return state
+
+
+# Worker of a parsing process, set once by the pool initializer so that the
+# tasks only carry the tagpack tuples (see insert_tagpack).
+_prepare_worker: Optional[InsertTagpackWorker] = None
+
+
+def init_prepare_worker(worker: InsertTagpackWorker):
+    global _prepare_worker
+    _prepare_worker = worker
+
+
+def prepare_in_worker(data):
+    """Pool task: :meth:`InsertTagpackWorker.prepare` in a parsing process."""
+    assert _prepare_worker is not None, "init_prepare_worker was not called"
+    return _prepare_worker.prepare(data)
+
 
 def auto_commit(function):
     @wraps(function)
@@ -188,6 +365,7 @@ class TagStore(object):
 
         self.existing_packs = None
         self.existing_actorpacks = None
+        self._tag_id_sequence = None
 
     def tp_exists(self, prefix, rel_path):
         if not self.existing_packs:
@@ -201,10 +379,8 @@ class TagStore(object):
         return tp_id not in self.existing_packs or self.existing_packs[tp_id] < lastmod
 
     def create_id(self, prefix, rel_path):
-        return ":".join([prefix, rel_path]) if prefix else rel_path
+        return create_tagpack_id(prefix, rel_path)
 
-    @retry_on_deadlock(times=3)
-    @auto_commit
     def insert_tagpack(
         self,
         tagpack,
@@ -214,123 +390,111 @@ class TagStore(object):
         lastmod: Optional[datetime],
         prefix,
         rel_path,
-        batch=1000,
+        batch=None,
         actor_resolve_mapping=None,
     ):
-        tagpack_id = self.create_id(prefix, rel_path)
-        h = _get_header(tagpack, tagpack_id)
+        # ``batch`` is accepted for compatibility; rows are streamed via COPY.
+        prepared = prepare_tagpack(
+            tagpack,
+            self.create_id(prefix, rel_path),
+            is_public,
+            tag_type_default,
+            lastmod,
+            actor_resolve_mapping,
+        )
+        self.write_tagpack(prepared, force_insert)
+
+    def _allocate_tag_ids(self, n: int) -> List[int]:
+        """Draw ``n`` ids from the tag id sequence in one round trip, so rows
+        referencing the tags (tag_concept) can be built client-side."""
+        if n == 0:
+            return []
+        if self._tag_id_sequence is None:
+            self.cursor.execute("SELECT pg_get_serial_sequence('tag', 'id')")
+            self._tag_id_sequence = self.cursor.fetchone()[0]
+        self.cursor.execute(
+            "SELECT nextval(%s) FROM generate_series(1, %s)",
+            (self._tag_id_sequence, n),
+        )
+        return [row[0] for row in self.cursor.fetchall()]
+
+    def _copy_rows(self, table: str, columns, rows):
+        """Stream ``rows`` into ``table`` with COPY FROM STDIN."""
+        self.cursor.copy_expert(
+            f"COPY {table} ({', '.join(columns)}) FROM STDIN "
+            "WITH (FORMAT csv, NULL '\\N')",
+            CopyRowStream(rows),
+        )
 
+    @retry_on_deadlock(times=3)
+    @auto_commit
+    def write_tagpack(self, prepared: "PreparedTagPack", force_insert: bool):
+        """Write a tagpack prepared by :func:`prepare_tagpack`.
+
+        Tags, addresses and concepts are COPYed into session-local staging
+        tables and merged with one set-based INSERT each; tag ids are drawn
+        from the tag sequence up front.
+        """
         if force_insert:
-            logger.info(f"evicting and re-inserting tagpack {tagpack_id}")
+            logger.info(f"evicting and re-inserting tagpack {prepared.tagpack_id}")
             q = "DELETE FROM tagpack WHERE id = (%s)"
-            self.cursor.execute(q, (tagpack_id,))
+            self.cursor.execute(q, (prepared.tagpack_id,))
 
-        if lastmod is None:
+        if prepared.lastmod is None:
             q = "INSERT INTO tagpack \
                 (id, title, description, creator, uri, acl_group) \
                 VALUES (%s,%s,%s,%s,%s,%s)"
-            v = (
-                h.get("id"),
-                h.get("title"),
-                h.get("description"),
-                h.get("creator"),
-                tagpack.uri,
-                "public" if is_public else "private",
-            )
+            v = prepared.header
         else:
             q = "INSERT INTO tagpack \
                 (id, title, description, creator, uri, acl_group, lastmod) \
                 VALUES (%s,%s,%s,%s,%s,%s,%s)"
-            v = (
-                h.get("id"),
-                h.get("title"),
-                h.get("description"),
-                h.get("creator"),
-                tagpack.uri,
-                "public" if is_public else "private",
-                lastmod,
-            )
+            v = prepared.header + (prepared.lastmod,)
         self.cursor.execute(q, v)
 
-        addr_sql = "INSERT INTO address (network, address) VALUES %s \
-            ON CONFLICT DO NOTHING"
-        tag_sql = "INSERT INTO tag (label, source, identifier, \
-            asset, network, is_cluster_definer, confidence, lastmod, \
-            context, tagpack, actor, tag_type, tag_subject ) VALUES \
-            %s RETURNING id"
-
-        tag_concept_sql = "INSERT INTO tag_concept (tag_id, \
-            concept_relation_annotation_id, concept_id) VALUES %s \
-            ON CONFLICT DO NOTHING"
-
-        def insert_tags_batch(tag_data, tag_concepts, address_data):
-            new_ids = execute_values(
-                self.cursor,
-                tag_sql,
-                tag_data,
-                template="(%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)",
-                fetch=True,
-                page_size=batch,
-            )
-            execute_values(self.cursor, addr_sql, address_data, template="(%s, %s)")
-
-            assert len(tag_concepts) == len(new_ids)
-            tcd = []
-            for tag_id, concept_ids in zip(new_ids, tag_concepts):
-                for tc, t in concept_ids:
-                    tcd.append((tag_id, t, tc))
-            execute_values(self.cursor, tag_concept_sql, tcd, template="(%s, %s, %s)")
-
-        tag_data = []
-        address_data = []
-        tag_concepts = []
-        seen_tag_keys = set()
-        skipped_count = 0
-        for tag in tagpack.get_unique_tags():
-            tag_tuple = _get_tag(
-                tag, tagpack_id, tag_type_default, actor_resolve_mapping
-            )
-            # Extract unique key from tag_tuple: (identifier, network, label, source)
-            # Tuple indices: 0=label, 1=source, 2=identifier, 4=network
-            unique_key = (tag_tuple[2], tag_tuple[4], tag_tuple[0], tag_tuple[1])
-
-            if unique_key in seen_tag_keys:
-                # Duplicate in incoming payload, skip it
-                identifier, network, label, source = unique_key
-                context = tag.all_fields.get("context")
-                logger.warning(
-                    "Duplicate tag in incoming tagpack payload, skipping insertion: "
-                    "label=%s, identifier=%s, network=%s, source=%s, context=%s",
-                    label,
-                    identifier,
-                    network,
-                    source,
-                    context,
-                )
-                skipped_count += 1
-                continue
+        if not prepared.tags:
+            return
 
-            seen_tag_keys.add(unique_key)
-            tag_data.append(tag_tuple)
-            adr_and_net = _get_network_and_address(tag)
-            if adr_and_net is not None:
-                address_data.append(adr_and_net)
-            tag_concepts.append(_get_tag_concepts(tag))
-
-            if len(tag_data) > batch:
-                insert_tags_batch(tag_data, tag_concepts, address_data)
-                tag_data = []
-                address_data = []
-                tag_concepts = []
-
-        # insert remaining items
-        insert_tags_batch(tag_data, tag_concepts, address_data)
-
-        if skipped_count > 0:
-            logger.info(
-                f"Skipped {skipped_count} tag(s) for tagpack {tagpack_id} "
-                "because they were duplicates in the incoming payload"
-            )
+        # Temp tables are unlogged and private to this connection; rolled back
+        # with the transaction if it fails, emptied on commit otherwise.
+        self.cursor.execute(
+            "CREATE TEMP TABLE IF NOT EXISTS tag_stage (LIKE tag) \
+                ON COMMIT DELETE ROWS; \
+            CREATE TEMP TABLE IF NOT EXISTS address_stage \
+                (network text, address text) ON COMMIT DELETE ROWS; \
+            CREATE TEMP TABLE IF NOT EXISTS tag_concept_stage \
+                (tag_id integer, concept_relation_annotation_id text, \
+                concept_id text) ON COMMIT DELETE ROWS"
+        )
+
+        tag_ids = self._allocate_tag_ids(len(prepared.tags))
+        self._copy_rows(
+            "tag_stage",
+            ("id",) + TAG_COLUMNS,
+            ((tag_id,) + tag for tag_id, tag in zip(tag_ids, prepared.tags)),
+        )
+        self._copy_rows("address_stage", ("network", "address"), prepared.addresses)
+        self._copy_rows(
+            "tag_concept_stage",
+            ("tag_id", "concept_relation_annotation_id", "concept_id"),
+            (
+                (tag_id, t, tc)
+                for tag_id, concepts in zip(tag_ids, prepared.concepts)
+                for tc, t in concepts
+            ),
+        )
+
+        columns = ", ".join(("id",) + TAG_COLUMNS)
+        self.cursor.execute(
+            f"INSERT INTO tag ({columns}) SELECT {columns} FROM tag_stage; \
+            INSERT INTO address (network, address) \
+                SELECT network, address FROM address_stage \
+                ON CONFLICT DO NOTHING; \
+            INSERT INTO tag_concept \
+                (tag_id, concept_relation_annotation_id, concept_id) \
+                SELECT tag_id, concept_relation_annotation_id, concept_id \
+                FROM tag_concept_stage ON CONFLICT DO NOTHING"
+        )
 
     def actorpack_exists(self, prefix, actorpack_name):
         if not self.existing_actorpacks:
@@ -823,12 +987,13 @@ class TagStore(object):
     @auto_commit
     def insert_cluster_mappings(self, clusters, fresh=False):
         if not clusters.empty:
-            q = f"INSERT INTO {_acm_table(fresh)} (address, network, \
-                gs_cluster_id , gs_cluster_def_addr , gs_cluster_no_addr) \
-                VALUES (%s, %s, %s, %s, %s) ON CONFLICT (network, address) \
-                DO UPDATE SET gs_cluster_id = EXCLUDED.gs_cluster_id, \
-                gs_cluster_def_addr = EXCLUDED.gs_cluster_def_addr, \
-                gs_cluster_no_addr = EXCLUDED.gs_cluster_no_addr"
+            table = _acm_table(fresh)
+            stage = f"{table}_stage"
+            # ord keeps the last row per key, as the former row-wise upserts did
+            self.cursor.execute(
+                f"CREATE TEMP TABLE IF NOT EXISTS {stage} \
+                    (ord bigint, LIKE {table}) ON COMMIT DELETE ROWS"
+            )
 
             cols = [
                 "address",
@@ -837,12 +1002,29 @@ class TagStore(object):
                 "cluster_defining_address",
                 "no_addresses",
             ]
-            data = [
-                tuple(_normalize_db_value(v) for v in row)
-                for row in clusters[cols].itertuples(index=False, name=None)
-            ]
+            data = (
+                (i,) + tuple(_normalize_db_value(v) for v in row)
+                for i, row in enumerate(
+                    clusters[cols].itertuples(index=False, name=None)
+                )
+            )
+            acm_cols = (
+                "address",
+                "network",
+                "gs_cluster_id",
+                "gs_cluster_def_addr",
+                "gs_cluster_no_addr",
+            )
+            self._copy_rows(stage, ("ord",) + acm_cols, data)
 
-            execute_batch(self.cursor, q, data)
+            q = f"INSERT INTO {table} ({', '.join(acm_cols)}) \
+                SELECT DISTINCT ON (network, address) {', '.join(acm_cols)} \
+                FROM {stage} ORDER BY network, address, ord DESC \
+                ON CONFLICT (network, address) DO UPDATE SET \
+                gs_cluster_id = EXCLUDED.gs_cluster_id, \
+                gs_cluster_def_addr = EXCLUDED.gs_cluster_def_addr, \
+                gs_cluster_no_addr = EXCLUDED.gs_cluster_no_addr"
+            self.cursor.execute(q)
 
     @auto_commit
     def finish_mappings_update(self, keys):
@@ -1,11 +1,24 @@
 import re
-from collections import Counter, defaultdict
-from typing import Dict, List, Optional
+from collections import Counter, OrderedDict, defaultdict
+from functools import lru_cache
+from typing import (
+    Dict,
+    Hashable,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
 
 from pydantic import BaseModel
 
 from ..db import InheritedFrom, TagPublic
 
+K = TypeVar("K", bound=Hashable)
+
 _FILTER_WORDS = dict.fromkeys(["to", "in", "the", "by", "of", "at", "", "vault"], True)
 
 
@@ -122,9 +135,160 @@ class TagDigestComputationConfig(BaseModel):
         return self
 
 
+class _TagFeatures(NamedTuple):
+    """What the digest reads of a tag, label normalization done."""
+
+    conf: float
+    weight: float
+    inherited: bool
+    label: str
+    nlabel: str
+    word_counts: Counter
+    nr_words: int
+    actor: Optional[str]
+    is_actor_tag: bool
+    concepts: Tuple[Tuple[str, float], ...]
+    source: Optional[str]
+    creator: Optional[str]
+    lastmod: int
+
+
+def _tag_fingerprint(t: TagPublic) -> tuple:
+    return (
+        t.label,
+        t.confidence_level,
+        t.inherited_from,
+        t.actor,
+        t.tag_type,
+        tuple(t.concepts),
+        t.source,
+        t.creator,
+        t.lastmod,
+    )
+
+
+@lru_cache(maxsize=65_536)
+def _normalize_label(label: str) -> Tuple[str, Tuple[str, ...]]:
+    """Normalized label and its words without filter words."""
+    norm_words = [_normalizeWord(w) for w in _normalizeWord(label).split(" ")]
+    words = tuple(w for w in norm_words if w not in _FILTER_WORDS)
+    return _normalizeWord(label), words
+
+
+def _tag_features(fingerprint: tuple, exponent: float) -> _TagFeatures:
+    (
+        label,
+        confidence_level,
+        inherited_from,
+        actor,
+        tag_type,
+        concepts,
+        source,
+        creator,
+        lastmod,
+    ) = fingerprint
+    conf = confidence_level or 0.1
+    w = conf**exponent
+    nlabel, words = _normalize_label(label)
+    return _TagFeatures(
+        conf=conf,
+        weight=w,
+        inherited=inherited_from == InheritedFrom.CLUSTER
+        or inherited_from == InheritedFrom.PUBKEY_AND_CLUSTER,
+        label=label,
+        nlabel=nlabel,
+        word_counts=Counter(words),
+        nr_words=len(words),
+        actor=actor if actor is not None and len(actor.strip()) > 0 else None,
+        is_actor_tag=tag_type == "actor",
+        # tags without categorization are added to unknown category in wordcloud
+        concepts=tuple(
+            (x, w * _get_concept_weight(x)) for x in concepts or ["unknown"]
+        ),
+        source=source,
+        creator=creator,
+        lastmod=lastmod,
+    )
+
+
 def compute_tag_digest(
     tags: List[TagPublic],
     config: TagDigestComputationConfig = TagDigestComputationConfig(),
+) -> TagDigest:
+    exponent = config.confidence_weight_exponent
+    return _digest([_tag_features(_tag_fingerprint(t), exponent) for t in tags], config)
+
+
+class TagDigestCache:
+    """Bounded LRU of digests keyed by configuration and tag-set fingerprint.
+
+    Tag sets repeat a lot across subjects and requests (e.g. every deposit
+    address of an exchange inherits the same cluster-definer tag), so
+    ``compute_tag_digests`` looks digests up here before computing them.
+    Cached digests are shared and must not be modified.
+    """
+
+    def __init__(self, maxsize: int = 10_000):
+        self.maxsize = maxsize
+        self._digests: OrderedDict = OrderedDict()
+
+    def get(self, key) -> Optional[TagDigest]:
+        digest = self._digests.get(key)
+        if digest is not None:
+            self._digests.move_to_end(key)
+        return digest
+
+    def put(self, key, digest: TagDigest):
+        self._digests[key] = digest
+        self._digests.move_to_end(key)
+        while len(self._digests) > self.maxsize:
+            self._digests.popitem(last=False)
+
+    def __len__(self):
+        return len(self._digests)
+
+
+def compute_tag_digests(
+    tags_by_subject: Mapping[K, Sequence[TagPublic]],
+    config: TagDigestComputationConfig = TagDigestComputationConfig(),
+    cache: Optional[TagDigestCache] = None,
+) -> Dict[K, TagDigest]:
+    """``compute_tag_digest`` of the tags of many subjects at once.
+
+    Each distinct tag is reduced to its features (normalized label and words,
+    confidence weight, concept weights) once for the whole batch, and each
+    distinct tag set is digested once: subjects with equal tag sets (in
+    order) share one digest object, which must not be modified. ``cache``
+    keeps digests across calls.
+    """
+    config_key = tuple(config.model_dump().values())
+    exponent = config.confidence_weight_exponent
+    features: Dict[tuple, _TagFeatures] = {}
+    digests: Dict[tuple, TagDigest] = {}
+    result: Dict[K, TagDigest] = {}
+    for subject, tags in tags_by_subject.items():
+        fingerprints = tuple(_tag_fingerprint(t) for t in tags)
+        key = (config_key, fingerprints)
+        digest = digests.get(key)
+        if digest is None and cache is not None:
+            digest = cache.get(key)
+        if digest is None:
+            tag_features = []
+            for fp in fingerprints:
+                f = features.get(fp)
+                if f is None:
+                    f = features[fp] = _tag_features(fp, exponent)
+                tag_features.append(f)
+            digest = _digest(tag_features, config)
+            if cache is not None:
+                cache.put(key, digest)
+        digests[key] = digest
+        result[subject] = digest
+    return result
+
+
+def _digest(
+    tags: Sequence[_TagFeatures], config: TagDigestComputationConfig
 ) -> TagDigest:
     tags_count = 0
     total_words = 0
@@ -151,82 +315,8 @@ def compute_tag_digest(
         }
     )
 
-    def add_tag_data(
-        t,
-        tags_count: int,
-        total_words: int,
-        tags_count_cluster: int,
-        actor_confidence_threshold: float = 0.0,
-    ):
-        if not _skipTag(t):
-            conf = t.confidence_level or 0.1
-            w = conf**config.confidence_weight_exponent
-
-            tags_count += 1
-
-            if (
-                t.inherited_from == InheritedFrom.CLUSTER
-                or t.inherited_from == InheritedFrom.PUBKEY_AND_CLUSTER
-            ):
-                tags_count_cluster += 1
-
-            # compute words
-            norm_words = [_normalizeWord(w) for w in _normalizeWord(t.label).split(" ")]
-            filtered_words = [w for w in norm_words if w not in _FILTER_WORDS]
-            total_words += len(filtered_words)
-
-            # add words
-            label_word_counter.update(Counter(filtered_words))
-
-            # add labels
-            nlabel = _normalizeWord(t.label)
-            ls = label_summary[nlabel]
-            full_label_counter.add(nlabel, w)
-
-            # add actor
-            if (
-                t.actor is not None
-                and len(t.actor.strip()) > 0
-                and conf >= actor_confidence_threshold
-                and (
-                    not config.only_propagate_high_confidence_actors
-                    or t.tag_type == "actor"
-                )
-            ):
-                actor_labels[t.actor].add(nlabel, weight=w)
-                actor_counter.add(t.actor, weight=w)
-
-            if t.concepts:
-                for x in t.concepts:
-                    concepts_counter.add(x, weight=w * _get_concept_weight(x))
-
-                    ls["concepts"].add(x)
-            else:
-                # tags without categorization are added to unknown category in wordcloud
-                x = "unknown"
-                concepts_counter.add(x, weight=w * _get_concept_weight(x))
-
-                ls["concepts"].add(x)
-
-            ls["cnt"] += 1
-            ls["lbl"] = t.label
-            ls["src"].add(t.source)
-            ls["creators"].add(t.creator)
-            ls["sumConfidence"] += conf
-            ls["lastmod"] = max(ls["lastmod"], t.lastmod)
-            ls["inherited"] = (
-                t.inherited_from == InheritedFrom.CLUSTER
-                or t.inherited_from == InheritedFrom.PUBKEY_AND_CLUSTER
-            ) and (ls["inherited"])
-
-        return tags_count, total_words, tags_count_cluster
-
     if config.only_propagate_high_confidence_actors:
-        confidences_for_actor_inheritance = set()
-        for t in tags:
-            if t.tag_type == "actor":
-                conf = t.confidence_level or 0.1
-                confidences_for_actor_inheritance.add(conf)
+        confidences_for_actor_inheritance = {t.conf for t in tags if t.is_actor_tag}
 
         highest_n = list(reversed(sorted(list(confidences_for_actor_inheritance))))[
             : config.consider_n_confidence_buckets
@@ -248,13 +338,42 @@ def compute_tag_digest(
         actor_confidence_threshold = 0.0
 
     for t in tags:
-        tags_count, total_words, tags_count_cluster = add_tag_data(
-            t,
-            tags_count,
-            total_words,
-            tags_count_cluster,
-            actor_confidence_threshold=actor_confidence_threshold,
-        )
+        if _skipTag(t):
+            continue
+        w = t.weight
+        tags_count += 1
+        if t.inherited:
+            tags_count_cluster += 1
+
+        # add words
+        total_words += t.nr_words
+        label_word_counter.update(t.word_counts)
+
+        # add labels
+        nlabel = t.nlabel
+        ls = label_summary[nlabel]
+        full_label_counter.add(nlabel, w)
+
+        # add actor
+        if (
+            t.actor is not None
+            and t.conf >= actor_confidence_threshold
+            and (not config.only_propagate_high_confidence_actors or t.is_actor_tag)
+        ):
+            actor_labels[t.actor].add(nlabel, weight=w)
+            actor_counter.add(t.actor, weight=w)
+
+        for x, concept_weight in t.concepts:
+            concepts_counter.add(x, weight=concept_weight)
+            ls["concepts"].add(x)
+
+        ls["cnt"] += 1
+        ls["lbl"] = t.label
+        ls["src"].add(t.source)
+        ls["creators"].add(t.creator)
+        ls["sumConfidence"] += t.conf
+        ls["lastmod"] = max(ls["lastmod"], t.lastmod)
+        ls["inherited"] = t.inherited and ls["inherited"]
 
     # create a relevance score, prefer items where similar labels exist.
     # Precompute the recurring words once (the sum is order-independent), instead
@@ -659,6 +659,19 @@ def _get_actors_for_subject_stmt(subject_id: str, groups: List[str]):
     )
 
 
+def _get_actors_for_subjects_stmt(subject_ids: List[str], groups: List[str]):
+    return (
+        select(Tag.identifier, Actor.id, Actor.label)
+        .where(Tag.identifier.in_(subject_ids))
+        .where(Actor.id.isnot(None))
+        .where(Actor.id == Tag.actor_id)
+        .where(Tag.tagpack_id == TagPack.id)
+        .where(TagPack.acl_group.in_(groups))
+        .order_by(Tag.identifier, Actor.label)
+        .distinct()
+    )
+
+
 def _get_actors_for_clusterid_stmt(cluster_id: int, network: int, groups: List[str]):
     AddressClusterMap, _, _, cluster_id = _cluster_relations_for(cluster_id)
     return (
@@ -875,6 +888,20 @@ class TagstoreDbAsync:
         )
         return [HumanReadableId(id=idt, label=lbl) for idt, lbl in results]
 
+    @_inject_session
+    async def get_actors_by_subjectids(
+        self, subject_ids: List[str], groups: List[str], session=None
+    ) -> Dict[str, List[HumanReadableId]]:
+        # One query for many subjects, e.g. a whole /bulk batch.
+        if not subject_ids:
+            return {}
+        cleaned = [sid.strip() for sid in subject_ids]
+        results = await session.exec(_get_actors_for_subjects_stmt(cleaned, groups))
+        out: Dict[str, List[HumanReadableId]] = {sid: [] for sid in cleaned}
+        for sid, idt, lbl in results:
+            out.setdefault(sid, []).append(HumanReadableId(id=idt, label=lbl))
+        return out
+
     @_inject_session
     async def get_labels_by_subjectid(
         self, subject_id: str, groups: List[str], session=None
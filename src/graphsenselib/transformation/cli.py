@@ -1625,6 +1625,16 @@ def _delete_fresh_cluster_stats_rows(transformed_db, keys):
         "(default 64). Does NOT control join parallelism."
     ),
 )
+@click.option(
+    "--feed-threads",
+    type=int,
+    default=None,
+    help=(
+        "Streamed partitions decoded and fed to the union-find concurrently on "
+        "the driver while the next one is pulled from Spark (default 4). Driver "
+        "memory holds up to this many partition blobs plus one."
+    ),
+)
 @click.option(
     "--end-block",
     type=int,
@@ -1650,7 +1660,13 @@ def _delete_fresh_cluster_stats_rows(transformed_db, keys):
     ),
 )
 def run_clustering(
-    env, currency, local, read_partitions, end_block, disable_safety_checks
+    env,
+    currency,
+    local,
+    read_partitions,
+    feed_threads,
+    end_block,
+    disable_safety_checks,
 ):
     """Run one-off UTXO address clustering with PySpark.
 
@@ -1766,6 +1782,8 @@ def run_clustering(
                 spark_kwargs = {}
                 if read_partitions is not None:
                     spark_kwargs["read_partitions"] = read_partitions
+                if feed_threads is not None:
+                    spark_kwargs["feed_threads"] = feed_threads
                 run_clustering_spark(
                     spark_session,
                     raw_keyspace=raw_keyspace,
@@ -12,7 +12,9 @@ harvests the same id sets from the txs it already holds.
 import logging
 import resource
 import time
-from typing import Dict, Iterator, List, Optional, Set
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
 
 from graphsenselib.utils.utxo import multi_input_address_set, resolve_address_id_sets
 
@@ -167,6 +169,11 @@ DEFAULT_SPARK_WRITE_CHUNK = 10_000_000
 # partitions just spawn hundreds of tiny tasks/stages across distinct/join/
 # groupBy and the Arrow collect.
 DEFAULT_READ_PARTITIONS = 64
+# Partitions decoded + fed to the union-find concurrently on the driver while
+# the next one is pulled from Spark. Rust releases the GIL for the Arrow ingest
+# and MinUnionFind unites lock-free, so feeds overlap each other and the Spark
+# delivery; driver memory is bounded by feed_threads + 1 partition blobs.
+DEFAULT_FEED_THREADS = 4
 
 
 def multi_input_address_id_sets(
@@ -515,6 +522,151 @@ def stream_spark_column_as_arrow_ipc(df, column: str, arrow_type=None):
         idx += 1
 
 
+def _feed_edge_blob(
+    c, blob: bytes, max_address_id: int, feed_batch_size: int
+) -> Tuple[int, int, float, float]:
+    """Decode one partition's Arrow IPC blob and unite its edge sets in ``c``.
+
+    Returns ``(rows_fed, dropped_txs, deser_seconds, rust_seconds)``. Safe to
+    call from several threads at once on the same ``c``.
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    d0 = time.perf_counter()
+    batches = list(pa.ipc.open_stream(pa.py_buffer(blob)))
+    deser_s = time.perf_counter() - d0
+
+    rows = 0
+    dropped = 0
+    rust_s = 0.0
+    for record_batch in batches:
+        ids_col = record_batch.column(0)
+        for off in range(0, len(ids_col), feed_batch_size):
+            chunk = ids_col.slice(off, feed_batch_size)
+            n = len(chunk)
+            if n == 0:
+                continue
+            # Defensive: never feed an address id beyond the union-find's
+            # size — the Rust engine indexes its node array directly and
+            # panics on an out-of-bounds id. The union-find is sized from
+            # summary_statistics.no_addresses, which can lag the real
+            # highest address id. With the transformed-keyspace lock held
+            # this should not happen (no concurrent id growth), but a stale
+            # statistic or a raw end_block ahead of the transformed data
+            # could still surface ids > max_address_id; drop those txs and
+            # warn rather than crash. The bound check is a vectorized scan
+            # of the chunk, so the zero-copy fast path below is unaffected;
+            # only a chunk that actually trips it pays the Python fallback.
+            flat = chunk.flatten()
+            if len(flat) and pc.max(flat).as_py() > max_address_id:
+                safe = [
+                    ids
+                    for ids in chunk.to_pylist()
+                    if ids and max(ids) <= max_address_id
+                ]
+                dropped += n - len(safe)
+                if safe:
+                    r0 = time.perf_counter()
+                    c.process_transactions(safe)
+                    rust_s += time.perf_counter() - r0
+                    rows += len(safe)
+                continue
+            # Hand the Arrow list<uint32> buffer straight to Rust: it reads
+            # the offsets+values in place (zero Python objects) with the GIL
+            # released, so concurrent feeds actually run in parallel.
+            r0 = time.perf_counter()
+            c.process_transactions_arrow(chunk)
+            rust_s += time.perf_counter() - r0
+            rows += n
+    return rows, dropped, deser_s, rust_s
+
+
+def _feed_blobs_into_unionfind(
+    c,
+    blobs: Iterable[Tuple[int, int, bytes, float]],
+    num_parts: int,
+    max_address_id: int,
+    feed_batch_size: int,
+    feed_threads: int = DEFAULT_FEED_THREADS,
+) -> Dict[str, float]:
+    """Feed ``(idx, num_parts, blob, wait_seconds)`` partitions (the
+    :func:`stream_spark_column_as_arrow_ipc` shape) into the union-find ``c``.
+
+    Up to ``feed_threads`` partitions are decoded and united on a thread pool
+    while the caller's iterator pulls the next one, so Spark delivery and the
+    driver feed overlap instead of alternating. Union-find is order-independent,
+    so the result equals a serial feed. At most ``feed_threads`` pulled blobs
+    are held at once: the oldest partition is awaited (and logged, in partition
+    order) before another is pulled. ``feed_threads <= 1`` keeps one partition
+    in flight, which still overlaps it with the next pull.
+
+    Returns the counters ``total_multi_input``, ``dropped_txs``, ``t_wait``,
+    ``t_deser`` and ``t_rust``; the per-partition ``deser``/``rust`` times are
+    summed across threads, so with overlap they can exceed wall-clock.
+    """
+    feed_threads = max(1, feed_threads)
+    total_multi_input = 0
+    dropped_txs = 0
+    t_wait = 0.0  # blocked pulling partitions: Spark compute + executor->driver ship
+    t_deser = 0.0  # Arrow IPC parse on the driver
+    t_rust = 0.0  # Rust Arrow ingest + union-find (process_transactions_arrow)
+    first_wait = 0.0  # partition 1 warm-up, excluded from the ETA extrapolation
+    read_start = time.perf_counter()
+    pending = deque()
+
+    def collect():
+        nonlocal total_multi_input, dropped_txs, t_deser, t_rust
+        idx, wait_s, future = pending.popleft()
+        part_rows, part_dropped, deser_s, part_rust = future.result()
+        dropped_txs += part_dropped
+        t_deser += deser_s
+        t_rust += part_rust
+        total_multi_input += part_rows
+
+        # ETA from steady-state partitions only — partition 1 carries warm-up.
+        done = idx + 1
+        eta = ""
+        if done >= 2 and num_parts:
+            per_part = (time.perf_counter() - read_start - first_wait) / idx
+            eta = f" | ETA ~{per_part * max(0, num_parts - done) / 60:.1f}m"
+        logger.info(
+            f"  [read] partition {done}/{num_parts}: {part_rows:,} rows | "
+            f"wait(spark)={wait_s:.1f}s feed={deser_s + part_rust:.1f}s "
+            f"(deser={deser_s:.2f} rust(arrow)={part_rust:.2f}) | "
+            f"cum {total_multi_input:,}{eta}"
+        )
+
+    with ThreadPoolExecutor(
+        max_workers=feed_threads, thread_name_prefix="uf-feed"
+    ) as pool:
+        try:
+            for idx, _np, blob, wait_s in blobs:
+                t_wait += wait_s
+                if idx == 0:
+                    first_wait = wait_s
+                future = pool.submit(
+                    _feed_edge_blob, c, blob, max_address_id, feed_batch_size
+                )
+                del blob
+                pending.append((idx, wait_s, future))
+                if len(pending) >= feed_threads:
+                    collect()
+            while pending:
+                collect()
+        finally:
+            for _, _, future in pending:
+                future.cancel()
+
+    return {
+        "total_multi_input": total_multi_input,
+        "dropped_txs": dropped_txs,
+        "t_wait": t_wait,
+        "t_deser": t_deser,
+        "t_rust": t_rust,
+    }
+
+
 def _read_edges_into_unionfind(
     spark,
     c,
@@ -525,9 +677,12 @@ def _read_edges_into_unionfind(
     read_partitions: int,
     feed_batch_size: int,
     exclude_coinjoin: bool = True,
+    feed_threads: int = DEFAULT_FEED_THREADS,
 ) -> Dict[str, float]:
     """PHASE 1: bulk-read the multi-input edge sets and feed them to the in-process
-    Rust Union-Find ``c``, streaming one Spark partition at a time as Arrow IPC.
+    Rust Union-Find ``c``, streaming one Spark partition at a time as Arrow IPC
+    and feeding up to ``feed_threads`` partitions concurrently
+    (:func:`_feed_blobs_into_unionfind`).
 
     ``max_address_id`` is the id bound ``c`` was sized with; txs carrying an id
     above it are dropped (and counted) rather than passed to Rust, which indexes
@@ -539,9 +694,6 @@ def _read_edges_into_unionfind(
     = Spark compute + executor→driver ship) vs ``feed`` (driver-side Arrow→Rust
     ingest + union-find) — the one split local benchmarks can't settle.
     """
-    import pyarrow as pa
-    import pyarrow.compute as pc
-
     cass_format = "org.apache.spark.sql.cassandra"
 
     # read_partitions only coalesces the FINAL edge-set DataFrame for bounded
@@ -588,81 +740,21 @@ def _read_edges_into_unionfind(
         f"below is then just cache reads."
     )
 
-    total_multi_input = 0
-    dropped_txs = 0
-    t_wait = 0.0  # blocked pulling partitions: Spark compute + executor->driver ship
-    t_deser = 0.0  # Arrow IPC parse on the driver
-    t_rust = 0.0  # Rust Arrow ingest + union-find (process_transactions_arrow)
-    first_wait = 0.0  # partition 1 warm-up, excluded from the ETA extrapolation
     read_start = time.perf_counter()
     try:
-        for idx, _np, blob, wait_s in stream_spark_column_as_arrow_ipc(edge_df, "ids"):
-            t_wait += wait_s
-            if idx == 0:
-                first_wait = wait_s
-
-            d0 = time.perf_counter()
-            batches = list(pa.ipc.open_stream(pa.py_buffer(blob)))
-            deser_s = time.perf_counter() - d0
-            t_deser += deser_s
-
-            part_rows = 0
-            part_rust = 0.0
-            for record_batch in batches:
-                ids_col = record_batch.column(0)
-                for off in range(0, len(ids_col), feed_batch_size):
-                    chunk = ids_col.slice(off, feed_batch_size)
-                    n = len(chunk)
-                    if n == 0:
-                        continue
-                    # Defensive: never feed an address id beyond the union-find's
-                    # size — the Rust engine indexes its node array directly and
-                    # panics on an out-of-bounds id. The union-find is sized from
-                    # summary_statistics.no_addresses, which can lag the real
-                    # highest address id. With the transformed-keyspace lock held
-                    # this should not happen (no concurrent id growth), but a stale
-                    # statistic or a raw end_block ahead of the transformed data
-                    # could still surface ids > max_address_id; drop those txs and
-                    # warn rather than crash. The bound check is a vectorized scan
-                    # of the chunk, so the zero-copy fast path below is unaffected;
-                    # only a chunk that actually trips it pays the Python fallback.
-                    flat = chunk.flatten()
-                    if len(flat) and pc.max(flat).as_py() > max_address_id:
-                        safe = [
-                            ids
-                            for ids in chunk.to_pylist()
-                            if ids and max(ids) <= max_address_id
-                        ]
-                        dropped_txs += n - len(safe)
-                        if safe:
-                            r0 = time.perf_counter()
-                            c.process_transactions(safe)
-                            part_rust += time.perf_counter() - r0
-                            part_rows += len(safe)
-                        continue
-                    # Hand the Arrow list<uint32> buffer straight to Rust: it reads
-                    # the offsets+values in place (zero Python objects).
-                    r0 = time.perf_counter()
-                    c.process_transactions_arrow(chunk)
-                    part_rust += time.perf_counter() - r0
-                    part_rows += n
-            t_rust += part_rust
-            total_multi_input += part_rows
-
-            # ETA from steady-state partitions only — partition 1 carries warm-up.
-            done = idx + 1
-            eta = ""
-            if done >= 2 and num_parts:
-                per_part = (time.perf_counter() - read_start - first_wait) / idx
-                eta = f" | ETA ~{per_part * max(0, num_parts - done) / 60:.1f}m"
-            logger.info(
-                f"  [read] partition {done}/{num_parts}: {part_rows:,} rows | "
-                f"wait(spark)={wait_s:.1f}s feed={deser_s + part_rust:.1f}s "
-                f"(deser={deser_s:.2f} rust(arrow)={part_rust:.2f}) | "
-                f"cum {total_multi_input:,}{eta}"
-            )
+        fed = _feed_blobs_into_unionfind(
+            c,
+            stream_spark_column_as_arrow_ipc(edge_df, "ids"),
+            num_parts,
+            max_address_id,
+            feed_batch_size,
+            feed_threads,
+        )
     finally:
         edge_df.unpersist()
+    total_multi_input = fed["total_multi_input"]
+    dropped_txs = fed["dropped_txs"]
+    t_wait, t_deser, t_rust = fed["t_wait"], fed["t_deser"], fed["t_rust"]
 
     if dropped_txs:
         logger.warning(
@@ -680,7 +772,8 @@ def _read_edges_into_unionfind(
     logger.info(
         f"  [read] DONE: {num_parts} partitions, {total_multi_input:,} edge sets in "
         f"{denom:.1f}s — Spark delivery {spark_side:.1f}s | driver feed "
-        f"{feed_total:.1f}s (deser {t_deser:.1f}s + Rust union-find {t_rust:.1f}s)"
+        f"{feed_total:.1f}s (deser {t_deser:.1f}s + Rust union-find {t_rust:.1f}s) "
+        f"across {max(1, feed_threads)} feed thread(s)"
     )
     return {
         "denom": denom,
@@ -841,6 +934,7 @@ def run_clustering_spark(
     end_block: Optional[int] = None,
     delete_stale=None,
     exclude_coinjoin: bool = True,
+    feed_threads: int = DEFAULT_FEED_THREADS,
 ):
     """Full one-off UTXO clustering with PySpark bulk read and bulk write.
 
@@ -861,7 +955,8 @@ def run_clustering_spark(
         only public APIs. The edge sets feed the in-process Rust Union-Find
         (``gs_clustering``) as zero-copy Arrow buffers
         (``process_transactions_arrow``, no Python materialization) in
-        ``feed_batch_size`` slices;
+        ``feed_batch_size`` slices, with up to ``feed_threads`` partitions
+        decoded and united concurrently while the next one is pulled;
       * **bulk-writes** the resulting ``address_id -> cluster_id`` mapping back
         to ``fresh_address_cluster`` / ``fresh_cluster_addresses`` in
         ``write_chunk``-sized slices via the Spark Cassandra connector, then
@@ -932,6 +1027,7 @@ def run_clustering_spark(
         read_partitions,
         feed_batch_size,
         exclude_coinjoin=exclude_coinjoin,
+        feed_threads=feed_threads,
     )
     logger.info(f"  [mem] peak rss after read: {_peak_rss_gb():.1f} GB")
 
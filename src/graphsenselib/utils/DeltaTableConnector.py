@@ -1,15 +1,19 @@
 import os
-from typing import Iterable, List, Tuple
+from typing import Iterable, List, Optional, Tuple
 
 try:
     import deltalake
     import duckdb
+    import pyarrow as pa
+    import pyarrow.compute as pc
 except ImportError:
     _has_delta_dependencies = False
 else:
     _has_delta_dependencies = True
 
 
+from datetime import datetime
+
 import pandas as pd
 
 from graphsenselib.ingest.account import from_bytes_df
@@ -20,8 +24,6 @@ from graphsenselib.schema.resources.parquet.account import (
 from graphsenselib.schema.resources.parquet.account_trx import (
     BINARY_COL_CONVERSION_MAP_ACCOUNT_TRX,
 )
-from typing import Optional
-from datetime import datetime
 
 DEFAULT_KEY_ENCODERS = {
     bytes: lambda x: x.hex(),
@@ -53,6 +55,21 @@ class BinaryInterpreter:
             return df
         return from_bytes_df(df, conversion_map_table)
 
+    def interpret_rows(self, table: "pa.Table", tablename) -> List[dict]:
+        """Rows of an Arrow table as dicts, big-endian binary int columns
+        decoded like :meth:`interpret` does for data frames."""
+        rows = table.to_pylist()
+        cols = [
+            c
+            for c in self.binary_col_conversion_map.get(tablename, [])
+            if c in table.column_names
+        ]
+        for row in rows:
+            for col in cols:
+                if row[col] is not None:
+                    row[col] = int.from_bytes(row[col], byteorder="big")
+        return rows
+
 
 class DeltaTableConnector:
     def __init__(self, base_directory: str, s3_credentials: dict | None):
@@ -229,6 +246,38 @@ class DeltaTableConnector:
                     f"block_ids {block_ids} not found in table {table}"
                 )
 
+    def get_table(
+        self, table: str, block_ids: List[int], columns: Optional[List[str]] = None
+    ) -> "pa.Table":
+        """Rows of ``table`` with a block_id in ``block_ids`` as an Arrow table.
+
+        Files outside the partitions of ``block_ids`` are skipped, the
+        block_id range is checked against the per-file and per-row-group
+        statistics before anything is read, and only ``columns`` (those the
+        table has; all if None) are read. Binary int columns stay binary, see
+        :meth:`BinaryInterpreter.interpret_rows`.
+        """
+        delta_table = deltalake.DeltaTable(
+            self.get_table_path(table), storage_options=self.get_storage_options()
+        )
+        if columns is not None:
+            available = {f.name for f in delta_table.schema().fields}
+            columns = [c for c in columns if c in available]
+        ids = sorted(set(block_ids))
+        if not ids:
+            schema = delta_table.to_pyarrow_dataset().schema
+            return schema.empty_table().select(columns or schema.names)
+        partitionsize = PARTITIONSIZES[self.network]
+        partitions = sorted({block_id // partitionsize for block_id in ids})
+        block_id = pc.field("block_id")
+        return delta_table.to_pyarrow_table(
+            columns=columns,
+            filters=pc.field("partition").isin(partitions)
+            & (block_id >= ids[0])
+            & (block_id <= ids[-1])
+            & block_id.isin(ids),
+        )
+
     def __getitem__(self, kv: Tuple[str, List[int]]):
         table, key = kv
         return self.get_items(table, key)
@@ -2,13 +2,17 @@
 # coding: utf-8
 """ """
 
-from typing import Dict, List
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence
 import base58
 import bech32
 from binascii import hexlify, unhexlify
 import hashlib
+import math
 
+import numpy as np
 from coincurve.keys import PublicKey
+from eth_hash.auto import keccak
 from eth_keys import keys
 
 from graphsenselib.utils.tron import evm_to_tron_address_string
@@ -90,6 +94,99 @@ def bech32_segwit_encode(hrp, witver, witprog):
         return f"Bech32 encoding failed: {e}"
 
 
+# --- Bulk encoders ---
+_B58_ALPHABET = np.frombuffer(base58.BITCOIN_ALPHABET, dtype=np.uint8)
+_B58_DIVISOR = 58**5
+_BECH32_CHARSET = np.frombuffer(bech32.CHARSET.encode(), dtype=np.uint8)
+_BECH32_GENERATOR = np.array(
+    [0x3B6A57B2, 0x26508E6D, 0x1EA119FA, 0x3D4233DD, 0x2A1462B3], dtype=np.uint32
+)
+
+
+def base58check_encode_many(prefix_bytes, payloads: List[bytes]) -> List[str]:
+    """``base58check_encode`` for many payloads of the same length.
+
+    The base conversion runs as long division by 58 over all payloads at
+    once, one byte column at a time.
+    """
+    if not payloads:
+        return []
+    data = [prefix_bytes + p for p in payloads]
+    rows = np.frombuffer(
+        b"".join(d + double_sha256(d)[:4] for d in data), dtype=np.uint8
+    ).reshape(len(data), -1)
+    width = rows.shape[1]
+    digits_needed = math.ceil(width * 8 / math.log2(58))
+    # Long division by 58**5 over 24-bit limbs stays within int64 and emits
+    # five base58 digits per pass.
+    pad = (-width) % 3
+    padded = np.pad(rows, ((0, 0), (pad, 0))).astype(np.int64)
+    limbs = (
+        (padded[:, 0::3] << 16) | (padded[:, 1::3] << 8) | padded[:, 2::3]
+    ).T.copy()
+    passes = math.ceil(digits_needed / 5)
+    digits = np.empty((len(data), passes * 5), dtype=np.int64)
+    for p in range(passes - 1, -1, -1):
+        rem = np.zeros(len(data), dtype=np.int64)
+        for limb in limbs:
+            cur = (rem << 24) | limb
+            limb[:] = cur // _B58_DIVISOR
+            rem = cur % _B58_DIVISOR
+        for d in range(4, -1, -1):
+            digits[:, p * 5 + d] = rem % 58
+            rem //= 58
+    digits = digits[:, passes * 5 - digits_needed :]
+    chars = _B58_ALPHABET[digits]
+    leading_zero_bytes = np.argmax(rows != 0, axis=1)
+    leading_zero_bytes[~rows.any(axis=1)] = width
+    leading_zero_digits = np.argmax(digits != 0, axis=1)
+    leading_zero_digits[~digits.any(axis=1)] = digits_needed
+    return [
+        "1" * int(nz) + row[start:].tobytes().decode("ascii")
+        for row, nz, start in zip(
+            chars, leading_zero_bytes.tolist(), leading_zero_digits.tolist()
+        )
+    ]
+
+
+def bech32_segwit_encode_many(hrp, witver, witprogs: List[bytes]) -> List[str]:
+    """``bech32_segwit_encode`` for many witness programs of the same length.
+
+    Only valid inputs are accepted (witness version 0..16, program length
+    20 or 32 for version 0); bit conversion and checksum run on all programs
+    at once.
+    """
+    if not witprogs:
+        return []
+    progs = np.frombuffer(b"".join(witprogs), dtype=np.uint8).reshape(len(witprogs), -1)
+    bits = np.unpackbits(progs, axis=1)
+    pad = (-bits.shape[1]) % 5
+    if pad:
+        bits = np.pad(bits, ((0, 0), (0, pad)))
+    data_5bit = bits.reshape(len(witprogs), -1, 5) @ np.array(
+        [16, 8, 4, 2, 1], dtype=np.uint8
+    )
+    payload = np.concatenate(
+        (np.full((len(witprogs), 1), witver, dtype=np.uint8), data_5bit), axis=1
+    ).astype(np.uint32)
+
+    chk = np.full(len(witprogs), bech32.bech32_polymod(bech32.bech32_hrp_expand(hrp)))
+    chk = chk.astype(np.uint32)
+    values = np.concatenate(
+        (payload, np.zeros((len(witprogs), 6), dtype=np.uint32)), axis=1
+    )
+    for col in range(values.shape[1]):
+        top = chk >> 25
+        chk = ((chk & 0x1FFFFFF) << 5) ^ values[:, col]
+        for i in range(5):
+            chk ^= np.where((top >> i) & 1, _BECH32_GENERATOR[i], 0).astype(np.uint32)
+    chk ^= 1
+    checksum = np.stack([(chk >> 5 * (5 - i)) & 31 for i in range(6)], axis=1)
+    chars = _BECH32_CHARSET[np.concatenate((payload, checksum), axis=1)]
+    prefix = hrp + "1"
+    return [prefix + row.tobytes().decode("ascii") for row in chars]
+
+
 # --- Mainnet Address Version Bytes and HRPs ---
 MAINNET_ADDRESS_SPECS = {
     "bitcoin": {
@@ -306,6 +403,66 @@ def cashaddr_encode(prefix: str, version_byte: int, payload_bytes: bytes) -> str
     return f"{prefix}:{encoded}"
 
 
+_CASHADDR_CHARSET_TABLE = np.frombuffer(_CASHADDR_CHARSET.encode(), dtype=np.uint8)
+_CASHADDR_GENERATOR = np.array(
+    [0x98F2BC8E61, 0x79B76D99E2, 0xF33E5FB3C4, 0xAE2EABE2A8, 0x1E4F43E470],
+    dtype=np.uint64,
+)
+
+
+def cashaddr_encode_many(
+    prefix: str, version_byte: int, payloads: List[bytes]
+) -> List[str]:
+    """``cashaddr_encode`` for many payloads of the same length.
+
+    Bit conversion and the 40-bit checksum polymod run on all payloads at once.
+    """
+    if not payloads:
+        return []
+    rows = np.frombuffer(
+        b"".join(bytes([version_byte]) + p for p in payloads), dtype=np.uint8
+    ).reshape(len(payloads), -1)
+    bits = np.unpackbits(rows, axis=1)
+    pad = (-bits.shape[1]) % 5
+    if pad:
+        bits = np.pad(bits, ((0, 0), (0, pad)))
+    data = bits.reshape(len(payloads), -1, 5) @ np.array(
+        [16, 8, 4, 2, 1], dtype=np.uint8
+    )
+
+    prefix_expanded = [ord(x) & 0x1F for x in prefix] + [0]
+    # The prefix is the same for every row: fold it in once.
+    c = 1
+    for d in prefix_expanded:
+        c0 = c >> 35
+        c = ((c & 0x07FFFFFFFF) << 5) ^ d
+        for i in range(5):
+            if (c0 >> i) & 1:
+                c ^= int(_CASHADDR_GENERATOR[i])
+    chk = np.full(len(payloads), c, dtype=np.uint64)
+    values = np.concatenate(
+        (data.astype(np.uint64), np.zeros((len(payloads), 8), dtype=np.uint64)),
+        axis=1,
+    )
+    for col in range(values.shape[1]):
+        top = chk >> np.uint64(35)
+        chk = ((chk & np.uint64(0x07FFFFFFFF)) << np.uint64(5)) ^ values[:, col]
+        for i in range(5):
+            chk ^= np.where(
+                (top >> np.uint64(i)) & np.uint64(1),
+                _CASHADDR_GENERATOR[i],
+                np.uint64(0),
+            )
+    chk ^= np.uint64(1)
+    checksum = np.stack(
+        [(chk >> np.uint64(5 * (7 - i))) & np.uint64(0x1F) for i in range(8)], axis=1
+    )
+    chars = _CASHADDR_CHARSET_TABLE[
+        np.concatenate((data.astype(np.uint64), checksum), axis=1)
+    ]
+    return [f"{prefix}:" + row.tobytes().decode("ascii") for row in chars]
+
+
 def get_bch_addresses(pubkey_hex):
     """Bitcoin Cash CashAddr P2PKH address (type 0, 160-bit pubkey hash).
 
@@ -391,6 +548,125 @@ def convert_pubkey_to_addresses(
     return all_addresses
 
 
+# --- Bulk conversion ---
+# Keys re-observed across batches (exchange hot wallets, miners) skip the
+# curve operation.
+PUBKEY_CACHE_SIZE = 1 << 16
+
+
+@lru_cache(maxsize=PUBKEY_CACHE_SIZE)
+def _compressed_and_uncompressed(pubkey: bytes) -> Optional[tuple]:
+    """(compressed, uncompressed) forms of a 33/65-byte key; None if invalid."""
+    try:
+        pk = PublicKey(pubkey)
+    except ValueError:
+        return None
+    return pk.format(compressed=True), pk.format(compressed=False)
+
+
+def hash160_many(datas: Sequence[bytes]) -> List[bytes]:
+    """``hash160`` of each element."""
+    sha256 = hashlib.sha256
+    ripemd160 = hashlib.new
+    return [ripemd160("ripemd160", sha256(d).digest()).digest() for d in datas]
+
+
+def _address_columns(
+    comp: List[bytes], uncomp: List[bytes], currencies: Sequence[str]
+) -> Dict[str, Dict[str, List[str]]]:
+    h = hash160_many(comp)
+    hu = hash160_many(uncomp)
+    redeem = None
+    out = {}
+    for currency in currencies:
+        if currency in ("btc", "ltc"):
+            specs = MAINNET_ADDRESS_SPECS[
+                "bitcoin" if currency == "btc" else "litecoin"
+            ]
+            if redeem is None:
+                redeem = hash160_many([b"\x00\x14" + x for x in h])
+            out[currency] = {
+                "p2pkh": base58check_encode_many(specs["p2pkh"], h),
+                "p2pkh_uncomp": base58check_encode_many(specs["p2pkh"], hu),
+                "p2wpkh_bech32": bech32_segwit_encode_many(specs["p2wpkh_hrp"], 0, h),
+                "p2sh_p2wpkh": base58check_encode_many(specs["p2sh"], redeem),
+            }
+        elif currency == "doge":
+            specs = MAINNET_ADDRESS_SPECS["dogecoin"]
+            out[currency] = {
+                "p2pkh": base58check_encode_many(specs["p2pkh"], h),
+                "p2pkh_uncomp": base58check_encode_many(specs["p2pkh"], hu),
+                "p2sh": base58check_encode_many(specs["p2sh"], h),
+            }
+        elif currency == "zec":
+            specs = MAINNET_ADDRESS_SPECS["zcash"]
+            out[currency] = {
+                "t1_p2pkh": base58check_encode_many(specs["t1_p2pkh"], h),
+                "t1_p2pkh_uncomp": base58check_encode_many(specs["t1_p2pkh"], hu),
+                "t3_p2sh": base58check_encode_many(specs["t3_p2sh"], h),
+            }
+        elif currency in ("eth", "trx"):
+            evm = [keccak(u[1:])[-20:] for u in uncomp]
+            if currency == "eth":
+                out[currency] = {"eth": ["0x" + a.hex() for a in evm]}
+            else:
+                out[currency] = {"trx": base58check_encode_many(b"\x41", evm)}
+        elif currency == "bch":
+            out[currency] = {
+                "p2pkh_cashaddr": cashaddr_encode_many("bitcoincash", 0x00, h),
+                "p2pkh_cashaddr_uncomp": cashaddr_encode_many("bitcoincash", 0x00, hu),
+            }
+        else:
+            raise ValueError(f"Unsupported currency: {currency}")
+    return out
+
+
+def derive_addresses_many(
+    pubkeys: Sequence[bytes],
+    currencies: Sequence[str] = ("btc", "doge", "ltc", "zec", "eth", "trx", "bch"),
+) -> List[List[str]]:
+    """Column variant of :func:`convert_pubkey_to_addresses`.
+
+    For each pubkey (compressed or uncompressed bytes) returns the distinct
+    addresses ``convert_pubkey_to_addresses`` derives for ``currencies``, in
+    the same order. Valid keys are hashed and encoded in bulk; anything the
+    curve rejects falls back to the per-key function, so edge cases (and its
+    error handling) stay identical. An underivable key yields ``[]``.
+    """
+    forms = [_compressed_and_uncompressed(bytes(pk)) if pk else None for pk in pubkeys]
+    valid = [(i, f) for i, f in enumerate(forms) if f is not None]
+    columns = _address_columns(
+        [f[0] for _, f in valid], [f[1] for _, f in valid], currencies
+    )
+    out: List[List[str]] = [[] for _ in pubkeys]
+    for row, (i, _) in enumerate(valid):
+        seen = set()
+        for by_form in columns.values():
+            for column in by_form.values():
+                address = column[row]
+                if address not in seen:
+                    seen.add(address)
+                    out[i].append(address)
+    for i, f in enumerate(forms):
+        if f is None and pubkeys[i]:
+            out[i] = _derive_addresses_scalar(bytes(pubkeys[i]), currencies)
+    return out
+
+
+def _derive_addresses_scalar(pubkey: bytes, currencies: Sequence[str]) -> List[str]:
+    try:
+        all_addrs = convert_pubkey_to_addresses(pubkey.hex(), list(currencies))
+    except Exception:
+        return []
+    out = []
+    for forms in all_addrs.values():
+        for key, val in forms.items():
+            if key == "error" or not isinstance(val, str) or not val or val in out:
+                continue
+            out.append(val)
+    return out
+
+
 def compress_public_key(uncompressed_pubkey_hex: str) -> str:
     """
     Converts an uncompressed public key hexadecimal string to a compressed one.
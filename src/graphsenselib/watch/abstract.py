@@ -1,7 +1,7 @@
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from datetime import datetime
-from typing import List, Optional, Tuple
+from typing import Iterable, List, Optional, Set, Tuple
 
 from ..datatypes.common import FlowDirection
 
@@ -33,6 +33,14 @@ class WatchpointProvider(ABC):
     def get_configuration(self, address: str) -> WatchConfig:
         pass
 
+    def filter_watched(self, addresses: Iterable[str]) -> Set[str]:
+        """Bulk variant of is_watched: the subset of addresses that are watched."""
+        return {a for a in addresses if self.is_watched(a)}
+
+    def refresh(self) -> bool:
+        """Reload the watchpoints if their source changed; True if reloaded."""
+        return False
+
     def __enter__(self):
         pass
 
@@ -63,6 +71,23 @@ class FlowProvider(ABC):
     ) -> Optional[List[Tuple[FlowEvent, object]]]:
         pass
 
+    def get_highest_block(self) -> Optional[int]:
+        """Highest block available from the source, None if unknown."""
+        return None
+
+    def get_flows_for_blocks(
+        self, start_block: int, end_block: int
+    ) -> List[List[Tuple[FlowEvent, object]]]:
+        """Flows of the consecutive blocks start_block..end_block (inclusive),
+        one list per block. Stops early at the first block without data."""
+        out = []
+        for block in range(start_block, end_block + 1):
+            flows = self.get_flows_for_block(block)
+            if flows is None:
+                break
+            out.append(flows)
+        return out
+
     def __enter__(self):
         pass
 
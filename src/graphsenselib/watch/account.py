@@ -1,4 +1,5 @@
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Optional, Tuple
 
 import requests
@@ -55,8 +56,33 @@ def parse_node_trace(trace) -> List[FlowEvent]:
 
 
 class AccountNodeFlowProvider(FlowProvider):
-    def __init__(self, node_url):
+    def __init__(self, node_url, max_workers: int = 1):
         self.node_url = node_url
+        self.max_workers = max_workers
+
+    def get_highest_block(self) -> Optional[int]:
+        resp = requests.post(
+            self.node_url,
+            json={"jsonrpc": "2.0", "method": "eth_blockNumber", "params": [], "id": 1},
+        )
+        if resp.status_code != 200:
+            raise Exception(f"Failed to query the node {self.node_url}: {resp}")
+        data = resp.json()
+        return to_int(data["result"]) if "result" in data else None
+
+    def get_flows_for_blocks(
+        self, start_block: int, end_block: int
+    ) -> List[List[Tuple[FlowEvent, object]]]:
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            results = pool.map(
+                self.get_flows_for_block, range(start_block, end_block + 1)
+            )
+            out = []
+            for flows in results:
+                if flows is None:
+                    break
+                out.append(flows)
+        return out
 
     def get_flows_for_block(
         self, block: int
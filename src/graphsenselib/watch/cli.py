@@ -37,7 +37,16 @@ def watch():
     required=True,
     help="File that defines the watched addresses.",
 )
-def watchflows(env, currency, state_file, watchpoints_file):
+@click.option(
+    "--batch-size",
+    type=int,
+    default=100,
+    show_default=True,
+    help="While behind the chain tip, fetch and match up to this many blocks "
+    "at once. At the tip blocks are still processed one by one; 1 disables "
+    "range mode.",
+)
+def watchflows(env, currency, state_file, watchpoints_file, batch_size):
     """Watches for movements money flows and generates notifications form that.
     \f
     Args:
@@ -48,7 +57,7 @@ def watchflows(env, currency, state_file, watchpoints_file):
     try:
         with create_lock(lock_name):
             with FlowWatcherFactory().file_based_from_config(
-                env, currency, state_file, watchpoints_file
+                env, currency, state_file, watchpoints_file, batch_size=batch_size
             ) as watcher:
                 watcher.watch()
     except LockAcquisitionError as e:
@@ -15,10 +15,13 @@ from .slack import SlackEventNotifier
 from .utxo import BitcoinEtlFlowProvider
 from .watcher import FlowWatcher
 
+# Parallel block fetches in range mode (the BtcBlockExporter default).
+RANGE_FETCH_WORKERS = 5
+
 
 class FlowWatcherFactory:
     def file_based_from_config(
-        self, env, currency, state_file, watchpoints_file
+        self, env, currency, state_file, watchpoints_file, batch_size: int = 1
     ) -> FlowWatcher:
         config = get_config()
         if not os.path.isfile(watchpoints_file):
@@ -40,19 +43,22 @@ class FlowWatcherFactory:
                 f"({env}.{currency}.ingest_config.node_reference is missing)"
             )
         node_ref = ks_config.ingest_config.get_first_node_reference()
+        max_workers = RANGE_FETCH_WORKERS if batch_size > 1 else 1
 
         return FlowWatcher(
             state=JsonWatcherState(state_file),
             watchpoints=JsonWatchpointProvider(watchpoints_file),
             flow_provider=(
-                AccountNodeFlowProvider(node_ref)
+                AccountNodeFlowProvider(node_ref, max_workers=max_workers)
                 if schema == "account"
                 else BitcoinEtlFlowProvider(
                     currency,
                     node_ref,
                     CassandraOutputResolver(DbFactory().from_config(env, currency)),
+                    max_workers=max_workers,
                 )
             ),
             notifiers=notifiers,
             new_block_backoff_sec=avg_blocktimes_by_currencies.get(currency, 600),
+            batch_size=batch_size,
         )
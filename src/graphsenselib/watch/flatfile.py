@@ -1,6 +1,7 @@
 import json
 import logging
 import os
+from typing import Iterable, Set
 
 from .abstract import WatchConfig, WatcherState, WatchpointProvider
 
@@ -9,11 +10,28 @@ logger = logging.getLogger(__name__)
 
 class JsonWatchpointProvider(WatchpointProvider):
     def __init__(self, filename: str):
-        with open(filename) as f:
+        self.filename = filename
+        self._mtime = None
+        self._load()
+
+    def _load(self):
+        self._mtime = os.stat(self.filename).st_mtime_ns
+        with open(self.filename) as f:
             self.data = json.load(f)
+        self._index = frozenset(self.data)
+
+    def refresh(self) -> bool:
+        if os.stat(self.filename).st_mtime_ns == self._mtime:
+            return False
+        self._load()
+        logger.info(f"Reloaded {len(self._index)} watchpoints from {self.filename}")
+        return True
 
     def is_watched(self, address: str):
-        return address in self.data
+        return address in self._index
+
+    def filter_watched(self, addresses: Iterable[str]) -> Set[str]:
+        return self._index.intersection(addresses)
 
     def get_configuration(self, address: str) -> WatchConfig:
         d = self.data.get(address, None)
@@ -66,12 +66,19 @@ class BitcoinEtlFlowProvider(FlowProvider):
     output_resolver: OutputResolverBase
 
     def __init__(
-        self, currency: str, node_url: str, output_resolver: OutputResolverBase
+        self,
+        currency: str,
+        node_url: str,
+        output_resolver: OutputResolverBase,
+        max_workers: int = 1,
     ):
         self.currency = currency
         self.node_url = node_url
         self.exporter = BtcBlockExporter(
-            provider_uri=node_url, max_workers=1, timeout=60, network=currency
+            provider_uri=node_url,
+            max_workers=max_workers,
+            timeout=60,
+            network=currency,
         )
         self.output_resolver = output_resolver
 
@@ -82,21 +89,38 @@ class BitcoinEtlFlowProvider(FlowProvider):
     def __exit__(self, exc_type, exc_val, exc_tb):
         self.output_resolver.__exit__(exc_type, exc_val, exc_tb)
 
-    def get_flows_for_block(
-        self, block: int
-    ) -> Optional[List[Tuple[FlowEvent, object]]]:
+    def _export_enriched_txs(self, start_block: int, end_block: int) -> List[dict]:
         with suppress_log_level(logging.INFO):
-            _, txs = self.exporter.export_blocks_and_transactions(block, block)
+            _, txs = self.exporter.export_blocks_and_transactions(
+                start_block, end_block
+            )
             enrich_txs(
                 txs,
                 self.output_resolver,
                 ignore_missing_outputs=True,
                 network=self.currency,
             )
+        return txs
 
+    def get_flows_for_block(
+        self, block: int
+    ) -> Optional[List[Tuple[FlowEvent, object]]]:
         events = []
-        for tx in txs:
+        for tx in self._export_enriched_txs(block, block):
             for e in parse_btcetl_txs(tx):
                 events.append((e, tx))
 
         return events if events else None
+
+    def get_highest_block(self) -> Optional[int]:
+        return self.exporter.get_current_block_number()
+
+    def get_flows_for_blocks(
+        self, start_block: int, end_block: int
+    ) -> List[List[Tuple[FlowEvent, object]]]:
+        # One exporter call fetches the blocks in parallel (max_workers) and
+        # resolves the inputs of the whole range in bulk.
+        by_block = {b: [] for b in range(start_block, end_block + 1)}
+        for tx in self._export_enriched_txs(start_block, end_block):
+            by_block[tx["block_number"]].extend((e, tx) for e in parse_btcetl_txs(tx))
+        return list(by_block.values())
@@ -1,10 +1,16 @@
 import logging
 import time
-from typing import List
+from typing import List, Optional, Tuple
 
 from ..datatypes import FlowDirection
 from ..utils.signals import graceful_ctlc_shutdown
-from .abstract import EventNotifier, FlowProvider, WatcherState, WatchpointProvider
+from .abstract import (
+    EventNotifier,
+    FlowEvent,
+    FlowProvider,
+    WatcherState,
+    WatchpointProvider,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -17,12 +23,17 @@ class FlowWatcher:
         flow_provider: FlowProvider,
         notifiers: List[EventNotifier],
         new_block_backoff_sec: int = 600,
+        batch_size: int = 1,
     ):
         self.provider = flow_provider
         self.notifiers = notifiers
         self.state = state
         self.watchpoints = watchpoints
         self.new_block_backoff_sec = new_block_backoff_sec
+        # When behind the tip, up to batch_size blocks are fetched as one range
+        # and the state is persisted per range; at the tip one block at a time.
+        self.batch_size = batch_size
+        self._known_tip = None
 
     def __enter__(self):
         self.state.__enter__()
@@ -39,48 +50,69 @@ class FlowWatcher:
             no.__exit__(exc_type, exc_value, traceback)
         self.watchpoints.__exit__(exc_type, exc_value, traceback)
 
+    def _range_end(self, next_block: int) -> Optional[int]:
+        """Last block of the next range, or None to fetch a single block (at or
+        near the tip, or if the provider cannot tell its highest block)."""
+        if self.batch_size <= 1:
+            return None
+        end = next_block + self.batch_size - 1
+        if self._known_tip is None or end > self._known_tip:
+            self._known_tip = self.provider.get_highest_block()
+        if self._known_tip is None or self._known_tip <= next_block:
+            return None
+        return min(end, self._known_tip)
+
+    def _notify_block(self, flows: List[Tuple[FlowEvent, object]]):
+        watched = self.watchpoints.filter_watched({flow.address for flow, _ in flows})
+        if watched:
+            for flow, raw_flow in flows:
+                if flow.address not in watched:
+                    continue
+                wconfig = self.watchpoints.get_configuration(flow.address)
+                if (
+                    (wconfig.on_incoming and flow.direction == FlowDirection.IN)
+                    or (wconfig.on_outgoing and flow.direction == FlowDirection.OUT)
+                ) and (wconfig.value_gt is None or flow.value > wconfig.value_gt):
+                    for notifier in self.notifiers:
+                        notifier.add_notification(flow, wconfig, raw_flow)
+
+        for notifier in self.notifiers:
+            notifier.send_notifications()
+        self.state.done_with_block()
+
     def watch(self):
         try:
             with graceful_ctlc_shutdown() as shutdown_initialized:
                 while True:
                     next_block = self.state.get_next_watch_block()
+                    self.watchpoints.refresh()
 
-                    flows = self.provider.get_flows_for_block(next_block)
+                    end_block = self._range_end(next_block)
+                    if end_block is None:
+                        flows = self.provider.get_flows_for_block(next_block)
+                        blocks = [flows] if flows is not None else []
+                    else:
+                        blocks = self.provider.get_flows_for_blocks(
+                            next_block, end_block
+                        )
 
-                    if next_block % 1000 == 0:
-                        logger.info(f"Done with block {next_block}")
+                    last_block = next_block + len(blocks) - 1
+                    if blocks and (last_block // 1000) != ((next_block - 1) // 1000):
+                        logger.info(f"Done with block {last_block}")
 
                     if shutdown_initialized():
                         self.state.persist()
                         return
 
-                    if flows is None:
+                    if not blocks:
                         wait_sec = int(self.new_block_backoff_sec * 1.3)
                         logger.info(f"No data found for block, waiting {wait_sec}s.")
                         time.sleep(wait_sec)
                         continue
 
-                    for flow, raw_flow in flows:
-                        if self.watchpoints.is_watched(flow.address):
-                            wconfig = self.watchpoints.get_configuration(flow.address)
-                            if (
-                                (
-                                    wconfig.on_incoming
-                                    and flow.direction == FlowDirection.IN
-                                )
-                                or (
-                                    wconfig.on_outgoing
-                                    and flow.direction == FlowDirection.OUT
-                                )
-                            ) and (
-                                wconfig.value_gt is None
-                                or flow.value > wconfig.value_gt
-                            ):
-                                for notifier in self.notifiers:
-                                    notifier.add_notification(flow, wconfig, raw_flow)
-
-                    for notifier in self.notifiers:
-                        notifier.send_notifications()
-                    self.state.done_with_block()
+                    for flows in blocks:
+                        self._notify_block(flows)
+                    if len(blocks) > 1:
+                        self.state.persist()
         finally:
             self.state.persist()
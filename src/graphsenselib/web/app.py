@@ -510,6 +510,8 @@ async def setup_database(app: FastAPI):
     mod = importlib.import_module("graphsenselib.db.asynchronous." + driver)
     cls = getattr(mod, driver.capitalize())
     app.state.db = cls(db_config, logger)
+    if db_config.immutable_cache_warmup_blocks > 0:
+        await app.state.db.warm_immutable_cache(db_config.immutable_cache_warmup_blocks)
 
     ts_conf = config.tagstore
 
@@ -130,6 +130,14 @@ class GSRestConfig(BaseSettings):
             "the check."
         ),
     )
+    bulk_batch_size: int = Field(
+        default=100,
+        description=(
+            "Number of key values the bulk endpoints hand to an operation's "
+            "batched implementation at once (e.g. get_address). 0 disables "
+            "batching and runs one call per value."
+        ),
+    )
     max_request_body_bytes: int = Field(
         default=8 * 1024 * 1024,
         description=(
@@ -63,6 +63,11 @@ class MockTagstoreDb:
     ) -> list[Any]:
         return []
 
+    async def get_actors_by_subjectids(
+        self, subject_ids: list[str], groups: list[str]
+    ) -> dict[str, list[Any]]:
+        return {sid.strip(): [] for sid in subject_ids}
+
     async def get_tags_by_subjectid(
         self, address: str, offset: int, limit: Optional[int], groups: list[str]
     ) -> list[Any]:
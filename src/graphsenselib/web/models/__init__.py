@@ -72,6 +72,8 @@ from graphsenselib.web.models.heuristics import (
     WhirlpoolTx0Heuristic,
 )
 from graphsenselib.web.models.search import (
+    AddressNeighborSearchResult,
+    AddressNeighborSearchStep,
     SearchResult,
     SearchResultByCurrency,
     SearchResultLeaf,
@@ -154,6 +156,8 @@ __all__ = [
     "Block",
     "BlockAtDate",
     # Search
+    "AddressNeighborSearchResult",
+    "AddressNeighborSearchStep",
     "SearchResultByCurrency",
     "SearchResult",
     "SearchResultLeaf",
@@ -4,6 +4,8 @@ from __future__ import annotations
 
 from typing import Optional
 
+from pydantic import Field
+
 from graphsenselib.web.models.addresses import Address
 from graphsenselib.web.models.base import APIModel, api_model_config
 from graphsenselib.web.models.common import LabeledItemRef
@@ -95,3 +97,52 @@ class SearchResultLevel1(APIModel):
     neighbor: NeighborEntity
     matching_addresses: list[Address]
     paths: list[SearchResultLevel2]
+
+
+ADDRESS_NEIGHBOR_SEARCH_STEP_EXAMPLE = {
+    "address": "1Archive1n2C579dMsAu3iC6tWzuQJz8dN",
+    "depth": 1,
+    "value": 27789282,
+    "no_txs": 3,
+    "keywords": ["1Archive1n2C579dMsAu3iC6tWzuQJz8dN", "internet archive"],
+}
+
+
+class AddressNeighborSearchStep(APIModel):
+    """One hop on a path found by the address neighbor search."""
+
+    model_config = api_model_config(ADDRESS_NEIGHBOR_SEARCH_STEP_EXAMPLE)
+
+    address: str
+    depth: int
+    value: int = Field(
+        description="Value on the edge from the previous step, in the "
+        "currency's smallest unit. 0 for the start address."
+    )
+    no_txs: Optional[int] = None
+    keywords: list[str] = Field(
+        description="The address itself and the labels, actors and concepts "
+        "of its tags; what match_keywords and prune_keywords are compared to."
+    )
+
+
+class AddressNeighborSearchResult(APIModel):
+    """Paths from the start address to every matching neighbor."""
+
+    model_config = api_model_config(
+        {
+            "state": "done",
+            "paths": [[ADDRESS_NEIGHBOR_SEARCH_STEP_EXAMPLE]],
+            "nodes_visited": 42,
+            "queries": 12,
+        }
+    )
+
+    state: str = Field(
+        description='"done" when the search ran to completion or found '
+        'max_results matches, "timeout" or "query_budget_exhausted" when it '
+        "was cut short and may have missed matches."
+    )
+    paths: list[list[AddressNeighborSearchStep]]
+    nodes_visited: int
+    queries: int
@@ -7,6 +7,7 @@ from fastapi import APIRouter, Depends, Query, Request
 from graphsenselib.web.service import ServiceContext
 from graphsenselib.web.models import (
     Address,
+    AddressNeighborSearchResult,
     AddressTags,
     AddressTxs,
     Cluster,
@@ -288,6 +289,81 @@ async def list_address_neighbors(
     return result
 
 
+@router.get(
+    "/addresses/{address}/search",
+    summary="Search the neighborhood of an address",
+    description=(
+        "Walks the address graph from the given address in one direction, up to "
+        "`depth` hops and `breadth` neighbors per hop, and returns one path per "
+        "neighbor whose tags (label, actor, concepts) or address match one of "
+        "`match_keywords`. Matching addresses end a path, addresses matching "
+        "`prune_keywords` are not expanded. The search is bounded by "
+        "`search_time_seconds`; check `state` to see whether it ran to completion."
+    ),
+    operation_id="search_address_neighbors",
+    response_model=AddressNeighborSearchResult,
+    response_model_exclude_none=True,
+    responses={404: {"description": "Address not found for the selected currency."}},
+)
+async def search_address_neighbors(
+    request: Request,
+    currency: CurrencyPath,
+    address: AddressPath,
+    direction: DirectionQuery,
+    match_keywords: str = Query(
+        ...,
+        description="Comma separated labels, actors, concepts or addresses to find",
+        examples=["exchange"],
+    ),
+    prune_keywords: Optional[str] = Query(
+        None,
+        description="Comma separated labels, actors, concepts or addresses not to "
+        "search beyond",
+        examples=["mixer"],
+    ),
+    depth: int = Query(
+        5, ge=1, le=service.MAX_SEARCH_DEPTH, description="Search depth"
+    ),
+    breadth: int = Query(
+        200,
+        ge=1,
+        le=service.MAX_SEARCH_BREADTH,
+        description="Neighbors followed per address",
+    ),
+    min_value: int = Query(
+        0, ge=0, description="Skip edges below this value, in the smallest unit"
+    ),
+    max_results: Optional[int] = Query(
+        None, ge=1, description="Stop after this many matches"
+    ),
+    strategy: Literal["bfs", "best_first"] = Query(
+        "bfs",
+        description="Expand the closest addresses first (bfs) or follow the "
+        "largest flows first (best_first)",
+    ),
+    search_time_seconds: float = Query(
+        5, gt=0, le=service.MAX_SEARCH_TIME, description="Search time budget"
+    ),
+    ctx: ServiceContext = Depends(get_ctx),
+):
+    """Search neighbors of an address."""
+    result = await service.search_address_neighbors(
+        ctx,
+        currency=currency.lower(),
+        address=address,
+        direction=direction,
+        match_keywords=parse_comma_separated_strings(match_keywords) or [],
+        prune_keywords=parse_comma_separated_strings(prune_keywords),
+        depth=depth,
+        breadth=breadth,
+        min_value=min_value,
+        max_results=max_results,
+        strategy=strategy,
+        search_time=search_time_seconds,
+    )
+    return result
+
+
 @router.get(
     "/addresses/{address}/links",
     summary="List transactions between two addresses",
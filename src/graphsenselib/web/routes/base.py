@@ -3,11 +3,15 @@
 import functools
 import logging
 import re
+import types
 from datetime import datetime
-from typing import Annotated, Any, Optional
+from typing import Annotated, Any, Optional, Union, get_args, get_origin
 
 from fastapi import Depends, Header, Request
+from fastapi.datastructures import DefaultPlaceholder
+from fastapi.responses import JSONResponse
 from fastapi.routing import APIRoute
+from pydantic import BaseModel
 from starlette.responses import Response
 
 from graphsenselib.errors import BadUserInputException
@@ -23,6 +27,14 @@ class PluginRoute(APIRoute):
 
     Routes return raw result objects; this class applies hooks and serializes.
     StreamingResponse (bulk routes) passes through untouched.
+
+    Results whose models serialize exactly like the response model (see
+    ``serializes_as``) are written to JSON straight from the models
+    (``to_json_bytes``). FastAPI would otherwise validate the dumped dict
+    against the response model, i.e. rebuild every model once more, only to
+    serialize the copy with the same serializer. Byte parity holds because
+    FastAPI (>= 0.130) dumps such responses with pydantic-core as well,
+    which it only does for routes without an explicit ``response_class``.
     """
 
     def __init__(self, path: str, endpoint, **kwargs):
@@ -36,9 +48,24 @@ class PluginRoute(APIRoute):
             request = deps.get("request")
             if request:
                 apply_plugin_hooks(request, result)
+            if self.direct_json and serializes_as(self.response_model, result):
+                return Response(
+                    to_json_bytes(result),
+                    status_code=self.status_code or 200,
+                    media_type="application/json",
+                )
             return to_json_response(result)
 
         super().__init__(path, plugin_endpoint, **kwargs)
+        self.direct_json = (
+            isinstance(self.response_class, DefaultPlaceholder)
+            and self.response_class.value is JSONResponse
+            and self.response_model_exclude_none
+            and not self.response_model_exclude_unset
+            and not self.response_model_exclude_defaults
+            and self.response_model_include is None
+            and self.response_model_exclude is None
+        )
 
 
 def make_ctx(
@@ -186,6 +213,45 @@ def to_json_response(result: Any) -> dict:
         return _model_to_dict(result)
 
 
+@functools.lru_cache(maxsize=None)
+def _model_serializes_as(response_model: Any, cls: type) -> bool:
+    if get_origin(response_model) in (Union, types.UnionType):
+        return cls in get_args(response_model)
+    if not (
+        isinstance(response_model, type)
+        and issubclass(response_model, BaseModel)
+        and issubclass(cls, BaseModel)
+        and (issubclass(cls, response_model) or issubclass(response_model, cls))
+    ):
+        return False
+    # e.g. Cluster, an Entity subclass without fields of its own
+    return {n: f.annotation for n, f in cls.model_fields.items()} == {
+        n: f.annotation for n, f in response_model.model_fields.items()
+    } and set(cls.model_computed_fields) == set(response_model.model_computed_fields)
+
+
+def serializes_as(response_model: Any, result: Any) -> bool:
+    """Whether FastAPI's response for ``to_json_response(result)``, validated
+    against ``response_model`` (with ``exclude_none``), is
+    ``to_json_bytes(result)``."""
+    if isinstance(result, list):
+        if get_origin(response_model) is not list:
+            return False
+        (item_model,) = get_args(response_model)
+        return all(_model_serializes_as(item_model, type(r)) for r in result)
+    return _model_serializes_as(response_model, type(result))
+
+
+def to_json_bytes(result: Any) -> bytes:
+    """JSON of an API model (or a list of them) as FastAPI writes it for a
+    response model of the same type."""
+    if isinstance(result, list):
+        return b"[" + b",".join(to_json_bytes(r) for r in result) + b"]"
+    return result.__pydantic_serializer__.to_json(
+        result, exclude_none=True, by_alias=True
+    )
+
+
 def _model_to_dict(obj: Any) -> Any:
     """Convert a single model to dict."""
     # Prefer to_dict() for compatibility with both old and new models
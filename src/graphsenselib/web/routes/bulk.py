@@ -46,6 +46,17 @@ default_concurrency_by_operation = {
 tasks_in_flight_factor = 4
 min_tasks_in_flight = 64
 
+# Operations with a batched implementation in the same service module:
+# operation -> (key, batch function). The batch function is called as
+# fn(ctx, currency, values, **params) with up to `bulk_batch_size` values of
+# `key` and returns one result or exception per value, in order. It reads
+# all values with grouped backend queries instead of one call per value.
+# Only used when `key` is the only list in the request.
+batch_operations = {
+    "get_address": ("address", "get_addresses"),
+}
+default_bulk_batch_size = 100
+
 # `clusters` is listed before `entities` so new cluster-named operations resolve
 # against clusters_service first. `entities_service` is still present as a
 # back-compat shim re-exporting the same functions under their legacy names.
@@ -99,34 +110,18 @@ def flatten(item, name="", flat_dict=None, format=None):
     return flat_dict
 
 
-async def wrap(
-    request,
-    ctx,
-    operation,
-    currency,
-    params,
-    keys,
-    num_pages,
-    format,
-    max_concurrency_sem_context,
-):
-    params = dict(params)
-    for k, v in keys.items():
-        params[k] = v
-    try:
-        async with max_concurrency_sem_context:
-            result = await operation(ctx, currency, **params)
-    except NotFoundException:
-        result = {error_field: "not found"}
-    except BadUserInputException as e:
-        traceback.print_exception(type(e), e, e.__traceback__)
-        result = {error_field: str(e)}
-    except TypeError as e:
-        traceback.print_exception(type(e), e, e.__traceback__)
-        result = {error_field: str(e)}
-    except Exception as e:
-        traceback.print_exception(type(e), e, e.__traceback__)
-        result = {error_field: "internal error"}
+def error_result(e):
+    if isinstance(e, NotFoundException):
+        return {error_field: "not found"}
+    traceback.print_exception(type(e), e, e.__traceback__)
+    if isinstance(e, (BadUserInputException, TypeError)):
+        return {error_field: str(e)}
+    return {error_field: "internal error"}
+
+
+def flatten_result(request, result, keys, format):
+    """Flatten one operation result into output rows; returns the rows and
+    the next page state, if any."""
     # Apply plugin response hooks (e.g. private-tag obfuscation) to the model
     # object here, mirroring PluginRoute for non-streaming routes. StreamingResponse
     # bypasses PluginRoute, so without this bulk would leak un-obfuscated tag data.
@@ -162,6 +157,29 @@ async def wrap(
         append_keys(fl)
         fl[info_field] = "no data"
         flat.append(fl)
+    return flat, page_state
+
+
+async def wrap(
+    request,
+    ctx,
+    operation,
+    currency,
+    params,
+    keys,
+    num_pages,
+    format,
+    max_concurrency_sem_context,
+):
+    params = dict(params)
+    for k, v in keys.items():
+        params[k] = v
+    try:
+        async with max_concurrency_sem_context:
+            result = await operation(ctx, currency, **params)
+    except Exception as e:
+        result = error_result(e)
+    flat, page_state = flatten_result(request, result, keys, format)
     num_pages -= 1
     if num_pages > 0 and page_state:
         params["page"] = page_state
@@ -181,6 +199,54 @@ async def wrap(
     return flat
 
 
+async def wrap_batch(
+    request,
+    ctx,
+    batch_operation,
+    currency,
+    params,
+    key,
+    values,
+    format,
+    max_concurrency_sem_context,
+):
+    """Like wrap() for a batch of key values, using a batched implementation
+    from `batch_operations`. Rows are the same as from one wrap() per value."""
+    try:
+        async with max_concurrency_sem_context:
+            results = await batch_operation(ctx, currency, values, **params)
+    except Exception as e:
+        results = [e] * len(values)
+    flat = []
+    for value, result in zip(values, results):
+        if isinstance(result, Exception):
+            result = error_result(result)
+        rows, _ = flatten_result(request, result, {key: value}, format)
+        flat.extend(rows)
+    return flat
+
+
+def get_batch_operation(mod, operation_name, keys, params, ctx):
+    """Return the batched implementation of `operation_name` if it is
+    registered in `batch_operations`, enabled and applicable to this request
+    (its key is the only list and it accepts the other parameters)."""
+    if operation_name not in batch_operations:
+        return None
+    if getattr(ctx.config, "bulk_batch_size", default_bulk_batch_size) <= 0:
+        return None
+    key, batch_function_name = batch_operations[operation_name]
+    if list(keys) != [key]:
+        return None
+    batch_operation = getattr(mod, batch_function_name, None)
+    if batch_operation is None:
+        return None
+    try:
+        inspect.signature(batch_operation).bind(None, None, [], **params)
+    except TypeError:
+        return None
+    return batch_operation
+
+
 def stack(request, ctx, currency, operation, body, num_pages, format):
     operation_name = operation
     operation_func = None
@@ -239,6 +305,31 @@ def stack(request, ctx, currency, operation, body, num_pages, format):
 
     context = asyncio.Semaphore(max_concurrency_bulk_operation)
 
+    batch_operation = get_batch_operation(mod, operation_name, keys, params, ctx)
+    if batch_operation is not None:
+        (key,) = keys
+        values = keys[key][:ln]
+        batch_size = getattr(ctx.config, "bulk_batch_size", default_bulk_batch_size)
+
+        def make_batch_task(i):
+            return wrap_batch(
+                request,
+                ctx,
+                batch_operation,
+                currency,
+                params,
+                key,
+                values[i * batch_size : (i + 1) * batch_size],
+                format,
+                context,
+            )
+
+        return bounded_as_completed(
+            make_batch_task,
+            -(-ln // batch_size),
+            max_concurrency_bulk_operation * tasks_in_flight_factor,
+        )
+
     def make_task(i):
         the_keys = {}
         for k, v in keys.items():
@@ -1,5 +1,8 @@
 from typing import Optional
 
+from graphsenselib.db.asynchronous.services.neighbor_search import (
+    NeighborSearchLimits,
+)
 from graphsenselib.errors import BadUserInputException
 from graphsenselib.tagstore.algorithms.obfuscate import obfuscate_tag_if_not_public
 
@@ -8,6 +11,10 @@ from graphsenselib.web.translators import (
     pydantic_to_openapi,
 )
 
+MAX_SEARCH_DEPTH = 10
+MAX_SEARCH_BREADTH = 1000
+MAX_SEARCH_TIME = 60
+
 
 async def list_related_addresses(
     ctx,
@@ -62,6 +69,15 @@ async def get_address(ctx, currency, address, include_actors=True):
     return pydantic_to_openapi(pydantic_result)
 
 
+async def get_addresses(ctx, currency, addresses, include_actors=True):
+    """Batched get_address for /bulk: one result or exception per address."""
+    results = await ctx.services.addresses_service.get_addresses(
+        currency, addresses, ctx.tagstore_groups, include_actors
+    )
+
+    return [r if isinstance(r, Exception) else pydantic_to_openapi(r) for r in results]
+
+
 async def list_tags_by_address(
     ctx, currency, address, page=None, pagesize=None, include_best_cluster_tag=False
 ):
@@ -139,6 +155,40 @@ async def list_address_neighbors(
     return pydantic_to_openapi(pydantic_result)
 
 
+async def search_address_neighbors(
+    ctx,
+    currency,
+    address,
+    direction,
+    match_keywords,
+    prune_keywords=None,
+    depth=5,
+    breadth=200,
+    min_value=0,
+    max_results=None,
+    strategy="bfs",
+    search_time=5,
+):
+    pydantic_result = await ctx.services.addresses_service.search_address_neighbors(
+        currency,
+        address,
+        direction,
+        ctx.tagstore_groups,
+        match_keywords,
+        prune_keywords,
+        NeighborSearchLimits(
+            max_depth=depth,
+            max_breadth=breadth,
+            min_value=min_value,
+            max_results=max_results,
+            time_budget_s=search_time,
+            strategy=strategy,
+        ),
+    )
+
+    return pydantic_to_openapi(pydantic_result)
+
+
 async def list_address_links(
     ctx,
     currency,
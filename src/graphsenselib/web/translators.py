@@ -79,6 +79,9 @@ from graphsenselib.db.asynchronous.services.models import (
     NeighborEntity as PydanticNeighborEntity,
 )
 from graphsenselib.db.asynchronous.services.models import RatesResponse as PydanticRates
+from graphsenselib.db.asynchronous.services.models import (
+    AddressNeighborSearchResult as PydanticAddressNeighborSearchResult,
+)
 from graphsenselib.db.asynchronous.services.models import (
     SearchResult as PydanticSearchResult,
 )
@@ -112,6 +115,7 @@ from graphsenselib.web.models import (
     AddressTags,
     AddressTxs,
     AddressTxUtxo,
+    AddressNeighborSearchResult,
     Block,
     BlockAtDate,
     Concept,
@@ -588,6 +592,14 @@ def to_api_search_result(pydantic_result: PydanticSearchResult) -> SearchResult:
     return SearchResult.model_validate(pydantic_result.model_dump())
 
 
+def to_api_address_neighbor_search_result(
+    pydantic_result: PydanticAddressNeighborSearchResult,
+) -> AddressNeighborSearchResult:
+    """Convert service AddressNeighborSearchResult to API
+    AddressNeighborSearchResult."""
+    return AddressNeighborSearchResult.model_validate(pydantic_result.model_dump())
+
+
 def to_api_token_configs(pydantic_configs: PydanticTokenConfigs) -> TokenConfigs:
     """Convert service TokenConfigs to API TokenConfigs."""
     return TokenConfigs(
@@ -702,6 +714,7 @@ def pydantic_to_openapi(pydantic_obj: Any) -> Any:
         "TagSummary": to_api_tag_summary,
         "SearchResult": to_api_search_result,
         "SearchResultByCurrency": to_api_search_result_by_currency,
+        "AddressNeighborSearchResult": to_api_address_neighbor_search_result,
         "TokenConfigs": to_api_token_configs,
         "ExternalConversion": to_api_external_conversion,
         "CrossChainPubkeyRelatedAddress": to_api_cross_chain_pubkey_related_address,
@@ -5,14 +5,22 @@ from __future__ import annotations
 import base64
 import gzip
 import json
+import random
+import re
 import struct
+from collections import Counter
 
 import pytest
 from click.testing import CliRunner
 
+from graphsenselib.convert.address_scan import scanner
 from graphsenselib.convert.address_scan.cli import scan_for_addresses_cmd
-from graphsenselib.convert.address_scan.detectors import decodes_to_text
-from graphsenselib.convert.address_scan.scanner import build_report, scan
+from graphsenselib.convert.address_scan.detectors import (
+    DETECTORS,
+    TX_DETECTORS,
+    decodes_to_text,
+)
+from graphsenselib.convert.address_scan.scanner import build_report, scan, scan_chunks
 from graphsenselib.convert.gs_files.parser import lzw_pack
 
 # Real / valid fixtures per detector.
@@ -118,5 +126,142 @@ def test_cli_missing_file_errors():
     assert result.exit_code != 0
 
 
+def _reference_scan(text):
+    """The per-detector ``re.findall`` scan the single-pass matcher replaces."""
+    found, rejected, contexts = {}, {}, {}
+    for label, pattern, validator in DETECTORS + TX_DETECTORS:
+        for m in re.finditer(pattern, text):
+            value = m.group()
+            target = found if validator is None or validator(value) else rejected
+            target.setdefault(label, Counter())[value] += 1
+            snippet = text[max(0, m.start() - 50) : m.end() + 50]
+            contexts.setdefault((label, value), snippet.replace("\n", " "))
+    return found, rejected, contexts
+
+
+def _noisy_corpus(seed=3):
+    rng = random.Random(seed)
+    hexes = "0123456789abcdef"
+    words = [
+        *VALID.values(),
+        "e3b0c44298fc1c149afbf4c8996fb92427ae41e4649b934ca495991b7852b855",
+        "0x" + "".join(rng.choice(hexes) for _ in range(40)),
+        "1A1zP1eP5QGefi2DMPTfTL5SLmv7DivfNb",  # bad checksum
+        "rrrr" + VALID["XRP"] + "zz",  # XRP slice of a longer run
+        "x" * 200,
+        "abc",
+    ]
+    seps = [" ", "\n", ",", "'", "\x00", "\xe9", ""]
+    return "".join(rng.choice(words) + rng.choice(seps) for _ in range(400))
+
+
+def _split(text, rng):
+    pos = 0
+    while pos < len(text):
+        step = rng.randint(1, 97)
+        yield text[pos : pos + step]
+        pos += step
+
+
+def test_single_pass_matches_per_detector_scan_across_chunks():
+    text = _noisy_corpus()
+    ref_found, ref_rejected, ref_contexts = _reference_scan(text)
+
+    found, rejected, contexts = scan_chunks(
+        _split(text, random.Random(5)), tx_hashes=True, context_width=50
+    )
+
+    assert found == ref_found
+    assert rejected == ref_rejected
+    # same label order and most_common tie order as the old scan
+    assert list(found) == list(ref_found)
+    assert {k: list(c) for k, c in found.items()} == {
+        k: list(c) for k, c in ref_found.items()
+    }
+    assert contexts == ref_contexts
+
+
+def test_validator_runs_once_per_distinct_candidate(monkeypatch):
+    calls = []
+
+    def validator(value):
+        calls.append(value)
+        return True
+
+    monkeypatch.setattr(
+        scanner, "DETECTORS", [DETECTORS[0]._replace(validator=validator)]
+    )
+    addr = VALID["BTC legacy/P2SH"]
+    found, _ = scan(f"{addr} 0{addr}0 {addr}\n{addr}")
+
+    assert found["BTC legacy/P2SH"][addr] == 4
+    assert calls == [addr]
+
+
+def test_build_report_workers_and_chunking_do_not_change_report(tmp_path, monkeypatch):
+    p = tmp_path / "dump.sql.gz"
+    p.write_bytes(gzip.compress(_noisy_corpus().encode("latin-1")))
+    q = tmp_path / "plain.txt"
+    q.write_text(_noisy_corpus(seed=4))
+    kwargs = {"tx_hashes": True, "context": True, "rejected_limit": 0}
+
+    expected = build_report([str(p), str(q)], **kwargs)
+    parallel = build_report([str(p), str(q)], workers=2, **kwargs)
+    monkeypatch.setattr(scanner, "CHUNK_CHARS", 64)
+    chunked = build_report([str(p), str(q)], **kwargs)
+    streamed = build_report([str(q)], decompress=False, **kwargs)
+
+    assert parallel == expected
+    assert chunked == expected
+    assert streamed["files"][0] == expected["files"][1]
+
+
+def test_build_report_bounds_streams_queued_for_the_pool(tmp_path, monkeypatch):
+    from concurrent.futures import Future
+
+    outstanding = []
+    peak = [0]
+
+    class RecordingPool:
+        """Runs jobs inline and counts results not yet collected."""
+
+        def __init__(self, workers):
+            pass
+
+        def submit(self, fn, *args):
+            future = Future()
+            future.set_result(fn(*args))
+            outstanding.append(future)
+            peak[0] = max(peak[0], len(outstanding))
+            collected = future.result
+
+            def result():
+                outstanding.remove(future)
+                return collected()
+
+            future.result = result
+            return future
+
+        def shutdown(self, cancel_futures=False):
+            pass
+
+    paths = []
+    for i in range(6):
+        p = tmp_path / f"part{i}.sql.gz"
+        p.write_bytes(gzip.compress(_noisy_corpus(seed=i).encode("latin-1")))
+        paths.append(str(p))
+
+    expected = build_report(paths)
+    monkeypatch.setattr(scanner, "ProcessPoolExecutor", RecordingPool)
+    parallel = build_report(paths, workers=2)
+
+    assert parallel == expected
+    # 12 streams (each file plus its decompressed layer); at most 2 * workers
+    # results wait besides the one just submitted
+    assert sum(f["stream_count"] for f in parallel["files"]) == 12
+    assert peak[0] == 5
+    assert outstanding == []
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
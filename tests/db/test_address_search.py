@@ -0,0 +1,264 @@
+"""Address search planning (DB-free): which index tables and partitions an
+expression reads, and exact results from an in-memory prefix / suffix index."""
+
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from graphsenselib.db.asynchronous.address_search import (
+    ADDRESS_PREFIX_TABLE,
+    ADDRESS_SUFFIX_TABLE,
+    MAX_POSTFILTER_ROWS,
+    hex_prefix_range,
+    plan_address_search,
+)
+from graphsenselib.db.account import TransformedDbAccount
+from graphsenselib.db.asynchronous.cassandra import Cassandra
+from graphsenselib.db.state import (
+    STATE_TABLE,
+    build_address_suffix_index_row,
+    parse_address_suffix_index_value,
+)
+
+TARGET = "0x33d05d1c9b4a2e7f000000000000000000008f65"
+# share the prefix partition (33D05) and sort before the target
+DECOYS = [f"0x33d05{i:035x}" for i in range(1, 40)]
+OTHERS = [
+    "0x33d05e0000000000000000000000000000008f65",
+    "0xaaaa000000000000000000000000000000008f65",
+    "0x0000000000000000000000000000000000018f65",
+]
+ADDRESSES = [TARGET, *DECOYS, *OTHERS]
+
+
+class _Result:
+    def __init__(self, rows, paging_state=None):
+        self.current_rows = rows
+        self.paging_state = paging_state
+
+    def one(self):
+        return self.current_rows[0] if self.current_rows else None
+
+
+def _cassandra(marker, indexed=ADDRESSES):
+    """Cassandra over an in-memory address index; ``indexed`` are the
+    addresses in the suffix table."""
+    db = Cassandra.__new__(Cassandra)
+    db.parameters = {"eth": {"address_prefix_length": 5, "tx_prefix_length": 5}}
+    db.queries = []
+    tables = {
+        ADDRESS_PREFIX_TABLE: sorted(bytes.fromhex(a[2:]) for a in ADDRESSES),
+        ADDRESS_SUFFIX_TABLE: sorted(bytes.fromhex(a[2:]) for a in indexed),
+    }
+
+    async def execute_async(
+        currency, keyspace, query, params, paging_state=None, fetch_size=None
+    ):
+        db.queries.append((query, params))
+        if "FROM state" in query:
+            if marker is None:
+                return _Result([])
+            return _Result([{"value": json.dumps(marker)}])
+        table = query.split()[3]
+        partition, *rest = params
+        limit = rest.pop() if "LIMIT" in query else None
+        lower = rest[0] if rest else b""
+        upper = rest[1] if len(rest) > 1 else None
+        if table == ADDRESS_SUFFIX_TABLE:
+            in_partition = [
+                a for a in tables[table] if a.hex().upper()[-4:] == partition
+            ]
+        else:
+            in_partition = [
+                a for a in tables[table] if a.hex().upper()[:5] == partition
+            ]
+        rows = [a for a in in_partition if a >= lower and (upper is None or a < upper)]
+        start = paging_state or 0
+        n = limit or fetch_size or len(rows)
+        page = rows[start : start + n]
+        more = fetch_size is not None and start + n < len(rows)
+        return _Result([{"address": a} for a in page], start + n if more else None)
+
+    db.execute_async = execute_async
+    return db
+
+
+def _tables(db):
+    return [q.split()[3] for q, _ in db.queries if "FROM state" not in q]
+
+
+def test_hex_prefix_range():
+    assert hex_prefix_range("") is None
+    assert hex_prefix_range("33d05d") == (b"\x33\xd0\x5d", b"\x33\xd0\x5e")
+    assert hex_prefix_range("33d05") == (b"\x33\xd0\x50", b"\x33\xd0\x60")
+    assert hex_prefix_range("3f") == (b"\x3f", b"\x40")
+    assert hex_prefix_range("ff") == (b"\xff", None)
+
+
+def test_plans():
+    complete, partial = (0, 4), (1000, 4)
+
+    (lookup,) = plan_address_search("33d05d", None, 5, complete, 10)
+    assert (lookup.table, lookup.partitions, lookup.max_rows) == (
+        ADDRESS_PREFIX_TABLE,
+        ("33D05",),
+        10,
+    )
+
+    # prefix and suffix in one range read, no post-filter needed
+    (lookup,) = plan_address_search("33d05d", "8f65", 5, complete, 10)
+    assert (lookup.table, lookup.partitions, lookup.postfix) == (
+        ADDRESS_SUFFIX_TABLE,
+        ("8F65",),
+        None,
+    )
+    (lookup,) = plan_address_search("", "18f65", 5, complete, 10)
+    assert (lookup.partitions, lookup.postfix) == (("8F65",), "18f65")
+    (lookup,) = plan_address_search("", "f65", 5, complete, 10)
+    assert len(lookup.partitions) == 16 and "0F65" in lookup.partitions
+
+    # older addresses are only found through the prefix table
+    suffix, prefix = plan_address_search("33d05d", "8f65", 5, partial, 10)
+    assert (suffix.table, prefix.table) == (ADDRESS_SUFFIX_TABLE, ADDRESS_PREFIX_TABLE)
+    assert (prefix.postfix, prefix.max_rows) == ("8f65", MAX_POSTFILTER_ROWS)
+
+    # no suffix index or a postfix too short for it
+    for index, postfix in [(None, "8f65"), (complete, "65")]:
+        (lookup,) = plan_address_search("33d05d", postfix, 5, index, 10)
+        assert lookup.table == ADDRESS_PREFIX_TABLE
+    (lookup,) = plan_address_search("33d0", "65", 5, None, 10)
+    assert len(lookup.partitions) == 16 and "33D0F" in lookup.partitions
+
+    assert plan_address_search("33d0", None, 5, complete, 10) == []
+    assert plan_address_search("", "65", 5, complete, 10) == []
+
+
+async def test_postfix_beyond_the_first_prefix_matches_is_found():
+    db = _cassandra({"address_id": 0, "suffix_length": 4})
+    assert await db.list_matching_addresses("eth", "0x33d05d...8f65") == [TARGET]
+    assert _tables(db) == [ADDRESS_SUFFIX_TABLE]
+
+    # a short prefix works too, results ascending
+    assert await db.list_matching_addresses("eth", "0x33...8F65") == [
+        TARGET,
+        OTHERS[0],
+    ]
+    assert await db.list_matching_addresses("eth", "...018f65") == [OTHERS[2]]
+    assert await db.list_matching_addresses("eth", "0x33d05d...f65") == [TARGET]
+
+
+async def test_without_suffix_index_prefix_range_is_post_filtered():
+    db = _cassandra(None)
+    assert await db.list_matching_addresses("eth", "0x33d05...8f65", limit=1) == [
+        TARGET
+    ]
+    assert _tables(db) == [ADDRESS_PREFIX_TABLE]
+    # TRM style: prefix one character short of the prefix partition
+    assert await db.list_matching_addresses("eth", "0x33d0...8f65") == [
+        TARGET,
+        OTHERS[0],
+    ]
+    assert await db.list_matching_addresses("eth", "...8f65") == []
+
+
+async def test_partial_suffix_index_is_merged_with_prefix_scan():
+    # only the target is new enough to be in the suffix table
+    db = _cassandra({"address_id": 1000, "suffix_length": 4}, indexed=[TARGET])
+    assert await db.list_matching_addresses("eth", "0x33d05...8f65") == [
+        TARGET,
+        OTHERS[0],
+    ]
+    assert sorted(_tables(db)) == [ADDRESS_PREFIX_TABLE, ADDRESS_SUFFIX_TABLE]
+
+
+async def test_plain_prefix_search_is_one_limited_read():
+    db = _cassandra({"address_id": 0, "suffix_length": 4})
+    assert (
+        await db.list_matching_addresses("eth", "0x33d05", limit=3)
+        == (sorted([TARGET, *DECOYS])[:3])
+    )
+    # the marker is not read without a postfix
+    ((query, params),) = db.queries
+    assert query.endswith("LIMIT %s") and params[-1] == 3
+
+
+@pytest.mark.parametrize("expression", ["0x33d05d...8g65", "0xzz...8f65"])
+async def test_invalid_hex_finds_nothing(expression):
+    db = _cassandra({"address_id": 0, "suffix_length": 4})
+    assert await db.list_matching_addresses("eth", expression) == []
+
+
+def test_marker_value_round_trip():
+    row = build_address_suffix_index_row(1000, 4)
+    assert parse_address_suffix_index_value(row["value"]) == (1000, 4)
+    assert parse_address_suffix_index_value(None) is None
+
+
+def _transformed(marker):
+    """Transformed keyspace whose prefix table holds ``ADDRESSES`` with
+    their list position as address id."""
+    db = TransformedDbAccount.__new__(TransformedDbAccount)
+    db.written = {}
+    db.get_address_suffix_index = lambda: marker
+    db.select = lambda table, columns, fetch_size: iter(
+        SimpleNamespace(address=bytes.fromhex(a[2:]), address_id=i)
+        for i, a in enumerate(ADDRESSES)
+    )
+    db.ingest = lambda table, items: db.written.setdefault(table, []).extend(items)
+    return db
+
+
+async def test_backfill_makes_pre_existing_addresses_searchable():
+    # the delta updater indexed the addresses from id 30 on; the target (id
+    # 0) predates it
+    db = _transformed((30, 4))
+    assert db.backfill_address_suffix_index(batch_size=7) == 30
+
+    rows = db.written[ADDRESS_SUFFIX_TABLE]
+    assert sorted(r["address_id"] for r in rows) == list(range(30))
+    assert {r["address_suffix"] for r in rows} == {"8F65"} | {
+        a[-4:].upper() for a in DECOYS[:29]
+    }
+    (marker,) = db.written[STATE_TABLE]
+    assert parse_address_suffix_index_value(marker["value"]) == (0, 4)
+
+    indexed = ["0x" + r["address"].hex() for r in rows] + ADDRESSES[30:]
+    search = _cassandra({"address_id": 0, "suffix_length": 4}, indexed=indexed)
+    assert await search.list_matching_addresses("eth", "0x33d05...8f65") == [
+        TARGET,
+        OTHERS[0],
+    ]
+    # no prefix partition scan left
+    assert _tables(search) == [ADDRESS_SUFFIX_TABLE]
+
+
+def test_backfill_without_marker_indexes_everything_and_is_done_once():
+    db = _transformed(None)
+    assert db.backfill_address_suffix_index() == len(ADDRESSES)
+    (marker,) = db.written[STATE_TABLE]
+    assert parse_address_suffix_index_value(marker["value"]) == (0, 4)
+
+    db = _transformed((0, 4))
+    assert db.backfill_address_suffix_index() == 0
+    assert db.written == {}
+
+
+@pytest.mark.parametrize("currency,exit_code", [("eth", 0), ("trx", 2)])
+def test_backfill_cli_is_eth_only(monkeypatch, currency, exit_code):
+    from click.testing import CliRunner
+
+    from graphsenselib.deltaupdate import cli
+
+    calls = []
+    monkeypatch.setattr(
+        cli, "backfill_address_suffix_index", lambda *a: calls.append(a)
+    )
+
+    result = CliRunner().invoke(
+        cli.deltaupdate_cli,
+        ["delta-update", "backfill-address-suffix-index", "-e", "pytest"]
+        + ["-c", currency, "--batch-size", "500"],
+    )
+    assert result.exit_code == exit_code, result.output
+    assert calls == ([("pytest", "eth", 500)] if exit_code == 0 else [])
@@ -0,0 +1,221 @@
+"""k-way merge over paged address transaction streams (DB-free): a fake
+``fetch_page`` serves each stream from a sorted list and uses row offsets as
+Cassandra paging states."""
+
+import pytest
+
+from graphsenselib.db.asynchronous.address_txs_merge import (
+    MergePages,
+    StreamCursor,
+    decode_merge_page,
+    encode_merge_page,
+    is_merge_page,
+    merge_address_txs_streams,
+)
+from graphsenselib.errors import BadUserInputException
+
+
+class FakeStreams:
+    def __init__(self, streams, groups=(0,)):
+        # streams[i][group] is the ordered row list of stream i in that group
+        self.streams = streams
+        self.keys = [(False, f"asset{i}") for i in range(len(streams))]
+        self.groups = list(groups)
+        self.reads = []
+
+    def next_group(self, g):
+        i = self.groups.index(g) + 1
+        return self.groups[i] if i < len(self.groups) else None
+
+    async def fetch_page(self, i, cursor, n):
+        rows = self.streams[i].get(cursor.s_d_group, [])
+        start = int.from_bytes(cursor.paging_state or b"\x00", "big")
+        page = rows[start : start + n]
+        self.reads.append((i, cursor.s_d_group, len(page)))
+        end = start + len(page)
+        return page, end.to_bytes(4, "big") if end < len(rows) else None
+
+    async def list_rows(
+        self, fetch_size, page=None, min_fetch_size=2, descending=False
+    ):
+        cursors = (
+            [StreamCursor(self.groups[0]) for _ in self.streams]
+            if page is None
+            else decode_merge_page(page, self.keys)
+        )
+        rows, row_cursors, finished = await merge_address_txs_streams(
+            cursors,
+            self.fetch_page,
+            self.next_group,
+            lambda r: (-r["tx_id"] if descending else r["tx_id"],),
+            fetch_size,
+            min_fetch_size=min_fetch_size,
+        )
+        return rows, MergePages(row_cursors, self.keys), finished
+
+    async def list(self, fetch_size, page=None, **kw):
+        rows, pages, finished = await self.list_rows(fetch_size, page, **kw)
+        return rows, None if finished else pages[-1]
+
+
+def _rows(stream, *tx_ids):
+    return [{"tx_id": t, "stream": stream} for t in tx_ids]
+
+
+async def _all_pages(fake, fetch_size, **kw):
+    pages, page = [], None
+    while True:
+        rows, page = await fake.list(fetch_size, page, **kw)
+        pages.append(rows)
+        if page is None:
+            return pages
+
+
+async def _resume(fake, page):
+    pages = []
+    while page is not None:
+        rows, page = await fake.list(3, page)
+        pages.append(rows)
+    return pages
+
+
+async def test_pages_concatenate_to_the_fully_merged_listing():
+    streams = [
+        {0: _rows(0, 1, 4, 4, 9, 12, 13, 14)},
+        {0: _rows(1, 2, 3, 4, 10)},
+        {0: []},
+        {0: _rows(3, 5, 6, 7, 8, 11, 15, 16, 17, 18)},
+    ]
+    expected = sorted(r["tx_id"] for s in streams for r in s[0])
+    for fetch_size in (1, 3, 4, 7, 100):
+        pages = await _all_pages(FakeStreams(streams), fetch_size)
+        assert [r["tx_id"] for p in pages for r in p] == expected
+        assert all(len(p) <= fetch_size for p in pages)
+
+
+async def test_streams_continue_through_secondary_groups():
+    # descending listing: groups are read from 2 down to 0
+    streams = [
+        {2: _rows(0, 25, 21), 0: _rows(0, 3)},
+        {2: _rows(1, 22), 1: _rows(1, 12, 11), 0: _rows(1, 2, 1)},
+    ]
+    fake = FakeStreams(streams, groups=(2, 1, 0))
+
+    pages = await _all_pages(fake, 2, min_fetch_size=1, descending=True)
+
+    assert [[r["tx_id"] for r in p] for p in pages] == [
+        [25, 22],
+        [21, 12],
+        [11, 3],
+        [2, 1],
+    ]
+    # stream 0 has no rows in group 1 and moves on to group 0
+    assert (0, 1, 0) in fake.reads
+
+
+async def test_deep_pages_only_read_one_page_per_stream():
+    streams = [{0: _rows(i, *range(i, 10_000, 4))} for i in range(4)]
+    fake = FakeStreams(streams)
+    page = None
+    for _ in range(50):
+        _, page = await fake.list(100, page, min_fetch_size=10)
+
+    fake.reads.clear()
+    rows, _ = await fake.list(100, page, min_fetch_size=10)
+
+    assert [r["tx_id"] for r in rows] == list(range(5000, 5100))
+    # every stream resumes from its paging state, nothing before it is re-read
+    assert sum(n for _, _, n in fake.reads) <= 4 * 100
+
+
+async def test_streams_are_fetched_lazily():
+    streams = [{0: _rows(0, *range(100))}, {0: _rows(1, 1000, 1001)}]
+    fake = FakeStreams(streams)
+
+    rows, page = await fake.list(60, min_fetch_size=10)
+
+    assert [r["tx_id"] for r in rows] == list(range(60))
+    # stream 1 was read once, stream 0 refilled only by what was missing
+    assert [(i, n) for i, _, n in fake.reads] == [(0, 30), (1, 2), (0, 30)]
+    assert page is not None
+
+
+async def test_exhausted_listing_has_no_next_page():
+    fake = FakeStreams([{0: _rows(0, 1, 2)}, {0: []}])
+    rows, page = await fake.list(10)
+    assert [r["tx_id"] for r in rows] == [1, 2]
+    assert page is None
+
+
+async def test_every_row_has_a_token_resuming_after_it():
+    # callers (list_links) truncate a page and continue after the last row
+    # they kept, which is usually not the last row of the batch
+    streams = [
+        {0: _rows(0, 1, 4, 9, 12)},
+        {0: _rows(1, 2, 3, 10)},
+        {0: _rows(2, 5, 6, 7, 8, 11)},
+    ]
+    expected = sorted(r["tx_id"] for s in streams for r in s[0])
+    for fetch_size in (4, 7, 100):
+        rows, pages, _ = await FakeStreams(streams).list_rows(fetch_size)
+        assert len(pages) == len(rows)
+        for kept in range(1, len(rows) + 1):
+            page = pages[kept - 1]
+            rest = (
+                []
+                if page is None
+                else [
+                    r["tx_id"]
+                    for p in await _resume(FakeStreams(streams), page)
+                    for r in p
+                ]
+            )
+            assert [r["tx_id"] for r in rows[:kept]] + rest == expected
+
+
+async def test_token_after_the_last_row_of_an_exhausted_listing_is_none():
+    fake = FakeStreams([{0: _rows(0, 1, 2)}, {0: _rows(1, 3)}])
+    rows, pages, finished = await fake.list_rows(10)
+    assert finished and [r["tx_id"] for r in rows] == [1, 2, 3]
+    assert pages[-1] is None and pages[0] is not None
+
+
+def test_page_tokens_round_trip_and_reject_garbage():
+    cursors = [
+        StreamCursor(7, b"\x01\x02state", 3),
+        StreamCursor(None),
+        StreamCursor(0),
+    ]
+    streams = [(False, "ETH"), (True, "ETH"), (True, "USDT")]
+    page = encode_merge_page(cursors, streams)
+
+    assert is_merge_page(page) and not is_merge_page("123:4")
+    assert decode_merge_page(page, streams) == cursors
+    for bad in ("m1.!!!", "m1." + page[3:-4], "m1."):
+        with pytest.raises(BadUserInputException, match="not formatted correctly"):
+            decode_merge_page(bad, streams)
+
+
+def test_page_tokens_are_bound_to_their_streams():
+    cursors = [StreamCursor(0, b"state", 1), StreamCursor(0)]
+    page = encode_merge_page(cursors, [(False, "ETH"), (True, "ETH")])
+
+    # same number of streams, but another direction / asset selection
+    for streams in (
+        [(False, "ETH"), (False, "USDT")],
+        [(True, "ETH"), (False, "ETH")],
+        [(False, "ETH")],
+    ):
+        with pytest.raises(BadUserInputException, match="different direction"):
+            decode_merge_page(page, streams)
+
+
+def test_page_tokens_are_bound_to_their_tx_id_range():
+    cursors = [StreamCursor(0, b"state", 1)]
+    streams = [(False, "ETH")]
+    page = encode_merge_page(cursors, streams, (100, None))
+
+    assert decode_merge_page(page, streams, (100, None)) == cursors
+    for bounds in ((None, None), (101, None), (100, 500)):
+        with pytest.raises(BadUserInputException, match="tx id range"):
+            decode_merge_page(page, streams, bounds)
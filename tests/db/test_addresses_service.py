@@ -277,3 +277,31 @@ async def test_trivial_evm_invalid_trx_does_not_fail():
 
     assert result.addresses == []
     get_address_mock.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_search_address_neighbors_is_served_by_the_web_layer():
+    from graphsenselib.web.service import addresses_service as web_addresses
+
+    from tests.db.test_neighbor_search import FakeDb, FakeTagstore, _tag
+
+    db = FakeDb({BTC_LEGACY_ADDRESS: [("1b", 5), ("1c", 6)], "1b": [("1d", 1)]})
+    tags_service = SimpleNamespace(
+        tagstore=FakeTagstore({"1d": _tag("Bitstamp", "exchange")})
+    )
+    ctx = SimpleNamespace(
+        services=SimpleNamespace(
+            addresses_service=_make_service(db=db, tags_service=tags_service)
+        ),
+        tagstore_groups=["public"],
+    )
+
+    result = await web_addresses.search_address_neighbors(
+        ctx, "btc", BTC_LEGACY_ADDRESS, "out", ["exchange"]
+    )
+
+    assert result.state == "done"
+    assert [[step.address for step in path] for path in result.paths] == [
+        [BTC_LEGACY_ADDRESS, "1b", "1d"]
+    ]
+    assert result.paths[0][-1].keywords[-1] == "exchange"
@@ -0,0 +1,150 @@
+"""Non-atomic DbWriterMixin.apply_changes: per-partition grouping, retry of
+only the failed statements and the AIMD concurrency controller (DB-free)."""
+
+from collections import namedtuple
+
+import pytest
+from cassandra import InvalidRequest, WriteTimeout
+from cassandra.cqltypes import Int32Type
+from cassandra.query import BatchStatement, PreparedStatement
+
+from graphsenselib.db import analytics
+from graphsenselib.db.analytics import AimdConcurrency, DbChange, DbWriterMixin
+from graphsenselib.db.cassandra import group_statements_by_partition
+
+Column = namedtuple("Column", ["keyspace_name", "table_name", "name", "type"])
+
+
+def _prepared(cql):
+    return PreparedStatement(
+        [
+            Column("ks", "address", "address_id_group", Int32Type),
+            Column("ks", "address", "address_id", Int32Type),
+        ],
+        cql.encode(),
+        [0],
+        cql,
+        "ks",
+        4,
+        None,
+        None,
+    )
+
+
+def _change(group, aid, action=DbChange.update):
+    return action(table="address", data={"address_id_group": group, "address_id": aid})
+
+
+def _ids(unit):
+    if isinstance(unit, BatchStatement):
+        values = [v for _, _, v in unit._statements_and_parameters]
+    else:
+        values = [unit.values]
+    return [int.from_bytes(v[1], "big") for v in values]
+
+
+class FakeCassandraDb:
+    def __init__(self, fail_rounds=()):
+        self.fail_rounds = list(fail_rounds)
+        self.rounds = []
+
+    def get_prepared_statement(self, cql):
+        return _prepared(cql)
+
+    def execute_statements_tracked(self, statements, concurrency):
+        self.rounds.append((concurrency, statements))
+        fail = self.fail_rounds.pop(0) if self.fail_rounds else set()
+        return [
+            fail[aid] if (aid := _ids(unit)[0]) in fail else None for unit in statements
+        ]
+
+
+class FakeWriter(DbWriterMixin):
+    def __init__(self, db):
+        self._db = db
+
+    def get_keyspace(self):
+        return "ks"
+
+
+@pytest.fixture(autouse=True)
+def no_sleep(monkeypatch):
+    monkeypatch.setattr(analytics.time, "sleep", lambda s: None)
+
+
+def test_group_statements_by_partition_packs_same_partition_upserts():
+    ps = _prepared("INSERT INTO ks.address (address_id_group,address_id) VALUES (?,?)")
+    stmts = [
+        ps.bind({"address_id_group": g, "address_id": i})
+        for g, i in [(0, 1), (1, 2), (0, 3), (0, 4), (2, 5)]
+    ]
+
+    units = group_statements_by_partition(stmts, max_batch_size=2)
+
+    batches = [u for u in units if isinstance(u, BatchStatement)]
+    assert [_ids(u) for u in batches] == [[1, 3]]
+    assert batches[0].routing_key == stmts[0].routing_key
+    assert sorted(i for u in units for i in _ids(u)) == [1, 2, 3, 4, 5]
+    assert group_statements_by_partition(stmts, max_batch_size=1) == stmts
+
+
+def test_only_failed_statements_are_resubmitted():
+    db = FakeCassandraDb(fail_rounds=[{2: WriteTimeout("slow replica", write_type=0)}])
+    changes = [_change(0, 1), _change(1, 2), _change(2, 3)]
+
+    result = FakeWriter(db).apply_changes(
+        changes, atomic=False, initial_concurrency=64, partition_batch_size=1
+    )
+
+    assert [sorted(i for u in stmts for i in _ids(u)) for _, stmts in db.rounds] == [
+        [1, 2, 3],
+        [2],
+    ]
+    assert result.attempts_made == 2
+    assert result.statements_retried == 1
+    assert [c for c, _ in db.rounds] == [64, 32]
+
+
+def test_deletes_are_never_batched():
+    db = FakeCassandraDb()
+    changes = [_change(0, 1), _change(0, 2), _change(0, 3, DbChange.delete)]
+
+    FakeWriter(db).apply_changes(changes, atomic=False)
+
+    ((_, units),) = db.rounds
+    assert [_ids(u) for u in units] == [[1, 2], [3]]
+    assert isinstance(units[0], BatchStatement)
+
+
+def test_non_retryable_error_is_raised():
+    db = FakeCassandraDb(fail_rounds=[{1: InvalidRequest("bad")}])
+    with pytest.raises(InvalidRequest):
+        FakeWriter(db).apply_changes([_change(0, 1)], atomic=False)
+    assert len(db.rounds) == 1
+
+
+def test_gives_up_after_nr_retries():
+    db = FakeCassandraDb(fail_rounds=[{1: WriteTimeout("x", write_type=0)}] * 5)
+    with pytest.raises(WriteTimeout):
+        FakeWriter(db).apply_changes([_change(0, 1)], atomic=False, nr_retries=3)
+    assert len(db.rounds) == 3
+
+
+def test_concurrency_controller_persists_across_calls():
+    db = FakeCassandraDb(fail_rounds=[{1: WriteTimeout("x", write_type=0)}] * 2)
+    writer = FakeWriter(db)
+    writer.apply_changes([_change(0, 1)], atomic=False, initial_concurrency=100)
+    # 100 -> 50 -> 25, then a clean round: +10
+    assert writer._write_concurrency.current == 35
+
+    writer.apply_changes([_change(0, 1)], atomic=False, initial_concurrency=100)
+    assert db.rounds[-1][0] == 35
+
+
+def test_aimd_bounds():
+    c = AimdConcurrency(initial=8, minimum=5, maximum=20, step=10)
+    c.on_failure()
+    assert c.current == 5
+    c.on_success()
+    c.on_success()
+    assert c.current == 20
@@ -0,0 +1,247 @@
+"""Immutable row cache for rates and block rows.
+
+DB-free: the real ``Cassandra`` methods are bound to a fake that records the
+queries it is asked to run.
+"""
+
+import asyncio
+
+import pytest
+
+import graphsenselib.db.asynchronous.cassandra as cassandra_module
+from graphsenselib.db.asynchronous.cassandra import Cassandra
+from graphsenselib.db.asynchronous.immutable_cache import (
+    ImmutableRowCache,
+    estimate_size,
+)
+
+TIP = 1000
+
+
+def test_cache_evicts_least_recently_used_rows_by_bytes():
+    row_size = estimate_size({"block_id": 1, "rates": [1.0, 2.0]})
+    cache = ImmutableRowCache(max_bytes=3 * row_size)
+    for h in range(3):
+        cache.put(("ks", "exchange_rates", h), {"block_id": h, "rates": [1.0, 2.0]})
+
+    assert cache.get(("ks", "exchange_rates", 0)) is not None  # 0 is now recent
+    cache.put(("ks", "exchange_rates", 3), {"block_id": 3, "rates": [1.0, 2.0]})
+
+    assert ("ks", "exchange_rates", 1) not in cache
+    assert ("ks", "exchange_rates", 0) in cache
+    assert cache.get(("ks", "exchange_rates", 1)) is None
+    stats = cache.stats()
+    assert stats["entries"] == 3
+    assert stats["bytes"] <= stats["max_bytes"]
+    assert (stats["hits"], stats["misses"], stats["evictions"]) == (1, 1, 1)
+
+
+def test_stats_report_is_due_once_per_interval():
+    cache = ImmutableRowCache(max_bytes=1024)
+    assert not cache.report_due(60)
+    assert cache.report_due(0)
+    assert not cache.report_due(60)
+
+
+def test_cache_ignores_none_and_can_be_disabled():
+    cache = ImmutableRowCache(max_bytes=1024)
+    cache.put("a", None)
+    assert "a" not in cache
+    cache.put("b", {"x": 1})
+    cache.resize(0)
+    assert cache.stats()["entries"] == 0
+    cache.put("c", {"x": 1})
+    assert "c" not in cache
+
+
+class FakeCassandra:
+    get_rates = Cassandra.get_rates
+    list_rates = Cassandra.list_rates
+    get_token_rate = Cassandra.get_token_rate
+    prefetch_rates = Cassandra.prefetch_rates
+    prefetch_blocks = Cassandra.prefetch_blocks
+    warm_immutable_cache = Cassandra.warm_immutable_cache
+    get_immutable_cache_stats = Cassandra.get_immutable_cache_stats
+    _log_immutable_cache_stats = Cassandra._log_immutable_cache_stats
+    get_block_timestamp = Cassandra.get_block_timestamp
+    get_block = Cassandra.get_block
+    _get_block_row = Cassandra._get_block_row
+    _fetch_rates = Cassandra._fetch_rates
+    _immutable_key = Cassandra._immutable_key
+    _cache_immutable = Cassandra._cache_immutable
+
+    def __init__(self):
+        self.queries = []
+        self.config = {"currencies": {"btc": {}}}
+        # token -> heights with a rate, as written by the delta-update
+        self.token_rates = {"USDX": [10, 20]}
+
+    def get_keyspace_mapping(self, currency, keyspace_type):
+        return f"{currency}_{keyspace_type}"
+
+    def get_block_id_group(self, currency, height):
+        return height // 100
+
+    async def get_immutable_height(self, currency):
+        return TIP
+
+    def markup_values(self, currency, fiat_values):
+        return [{"code": "eur", "value": fiat_values[0]}]
+
+    def markup_rates(self, currency, row):
+        row["rates"] = [{"code": "eur", "value": row["fiat_values"][0]}]
+        return row
+
+    def _rate_row(self, h):
+        return {"block_id": h, "fiat_values": [h / 10]}
+
+    def _block_row(self, h):
+        return {"block_id": h, "block_id_group": h // 100, "timestamp": 10 * h}
+
+    async def execute_async(self, currency, keyspace_type, query, params):
+        self.queries.append((query, tuple(params)))
+        if "FROM token_exchange_rates" in query:
+            heights = self.token_rates[params[0]]
+            if len(params) > 1:
+                heights = [h for h in heights if h <= params[1]]
+            rows = [self._rate_row(max(heights))] if heights else []
+        else:
+            h = params[-1]
+            row = self._block_row(h) if "FROM block" in query else self._rate_row(h)
+            rows = [row] if h <= TIP + 5 else []
+
+        class _Result:
+            current_rows = rows
+
+            def one(self):
+                return self.current_rows[0] if self.current_rows else None
+
+        return _Result()
+
+    async def concurrent_with_args(
+        self, currency, keyspace_type, query, params, return_one=True
+    ):
+        rows = []
+        for p in params:
+            self.queries.append((query, tuple(p)))
+            if "FROM block" in query:
+                _, start, end = p
+                rows += [self._block_row(h) for h in range(start, end + 1)]
+            else:
+                rows += [self._rate_row(h) for h in p[0] if h <= TIP + 5]
+        return rows
+
+
+@pytest.fixture
+def db(monkeypatch):
+    monkeypatch.setattr(
+        cassandra_module, "immutable_row_cache", ImmutableRowCache(1 << 20)
+    )
+    return FakeCassandra()
+
+
+def test_list_rates_batches_misses_and_serves_repeats_from_cache(db):
+    heights = [5, 7, 5, TIP + 3, 9]
+    first = asyncio.run(db.list_rates("btc", heights))
+
+    assert [r["block_id"] for r in first] == heights
+    assert len(db.queries) == 1  # one IN query for all distinct heights
+    assert "IN" in db.queries[0][0]
+
+    db.queries.clear()
+    second = asyncio.run(db.list_rates("btc", [9, 7, 5]))
+    assert [r["block_id"] for r in second] == [9, 7, 5]
+    assert db.queries == []
+
+    # rows above the immutable height are re-read every time
+    asyncio.run(db.list_rates("btc", [TIP + 3]))
+    assert len(db.queries) == 1
+
+
+def test_get_rates_caches_only_immutable_heights(db):
+    assert asyncio.run(db.get_rates("eth", 10))["rates"][0]["value"] == 1.0
+    assert asyncio.run(db.get_rates("eth", TIP + 1))["block_id"] == TIP + 1
+    assert asyncio.run(db.get_rates("eth", TIP + 10)) is None
+    db.queries.clear()
+
+    asyncio.run(db.get_rates("eth", 10))
+    asyncio.run(db.get_rates("eth", TIP + 1))
+    assert [p for _, p in db.queries] == [(TIP + 1,)]
+    assert cassandra_module.immutable_row_cache.stats()["hits"] == 1
+
+
+def test_get_block_caches_only_immutable_heights(db):
+    assert asyncio.run(db.get_block("btc", 420))["timestamp"] == 4200
+    assert asyncio.run(db.get_block("btc", TIP + 1))["block_id"] == TIP + 1
+    db.queries.clear()
+
+    asyncio.run(db.get_block("btc", 420))
+    asyncio.run(db.get_block("btc", TIP + 1))
+    assert [p for _, p in db.queries] == [(10, TIP + 1)]
+
+
+def test_token_rate_is_cached_once_a_later_rate_exists(db):
+    def rate(block_id):
+        return asyncio.run(db.get_token_rate("eth", "usdx", block_id))[0]["value"]
+
+    assert rate(15) == 1.0
+    assert rate(25) == 2.0
+    db.queries.clear()
+
+    assert rate(15) == 1.0
+    assert db.queries == []
+
+    # the next rate the delta-update writes, below 25, changes the answer
+    db.token_rates["USDX"].append(22)
+    assert rate(25) == 2.2
+    assert len(db.queries) == 2
+
+
+def test_missing_token_rate_is_not_cached(db):
+    db.token_rates["USDX"] = []
+    assert asyncio.run(db.get_token_rate("eth", "usdx", 5)) is None
+    db.token_rates["USDX"] = [3]
+    assert asyncio.run(db.get_token_rate("eth", "usdx", 5))[0]["value"] == 0.3
+
+
+def test_prefetch_blocks_scans_each_group_once(db):
+    loaded = asyncio.run(db.prefetch_blocks("btc", 150, TIP + 50))
+
+    assert loaded == TIP - 150 + 1
+    params = [p for _, p in db.queries]
+    assert params[0] == (1, 150, 199)
+    assert params[-1] == (10, 1000, 1000)
+    assert len(params) == 10
+    db.queries.clear()
+
+    assert asyncio.run(db.get_block("btc", 420))["timestamp"] == 4200
+    assert asyncio.run(db.get_block_timestamp("btc", 421)) == {"timestamp": 4210}
+    assert db.queries == []
+
+
+def test_prefetch_rates_skips_cached_heights(db):
+    asyncio.run(db.list_rates("btc", [3]))
+    db.queries.clear()
+
+    assert asyncio.run(db.prefetch_rates("btc", 0, 5)) == 5
+    assert sorted(db.queries[0][1][0]) == [0, 1, 2, 4, 5]
+
+
+def test_warm_up_loads_the_highest_immutable_blocks(db, caplog):
+    caplog.set_level("INFO")
+    asyncio.run(db.warm_immutable_cache(10))
+    db.queries.clear()
+
+    assert [r["block_id"] for r in asyncio.run(db.list_rates("btc", [991, TIP]))] == [
+        991,
+        TIP,
+    ]
+    assert asyncio.run(db.get_block("btc", 995))["block_id"] == 995
+    assert db.queries == []
+    assert asyncio.run(db.get_block("btc", 990))["block_id"] == 990
+    assert len(db.queries) == 1
+
+    stats = db.get_immutable_cache_stats()
+    assert (stats["hits"], stats["misses"]) == (3, 1)
+    db._log_immutable_cache_stats(force=True)
+    assert "3 hits, 1 misses" in caplog.text
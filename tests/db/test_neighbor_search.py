@@ -0,0 +1,238 @@
+"""Bounded multi-hop neighbor search (DB-free): a fake database answers
+``list_neighbors`` from an adjacency dict, a fake tagstore tags nodes."""
+
+import asyncio
+from collections import namedtuple
+from types import SimpleNamespace
+
+import pytest
+
+from graphsenselib.datatypes.common import NodeType
+from graphsenselib.db.asynchronous.services.neighbor_search import (
+    NeighborSearchLimits,
+    search_neighbors,
+)
+
+Value = namedtuple("Value", ["value", "fiat_values"])
+
+BTC_ADDRESS = "13AM4VW2dhxYgXeQepoHkHSQuy6NgaEb94"
+
+
+def _tag(label, concept=None, actor=None):
+    return SimpleNamespace(
+        label=label, actor=actor, concepts=[concept] if concept else []
+    )
+
+
+class FakeDb:
+    def __init__(self, edges, delay=0):
+        self.edges = edges
+        self.delay = delay
+        self.expanded = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def list_neighbors(
+        self, currency, id, is_outgoing, node_type, targets, page, pagesize
+    ):
+        self.expanded.append(id)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+        field = "dst_address" if node_type == NodeType.ADDRESS else "dst_cluster_id"
+        rows = [
+            {field: n, "value": Value(v, []), "no_transactions": 1}
+            for n, v in self.edges.get(id, [])
+        ]
+        return rows[:pagesize], None
+
+
+class FakeTagstore:
+    def __init__(self, tags):
+        self.tags = tags
+        self.calls = 0
+        self.networks = set()
+
+    async def get_tags_by_subjectids(self, subject_ids, groups, network=None):
+        self.calls += 1
+        self.networks.add(network)
+        return {s: [self.tags[s]] for s in subject_ids if s in self.tags}
+
+    async def get_best_cluster_tags_for_clusters(self, cluster_ids, network, groups):
+        self.calls += 1
+        return {c: self.tags[c] for c in cluster_ids if c in self.tags}
+
+
+# 1 -> 2 -> 4 (exchange)
+#   -> 3 -> 4
+#        -> 5 (mixer) -> 6 (exchange)
+EDGES = {
+    1: [(2, 50), (3, 100)],
+    2: [(4, 10)],
+    3: [(5, 100), (4, 5)],
+    5: [(6, 100)],
+}
+TAGS = {
+    4: _tag("Binance", "exchange"),
+    5: _tag("Wasabi", "mixer"),
+    6: _tag("Kraken", "exchange", actor="kraken"),
+}
+
+
+async def _search(db, tagstore=None, match=("exchange",), **kw):
+    prune = kw.pop("prune", None)
+    return await search_neighbors(
+        db,
+        tagstore if tagstore is not None else FakeTagstore(TAGS),
+        "btc",
+        1,
+        "out",
+        NodeType.CLUSTER,
+        ["public"],
+        list(match),
+        prune_keywords=prune,
+        limits=NeighborSearchLimits(**kw),
+    )
+
+
+def _nodes(path):
+    return [s.node for s in path]
+
+
+async def test_finds_paths_and_stops_at_matches():
+    db = FakeDb(EDGES)
+    result = await _search(db)
+
+    assert result.state == "done"
+    # 3 carries more value than 2, is expanded first and enters 4
+    assert [_nodes(p) for p in result.paths] == [[1, 3, 4], [1, 3, 5, 6]]
+    # a matched node is not expanded further, each node is expanded once
+    assert sorted(db.expanded) == [1, 2, 3, 5]
+    assert result.paths[1][-1].keywords == ["6", "Kraken", "kraken", "exchange"]
+    assert result.nodes_visited == 6
+
+
+async def test_keywords_match_case_insensitive_labels_actors_and_ids():
+    result = await _search(FakeDb(EDGES), match=["KRAKEN", "2"])
+    assert [_nodes(p) for p in result.paths] == [[1, 2], [1, 3, 5, 6]]
+
+
+async def test_depth_value_and_prune_limits():
+    result = await _search(FakeDb(EDGES), max_depth=2)
+    assert [_nodes(p) for p in result.paths] == [[1, 3, 4]]
+
+    # 2 -> 4 and 3 -> 4 fall below the threshold
+    result = await _search(FakeDb(EDGES), min_value=20)
+    assert [_nodes(p) for p in result.paths] == [[1, 3, 5, 6]]
+
+    db = FakeDb(EDGES)
+    result = await _search(db, prune=["mixer"])
+    assert [_nodes(p) for p in result.paths] == [[1, 3, 4]]
+    assert 5 not in db.expanded
+
+
+async def test_breadth_limits_neighbors_per_expansion():
+    db = FakeDb({1: [(2, 1), (3, 3), (4, 2)]})
+    result = await _search(db, match=["2", "3", "4"], max_breadth=2)
+    # the largest edge first
+    assert [p[-1].node for p in result.paths] == [3, 2]
+
+
+async def test_best_first_follows_largest_flows_and_max_results():
+    edges = {1: [(2, 50), (3, 100)], 2: [(4, 10)], 3: [(5, 100)], 5: [(6, 100)]}
+
+    db = FakeDb(edges)
+    result = await _search(db, max_results=1, concurrency=1)
+    assert [_nodes(p) for p in result.paths] == [[1, 2, 4]]
+    assert db.expanded == [1, 3, 2]
+
+    db = FakeDb(edges)
+    result = await _search(db, strategy="best_first", max_results=1, concurrency=1)
+    assert result.state == "done"
+    assert [_nodes(p) for p in result.paths] == [[1, 3, 5, 6]]
+    assert db.expanded == [1, 3, 5]
+
+
+async def test_concurrent_expansion_shares_visited_set():
+    # a wide diamond: every level-1 node links to the same level-2 nodes
+    edges = {0: [(i, 1) for i in range(1, 21)]}
+    edges.update({i: [(100 + j, 1) for j in range(5)] for i in range(1, 21)})
+    db = FakeDb(edges, delay=0.001)
+
+    result = await search_neighbors(
+        db,
+        None,
+        "btc",
+        0,
+        "out",
+        NodeType.CLUSTER,
+        [],
+        ["104"],
+        limits=NeighborSearchLimits(concurrency=4),
+    )
+
+    assert db.max_in_flight == 4
+    assert len(result.paths) == 1
+    assert sorted(db.expanded) == list(range(0, 21)) + list(range(100, 104))
+
+
+async def test_query_budget_and_timeout():
+    chain = {i: [(i + 1, 1)] for i in range(50)}
+    result = await _search(FakeDb(chain), match=[], max_depth=100, max_queries=6)
+    # one list_neighbors plus one tagstore query per hop
+    assert result.state == "query_budget_exhausted"
+    assert result.queries == 6
+
+    db = FakeDb(chain, delay=0.05)
+    result = await _search(db, match=[], max_depth=100, time_budget_s=0.12)
+    assert result.state == "timeout"
+    assert 2 <= len(db.expanded) <= 4
+    assert db.in_flight == 0
+
+
+async def test_tag_lookups_are_checked_against_the_budget_before_they_run():
+    # all expansions of the first hop are scheduled before any returns, so
+    # their tag lookups only fit into what is left of the budget
+    edges = {1: [(i, 1) for i in range(2, 6)]}
+    edges.update({i: [(10 + i, 1)] for i in range(2, 6)})
+    tagstore = FakeTagstore({})
+    result = await _search(FakeDb(edges, delay=0.001), tagstore, max_queries=6)
+
+    assert result.queries == 6
+    # start expansion + its lookup + four expansions, no lookup left
+    assert tagstore.calls == 1
+    assert result.state == "query_budget_exhausted"
+
+
+async def test_address_search_uses_user_format_ids_and_batched_tag_lookups():
+    db = FakeDb({BTC_ADDRESS: [("1b", 5), ("1c", 6)], "1b": [("1d", 1)]})
+    tagstore = FakeTagstore({"1d": _tag("Bitstamp", "exchange")})
+
+    result = await search_neighbors(
+        db,
+        tagstore,
+        "btc",
+        BTC_ADDRESS,
+        "out",
+        NodeType.ADDRESS,
+        ["public"],
+        ["exchange"],
+    )
+
+    assert [_nodes(p) for p in result.paths] == [[BTC_ADDRESS, "1b", "1d"]]
+    # one tagstore query per expansion that found new nodes
+    assert tagstore.calls == 2
+    # the tagstore keeps networks upper case
+    assert tagstore.networks == {"BTC"}
+
+
+async def test_expansion_errors_propagate():
+    class FailingDb(FakeDb):
+        async def list_neighbors(self, *args, **kwargs):
+            raise RuntimeError("read timeout")
+
+    with pytest.raises(RuntimeError):
+        await _search(FailingDb({}))
@@ -0,0 +1,135 @@
+"""Secondary group occupancy index (DB-free): which secondary groups the
+async layer reads for address transaction listings and neighbor queries."""
+
+import json
+
+import pytest
+from cassandra import InvalidRequest
+
+from graphsenselib.db.asynchronous.cassandra import Cassandra
+from graphsenselib.db.state import (
+    build_secondary_group_index_row,
+    parse_secondary_group_index_value,
+)
+from graphsenselib.deltaupdate.update.account.createchanges import (
+    prepare_secondary_group_index_for_ingest,
+)
+
+BUCKET = 100
+
+
+class _Result:
+    def __init__(self, rows):
+        self.current_rows = rows
+
+    def one(self):
+        return self.current_rows[0] if self.current_rows else None
+
+
+def _cassandra(marker, occupied, pre_migration=False):
+    db = Cassandra.__new__(Cassandra)
+    db.parameters = {"eth": {"block_bucket_size_address_txs": BUCKET}}
+    db.queries = []
+
+    async def execute_async(currency, keyspace, query, params, autopaging=False):
+        db.queries.append(query)
+        if "FROM state" in query:
+            if marker is None:
+                return _Result([])
+            return _Result([{"value": json.dumps(marker)}])
+        if pre_migration:
+            raise InvalidRequest("unconfigured table")
+        col = query.split()[1]
+        return _Result([{col: g} for g in occupied])
+
+    async def get_currency_statistics(currency):
+        return {"no_blocks": 1000}
+
+    db.execute_async = execute_async
+    db.get_currency_statistics = get_currency_statistics
+    return db
+
+
+async def _groups(db, table, address_id, lo=0, hi=8):
+    return await db.get_occupied_secondary_groups("eth", table, 0, address_id, lo, hi)
+
+
+async def test_without_marker_every_group_is_read():
+    db = _cassandra(None, [4])
+    assert await _groups(db, "address_transactions", 5) == list(range(9))
+    assert not any("secondary_groups" in q for q in db.queries)
+
+
+async def test_address_txs_before_the_index_start_are_not_skipped():
+    marker = {"block_id": 250, "address_id": 100}
+    occupied = [1, 4, 7]
+
+    # old address: groups of blocks < 300 may hold unindexed rows
+    db = _cassandra(marker, occupied)
+    assert await _groups(db, "address_transactions", 50) == [0, 1, 2, 4, 7]
+    # address created after the index start: fully indexed
+    db = _cassandra(marker, occupied)
+    assert await _groups(db, "address_transactions", 150) == [1, 4, 7]
+    assert await _groups(db, "address_transactions", 150, lo=2, hi=6) == [4]
+
+
+async def test_relations_are_indexed_for_new_addresses_only():
+    marker = {"block_id": 250, "address_id": 100}
+    db = _cassandra(marker, [3])
+
+    assert await _groups(db, "address_outgoing_relations", 50) == list(range(9))
+    assert await _groups(db, "address_incoming_relations", 150) == [3]
+    assert "dst_address_id_secondary_group" in db.queries[-1]
+
+
+async def test_pre_migration_keyspace_reads_every_group():
+    db = _cassandra({"block_id": 0, "address_id": 0}, [], pre_migration=True)
+    assert await _groups(db, "address_transactions", 7) == list(range(9))
+
+
+async def test_occupancy_is_cached_per_instance_until_the_keyspace_moves_on():
+    marker = {"block_id": 0, "address_id": 0}
+    db = _cassandra(marker, [3])
+
+    def index_reads():
+        return sum("_secondary_groups WHERE" in q for q in db.queries)
+
+    assert await _groups(db, "address_transactions", 7) == [3]
+    assert await _groups(db, "address_transactions", 7, lo=3, hi=5) == [3]
+    assert index_reads() == 1
+
+    # another connection (keyspace) has its own entries
+    other = _cassandra(marker, [5])
+    assert await _groups(other, "address_transactions", 7) == [5]
+
+    async def get_currency_statistics(currency):
+        return {"no_blocks": 1001}
+
+    db.get_currency_statistics = get_currency_statistics
+    assert await _groups(db, "address_transactions", 7) == [3]
+    assert index_reads() == 2
+
+
+def test_marker_value_round_trip():
+    row = build_secondary_group_index_row(250, 100)
+    assert parse_secondary_group_index_value(row["value"]) == (250, 100)
+    assert parse_secondary_group_index_value(None) is None
+
+
+@pytest.mark.parametrize("prefix", ["", "src_"])
+def test_index_changes_are_deduplicated(prefix):
+    changes = prepare_secondary_group_index_for_ingest(
+        "t", prefix, [(0, 5, 2), (0, 5, 2), (1, 9, 0)]
+    )
+    assert [c.data for c in changes] == [
+        {
+            f"{prefix}address_id_group": 0,
+            f"{prefix}address_id": 5,
+            f"{prefix}address_id_secondary_group": 2,
+        },
+        {
+            f"{prefix}address_id_group": 1,
+            f"{prefix}address_id": 9,
+            f"{prefix}address_id_secondary_group": 0,
+        },
+    ]
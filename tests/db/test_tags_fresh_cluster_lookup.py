@@ -54,6 +54,15 @@ class FakeDb:
     async def get_address_entity_id(self, currency, address):
         return LEGACY_SINGLETON_ID
 
+    async def get_address_cluster_ids(self, currency, addresses):
+        return {a: (ADDRESS_ID, LEGACY_SINGLETON_ID) for a in addresses}
+
+    async def get_fresh_cluster_ids(self, currency, address_ids):
+        return {
+            address_id: FRESH_PUBLIC_CLUSTER_ID if self.fresh_active else None
+            for address_id in address_ids
+        }
+
 
 class FakeTagstore:
     """Tags exist only under the cluster ids in ``best_by_public_id``."""
@@ -152,3 +161,19 @@ def test_legacy_lookup_unchanged_when_fresh_inactive():
         )
     )
     assert summary.best_actor == "kraken"
+
+
+def test_batch_legacy_lookup_when_fresh_inactive():
+    svc = _make_service(
+        FakeDb(fresh_active=False),
+        FakeTagstore({LEGACY_SINGLETON_ID: _kraken_cluster_tag()}),
+    )
+    summaries = asyncio.run(
+        svc.get_tag_summaries_by_subject_ids(
+            "btc",
+            [DEPOSIT_ADDRESS],
+            ["public"],
+            include_best_cluster_tag=True,
+        )
+    )
+    assert summaries[DEPOSIT_ADDRESS].best_actor == "kraken"
@@ -18,6 +18,7 @@ import pytest
 from graphsenselib.datatypes import DbChangeType
 from graphsenselib.db import DbChange
 from graphsenselib.deltaupdate.update.generic import DeltaValue, EntityDelta
+from graphsenselib.deltaupdate.update.utxo.entitycache import EntityRowCache
 from graphsenselib.deltaupdate.update.utxo.update import (
     ClusteringChanges,
     _ClusterStats,
@@ -1079,6 +1080,7 @@ def _run_batch_hook(monkeypatch, cluster_inputs, activity):
         ),
     )
     s._parallel_pool = None
+    s.entity_cache = EntityRowCache(max_entries=0)
     s._patch_mode = False
     s._statistics = None
     s._batch_start_time = time.time()
@@ -0,0 +1,254 @@
+from collections import namedtuple
+
+import pytest
+
+from graphsenselib.db import DbChange
+from graphsenselib.deltaupdate.update.generic import ApplicationStrategy, DeltaValue
+from graphsenselib.deltaupdate.update.utxo import update as utxo_update
+from graphsenselib.deltaupdate.update.utxo.entitycache import EntityRowCache
+
+AddressRow = namedtuple(
+    "AddressRow",
+    ["address_id", "address_id_group", "address", "cluster_id", "no_incoming_txs"],
+)
+ClusterRow = namedtuple("ClusterRow", ["cluster_id", "no_addresses", "in_degree"])
+
+
+class RecordingFetch:
+    def __init__(self, rows):
+        self.rows = rows
+        self.calls = []
+
+    def __call__(self, keys):
+        self.calls.append(sorted(keys))
+        return {k: self.rows.get(k) for k in keys}
+
+
+def test_address_ids_fetch_only_misses_and_never_cache_unknown():
+    cache = EntityRowCache(max_entries=10)
+    fetch = RecordingFetch({"a": 1, "b": 2})
+
+    assert cache.get_address_ids(["a", "b", "new"], fetch) == {
+        "a": 1,
+        "b": 2,
+        "new": None,
+    }
+    assert cache.get_address_ids(["a", "b", "new"], fetch) == {
+        "a": 1,
+        "b": 2,
+        "new": None,
+    }
+    assert fetch.calls == [["a", "b", "new"], ["new"]]
+
+
+def test_lru_is_bounded():
+    cache = EntityRowCache(max_entries=2)
+    fetch = RecordingFetch({1: "r1", 2: "r2", 3: "r3"})
+    cache.get_cluster_rows([1, 2], fetch)
+    cache.get_cluster_rows([1], fetch)  # 1 is now most recent
+    cache.get_cluster_rows([3], fetch)  # evicts 2
+
+    cache.get_cluster_rows([1, 2, 3], fetch)
+    assert fetch.calls[-1] == [2]
+    assert cache.stats()["cluster_rows_size"] == 2
+
+
+def test_disabled_cache_always_fetches():
+    cache = EntityRowCache(max_entries=0)
+    fetch = RecordingFetch({1: "r1"})
+    cache.get_address_rows([1], fetch)
+    cache.get_address_rows([1], fetch)
+    assert fetch.calls == [[1], [1]]
+
+
+def _changes():
+    return [
+        DbChange.update(
+            table="address",
+            data={"address_id": 5, "address_id_group": 0, "no_incoming_txs": 8},
+        ),
+        DbChange.new(
+            table="address",
+            data={
+                "address_id": 6,
+                "address_id_group": 0,
+                "address": "new",
+                "cluster_id": 60,
+                "no_incoming_txs": 1,
+                "total_received": DeltaValue(3, [1, 2]),
+            },
+        ),
+        DbChange.update(table="cluster", data={"cluster_id": 50, "in_degree": 4}),
+        DbChange.new(table="address_incoming_relations", data={"x": 1}),
+    ]
+
+
+def _staged_cache():
+    cache = EntityRowCache(max_entries=10)
+    cache.stage(
+        _changes(),
+        address_ids={"old": 5, "new": 6},
+        address_rows={5: AddressRow(5, 0, "old", 50, 7), 6: None},
+        cluster_rows={50: ClusterRow(50, 3, 2), 60: None},
+    )
+    return cache
+
+
+def test_staged_rows_visible_only_after_commit():
+    cache = _staged_cache()
+    fetch = RecordingFetch({})
+    cache.get_address_ids(["new"], fetch)
+    assert fetch.calls == [["new"]]
+
+    cache.commit()
+    fetch = RecordingFetch({})
+    ids = cache.get_address_ids(["old", "new"], fetch)
+    addresses = cache.get_address_rows([5, 6], fetch)
+    clusters = cache.get_cluster_rows([50], fetch)
+
+    assert fetch.calls == []
+    assert ids == {"old": 5, "new": 6}
+    # updates overlay the row they were computed against
+    assert addresses[5].no_incoming_txs == 8
+    assert addresses[5].cluster_id == 50
+    assert addresses[6].address == "new"
+    assert addresses[6].total_received.fiat_values == [1, 2]
+    assert (clusters[50].in_degree, clusters[50].no_addresses) == (4, 3)
+
+
+def test_invalidate_drops_cached_and_staged_rows():
+    cache = _staged_cache()
+    cache.commit()
+    cache.stage(_changes(), {"x": 9}, {5: None}, {})
+    cache.invalidate()
+    cache.commit()
+
+    fetch = RecordingFetch({})
+    cache.get_address_ids(["old", "x"], fetch)
+    assert fetch.calls == [["old", "x"]]
+
+
+# --- commit / invalidate around persist ----------------------------------
+
+
+class _StubTransformed:
+    def get_keyspace(self):
+        return "tks"
+
+    def get_summary_statistics(self):
+        return None
+
+    def get_highest_address_id(self, sanity_check=True):
+        return 0
+
+    def get_highest_cluster_id(self, sanity_check=True):
+        return 1
+
+
+class _StubRaw:
+    def get_keyspace(self):
+        return "rks"
+
+
+class _StubDb:
+    raw = _StubRaw()
+    transformed = _StubTransformed()
+
+
+def _strategy():
+    strategy = utxo_update.UpdateStrategyUtxo(
+        _StubDb(),
+        "btc",
+        pedantic=False,
+        application_strategy=ApplicationStrategy.BATCH,
+        entity_cache_size=10,
+    )
+    strategy._batch_start_time = 0.0
+    strategy.entity_cache = _staged_cache()
+    strategy.changes = ["data"]
+    strategy.bookkeeping_changes = ["bookkeeping"]
+    return strategy
+
+
+def test_persist_commits_cache_after_apply(monkeypatch):
+    monkeypatch.setattr(utxo_update, "apply_changes", lambda *a, **kw: None)
+    strategy = _strategy()
+    strategy.persist_updater_progress()
+
+    fetch = RecordingFetch({})
+    strategy.entity_cache.get_address_rows([5, 6], fetch)
+    assert fetch.calls == []
+
+
+def test_persist_failure_invalidates_cache(monkeypatch):
+    def fail(*args, **kwargs):
+        raise RuntimeError("write timeout")
+
+    monkeypatch.setattr(utxo_update, "apply_changes", fail)
+    strategy = _strategy()
+    with pytest.raises(RuntimeError):
+        strategy.persist_updater_progress()
+
+    strategy.entity_cache.commit()
+    fetch = RecordingFetch({})
+    strategy.entity_cache.get_address_rows([5], fetch)
+    assert fetch.calls == [[5]]
+
+
+class _DuConfig:
+    currency = "btc"
+
+
+class _NoSchemas:
+    def apply_migrations(self, *args, **kwargs):
+        pass
+
+
+def test_factory_entity_cache_size_zero_disables_cache():
+    from graphsenselib.deltaupdate.update.factory import UpdaterFactory
+
+    strategy = UpdaterFactory().get_updater(
+        _DuConfig(),
+        _StubDb(),
+        version=2,
+        write_new=True,
+        write_dirty=True,
+        pedantic=False,
+        write_batch=10,
+        patch_mode=False,
+        entity_cache_size=0,
+    )
+    assert isinstance(strategy, utxo_update.UpdateStrategyUtxo)
+    assert not strategy.entity_cache.enabled
+
+    fetch = RecordingFetch({"a": 1})
+    strategy.entity_cache.get_address_ids(["a"], fetch)
+    strategy.entity_cache.get_address_ids(["a"], fetch)
+    assert fetch.calls == [["a"], ["a"]]
+
+
+@pytest.mark.parametrize(
+    "args,expected", [([], None), (["--entity-cache-size", "0"], 0)]
+)
+def test_delta_update_cli_passes_entity_cache_size(monkeypatch, args, expected):
+    from click.testing import CliRunner
+
+    from graphsenselib.deltaupdate import cli
+
+    calls = []
+    monkeypatch.setattr(cli, "update", lambda *a, **kw: calls.append(kw))
+    monkeypatch.setattr(cli, "GraphsenseSchemas", lambda: _NoSchemas())
+
+    result = CliRunner().invoke(
+        cli.deltaupdate_cli,
+        ["delta-update", "update", "-e", "pytest", "-c", "btc", *args],
+    )
+    assert result.exit_code == 0, result.output
+    assert calls[0]["entity_cache_size"] == expected
+
+
+def test_entity_cache_size_config_default():
+    from graphsenselib.config.config import AppConfig
+
+    field = AppConfig.model_fields["delta_updater_entity_cache_size"]
+    assert field.default == utxo_update.DEFAULT_ENTITY_CACHE_SIZE
@@ -183,7 +183,9 @@ def test_batch_size_override():
             provider_timeout=3600,
             file_batch_size=500,
         )
-        MockRunner.assert_called_once_with(PARTITIONSIZES["eth"], 500)
+        MockRunner.assert_called_once_with(
+            PARTITIONSIZES["eth"], 500, pipeline_depth=2, source_parallelism=1
+        )
 
 
 def test_unsupported_mode_rejected():
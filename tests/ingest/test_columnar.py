@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+"""Columnar eth logs: same Delta rows as the dict path."""
+
+import copy
+
+import pytest
+
+pytest.importorskip("deltalake")
+
+import pyarrow as pa
+from deltalake import DeltaTable
+
+from graphsenselib.ingest.account import prepare_logs_inplace
+from graphsenselib.ingest.columnar import (
+    hex_to_binary,
+    logs_table,
+    prepare_logs_arrow,
+)
+from graphsenselib.ingest.delta.sink import DeltaDumpSinkFactory
+from graphsenselib.ingest.rpc_eth import LogColumns, parse_log_json
+from graphsenselib.schema.resources.parquet.account import ACCOUNT_SCHEMA_RAW
+
+PARTITION_SIZE = 100
+
+
+def _json_log(block, log_index, topics):
+    return {
+        "logIndex": hex(log_index),
+        "transactionHash": "0x" + f"{block:02x}{log_index:02x}" * 16,
+        "transactionIndex": hex(log_index // 2),
+        "blockHash": "0x" + f"{block:04x}" * 16,
+        "blockNumber": hex(block),
+        "address": "0x" + "Ab" * 20,
+        "data": "0x" + "00ff" * log_index,
+        "topics": topics,
+        "removed": False,
+    }
+
+
+# out of order, across two partitions, with and without topics
+JSON_LOGS = [
+    _json_log(150, 1, ["0x" + "11" * 32, "0x" + "22" * 32]),
+    _json_log(42, 3, []),
+    _json_log(150, 0, ["0x" + "33" * 32]),
+    _json_log(42, 0, None),
+    _json_log(99, 2, ["0x" + "AA" * 32]),
+]
+
+
+def _row_path(json_logs):
+    logs = [parse_log_json(json_log) for json_log in json_logs]
+    prepare_logs_inplace(logs, 1000, PARTITION_SIZE)
+    logs.sort(key=lambda x: (x["block_id"], x["log_index"]))
+    return pa.Table.from_pylist(logs, schema=ACCOUNT_SCHEMA_RAW["log"])
+
+
+def _arrow_path(json_logs):
+    columns = LogColumns()
+    for json_log in json_logs:
+        columns.add(json_log)
+    return prepare_logs_arrow(logs_table(columns.columns), PARTITION_SIZE)
+
+
+def test_arrow_logs_equal_row_logs():
+    expected = _row_path(copy.deepcopy(JSON_LOGS))
+    actual = _arrow_path(JSON_LOGS)
+    assert actual.schema == expected.schema
+    assert actual.to_pylist() == expected.to_pylist()
+    assert actual.column("topic0").to_pylist()[:2] == [b"", b""]
+
+
+def test_trailing_logs_without_topics_get_an_empty_topic0():
+    json_logs = [_json_log(7, 0, ["0x" + "44" * 32]), _json_log(7, 1, [])]
+    expected = _row_path(copy.deepcopy(json_logs))
+    actual = _arrow_path(json_logs)
+    assert actual.to_pylist() == expected.to_pylist()
+    assert actual.column("topic0").to_pylist() == [b"\x44" * 32, b""]
+
+
+def test_no_logs_give_an_empty_log_table():
+    actual = _arrow_path([])
+    assert actual.num_rows == 0
+    assert actual.schema == ACCOUNT_SCHEMA_RAW["log"]
+
+
+def test_hex_to_binary():
+    arr = pa.array(["0x", "0x00ff", None, "0xAbCd", "beef"])
+    assert hex_to_binary(arr).to_pylist() == [
+        b"",
+        b"\x00\xff",
+        None,
+        b"\xab\xcd",
+        b"\xbe\xef",
+    ]
+    # offsets of a slice start inside the string buffer
+    assert hex_to_binary(arr.slice(3)).to_pylist() == [b"\xab\xcd", b"\xbe\xef"]
+
+    with pytest.raises(ValueError):
+        hex_to_binary(pa.array(["0xabc"]))
+    with pytest.raises(ValueError):
+        hex_to_binary(pa.array(["0xzz"]))
+
+
+def test_delta_sink_writes_arrow_logs(tmp_path):
+    writer = DeltaDumpSinkFactory.create_writer("eth", None, "append", str(tmp_path))
+    writer.write_table("log", _arrow_path(JSON_LOGS[1:2] + JSON_LOGS[3:]))
+
+    table = DeltaTable(f"{tmp_path}/log").to_pyarrow_table()
+    expected = _row_path(copy.deepcopy(JSON_LOGS[1:2] + JSON_LOGS[3:]))
+    assert sorted(table.to_pylist(), key=lambda r: (r["block_id"], r["log_index"])) == (
+        expected.to_pylist()
+    )
@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+"""Background compaction of closed Delta partitions during ingest."""
+
+import pytest
+
+pytest.importorskip("deltalake")
+
+import pyarrow as pa
+from deltalake import DeltaTable
+
+from graphsenselib.ingest.delta.compaction import (
+    CompactionPolicy,
+    DeltaCompactionScheduler,
+    partition_file_stats,
+    table_file_stats,
+)
+from graphsenselib.ingest.delta.sink import (
+    DBWriteConfig,
+    DeltaDumpWriter,
+    TableWriteConfig,
+)
+
+SCHEMA = pa.schema(
+    [
+        ("partition", pa.int32()),
+        ("block_id", pa.int32()),
+        ("tx_hash", pa.binary()),
+    ]
+)
+CONFIG = DBWriteConfig(
+    table_configs=[
+        TableWriteConfig(
+            table_name="transaction",
+            table_schema=SCHEMA,
+            partition_cols=("partition",),
+            primary_keys=["block_id", "tx_hash"],
+        ),
+        TableWriteConfig(
+            table_name="trc10",
+            table_schema=pa.schema([("partition", pa.int32()), ("id", pa.int32())]),
+            blockindep=True,
+        ),
+    ]
+)
+POLICY = CompactionPolicy(min_small_files=3, vacuum_every=1, vacuum_retention_hours=0)
+
+
+def _rows(partition, first, n=5):
+    return [
+        {"partition": partition, "block_id": b, "tx_hash": bytes([b % 256]) * 4}
+        for b in range(first, first + n)
+    ]
+
+
+def _writer(directory, policy=POLICY):
+    return DeltaDumpWriter(
+        str(directory), CONFIG, write_mode="append", compaction_policy=policy
+    )
+
+
+def test_closed_partitions_are_compacted_and_open_one_left_alone(tmp_path):
+    writer = _writer(tmp_path)
+    for i in range(4):
+        writer.write_table("transaction", _rows(0, 10 * i))
+    writer.write_table("transaction", _rows(1, 100))
+    # the scan of this compaction must not race the next append
+    writer.compaction.join()
+    writer.write_table("transaction", _rows(1, 110))
+
+    table = DeltaTable(f"{tmp_path}/transaction")
+    stats = partition_file_stats(table)
+    assert stats[0].files == 1
+    assert stats[1].files == 2
+    rows = table.to_pyarrow_table(filters=[("partition", "=", 0)])
+    assert rows.num_rows == 20
+    assert sorted(rows.column("block_id").to_pylist()) == [
+        b for i in range(4) for b in range(10 * i, 10 * i + 5)
+    ]
+
+    writer.close()
+    summary = writer.compaction.stats()["transaction"]
+    assert summary["compactions"] == 1
+    assert (summary["files_removed"], summary["files_added"]) == (4, 1)
+    # as of the scan after compacting partition 0, before the second append
+    assert summary["files"] == 2
+    # vacuum_every=1 with no retention removes the compacted-away files
+    assert summary["files_vacuumed"] == 4
+    assert summary["errors"] == 0
+    assert "trc10" not in writer.compaction.stats()
+
+
+def test_partitions_below_threshold_are_not_rewritten(tmp_path):
+    writer = _writer(tmp_path)
+    writer.write_table("transaction", _rows(0, 0))
+    writer.write_table("transaction", _rows(0, 10))
+    writer.write_table("transaction", _rows(1, 20))
+    writer.close()
+
+    assert writer.compaction.stats()["transaction"]["compactions"] == 0
+    assert table_file_stats(DeltaTable(f"{tmp_path}/transaction")).files == 3
+
+
+def test_first_write_of_a_run_closes_partitions_of_earlier_runs(tmp_path):
+    plain = DeltaDumpWriter(str(tmp_path), CONFIG, write_mode="append")
+    for i in range(3):
+        plain.write_table("transaction", _rows(0, 10 * i))
+    assert plain.compaction is None
+
+    writer = _writer(tmp_path)
+    writer.write_table("transaction", _rows(1, 100))
+    writer.compaction.join()
+    writer.close()
+
+    stats = partition_file_stats(DeltaTable(f"{tmp_path}/transaction"))
+    assert (stats[0].files, stats[1].files) == (1, 1)
+
+
+def test_failures_are_counted_not_raised():
+    def open_table(name):
+        raise OSError("bucket unreachable")
+
+    scheduler = DeltaCompactionScheduler(open_table, {"block": ["block_id"]})
+    scheduler.notify("block", 1)
+    scheduler.notify("block", 1)  # same partition: nothing new closed
+    scheduler.notify("unknown", 1)
+    scheduler.join()
+    scheduler.close()
+
+    assert scheduler.stats()["block"]["errors"] == 1
@@ -0,0 +1,143 @@
+"""Tests for the pipelined IngestRunner.run."""
+
+import threading
+import time
+
+import pytest
+
+from graphsenselib.ingest.common import BlockRangeContent, Sink, Source
+from graphsenselib.ingest.ingestrunner import IngestRunner
+
+
+class SlowSource(Source):
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.read_ranges = []
+        self.commits = []
+
+    def read_blockrange(self, start_block, end_block):
+        time.sleep(self.delay)
+        self.read_ranges.append((start_block, end_block))
+        blocks = [
+            {"block_id": i, "timestamp": 1_700_000_000 + i * 12}
+            for i in range(start_block, end_block + 1)
+        ]
+        return BlockRangeContent(
+            table_contents={"block": blocks},
+            start_block=start_block,
+            end_block=end_block,
+        )
+
+    def read_blockindep(self):
+        return BlockRangeContent(table_contents={})
+
+    def get_last_synced_block(self):
+        return 10_000
+
+    def commit(self, end_block):
+        self.commits.append(end_block)
+
+
+class IdentityTransformer:
+    network = "eth"
+
+    def transform(self, data):
+        return data
+
+    def transform_blockindep(self, data):
+        return data
+
+
+class RecordingSink(Sink):
+    def __init__(self, name, fail_at=None, barrier=None):
+        self.name = name
+        self.fail_at = fail_at
+        self.barrier = barrier
+        self.writes = []
+
+    def write(self, block_range_content):
+        start = block_range_content.start_block
+        if start is None:
+            return
+        if self.barrier is not None:
+            # Both sinks must be inside write() at the same time.
+            self.barrier.wait(timeout=5)
+        if start == self.fail_at:
+            raise RuntimeError(f"{self.name} failed")
+        self.writes.append((start, block_range_content.end_block))
+
+    def highest_block(self):
+        return self.writes[-1][1] if self.writes else None
+
+
+def _runner(source, sinks, **kw):
+    runner = IngestRunner(partition_batch_size=1000, file_batch_size=100, **kw)
+    runner.addSource(source)
+    runner.addTransformer(IdentityTransformer())
+    for sink in sinks:
+        runner.addSink(sink)
+    return runner
+
+
+def test_sinks_write_concurrently_and_in_order():
+    barrier = threading.Barrier(2)
+    delta = RecordingSink("delta", barrier=barrier)
+    cassandra = RecordingSink("cassandra", barrier=barrier)
+    runner = _runner(SlowSource(), [delta, cassandra])
+
+    assert runner.run(0, 1999) == 1999
+
+    expected = [(i, i + 99) for i in range(0, 2000, 100)]
+    assert delta.writes == expected
+    assert cassandra.writes == expected
+    assert runner.stage_stats["source"].items == 20
+    assert runner.stage_stats["sinks"].blocks == 2000
+
+
+def test_parallel_source_reads_keep_block_order():
+    sink = RecordingSink("delta")
+    source = SlowSource(delay=0.01)
+    runner = _runner(source, [sink], source_parallelism=4, pipeline_depth=3)
+
+    assert runner.run(0, 999) == 999
+    assert sink.writes == [(i, i + 99) for i in range(0, 1000, 100)]
+
+
+def test_sink_failure_stops_pipeline():
+    ok = RecordingSink("delta")
+    failing = RecordingSink("cassandra", fail_at=300)
+    runner = _runner(SlowSource(), [ok, failing])
+
+    with pytest.raises(RuntimeError, match="cassandra failed"):
+        runner.run(0, 999)
+
+    # Nothing past the failed chunk is dispatched, so sinks stay at most one
+    # chunk apart.
+    assert ok.writes[-1] == (300, 399)
+    assert failing.writes[-1] == (200, 299)
+
+
+def test_source_is_told_about_committed_chunks_only():
+    source = SlowSource()
+    runner = _runner(source, [RecordingSink("delta", fail_at=300)], pipeline_depth=3)
+
+    with pytest.raises(RuntimeError, match="delta failed"):
+        runner.run(0, 999)
+
+    # the source may read ahead of the sink, only written chunks are committed
+    assert source.commits == [99, 199, 299]
+
+
+def test_source_failure_is_raised():
+    class FailingSource(SlowSource):
+        def read_blockrange(self, start_block, end_block):
+            if start_block == 200:
+                raise ValueError("node down")
+            return super().read_blockrange(start_block, end_block)
+
+    sink = RecordingSink("delta")
+    runner = _runner(FailingSource(), [sink])
+
+    with pytest.raises(ValueError, match="node down"):
+        runner.run(0, 999)
+    assert sink.writes == [(0, 99), (100, 199)]
@@ -7,12 +7,15 @@ parser stays byte-for-byte compatible with the implementation it replaced
 2026-07).
 """
 
+import random
+
 import pytest
 
 from graphsenselib.ingest.utxo import (
     P2pkParserException,
     UnknownScriptType,
     parse_script,
+    parse_scripts,
 )
 
 # (script_hex, expected_addresses_or_None, expected_type) — from scripts.json.
@@ -172,3 +175,66 @@ _INT_OF_EMPTY_PUSH = [
 def test_replicates_btcpy_indexerror(script_hex):
     with pytest.raises(IndexError):
         parse_script(script_hex)
+
+
+def _parse_script_or_exception(script_hex, network):
+    try:
+        return parse_script(script_hex, network)
+    except (UnknownScriptType, P2pkParserException) as exception:
+        return exception
+
+
+def _generated_scripts(n=300, seed=7):
+    """Canonical templates with random payloads, their near misses (wrong
+    length, flipped opcode, bad key prefix) and non-canonical pushes."""
+    rng = random.Random(seed)
+    out = []
+    for _ in range(n):
+        h20 = rng.randbytes(20).hex()
+        h32 = rng.randbytes(32).hex()
+        prefix = rng.choice(["02", "03", "04", "05", "06", "07"])
+        out += [
+            "76a914" + h20 + "88ac",
+            "a914" + h20 + "87",
+            "0014" + h20,
+            "0020" + h32,
+            "5120" + h32,
+            "21" + prefix + h32 + "ac",
+            "41" + prefix + rng.randbytes(64).hex() + "ac",
+            "76a94c14" + h20 + "88ac",  # OP_PUSHDATA1-encoded hash
+            "76a914" + h20 + "88ad",
+            "a914" + h20[:-2] + "87",
+            "0015" + h20 + "00",
+        ]
+    return out
+
+
+@pytest.mark.parametrize("network", ["btc", "ltc", "bch", "zec", "doge"])
+def test_parse_scripts_matches_parse_script(network):
+    scripts = (
+        [s for s, _, _ in _HANDLED]
+        + _UNKNOWN
+        + [_UNPARSEABLE_P2PK]
+        + ["0x" + s for s, _, _ in _HANDLED[:3]]
+        + _generated_scripts()
+    )
+    # duplicates share a derived address
+    scripts += scripts[:50]
+
+    batched = parse_scripts(scripts, network)
+
+    assert len(batched) == len(scripts)
+    for script_hex, got in zip(scripts, batched):
+        expected = _parse_script_or_exception(script_hex, network)
+        if isinstance(expected, Exception):
+            assert type(got) is type(expected), script_hex
+            assert str(got) == str(expected)
+        else:
+            assert got == expected, script_hex
+
+
+def test_parse_scripts_falls_back_on_undecodable_hex():
+    scripts = [_HANDLED[0][0], "abc", _HANDLED[1][0]]
+    with pytest.raises(ValueError):
+        parse_scripts(scripts)
+    assert parse_scripts([]) == []
@@ -1,5 +1,8 @@
+import threading
+from unittest.mock import patch
+
 from graphsenselib.ingest.common import BlockRangeContent
-from graphsenselib.ingest.source import split_blockrange
+from graphsenselib.ingest.source import SourceETH, SourceUTXO, split_blockrange
 
 
 def test_split_blockrange():
@@ -32,3 +35,29 @@ def test_split_blockrange_single2():
 
 def test_block_range():
     BlockRangeContent(table_contents={})
+
+
+def _rpc_loop_threads():
+    return [t for t in threading.enumerate() if t.name == "async-rpc-loop"]
+
+
+def test_eth_source_close_stops_async_rpc_loop():
+    before = len(_rpc_loop_threads())
+    source = SourceETH("http://fake:8545", 10, async_rpc=True)
+    source.client._get_loop()
+    assert len(_rpc_loop_threads()) == before + 1
+
+    source.close()
+    assert len(_rpc_loop_threads()) == before
+
+
+def test_utxo_source_close_releases_client_and_store():
+    source = SourceUTXO("http://fake:8332", "btc", 10, async_rpc=True)
+    source.fast_exporter.client._get_loop()
+    thread = source.fast_exporter.client._thread
+
+    with patch.object(source.fast_exporter.output_store, "close") as store_close:
+        source.close()
+
+    store_close.assert_called_once()
+    assert not thread.is_alive()
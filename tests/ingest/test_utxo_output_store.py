@@ -0,0 +1,133 @@
+from graphsenselib.ingest.utxo_output_store import DiskOutputStore, MemoryOutputStore
+
+TX_A = "aa" * 32
+TX_B = "bb" * 32
+TX_C = "cc" * 32
+
+
+def _entry(value):
+    return (value, [f"addr{value}"], "p2pkh", None)
+
+
+def test_memory_store_spend_and_trim():
+    store = MemoryOutputStore(max_entries=2)
+    store.add_outputs(TX_A, {0: _entry(1), 1: _entry(2)})
+    assert store.prefetch([TX_A, TX_B]) == {TX_A}
+    assert store.get(TX_A, 1) == _entry(2)
+
+    assert len(store) == 2
+    store.spend([(TX_A, 0), (TX_A, 1)])
+    assert len(store) == 0
+
+    for h in (TX_A, TX_B, TX_C):
+        store.add_outputs(h, {0: _entry(3)})
+    store.trim()
+    assert len(store) == 1
+    assert store.get(TX_C, 0) == _entry(3)
+
+
+def test_disk_store_spills_instead_of_dropping(tmp_path):
+    store = DiskOutputStore(str(tmp_path / "btc_outputs.sqlite"), hot_entries=2)
+    store.add_outputs(TX_A, {0: _entry(1), 1: _entry(2)})
+    store.add_outputs(TX_B, {0: _entry(3)})
+    store.add_outputs(TX_C, {0: _entry(4)})
+    store.trim()
+
+    # TX_A and TX_B were spilled, only TX_C is hot
+    assert store.describe() == ("1 txs in memory, ~3 outputs on disk, 0 spends pending")
+    assert len(store) == 4
+    assert store.prefetch([TX_A, TX_B, TX_C, "dd" * 32]) == {TX_A, TX_B, TX_C}
+    assert store.get(TX_A, 1) == _entry(2)
+
+    store.spend([(TX_A, 0), (TX_B, 0)])
+    assert store.get(TX_A, 0) is None
+    assert store.get(TX_A, 1) == _entry(2)
+    assert store.get(TX_B, 0) is None
+
+
+def test_disk_store_survives_restart(tmp_path):
+    path = str(tmp_path / "btc_outputs.sqlite")
+    store = DiskOutputStore(path)
+    store.add_outputs(TX_A, {0: _entry(1), 5: (7, [], "nonstandard", "ab")})
+    store.close()
+
+    reopened = DiskOutputStore(path)
+    assert len(reopened) == 2
+    assert reopened.get(TX_A, 5) == (7, [], "nonstandard", "ab")
+    reopened.spend([(TX_A, 0), (TX_A, 5)])
+    reopened.close()
+
+    assert len(DiskOutputStore(path)) == 0
+
+
+def test_disk_store_seed_and_spend_from_disk(tmp_path):
+    store = DiskOutputStore(str(tmp_path / "btc_outputs.sqlite"))
+    n = store.seed([(TX_A, 0, _entry(1)), (TX_A, 1, _entry(2))])
+    assert n == 2
+    store.spend([(TX_A, 0)])
+    store.flush()
+    assert store.disk_outputs == 1
+    assert store.prefetch([TX_A]) == {TX_A}
+    assert store.get(TX_A, 1) == _entry(2)
+
+
+def test_disk_store_keeps_prefetched_outputs_across_a_crash(tmp_path):
+    path = str(tmp_path / "btc_outputs.sqlite")
+    store = DiskOutputStore(path, hot_entries=2)
+    store.seed([(TX_A, 0, _entry(1)), (TX_A, 1, _entry(2))])
+    assert store.prefetch([TX_A]) == {TX_A}
+    store.spend([(TX_A, 0)])
+
+    # a spill of other txs commits, then the process dies without close()
+    for h in (TX_B, TX_C, "dd" * 32):
+        store.add_outputs(h, {0: _entry(3)})
+    store.trim()
+    assert len(store) == 4
+    store._db.close()
+
+    reopened = DiskOutputStore(path)
+    assert reopened.get(TX_A, 0) is None
+    assert reopened.get(TX_A, 1) == _entry(2)
+    # spilling a prefetched tx writes nothing new
+    reopened.flush()
+    assert reopened.disk_outputs == 3
+
+
+def test_deferred_spends_are_evicted_on_commit():
+    store = MemoryOutputStore()
+    store.add_outputs(TX_A, {0: _entry(1), 1: _entry(2)})
+    store.add_outputs(TX_B, {0: _entry(3)})
+    store.defer_spend(99, [(TX_A, 0)])
+    store.defer_spend(199, [(TX_A, 1), (TX_B, 0)])
+
+    assert store.pending_spends == 3
+    assert store.get(TX_A, 0) == _entry(1)
+
+    store.commit(99)
+    assert store.get(TX_A, 0) is None
+    assert store.get(TX_A, 1) == _entry(2)
+    assert len(store) == 2 and store.pending_spends == 2
+
+    store.commit(199)
+    assert len(store) == 0 and store.pending_spends == 0
+
+
+def test_disk_store_keeps_uncommitted_spends_across_a_crash(tmp_path):
+    # the pipeline reads chunks ahead of the sinks; if it dies before they
+    # are written, the outputs they spend must still be there on restart
+    path = str(tmp_path / "btc_outputs.sqlite")
+    store = DiskOutputStore(path, hot_entries=2)
+    store.seed([(TX_A, 0, _entry(1)), (TX_B, 0, _entry(2))])
+    assert store.prefetch([TX_A, TX_B]) == {TX_A, TX_B}
+    store.defer_spend(99, [(TX_A, 0)])
+    store.defer_spend(199, [(TX_B, 0)])
+    store.commit(99)
+
+    for h in (TX_C, "dd" * 32, "ee" * 32):
+        store.add_outputs(h, {0: _entry(3)})
+    store.trim()
+    store._db.close()
+
+    reopened = DiskOutputStore(path)
+    assert reopened.get(TX_A, 0) is None
+    assert reopened.get(TX_B, 0) == _entry(2)
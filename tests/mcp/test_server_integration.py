@@ -87,11 +87,32 @@ async def test_tool_surface_shape(bundled_mcp):
     assert "report_tag" not in names
 
 
-async def test_external_tool_skipped_without_config(bundled_mcp):
-    """search_neighbors is enabled in curation but not configured -> not registered."""
+async def test_external_tool_falls_back_without_config(bundled_mcp):
+    """search_neighbors is enabled in curation but not configured -> the
+    in-process fallback is registered with the same parameters."""
     async with Client(bundled_mcp) as c:
-        names = {t.name for t in await c.list_tools()}
-    assert "search_neighbors" not in names
+        tools = await c.list_tools()
+        names = {t.name for t in tools}
+        assert "search_neighbors" in names
+        # the route behind it stays off the auto-generated surface
+        assert "search_address_neighbors" not in names
+
+        tool = next(t for t in tools if t.name == "search_neighbors")
+        props = tool.inputSchema.get("properties", {})
+        assert {"network", "start_address", "match_keywords"} <= set(props)
+
+        result = await c.call_tool(
+            "search_neighbors",
+            {
+                "network": "btc",
+                "start_address": "addressA",
+                "search_type": "quicklock",
+                "match_keywords": ["exchange"],
+            },
+            raise_on_error=False,
+        )
+        assert result.is_error
+        assert "addr_only" in result.content[0].text
 
 
 async def test_external_tool_registered_when_configured(monkeypatch):
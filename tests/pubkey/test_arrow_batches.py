@@ -0,0 +1,84 @@
+"""Arrow-batch pubkey extraction and address derivation used by the Spark job.
+
+The ``mapInArrow`` functions are exercised directly on pyarrow record batches
+(no Spark session) and must agree with the per-row functions they replace.
+"""
+
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+
+from graphsenselib.pubkey.extract import (  # noqa: E402
+    extract_pubkeys_utxo,
+    extract_pubkeys_utxo_column,
+    extract_pubkeys_utxo_outputs,
+    extract_pubkeys_utxo_outputs_column,
+)
+from graphsenselib.pubkey.job import (  # noqa: E402
+    DERIVATION_CHAINS,
+    _derive_addresses_arrow,
+    _extract_pubkeys_utxo_arrow,
+)
+from graphsenselib.utils.pubkey_to_address import derive_addresses_many  # noqa: E402
+
+_PK1 = bytes.fromhex(
+    "035088337106d55746a3cc7a6b93b1eca9babd0e7bc8609ff90288093e29ea8ccb"
+)
+_PK2 = bytes.fromhex(
+    "0379be667ef9dcbbac55a06295ce870b07029bfcdb2dce28d959f2815b16f81798"
+)
+_SIG = bytes([0x30]) + b"\x11" * 70
+
+
+def _p2pkh_script(pk):
+    return bytes([len(_SIG)]) + _SIG + bytes([len(pk)]) + pk
+
+
+_INPUTS = [
+    [{"script_hex": _p2pkh_script(_PK1), "txinwitness": None}],
+    [
+        {"script_hex": None, "txinwitness": [_SIG, _PK2]},
+        {"script_hex": _p2pkh_script(_PK1).hex(), "txinwitness": None},
+    ],
+    None,
+    [{"script_hex": b"\x00", "txinwitness": []}],
+]
+_OUTPUTS = [
+    [{"script_hex": bytes([33]) + _PK2 + b"\xac"}],  # P2PK
+    [{"script_hex": b"\x76\xa9\x14" + b"\x00" * 20 + b"\x88\xac"}],  # P2PKH
+    None,
+    [],
+]
+
+
+def test_column_extractors_match_per_row():
+    assert extract_pubkeys_utxo_column(_INPUTS) == [
+        extract_pubkeys_utxo(i) for i in _INPUTS
+    ]
+    assert extract_pubkeys_utxo_outputs_column(_OUTPUTS) == [
+        extract_pubkeys_utxo_outputs(o) for o in _OUTPUTS
+    ]
+
+
+def test_extract_arrow_yields_distinct_batch_keys():
+    batch = pa.RecordBatch.from_pylist(
+        [{"inputs": i, "outputs": o} for i, o in zip(_INPUTS, _OUTPUTS)]
+    )
+    (out,) = list(_extract_pubkeys_utxo_arrow(iter([batch])))
+
+    assert out.schema.names == ["pubkey"]
+    assert out.column("pubkey").to_pylist() == [_PK1, _PK2]
+
+
+def test_derive_arrow_emits_one_row_per_address():
+    batch = pa.RecordBatch.from_arrays(
+        [pa.array([_PK1, b"\x02" + b"\xff" * 32, _PK2], pa.binary())],
+        names=["pubkey"],
+    )
+    (out,) = list(_derive_addresses_arrow(DERIVATION_CHAINS)(iter([batch])))
+
+    expected = derive_addresses_many([_PK1, _PK2], DERIVATION_CHAINS)
+    assert out.column("address").to_pylist() == expected[0] + expected[1]
+    assert out.column("pubkey").to_pylist() == [_PK1] * len(expected[0]) + [_PK2] * len(
+        expected[1]
+    )
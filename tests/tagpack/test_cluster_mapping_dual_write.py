@@ -62,9 +62,9 @@ class _RegimeGraphSense:
     def keyspace_for_network_exists(self, network):
         return True
 
-    def get_address_clusters(self, batch, network, fresh=False):
+    def iter_address_clusters(self, batch, network, fresh=False, chunk_size=5_000):
         self.calls.append(fresh)
-        return pd.DataFrame(
+        yield pd.DataFrame(
             {
                 "address": ["A"],
                 "address_id": [10],
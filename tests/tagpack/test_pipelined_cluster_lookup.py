@@ -0,0 +1,173 @@
+"""Pipelined streaming cluster lookup (``GraphSense.iter_address_clusters``).
+
+DB-free: a fake session answers the prepared lookups from dicts and records
+how many async requests were outstanding at once. The pipelined stream must
+produce the same mappings as the sequential ``get_address_clusters``.
+"""
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("yaml_include", reason="PyYAML is required for tagpack tests")
+
+from graphsenselib.tagpack import graphsense as gs_mod
+from graphsenselib.tagpack.graphsense import (
+    GraphSense,
+    QueryExecutionError,
+    eth_address_from_hex,
+    eth_addresses_from_hex,
+)
+
+BUCKET = 10
+
+
+class _Future:
+    def __init__(self, session, rows, error=None):
+        self._session = session
+        self._rows = rows
+        self._error = error
+
+    def result(self):
+        self._session.outstanding -= 1
+        if self._error is not None:
+            raise self._error
+        return self._rows
+
+
+class FakeSession:
+    def __init__(self, address_ids, cluster_ids, stats, definers, fail_once=()):
+        self.tables = {
+            "address_ids_by_address_prefix": address_ids,
+            "cluster_id": cluster_ids,
+            "stats": stats,
+            "definer": definers,
+        }
+        self.fail_once = set(fail_once)
+        self.outstanding = 0
+        self.max_outstanding = 0
+        self.requests = 0
+
+    def set_keyspace(self, keyspace):
+        pass
+
+    def execute(self, query):
+        return [{"address_prefix_length": 3, "bucket_size": BUCKET}]
+
+    def prepare(self, query):
+        if "address_ids_by_address_prefix" in query:
+            return "address_ids_by_address_prefix"
+        if "as cluster_defining_address" in query:
+            return "definer"
+        if "SELECT address_id, cluster_id" in query:
+            return "cluster_id"
+        return "stats"
+
+    def rows(self, table, params):
+        if table == "address_ids_by_address_prefix":
+            prefix, address = params
+            aid = self.tables[table].get(address)
+            return [] if aid is None else [{"address": address, "address_id": aid}]
+        group, key = params
+        assert group == key // BUCKET
+        row = self.tables[table].get(key)
+        return [] if row is None else [row]
+
+    def execute_async(self, table, params):
+        self.requests += 1
+        self.outstanding += 1
+        self.max_outstanding = max(self.max_outstanding, self.outstanding)
+        if (table, params) in self.fail_once:
+            self.fail_once.discard((table, params))
+            return _Future(self, None, RuntimeError("timeout"))
+        return _Future(self, self.rows(table, params))
+
+
+def _gs(session):
+    gs = GraphSense.__new__(GraphSense)
+    gs.session = session
+    gs.ks_map = {"BTC": {"transformed": "btc_t"}, "ETH": {"transformed": "eth_t"}}
+    gs._fresh_network_cache = {}
+    gs._execute_query = lambda stmt, params: pd.DataFrame.from_dict(
+        [row for p in params for row in session.rows(stmt, tuple(p))]
+    )
+    return gs
+
+
+def _utxo_session(**kw):
+    addresses = {f"1addr{i}": 100 + i for i in range(40)}
+    # ids 100..119 share cluster 7, the rest are fresh singletons (no row)
+    cluster_ids = {aid: {"address_id": aid, "cluster_id": 7} for aid in range(100, 120)}
+    stats = {7: {"cluster_id": 7, "no_addresses": 20}}
+    definers = {7: {"cluster_id": 7, "cluster_defining_address": "1def"}}
+    return FakeSession(addresses, cluster_ids, stats, definers, **kw)
+
+
+def _normalise(df):
+    cols = [
+        "address",
+        "address_id",
+        "cluster_id",
+        "no_addresses",
+        "cluster_defining_address",
+    ]
+    return df[cols].sort_values("address").reset_index(drop=True)
+
+
+def test_pipelined_chunks_match_sequential_lookup():
+    df = pd.DataFrame({"address": [f"1addr{i}" for i in range(45)]})
+    session = _utxo_session()
+    gs = _gs(session)
+
+    chunks = list(
+        gs.iter_address_clusters(df, "BTC", fresh=True, chunk_size=16, max_in_flight=5)
+    )
+    expected = gs.get_address_clusters(df, "BTC", fresh=True)
+
+    assert len(chunks) == 3
+    assert session.max_outstanding <= 5
+    pd.testing.assert_frame_equal(
+        _normalise(pd.concat(chunks)), _normalise(expected), check_dtype=False
+    )
+    # stats and definer of cluster 7 are read once per chunk, not per address
+    assert session.requests == 45 + 40 + 2 * 2
+
+
+def test_failed_lookup_is_retried(monkeypatch):
+    monkeypatch.setattr(gs_mod.time, "sleep", lambda s: None)
+    session = _utxo_session(fail_once=[("cluster_id", (10, 101))])
+    gs = _gs(session)
+    df = pd.DataFrame({"address": ["1addr1"]})
+
+    (result,) = gs.iter_address_clusters(df, "BTC", fresh=False)
+
+    assert result["cluster_id"].tolist() == [7]
+
+
+def test_persistent_failure_raises(monkeypatch):
+    monkeypatch.setattr(gs_mod.time, "sleep", lambda s: None)
+    monkeypatch.setattr(gs_mod, "_MAX_QUERY_EXECUTION_ATTEMPTS", 1)
+    session = _utxo_session(fail_once=[("cluster_id", (10, 101))])
+    gs = _gs(session)
+
+    with pytest.raises(QueryExecutionError):
+        list(gs.iter_address_clusters(pd.DataFrame({"address": ["1addr1"]}), "BTC"))
+
+
+def test_eth_lookup_converts_column_wise_and_keeps_checksum_spelling():
+    checksum = "0x52908400098527886E0F7030069857D2E4169EE7"
+    raw = bytes.fromhex(checksum[2:].lower())
+    session = FakeSession({raw: 5}, {}, {}, {})
+    gs = _gs(session)
+    df = pd.DataFrame({"address": [checksum, "0xnothex", "not-eth"]})
+
+    (result,) = gs.iter_address_clusters(df, "ETH")
+
+    assert result["address"].tolist() == [checksum]
+    assert result["cluster_id"].tolist() == [5]
+    assert result["cluster_defining_address"].tolist() == [checksum]
+    assert session.requests == 1
+
+
+def test_eth_addresses_from_hex_matches_scalar():
+    values = pd.Series(["0xAbCd", "0x", "0xabc", "0xzz12", "0x00ff"])
+    assert eth_addresses_from_hex(values) == [eth_address_from_hex(v) for v in values]
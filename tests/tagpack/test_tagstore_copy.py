@@ -0,0 +1,290 @@
+"""COPY-based tagpack and cluster-mapping writes of the TagStore.
+
+DB-free: the real ``TagStore`` methods run against a fake connection whose
+cursor records the statements and decodes the COPY payloads.
+"""
+
+import pickle
+import re
+import threading
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("yaml_include", reason="PyYAML is required for tagpack tests")
+
+from graphsenselib.tagpack import tagstore as ts_mod
+from graphsenselib.tagpack.tagstore import (
+    CopyRowStream,
+    InsertTagpackWorker,
+    TagStore,
+    prepare_tagpack,
+)
+
+_FIELD = re.compile(r'"((?:[^"]|"")*)"|([^,\n]*)')
+
+
+def _decode(stream):
+    """Parse COPY csv: quoted fields are strings, unquoted ``\\N`` is NULL."""
+    chunks = []
+    while chunk := stream.read(7):
+        chunks.append(chunk)
+    data, pos, rows, row = "".join(chunks), 0, [], []
+    while pos < len(data):
+        m = _FIELD.match(data, pos)
+        quoted, bare = m.groups()
+        if quoted is not None:
+            row.append(quoted.replace('""', '"'))
+        else:
+            row.append(None if bare == "\\N" else bare)
+        pos = m.end()
+        if data[pos] == "\n":
+            rows.append(row)
+            row = []
+        pos += 1
+    return rows
+
+
+class FakeCursor:
+    def __init__(self, first_tag_id=100):
+        self.statements = []
+        self.copies = {}
+        self._next_id = first_tag_id
+        self._rows = []
+
+    def execute(self, q, params=None):
+        self.statements.append((" ".join(q.split()), params))
+        if "pg_get_serial_sequence" in q:
+            self._rows = [("tag_id_seq",)]
+        elif "nextval" in q:
+            n = params[1]
+            self._rows = [(self._next_id + i,) for i in range(n)]
+            self._next_id += n
+
+    def fetchone(self):
+        return self._rows[0]
+
+    def fetchall(self):
+        return self._rows
+
+    def copy_expert(self, sql, stream):
+        table = sql.split()[1]
+        self.copies[table] = _decode(stream)
+
+
+class FakeConnection:
+    def __init__(self):
+        self.commits = 0
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        pass
+
+
+def _store():
+    store = TagStore.__new__(TagStore)
+    store.conn = FakeConnection()
+    store.cursor = FakeCursor()
+    store._tag_id_sequence = None
+    return store
+
+
+def _tag(**fields):
+    base = {
+        "label": "exchange ",
+        "source": "src",
+        "currency": "btc",
+        "network": "btc",
+        "confidence": "web_crawl",
+        "lastmod": "2024-01-01",
+    }
+    return SimpleNamespace(all_fields={**base, **fields})
+
+
+def _tagpack(tags):
+    return SimpleNamespace(
+        uri="https://example.org/tp.yaml",
+        contents={"title": "T", "creator": "me"},
+        tags=tags,
+        get_unique_tags=lambda: tags,
+    )
+
+
+TAGS = [
+    _tag(address="1abc", category="exchange", concepts=["defi"]),
+    _tag(address="1abc", category="exchange"),  # duplicate, skipped
+    _tag(tx_hash="ff00", label='say "hi"', context=None, abuse="scam"),
+]
+
+
+def test_copy_stream_distinguishes_null_from_empty_and_escapes():
+    rows = [(1, None, "", True), (2, 'a,"b"\nc', "\\N", False)]
+    assert _decode(CopyRowStream(rows)) == [
+        ["1", None, "", "t"],
+        ["2", 'a,"b"\nc', "\\N", "f"],
+    ]
+
+
+def test_prepare_tagpack_skips_payload_duplicates():
+    prepared = prepare_tagpack(_tagpack(TAGS), "pfx:tp.yaml", True, "actor", None)
+
+    assert prepared.header == (
+        "pfx:tp.yaml",
+        "T",
+        "not provided",
+        "me",
+        "https://example.org/tp.yaml",
+        "public",
+    )
+    assert [t[2] for t in prepared.tags] == ["1abc", "ff00"]
+    assert prepared.addresses == [("BTC", "1abc")]
+    assert prepared.concepts == [
+        [("defi", None), ("exchange", "primary")],
+        [("scam", "abuse")],
+    ]
+
+
+def test_write_tagpack_stages_rows_with_preallocated_ids():
+    store = _store()
+    prepared = prepare_tagpack(_tagpack(TAGS), "tp.yaml", False, "actor", None)
+
+    store.write_tagpack(prepared, force_insert=True)
+
+    cur = store.cursor
+    statements = [q for q, _ in cur.statements]
+    assert statements[0].startswith("DELETE FROM tagpack")
+    assert statements[1].startswith("INSERT INTO tagpack")
+    assert cur.statements[1][1][-1] == "private"
+    # one round trip allocates every tag id
+    assert [p for q, p in cur.statements if "nextval" in q] == [("tag_id_seq", 2)]
+
+    tags = cur.copies["tag_stage"]
+    assert [(r[0], r[1], r[3]) for r in tags] == [
+        ("100", "exchange", "1abc"),
+        ("101", 'say "hi"', "ff00"),
+    ]
+    assert tags[1][9] is None  # context
+    assert cur.copies["address_stage"] == [["BTC", "1abc"]]
+    assert cur.copies["tag_concept_stage"] == [
+        ["100", None, "defi"],
+        ["100", "primary", "exchange"],
+        ["101", "abuse", "scam"],
+    ]
+    assert "INSERT INTO tag (id, label" in statements[-1]
+    assert "ON CONFLICT DO NOTHING" in statements[-1]
+    assert store.conn.commits == 1
+
+
+def test_write_empty_tagpack_only_inserts_header():
+    store = _store()
+    store.write_tagpack(
+        prepare_tagpack(_tagpack([]), "tp.yaml", True, "actor", None), False
+    )
+    assert len(store.cursor.statements) == 1
+    assert store.cursor.copies == {}
+
+
+def test_cluster_mappings_upsert_keeps_last_row_per_key():
+    store = _store()
+    clusters = pd.DataFrame(
+        {
+            "address": ["A", "B", "A"],
+            "network": ["BTC"] * 3,
+            "cluster_id": [1, 2, 3],
+            "cluster_defining_address": ["A", "B", "A"],
+            "no_addresses": [1.0, float("nan"), 2.0],
+        }
+    )
+
+    store.insert_cluster_mappings(clusters, fresh=True)
+
+    rows = store.cursor.copies["address_cluster_mapping_v2_stage"]
+    assert rows == [
+        ["0", "A", "BTC", "1", "A", "1"],
+        ["1", "B", "BTC", "2", "B", None],
+        ["2", "A", "BTC", "3", "A", "2"],
+    ]
+    upsert = store.cursor.statements[-1][0]
+    assert upsert.startswith("INSERT INTO address_cluster_mapping_v2 ")
+    assert "DISTINCT ON (network, address)" in upsert
+    assert "ord DESC" in upsert
+
+
+def test_worker_prepares_without_db_and_writes_through_one_store(monkeypatch):
+    monkeypatch.setattr(
+        ts_mod.TagPack, "load_from_file", staticmethod(lambda *a: _tagpack(TAGS))
+    )
+    store = _store()
+    worker = InsertTagpackWorker(
+        "postgresql://x", "tagstore", None, {}, True, False, updateMode=True
+    )
+
+    pack = ("tp.yaml", None, "uri", "tp.yaml", "pfx", None, True)
+    prepared = worker.prepare((1, pack))
+    assert worker.tagstore is None
+    assert prepared[2].tagpack_id == "pfx:tp.yaml"
+    assert prepared[3] is True  # update mode and already ingested
+
+    worker.tagstore = store
+    assert worker.write(prepared) == (1, 3)
+    assert store.cursor.statements[0][0].startswith("DELETE FROM tagpack")
+
+    # the writer's store never travels to the parsing processes
+    assert pickle.loads(pickle.dumps(worker)).tagstore is None
+    assert worker.tagstore is store
+
+
+class _UnpicklableStore:
+    """Stand-in TagStore holding, like a psycopg2 connection, unpicklable state."""
+
+    written = []
+
+    def __init__(self, url, schema):
+        self._conn = threading.Lock()
+
+    def get_actor_alias_mapping(self):
+        return {}
+
+    def write_tagpack(self, tagpack, force_insert):
+        self.written.append(tagpack.tagpack_id)
+
+
+def test_parallel_insert_keeps_the_store_in_the_writer(tmp_path, monkeypatch):
+    from graphsenselib.tagpack import cli as tp_cli
+
+    n_packs = 60  # several chunks of 10 per worker
+    for i in range(n_packs):
+        (tmp_path / f"tp{i:02}.yaml").write_text("tags: []\n")
+    monkeypatch.setattr(
+        ts_mod.TagPack, "load_from_file", staticmethod(lambda *a: _tagpack(TAGS))
+    )
+    monkeypatch.setattr(ts_mod, "TagStore", _UnpicklableStore)
+    monkeypatch.setattr(tp_cli, "TagStore", _UnpicklableStore)
+    # Bulky parse state: the task queue pipe fills up, so tasks are still
+    # being sent while the writer already holds its store.
+    monkeypatch.setattr(tp_cli, "_load_taxonomies", lambda config: {"x": b"." * 2**20})
+    monkeypatch.setattr(_UnpicklableStore, "written", [])
+
+    passed, total = tp_cli.insert_tagpack(
+        "postgresql://x",
+        "tagstore",
+        str(tmp_path),
+        batch_size=100,
+        public=True,
+        force=False,
+        add_new=False,
+        no_strict_check=True,
+        no_git=True,
+        n_workers=2,
+        no_validation=True,
+        tag_type_default="actor",
+        config=None,
+        update_flag=False,
+    )
+
+    assert passed == total == n_packs
+    written = _UnpicklableStore.written
+    assert len(written) == len(set(written)) == n_packs
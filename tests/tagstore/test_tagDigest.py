@@ -5,8 +5,10 @@ import pytest
 pytest.importorskip("yaml_include", reason="PyYAML is required for tagpack tests")
 
 from graphsenselib.tagstore.algorithms.tag_digest import (
+    TagDigestCache,
     TagDigestComputationConfig,
     compute_tag_digest,
+    compute_tag_digests,
 )
 from graphsenselib.tagstore.algorithms.obfuscate import obfuscate_tag_if_not_public
 from graphsenselib.tagstore.db.queries import TagPublic
@@ -194,3 +196,54 @@ def test_tag_digest_exchange(tagsExchange):
 
     assert list(digest.concept_tag_cloud.keys())[0] == "exchange"
     assert list(digest.concept_tag_cloud.keys()) == ["exchange"]
+
+
+@pytest.mark.parametrize("only_high_confidence_actors", [False, True])
+def test_tag_digests_batch_matches_single(
+    tagsCryptoDogs, tagsIA, tagsExchange, only_high_confidence_actors
+):
+    config = TagDigestComputationConfig().with_only_propagate_high_confidence_actors(
+        only_high_confidence_actors
+    )
+    tag_sets = {
+        "dogs": tagsCryptoDogs,
+        "ia": tagsIA,
+        "exchange": tagsExchange,
+        "obfuscated": [obfuscate_tag_if_not_public(t) for t in tagsCryptoDogs],
+        "mixed": tagsExchange + tagsIA,
+        "untagged": [],
+    }
+    digests = compute_tag_digests(tag_sets, config=config)
+
+    assert list(digests) == list(tag_sets)
+    for subject, tags in tag_sets.items():
+        assert digests[subject] == compute_tag_digest(tags, config=config)
+
+
+def test_tag_digests_reuse_recurring_tag_sets(tagsExchange, tagsIA):
+    cache = TagDigestCache(maxsize=2)
+    deposits = {f"deposit{i}": list(tagsExchange) for i in range(3)}
+    digests = compute_tag_digests(deposits, cache=cache)
+
+    # equal tag sets (not the same objects) share one digest
+    assert len({id(d) for d in digests.values()}) == 1
+    assert len(cache) == 1
+    again = compute_tag_digests({"other": list(tagsExchange)}, cache=cache)
+    assert again["other"] is digests["deposit0"]
+
+    # the configuration is part of the key
+    weighted = compute_tag_digests(
+        {"other": tagsExchange},
+        config=TagDigestComputationConfig().with_confidence_weight_exponent(1.0),
+        cache=cache,
+    )
+    assert weighted["other"] is not digests["deposit0"]
+    assert len(cache) == 2
+
+    # least recently used entries are evicted
+    compute_tag_digests({"ia": tagsIA}, cache=cache)
+    assert len(cache) == 2
+    assert (
+        compute_tag_digests({"other": tagsExchange}, cache=cache)["other"]
+        is not digests["deposit0"]
+    )
@@ -14,6 +14,7 @@ from graphsenselib.ingest.rpc_utxo import (
     _parse_output,
     _script_hex_to_non_standard_address,
 )
+from graphsenselib.ingest.utxo_output_store import MemoryOutputStore
 
 
 class TestBtcToSatoshi:
@@ -698,8 +699,9 @@ class TestResolveUnresolvedInputs:
         with patch.object(BtcBlockExporter, "__init__", lambda self, **kw: None):
             exp = BtcBlockExporter.__new__(BtcBlockExporter)
             exp.max_workers = 2
-            exp._output_cache = {}
+            exp._output_store = MemoryOutputStore()
             exp.fail_on_unresolved_inputs = True
+            exp.defer_spends = False
             return exp
 
     def _tx_with_unresolvable_input(self):
@@ -921,3 +923,45 @@ class TestResolveUnresolvedInputs:
             mock_rpc.assert_not_called()
 
         assert transactions[1]["inputs"][0]["value"] == 100
+
+    def test_deferred_spends_are_evicted_on_commit(self):
+        """With defer_spends, spent outputs stay in the store until the chunk
+        that spent them is committed."""
+        exp = self._make_exporter()
+        exp.defer_spends = True
+        exp._output_store.update(
+            {"prev": {0: _make_cache_entry(100, ["a"], "p2pkh", None)}}
+        )
+        transactions = [
+            {
+                "hash": "spender",
+                "is_coinbase": False,
+                "inputs": [
+                    {
+                        "spent_transaction_hash": "prev",
+                        "spent_output_index": 0,
+                        "value": None,
+                        "addresses": [],
+                        "type": None,
+                    },
+                ],
+                "outputs": [],
+                "input_value": 0,
+                "output_value": 0,
+                "fee": 0,
+            },
+        ]
+
+        with pytest.raises(ValueError, match="end_block"):
+            exp._resolve_unresolved_inputs(transactions)
+
+        exp._resolve_unresolved_inputs(transactions, end_block=9)
+        assert transactions[0]["inputs"][0]["value"] == 100
+        assert exp._output_store.get("prev", 0) is not None
+        assert exp._output_store.pending_spends == 1
+
+        exp.commit_spends(8)
+        assert exp._output_store.get("prev", 0) is not None
+        exp.commit_spends(9)
+        assert exp._output_store.get("prev", 0) is None
+        assert exp._output_store.pending_spends == 0
@@ -1,12 +1,20 @@
 """Unit tests for graphsenselib.ingest.rpc_eth parsers and enrichment."""
 
+import asyncio
 import json
 import threading
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
+import httpx
+import orjson
+import requests
+
 from graphsenselib.ingest.rpc_eth import (
+    AdaptiveBatchSizer,
+    AdaptiveConcurrencyLimit,
+    AsyncBatchRpcClient,
     BatchRpcClient,
     BlockExporter,
     BlockReceiptExporter,
@@ -17,6 +25,7 @@ from graphsenselib.ingest.rpc_eth import (
     parse_log_json,
     parse_receipt_json,
     parse_transaction_json,
+    run_rpc_batches,
     to_float_or_none,
     to_normalized_address,
 )
@@ -225,10 +234,7 @@ class TestParseTransactionJson:
         assert tx["block_number"] == 16
         assert tx["block_timestamp"] == 1000
         assert tx["transaction_index"] == 0
-        assert (
-            tx["from_address"]
-            == "0xabcd0000000000000000000000000000000000aa"
-        )
+        assert tx["from_address"] == "0xabcd0000000000000000000000000000000000aa"
         assert tx["value"] == 1000000000000000000
         assert tx["gas"] == 21000
         assert tx["gas_price"] == 1000000000
@@ -292,8 +298,7 @@ class TestParseReceiptJson:
         )
         receipt = parse_receipt_json(receipt_json)
         assert (
-            receipt["contract_address"]
-            == "0xabcd0000000000000000000000000000000000ff"
+            receipt["contract_address"] == "0xabcd0000000000000000000000000000000000ff"
         )
 
     def test_l2_fields(self):
@@ -486,6 +491,495 @@ class TestBatchRpcClient:
         assert all(sid != id(main_session) for sid in child_sessions)
 
 
+# ---------------------------------------------------------------------------
+# AdaptiveConcurrencyLimit / AsyncBatchRpcClient
+# ---------------------------------------------------------------------------
+
+
+class TestAdaptiveConcurrencyLimit:
+    def test_grows_while_latency_is_stable(self):
+        limit = AdaptiveConcurrencyLimit(initial=4, maximum=8)
+        for _ in range(100):
+            limit._update(0.1, ok=True)
+        assert limit.limit == 8
+
+    def test_shrinks_on_slow_responses_and_errors(self):
+        limit = AdaptiveConcurrencyLimit(initial=16, minimum=2, maximum=16)
+        limit._update(0.1, ok=True)
+        limit._update(1.0, ok=True)
+        assert limit.limit < 16
+        for _ in range(10):
+            limit._update(0.1, ok=False)
+        assert limit.limit == 2
+
+    def test_detach_moves_to_a_new_loop(self):
+        async def contended(limit):
+            await limit.acquire()
+            waiter = asyncio.ensure_future(limit.acquire())
+            await asyncio.sleep(0)
+            await limit.release(0.1, ok=True)
+            await waiter
+
+        limit = AdaptiveConcurrencyLimit(initial=1, maximum=1)
+        # the second request is abandoned with the loop
+        asyncio.run(contended(limit))
+        assert limit.in_flight == 1
+        limit.detach()
+        assert limit.in_flight == 0
+        asyncio.run(contended(limit))
+
+
+def _async_client(handler, **kwargs):
+    client = AsyncBatchRpcClient("http://fake:8545", **kwargs)
+    mock_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    client._get_client = lambda: mock_client
+    return client
+
+
+class TestAsyncBatchRpcClient:
+    def test_make_batch_request(self):
+        def handler(request):
+            payload = orjson.loads(request.content)
+            return httpx.Response(
+                200,
+                content=orjson.dumps(
+                    [
+                        {"jsonrpc": "2.0", "id": r["id"], "result": "0x1"}
+                        for r in payload
+                    ]
+                ),
+            )
+
+        client = _async_client(handler)
+        try:
+            results = client.make_batch_request(
+                [
+                    {"jsonrpc": "2.0", "method": "test", "params": [], "id": 1},
+                    {"jsonrpc": "2.0", "method": "test", "params": [], "id": 2},
+                ]
+            )
+        finally:
+            client.close()
+
+        assert [r["id"] for r in results] == [1, 2]
+
+    def test_retries_server_errors(self):
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            if len(calls) == 1:
+                return httpx.Response(503)
+            return httpx.Response(
+                200,
+                content=orjson.dumps({"jsonrpc": "2.0", "id": 1, "result": "0x100"}),
+            )
+
+        client = _async_client(handler)
+        try:
+            with patch("graphsenselib.ingest.rpc_eth.asyncio.sleep", new=AsyncMock()):
+                assert client.get_latest_block_number() == 256
+        finally:
+            client.close()
+
+        assert len(calls) == 2
+
+    def test_transport_errors_keep_the_shared_client(self):
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            if len(calls) == 1:
+                raise httpx.ReadTimeout("read timed out", request=request)
+            return httpx.Response(
+                200,
+                content=orjson.dumps({"jsonrpc": "2.0", "id": 1, "result": "0x1"}),
+            )
+
+        client = AsyncBatchRpcClient("http://fake:8545")
+        shared = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        client._client = shared
+        try:
+            with patch("graphsenselib.ingest.rpc_eth.asyncio.sleep", new=AsyncMock()):
+                assert client.get_latest_block_number() == 1
+            # other requests in flight on the client are not aborted
+            assert client._client is shared and not shared.is_closed
+        finally:
+            client.close()
+
+    def test_closed_client_is_replaced_once(self):
+        client = AsyncBatchRpcClient("http://fake:8545")
+
+        async def scenario():
+            stale = client._get_client()
+            await stale.aclose()
+            await client._reset_client(stale)
+            fresh = client._get_client()
+            # a second request that failed on the stale client keeps the new one
+            await client._reset_client(stale)
+            assert client._client is fresh
+            await client._reset_client()
+
+        asyncio.run(scenario())
+
+    def test_rpc_error_raises(self):
+        def handler(request):
+            return httpx.Response(
+                200,
+                content=orjson.dumps(
+                    {"jsonrpc": "2.0", "id": 1, "error": {"code": -32000}}
+                ),
+            )
+
+        client = _async_client(handler)
+        try:
+            with pytest.raises(ValueError, match="RPC error for eth_blockNumber"):
+                client.get_latest_block_number()
+        finally:
+            client.close()
+
+    def test_can_be_used_again_after_close(self):
+        def handler(request):
+            return httpx.Response(
+                200,
+                content=orjson.dumps({"jsonrpc": "2.0", "id": 1, "result": "0x2"}),
+            )
+
+        client = _async_client(handler)
+        try:
+            assert client.get_latest_block_number() == 2
+            limit = client.limiter.limit
+            client.close()
+            # new loop, and a limiter condition bound to it
+            assert client.get_latest_block_number() == 2
+            assert client.limiter.limit > limit
+            assert client.limiter.in_flight == 0
+        finally:
+            client.close()
+
+    def test_block_exporter_keeps_block_order(self):
+        def handler(request):
+            payload = orjson.loads(request.content)
+            return httpx.Response(
+                200,
+                content=orjson.dumps(
+                    [
+                        {
+                            "jsonrpc": "2.0",
+                            "id": r["id"],
+                            "result": [
+                                {
+                                    "transactionHash": f"0xtx{r['id']}",
+                                    "transactionIndex": "0x0",
+                                    "blockHash": "0xbh",
+                                    "blockNumber": hex(r["id"]),
+                                    "cumulativeGasUsed": "0x5208",
+                                    "gasUsed": "0x5208",
+                                    "status": "0x1",
+                                    "logs": [],
+                                }
+                            ],
+                        }
+                        for r in payload
+                    ]
+                ),
+            )
+
+        client = _async_client(handler)
+        try:
+            exporter = BlockReceiptExporter(client, batch_size=3)
+            receipts, logs = exporter.export_receipts_and_logs(1, 10)
+        finally:
+            client.close()
+
+        assert [r["block_number"] for r in receipts] == list(range(1, 11))
+        assert logs == []
+
+    def test_close_stops_loop_thread(self):
+        def handler(request):
+            return httpx.Response(
+                200,
+                content=orjson.dumps({"jsonrpc": "2.0", "id": 1, "result": "0x1"}),
+            )
+
+        client = _async_client(handler)
+        assert client.get_latest_block_number() == 1
+        loop, thread = client._loop, client._thread
+        assert thread.is_alive()
+
+        client.close()
+        assert not thread.is_alive()
+        assert loop.is_closed()
+        assert "async-rpc-loop" not in {t.name for t in threading.enumerate()}
+        client.close()  # idempotent
+
+    def test_close_without_requests(self):
+        client = AsyncBatchRpcClient("http://fake:8545")
+        client.close()
+        assert client._loop is None
+
+
+class TestRunRpcBatches:
+    def test_results_in_item_order_with_thread_pool(self):
+        mock_client = MagicMock()
+        mock_client.make_batch_request.side_effect = lambda reqs: [
+            {"id": r["id"], "result": r["id"] * 2} for r in reqs
+        ]
+
+        out = run_rpc_batches(
+            mock_client,
+            [[1, 2], [3], [4, 5]],
+            lambda item: [{"id": i} for i in item],
+            lambda item, results, rpc_s: [r["result"] for r in results],
+            max_workers=3,
+        )
+
+        assert out == [[2, 4], [6], [8, 10]]
+
+
+class TestAdaptiveBatchSizer:
+    def test_targets_response_bytes(self):
+        sizer = AdaptiveBatchSizer(10, 4, target_bytes=1000, max_batch_size=1000)
+        # 10 bytes per item -> 100 items per batch, at most doubling per step
+        sizer.observe(10, 100, 0.1)
+        assert sizer.batch_size == 20
+        for _ in range(5):
+            sizer.observe(sizer.batch_size, sizer.batch_size * 10, 0.1)
+        assert sizer.batch_size == 100
+
+        # Payloads get bigger: shrink immediately
+        for _ in range(10):
+            sizer.observe(100, 100 * 500, 0.1)
+        assert sizer.batch_size <= 3
+
+    def test_shrinks_on_slow_batches_and_failures(self):
+        sizer = AdaptiveBatchSizer(40, 8, target_seconds=1.0)
+        sizer.observe(40, None, 4.0)
+        assert sizer.batch_size == 10
+        sizer.observe_failure(10)
+        assert sizer.batch_size == 5
+        assert sizer.max_workers == 4
+        sizer.observe(5, None, 0.1)
+        assert sizer.max_workers == 5
+        assert sizer.describe() == "batch=10 workers=5"
+
+    def test_exporter_splits_failing_batches(self):
+        sent = []
+
+        def make_batch_request(rpc_requests):
+            sent.append(len(rpc_requests))
+            if len(rpc_requests) > 2:
+                raise TimeoutError("read timed out")
+            return [
+                {"jsonrpc": "2.0", "id": r["id"], "result": []} for r in rpc_requests
+            ]
+
+        mock_client = MagicMock()
+        mock_client.make_batch_request.side_effect = make_batch_request
+
+        exporter = BlockReceiptExporter(
+            mock_client, batch_size=8, max_workers=1, target_batch_bytes=2**20
+        )
+        receipts, logs = exporter.export_receipts_and_logs(1, 8)
+
+        assert receipts == [] and logs == []
+        assert sent == [8, 4, 2, 2, 4, 2, 2]
+        # Each split halves the batch size; fast successes grow it back.
+        assert exporter.describe_batching() == "batch=8 workers=1"
+
+    @staticmethod
+    def _export_with(make_batch_request, batch_size=8):
+        mock_client = MagicMock()
+        mock_client.make_batch_request.side_effect = make_batch_request
+        exporter = BlockReceiptExporter(
+            mock_client, batch_size=batch_size, max_workers=1, target_batch_bytes=2**20
+        )
+        return exporter.export_receipts_and_logs(1, batch_size)
+
+    @pytest.mark.parametrize(
+        "error",
+        [
+            requests.exceptions.ConnectionError("Connection refused"),
+            requests.exceptions.ConnectTimeout("connect timed out"),
+            requests.HTTPError(response=MagicMock(status_code=401, text="auth")),
+            requests.HTTPError(response=MagicMock(status_code=502, text="bad gw")),
+            httpx.ConnectError("Connection refused"),
+            requests.HTTPError(
+                response=MagicMock(
+                    status_code=500, text="gas required exceeds allowance"
+                )
+            ),
+            requests.HTTPError(
+                response=MagicMock(status_code=400, text="invalid request payload")
+            ),
+        ],
+        ids=[
+            "refused",
+            "connect-timeout",
+            "auth",
+            "bad-gateway",
+            "httpx-refused",
+            "exceeds",
+            "payload",
+        ],
+    )
+    def test_node_failures_are_not_split(self, error):
+        sent = []
+
+        def make_batch_request(rpc_requests):
+            sent.append(len(rpc_requests))
+            raise error
+
+        with pytest.raises(type(error)):
+            self._export_with(make_batch_request)
+        assert sent == [8]
+
+    @pytest.mark.parametrize(
+        "error",
+        [
+            requests.exceptions.ReadTimeout("read timed out"),
+            httpx.ReadTimeout("read timed out"),
+            requests.exceptions.ChunkedEncodingError("IncompleteRead(0 bytes read)"),
+            requests.HTTPError(response=MagicMock(status_code=413, text="")),
+            requests.HTTPError(
+                response=MagicMock(status_code=500, text="response size exceeded")
+            ),
+        ],
+        ids=["read-timeout", "httpx-read-timeout", "truncated", "413", "size-500"],
+    )
+    def test_size_related_failures_are_split(self, error):
+        sent = []
+
+        def make_batch_request(rpc_requests):
+            sent.append(len(rpc_requests))
+            if len(rpc_requests) > 2:
+                raise error
+            return [
+                {"jsonrpc": "2.0", "id": r["id"], "result": []} for r in rpc_requests
+            ]
+
+        assert self._export_with(make_batch_request) == ([], [])
+        assert sent == [8, 4, 2, 2, 4, 2, 2]
+
+    def test_batch_level_limit_error_is_split(self):
+        sent = []
+
+        def make_batch_request(rpc_requests):
+            sent.append(len(rpc_requests))
+            if len(rpc_requests) > 4:
+                return [
+                    {
+                        "jsonrpc": "2.0",
+                        "id": None,
+                        "error": {"code": -32600, "message": "batch too large"},
+                    }
+                ]
+            return [
+                {"jsonrpc": "2.0", "id": r["id"], "result": []} for r in rpc_requests
+            ]
+
+        assert self._export_with(make_batch_request) == ([], [])
+        assert sent == [8, 4, 4]
+
+    def test_split_tree_gives_up_when_budget_is_spent(self):
+        sent = []
+
+        def make_batch_request(rpc_requests):
+            sent.append(len(rpc_requests))
+            raise TimeoutError("read timed out")
+
+        with patch(
+            "graphsenselib.ingest.rpc_eth._SplitBudget.exhausted",
+            side_effect=[False, True],
+        ):
+            with pytest.raises(TimeoutError):
+                self._export_with(make_batch_request)
+        assert sent == [8, 4]
+
+    def test_split_leaves_get_short_retry_budget(self):
+        retries = []
+
+        def make_batch_request_sized(rpc_requests, max_size_errors):
+            retries.append((len(rpc_requests), max_size_errors))
+            if len(rpc_requests) > 1:
+                raise TimeoutError("read timed out")
+            return [{"jsonrpc": "2.0", "id": rpc_requests[0]["id"], "result": []}], 10
+
+        client = BatchRpcClient("http://fake:8545")
+        client.make_batch_request_sized = make_batch_request_sized
+        sizer = AdaptiveBatchSizer(2, 1)
+        out = run_rpc_batches(
+            client,
+            [[1, 2], [3]],
+            lambda item: [{"id": i} for i in item],
+            lambda item, results, rpc_s: item,
+            max_workers=1,
+            sizer=sizer,
+        )
+
+        assert out == [[1], [2], [3]]
+        # unsplit single items keep the full budget, split leaves do not
+        assert retries == [(2, 2), (1, 5), (1, 5), (1, None)]
+
+    def test_async_client_does_not_split_connection_errors(self):
+        sent = []
+
+        def handler(request):
+            sent.append(len(orjson.loads(request.content)))
+            raise httpx.ConnectError("Connection refused")
+
+        client = _async_client(handler)
+        try:
+            with patch("graphsenselib.ingest.rpc_eth.asyncio.sleep", new=AsyncMock()):
+                with pytest.raises(httpx.ConnectError):
+                    client.run_batches(
+                        [[1, 2, 3, 4]],
+                        lambda item: [{"id": i} for i in item],
+                        lambda item, results, rpc_s: item,
+                        sizer=AdaptiveBatchSizer(4, 1),
+                    )
+        finally:
+            client.close()
+        # the full retry budget for the whole batch, no halves
+        assert sent == [4] * 15
+
+    @pytest.mark.parametrize(
+        "status,sent_sizes",
+        [(503, [4, 4, 4, 4]), (413, [4, 4, 2, 2])],
+        ids=["outage", "too-large"],
+    )
+    def test_async_client_splits_only_size_related_errors(self, status, sent_sizes):
+        sent = []
+
+        def handler(request):
+            payload = orjson.loads(request.content)
+            sent.append(len(payload))
+            if len(sent) <= 3 and len(payload) > 2:
+                return httpx.Response(status)
+            return httpx.Response(
+                200,
+                content=orjson.dumps(
+                    [{"jsonrpc": "2.0", "id": r["id"], "result": []} for r in payload]
+                ),
+            )
+
+        client = _async_client(handler)
+        try:
+            with patch("graphsenselib.ingest.rpc_eth.asyncio.sleep", new=AsyncMock()):
+                out = client.run_batches(
+                    [[1, 2, 3, 4]],
+                    lambda item: [{"id": i} for i in item],
+                    lambda item, results, rpc_s: item,
+                    sizer=AdaptiveBatchSizer(4, 1),
+                )
+        finally:
+            client.close()
+        # a node outage is ridden out with backoff, a size limit splits after
+        # one retry
+        assert sent == sent_sizes
+        assert [i for part in out for i in part] == [1, 2, 3, 4]
+
+
 # ---------------------------------------------------------------------------
 # BlockExporter
 # ---------------------------------------------------------------------------
@@ -0,0 +1,77 @@
+"""Threaded driver feed of streamed edge-set partitions into the union-find
+(``_feed_blobs_into_unionfind``, DB/Spark-free).
+
+Partitions are fed concurrently, so the resulting mapping must equal a
+serial feed regardless of thread count, and the out-of-range guard and
+dropped-tx accounting must behave exactly as before.
+"""
+
+import random
+
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+gs_clustering = pytest.importorskip(
+    "gs_clustering", reason="gs_clustering is required (make build-rust)"
+)
+
+from graphsenselib.transformation.clustering import (  # noqa: E402
+    _feed_blobs_into_unionfind,
+)
+
+
+def _ipc(edge_sets):
+    batch = pa.record_batch({"ids": pa.array(edge_sets, type=pa.list_(pa.uint32()))})
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, batch.schema) as writer:
+        writer.write_batch(batch)
+    return sink.getvalue().to_pybytes()
+
+
+def _partitions(n_parts, max_id, seed=7):
+    rng = random.Random(seed)
+    return [
+        [
+            rng.sample(range(1, max_id + 1), rng.randint(2, 4))
+            for _ in range(rng.randint(20, 60))
+        ]
+        for _ in range(n_parts)
+    ]
+
+
+def _stream(parts):
+    return ((i, len(parts), _ipc(p), 0.0) for i, p in enumerate(parts))
+
+
+def _mapping(c):
+    batch = c.get_mapping()
+    return batch.column("cluster_id").to_pylist()
+
+
+@pytest.mark.parametrize("feed_threads", [1, 4])
+def test_threaded_feed_matches_serial_union(feed_threads):
+    max_id = 2000
+    parts = _partitions(16, max_id)
+
+    expected = gs_clustering.Clustering(max_address_id=max_id)
+    expected.process_transactions([tx for p in parts for tx in p])
+
+    c = gs_clustering.Clustering(max_address_id=max_id)
+    fed = _feed_blobs_into_unionfind(
+        c, _stream(parts), len(parts), max_id, 25, feed_threads
+    )
+
+    assert fed["total_multi_input"] == sum(len(p) for p in parts)
+    assert fed["dropped_txs"] == 0
+    assert _mapping(c) == _mapping(expected)
+
+
+def test_out_of_range_ids_are_dropped_and_counted():
+    parts = [[[1, 2], [3, 99]], [[2, 3], [4, 100, 5]], [[6, 7]]]
+
+    c = gs_clustering.Clustering(max_address_id=10)
+    fed = _feed_blobs_into_unionfind(c, _stream(parts), len(parts), 10, 1000, 3)
+
+    assert fed["dropped_txs"] == 2
+    assert fed["total_multi_input"] == 3
+    assert _mapping(c)[:8] == [0, 1, 1, 1, 4, 5, 6, 6]
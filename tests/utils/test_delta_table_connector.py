@@ -1,4 +1,4 @@
-"""Tests for DeltaTableConnector.get_table_files.
+"""Tests for DeltaTableConnector.get_table_files and get_table.
 
 Uses a local temp Delta Lake table (no S3/MinIO required).
 """
@@ -11,6 +11,10 @@ import pyarrow.parquet as pq
 import pytest
 from deltalake import write_deltalake
 
+from graphsenselib.deltaupdate.update.account.modelsraw import (
+    EthTraceAdapter,
+    TrxTraceAdapter,
+)
 from graphsenselib.utils.DeltaTableConnector import DeltaTableConnector
 
 
@@ -63,3 +67,67 @@ class TestGetTableFiles:
         for f in files:
             pf = pq.read_table(f)
             assert pf.num_rows > 0
+
+
+@pytest.fixture
+def trace_table_dir():
+    """eth trace table over three partitions (partition size 10000)."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        block_ids = [1, 2, 10_001, 10_002, 20_001]
+        table = pa.table(
+            {
+                "partition": pa.array([b // 10_000 for b in block_ids], pa.int32()),
+                "block_id": pa.array(block_ids, pa.int32()),
+                "value": [(10**30 + b).to_bytes(32, "big") for b in block_ids],
+                "trace_type": ["call"] * len(block_ids),
+                "input": [b"\x00" * 64] * len(block_ids),
+            }
+        )
+        write_deltalake(
+            str(Path(tmpdir) / "eth" / "trace"), table, partition_by=["partition"]
+        )
+        yield str(Path(tmpdir) / "eth")
+
+
+class TestGetTable:
+    def test_filters_block_ids_and_projects_columns(self, trace_table_dir):
+        connector = DeltaTableConnector(trace_table_dir, s3_credentials=None)
+
+        table = connector.get_table(
+            "trace", [2, 10_002], columns=["block_id", "value", "not_in_table"]
+        )
+
+        assert table.column_names == ["block_id", "value"]
+        assert sorted(table.column("block_id").to_pylist()) == [2, 10_002]
+
+    def test_no_matching_blocks(self, trace_table_dir):
+        connector = DeltaTableConnector(trace_table_dir, s3_credentials=None)
+
+        assert connector.get_table("trace", [5], columns=["block_id"]).num_rows == 0
+        empty = connector.get_table("trace", [], columns=["block_id", "value"])
+        assert (empty.num_rows, empty.column_names) == (0, ["block_id", "value"])
+
+    def test_interpret_rows_decodes_binary_ints(self, trace_table_dir):
+        connector = DeltaTableConnector(trace_table_dir, s3_credentials=None)
+
+        rows = connector.interpreter.interpret_rows(
+            connector.get_table("trace", [20_001]), "trace"
+        )
+
+        assert [(r["block_id"], r["value"]) for r in rows] == [
+            (20_001, 10**30 + 20_001)
+        ]
+
+
+def test_adapter_source_columns_undo_renaming():
+    assert TrxTraceAdapter().source_columns() == [
+        "block_id",
+        "tx_hash",
+        "trace_index",
+        "caller_address",
+        "transferto_address",
+        "call_value",
+        "note",
+        "rejected",
+    ]
+    assert EthTraceAdapter().source_columns()[-1] == "trace_type"
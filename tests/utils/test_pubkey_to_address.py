@@ -1,8 +1,18 @@
+import random
+
 import base58
+import pytest
+from coincurve import PrivateKey
 
 from graphsenselib.utils.pubkey_to_address import (
+    base58check_encode,
+    base58check_encode_many,
+    bech32_segwit_encode,
+    bech32_segwit_encode_many,
     cashaddr_encode,
+    cashaddr_encode_many,
     convert_pubkey_to_addresses,
+    derive_addresses_many,
 )
 
 
@@ -62,3 +72,75 @@ def test_pubkey_to_address():
         == "ltc1qyxlu8m0llp05yfdq9lm86sz9jvdxvfkgay66a5"
     )
     assert addresses["trx"]["trx"] == "TCnExfGMUozCmUFpBBMAAGkEVJFS4yTJwn"
+
+
+@pytest.mark.parametrize("length", [1, 20, 32])
+@pytest.mark.parametrize("prefix", [b"\x00", b"\x05", b"\x30", b"\x1c\xb8"])
+def test_base58check_encode_many_matches_scalar(prefix, length):
+    rng = random.Random(length)
+    payloads = [rng.randbytes(length) for _ in range(200)]
+    payloads += [b"\x00" * length, b"\x00" + b"\xff" * (length - 1)]
+
+    assert base58check_encode_many(prefix, payloads) == [
+        base58check_encode(prefix, p) for p in payloads
+    ]
+
+
+@pytest.mark.parametrize("length", [20, 32])
+@pytest.mark.parametrize("hrp", ["bc", "ltc"])
+def test_bech32_segwit_encode_many_matches_scalar(hrp, length):
+    rng = random.Random(length)
+    programs = [rng.randbytes(length) for _ in range(200)] + [b"\x00" * length]
+
+    assert bech32_segwit_encode_many(hrp, 0, programs) == [
+        bech32_segwit_encode(hrp, 0, p) for p in programs
+    ]
+    assert bech32_segwit_encode_many(hrp, 0, []) == []
+
+
+def test_cashaddr_encode_many_matches_scalar():
+    rng = random.Random(3)
+    payloads = [rng.randbytes(20) for _ in range(200)] + [b"\x00" * 20]
+
+    assert cashaddr_encode_many("bitcoincash", 0x00, payloads) == [
+        cashaddr_encode("bitcoincash", 0x00, p) for p in payloads
+    ]
+
+
+def _scalar_addresses(pubkey: bytes, chains):
+    """The flattening the pubkey job applied to convert_pubkey_to_addresses."""
+    try:
+        all_addrs = convert_pubkey_to_addresses(pubkey.hex(), currencies=chains)
+    except Exception:
+        return []
+    out = []
+    for forms in all_addrs.values():
+        for key, val in forms.items():
+            if key != "error" and val not in out:
+                out.append(val)
+    return out
+
+
+@pytest.mark.parametrize(
+    "chains",
+    [
+        ["btc", "doge", "ltc", "zec", "eth", "trx", "bch"],
+        ["bch", "eth"],
+    ],
+)
+def test_derive_addresses_many_matches_scalar(chains):
+    rng = random.Random(11)
+    pubkeys = [
+        PrivateKey(rng.randbytes(32)).public_key.format(compressed=rng.random() < 0.7)
+        for _ in range(300)
+    ]
+    pubkeys += [
+        b"\x02" + b"\xff" * 32,  # off curve
+        b"\x04" + b"\x00" * 64,
+        b"\x02\x02",  # wrong length
+        pubkeys[0],  # repeated key (served from the cache)
+    ]
+
+    assert derive_addresses_many(pubkeys, chains) == [
+        _scalar_addresses(pk, chains) for pk in pubkeys
+    ]
@@ -0,0 +1,153 @@
+import json
+import os
+
+from graphsenselib.datatypes import FlowDirection
+from graphsenselib.watch.abstract import (
+    EventNotifier,
+    FlowEvent,
+    FlowProvider,
+    WatcherState,
+)
+from graphsenselib.watch.flatfile import JsonWatchpointProvider
+from graphsenselib.watch.watcher import FlowWatcher
+
+
+def _flow(block, address, direction=FlowDirection.IN, value=10):
+    return FlowEvent(
+        direction=direction,
+        address=address,
+        value=value,
+        block=block,
+        timestamp=None,
+        tx_ref=f"tx{block}",
+    )
+
+
+class FakeProvider(FlowProvider):
+    def __init__(self, tip, addresses_per_block):
+        self.tip = tip
+        self.addresses_per_block = addresses_per_block
+        self.calls = []
+
+    def _flows(self, block):
+        return [(_flow(block, a), None) for a in self.addresses_per_block(block)]
+
+    def get_flows_for_block(self, block):
+        self.calls.append(("block", block))
+        return self._flows(block) if block <= self.tip else None
+
+    def get_highest_block(self):
+        return self.tip
+
+    def get_flows_for_blocks(self, start_block, end_block):
+        self.calls.append(("range", start_block, end_block))
+        return [self._flows(b) for b in range(start_block, end_block + 1)]
+
+
+class StopAtTip(WatcherState):
+    """In-memory state; raises once the watcher reaches ``stop`` so watch()
+    returns instead of sleeping for the next block."""
+
+    def __init__(self, start, stop):
+        self.block = start
+        self.stop = stop
+        self.persisted = []
+
+    def load(self):
+        pass
+
+    def get_next_watch_block(self):
+        if self.block > self.stop:
+            raise StopIteration
+        return self.block
+
+    def done_with_block(self):
+        self.block += 1
+
+    def persist(self):
+        self.persisted.append(self.block)
+
+
+class RecordingNotifier(EventNotifier):
+    def __init__(self):
+        self.flows = []
+
+    def add_notification(self, flow, receiver_config, raw_tx):
+        self.flows.append((flow.block, flow.address))
+
+    def send_notifications(self):
+        pass
+
+
+def _watchpoints(tmp_path, addresses):
+    path = tmp_path / "watchpoints.json"
+    path.write_text(
+        json.dumps(
+            {
+                a: {"email": "x", "on_incoming": True, "on_outgoing": False}
+                for a in addresses
+            }
+        )
+    )
+    return path
+
+
+def _run(watcher):
+    try:
+        watcher.watch()
+    except StopIteration:
+        pass
+
+
+def test_catch_up_uses_ranges_then_single_blocks(tmp_path):
+    provider = FakeProvider(tip=24, addresses_per_block=lambda b: ["a", f"x{b}"])
+    state = StopAtTip(start=0, stop=24)
+    notifier = RecordingNotifier()
+    watcher = FlowWatcher(
+        state,
+        JsonWatchpointProvider(str(_watchpoints(tmp_path, ["a", "x24"]))),
+        provider,
+        [notifier],
+        batch_size=10,
+    )
+    _run(watcher)
+
+    assert provider.calls == [
+        ("range", 0, 9),
+        ("range", 10, 19),
+        ("range", 20, 24),
+    ]
+    assert notifier.flows == [(b, "a") for b in range(25)] + [(24, "x24")]
+    assert notifier.flows.count((24, "x24")) == 1
+    assert state.persisted[:3] == [10, 20, 25]
+
+
+def test_at_tip_fetches_one_block(tmp_path):
+    provider = FakeProvider(tip=5, addresses_per_block=lambda b: ["a"])
+    state = StopAtTip(start=5, stop=5)
+    watcher = FlowWatcher(
+        state,
+        JsonWatchpointProvider(str(_watchpoints(tmp_path, ["a"]))),
+        provider,
+        [RecordingNotifier()],
+        batch_size=10,
+    )
+    _run(watcher)
+    assert provider.calls == [("block", 5)]
+
+
+def test_watchpoints_reload_when_file_changes(tmp_path):
+    path = _watchpoints(tmp_path, ["a"])
+    wp = JsonWatchpointProvider(str(path))
+    assert wp.filter_watched(["a", "b"]) == {"a"}
+    assert wp.refresh() is False
+
+    path.write_text(
+        json.dumps({"b": {"email": "x", "on_incoming": True, "on_outgoing": True}})
+    )
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+    assert wp.refresh() is True
+    assert wp.filter_watched(["a", "b"]) == {"b"}
+    assert wp.get_configuration("b").on_outgoing is True
@@ -13,6 +13,8 @@ from tests.web.helpers import get_json, raw_request
 from tests.web.testdata.addresses import (
     address,
     address2,
+    addressD,
+    addressE,
     addressF,
     addressWithTagsInNeighbors,
     addressWithTagsOutNeighbors,
@@ -721,6 +723,80 @@ def test_get_address_entity(client):
     assert ("Address 0x40a197b01cdef4c77196045eaffac80f25be00fe not found") in body
 
 
+def test_search_address_neighbors(client):
+    path = (
+        "/{currency}/addresses/{address}/search"
+        "?direction={direction}&match_keywords={match}&depth={depth}"
+    )
+
+    # addressE carries a public labelX tag
+    result = get_json(
+        client,
+        path + "&max_results=1",
+        currency="btc",
+        address=address.address,
+        direction="out",
+        match="labelX",
+        depth=3,
+    )
+    assert result["state"] == "done"
+    [found] = result["paths"]
+    assert [s["address"] for s in found] == [address.address, addressE.address]
+    assert found[1]["depth"] == 1
+    assert found[1]["value"] == 27789282
+    assert "labelX" in found[1]["keywords"]
+
+    # addresses are keywords, too
+    result = get_json(
+        client,
+        path,
+        currency="btc",
+        address=address.address,
+        direction="out",
+        match=addressF.address,
+        depth=1,
+    )
+    assert [[s["address"] for s in p] for p in result["paths"]] == [
+        [address.address, addressF.address]
+    ]
+
+    result = get_json(
+        client,
+        path,
+        currency="btc",
+        address=address.address,
+        direction="in",
+        match=addressD.address,
+        depth=1,
+    )
+    assert [[s["address"] for s in p] for p in result["paths"]] == [
+        [address.address, addressD.address]
+    ]
+    assert result["paths"][0][1]["value"] == 50000000
+
+    status, _ = raw_request(
+        client,
+        path,
+        currency="btc",
+        address=address.address,
+        direction="out",
+        match="labelX",
+        depth=100,
+    )
+    assert status == 422
+
+    status, _ = raw_request(
+        client,
+        path,
+        currency="btc",
+        address="1Archive1n2C579dMsAu3iC6tWzuQJz8dN",
+        direction="out",
+        match="labelX",
+        depth=2,
+    )
+    assert status == 404
+
+
 # async def test_list_address_links(client):
 #     path = "/{currency}/addresses/{address}/links?neighbor={neighbor}"
 #     result = await get_json(
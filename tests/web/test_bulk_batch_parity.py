@@ -0,0 +1,240 @@
+"""Parity tests: the batched get_addresses used by /bulk must return, per
+address, exactly what the per-address get_address returns (or raises), and
+the bulk rows built from a batch must equal one wrap() call per address.
+"""
+
+import asyncio
+from collections import namedtuple
+from types import SimpleNamespace
+
+from starlette.datastructures import Headers
+
+from graphsenselib.db.asynchronous.services.common import get_address, get_addresses
+from graphsenselib.errors import AddressNotFoundException, BadUserInputException
+from graphsenselib.web.routes.bulk import (
+    batch_operations,
+    get_batch_operation,
+    wrap,
+    wrap_batch,
+)
+from graphsenselib.web.service import addresses_service
+
+Values = namedtuple("Values", ["value", "fiat_values"])
+Tx = namedtuple("Tx", ["height", "timestamp", "tx_hash"])
+Actor = namedtuple("Actor", ["id", "label"])
+
+KNOWN = {
+    "1A1zP1eP5QGefi2DMPTfTL5SLmv7DivfNa": 1,
+    "12c6DSiU4Rq3P4ZxziKxzrGpjfKHn2Ytfb": 2,
+    "1HLoD9E4SDFFPDiYfNYnkBLQ85Y51J3Zb1": 30_000,
+}
+NEW = "1FvzCLoTPGANNjWoUo6jUGuAG3wg1w4YjR"
+MISSING = "1BoatSLRy8Nm1f8nnT8TwNbAHy2BhLCMsP"
+INVALID = ""
+
+ACTORS = {"1A1zP1eP5QGefi2DMPTfTL5SLmv7DivfNa": [Actor("satoshi", "Satoshi")]}
+
+
+def _row(address, address_id):
+    values = Values(address_id, [{"code": "eur", "value": 1.0}])
+    tx = Tx(address_id, 1_600_000_000, bytes([address_id % 256]) * 32)
+    return {
+        "address": address,
+        "address_id": address_id,
+        "cluster_id": address_id + 7,
+        "first_tx": tx,
+        "last_tx": tx,
+        "no_incoming_txs": 1,
+        "no_outgoing_txs": -5,
+        "total_received": values,
+        "total_spent": values,
+        "in_degree": 1,
+        "out_degree": 2,
+        "balance": 10 * address_id,
+        "status": "clean",
+    }
+
+
+class FakeDb:
+    def __init__(self):
+        self.calls = []
+
+    async def get_address(self, currency, address):
+        self.calls.append("get_address")
+        if address not in KNOWN:
+            raise AddressNotFoundException(currency, address)
+        return _row(address, KNOWN[address])
+
+    async def get_addresses(self, currency, addresses):
+        self.calls.append("get_addresses")
+        return {a: _row(a, KNOWN[a]) for a in addresses if a in KNOWN}
+
+    async def new_address(self, currency, address):
+        if address != NEW:
+            raise AddressNotFoundException(currency, address)
+        row = _row(address, 99)
+        row["status"] = "new"
+        return row
+
+    async def get_fresh_cluster_id(self, currency, address_id):
+        return address_id * 1000
+
+    async def get_fresh_cluster_ids(self, currency, address_ids):
+        self.calls.append("get_fresh_cluster_ids")
+        return {a: a * 1000 for a in address_ids}
+
+    def get_token_configuration(self, currency):
+        return {}
+
+
+class FakeTagstore:
+    def __init__(self):
+        self.calls = []
+
+    async def get_actors_by_subjectid(self, subject_id, groups):
+        self.calls.append("get_actors_by_subjectid")
+        return ACTORS.get(subject_id.strip(), [])
+
+    async def get_actors_by_subjectids(self, subject_ids, groups):
+        self.calls.append("get_actors_by_subjectids")
+        return {s.strip(): ACTORS.get(s.strip(), []) for s in subject_ids}
+
+
+class FakeRates:
+    async def get_rates(self, currency, height=None):
+        return SimpleNamespace(rates=[{"code": "eur", "value": 2.0}])
+
+
+ADDRESSES = [*KNOWN, NEW, MISSING, INVALID, "1A1zP1eP5QGefi2DMPTfTL5SLmv7DivfNa"]
+
+
+async def _single(db, tagstore, address, include_actors):
+    try:
+        return await get_address(
+            db,
+            tagstore,
+            FakeRates(),
+            "btc",
+            address,
+            ["public"],
+            include_actors=include_actors,
+        )
+    except Exception as e:
+        return e
+
+
+def _same(expected, got):
+    if isinstance(expected, Exception):
+        return type(got) is type(expected) and str(got) == str(expected)
+    return got == expected
+
+
+def test_get_addresses_matches_get_address():
+    for include_actors in (True, False):
+        db, tagstore = FakeDb(), FakeTagstore()
+        expected = [
+            asyncio.run(_single(FakeDb(), FakeTagstore(), a, include_actors))
+            for a in ADDRESSES
+        ]
+        got = asyncio.run(
+            get_addresses(
+                db,
+                tagstore,
+                FakeRates(),
+                "btc",
+                ADDRESSES,
+                ["public"],
+                include_actors=include_actors,
+            )
+        )
+
+        assert len(got) == len(expected)
+        for address, e, g in zip(ADDRESSES, expected, got):
+            assert _same(e, g), address
+        assert isinstance(got[ADDRESSES.index(INVALID)], BadUserInputException)
+        # Known addresses are read in one batch; only the misses fall back.
+        assert db.calls.count("get_addresses") == 1
+        assert db.calls.count("get_address") == 2
+        assert tagstore.calls.count("get_actors_by_subjectid") == (
+            1 if include_actors else 0
+        )
+
+
+def _request():
+    app = SimpleNamespace(state=SimpleNamespace(plugins=[], plugin_contexts={}))
+    return SimpleNamespace(app=app, state=SimpleNamespace(), headers=Headers({}))
+
+
+def _ctx(db, tagstore, bulk_batch_size=100):
+    async def get_address_service(currency, address, groups, include_actors):
+        return await get_address(
+            db, tagstore, FakeRates(), currency, address, groups, include_actors
+        )
+
+    async def get_addresses_service(currency, addresses, groups, include_actors):
+        return await get_addresses(
+            db, tagstore, FakeRates(), currency, addresses, groups, include_actors
+        )
+
+    return SimpleNamespace(
+        tagstore_groups=["public"],
+        config=SimpleNamespace(bulk_batch_size=bulk_batch_size),
+        services=SimpleNamespace(
+            addresses_service=SimpleNamespace(
+                get_address=get_address_service,
+                get_addresses=get_addresses_service,
+            )
+        ),
+    )
+
+
+def test_wrap_batch_rows_match_wrap():
+    ctx = _ctx(FakeDb(), FakeTagstore())
+    for format in ("csv", "json"):
+        expected = []
+        for address in ADDRESSES:
+            expected.extend(
+                asyncio.run(
+                    wrap(
+                        _request(),
+                        ctx,
+                        addresses_service.get_address,
+                        "btc",
+                        {"include_actors": True},
+                        {"address": address},
+                        1,
+                        format,
+                        asyncio.Semaphore(1),
+                    )
+                )
+            )
+        got = asyncio.run(
+            wrap_batch(
+                _request(),
+                ctx,
+                addresses_service.get_addresses,
+                "btc",
+                {"include_actors": True},
+                "address",
+                ADDRESSES,
+                format,
+                asyncio.Semaphore(1),
+            )
+        )
+        assert got == expected
+
+
+def test_get_batch_operation_only_applies_to_matching_requests():
+    ctx = _ctx(FakeDb(), FakeTagstore())
+    assert batch_operations["get_address"] == ("address", "get_addresses")
+
+    def lookup(keys, params, ctx=ctx, operation="get_address"):
+        return get_batch_operation(addresses_service, operation, keys, params, ctx)
+
+    assert lookup({"address": ADDRESSES}, {}) is addresses_service.get_addresses
+    assert lookup({"address": ADDRESSES}, {"include_actors": False}) is not None
+    # unknown parameter, extra key list, unregistered operation, disabled
+    assert lookup({"address": ADDRESSES}, {"bogus": 1}) is None
+    assert lookup({"address": ADDRESSES, "other": [1]}, {}) is None
+    assert lookup({"address": ADDRESSES}, {}, operation="list_tags_by_address") is None
+    assert lookup({"address": ADDRESSES}, {}, ctx=_ctx(None, None, 0)) is None
@@ -0,0 +1,79 @@
+"""Micro-benchmarks of response building: writing API models straight to
+JSON must stay faster than FastAPI's validate-and-serialize path for
+representative responses (run with ``-m slow``)."""
+
+import time
+from typing import Union
+
+import pytest
+
+import tests.web.testdata.addresses as ad
+import tests.web.testdata.txs as txs
+from graphsenselib.web.models import (
+    Address,
+    AddressTxs,
+    Entity,
+    NeighborAddresses,
+    TxAccount,
+    TxUtxo,
+)
+from graphsenselib.web.routes.base import PluginRoute, to_json_bytes, to_json_response
+
+TX_PAGE = [
+    tx.model_copy(update={"tx_hash": f"{i:064x}"})
+    for i in range(250)
+    for tx in (txs.tx1, txs.tx1_eth)
+]
+RESPONSES = {
+    "address": (Address, ad.eth_address),
+    "entity": (Entity, ad.eth_entityWithTokens),
+    "neighbors": (NeighborAddresses, ad.eth_address2WithTokenFlows),
+    "address_txs": (
+        AddressTxs,
+        AddressTxs(address_txs=[txs.token_tx1_eth] * 500, next_page="x"),
+    ),
+    "tx_list": (list[Union[TxUtxo, TxAccount]], TX_PAGE),
+}
+
+
+# Direct serialization is 3-15x faster on these responses; the assertion only
+# asks for a margin well inside that, so it holds on a loaded runner.
+MIN_SPEEDUP = 1.5
+
+
+def _best_of(functions, repeat=7, number=20):
+    """Best-of-``repeat`` time of ``number`` calls, per function.
+
+    The functions are timed in turns within each repeat, so a slow phase of
+    the machine affects all of them alike.
+    """
+    best = [float("inf")] * len(functions)
+    for _ in range(repeat):
+        for i, f in enumerate(functions):
+            start = time.perf_counter()
+            for _ in range(number):
+                f()
+            best[i] = min(best[i], time.perf_counter() - start)
+    return best
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize("name", RESPONSES)
+def test_direct_json_is_faster_than_revalidation(name, record_property):
+    model, result = RESPONSES[name]
+    route = PluginRoute(
+        "/", lambda: None, response_model=model, response_model_exclude_none=True
+    )
+    field = route.response_field
+
+    def validated():
+        # what FastAPI does with the dict the endpoint used to return
+        value, errors = field.validate(to_json_response(result), loc=("response",))
+        assert not errors
+        return field.serialize_json(value, exclude_none=True)
+
+    assert to_json_bytes(result) == validated()
+    direct_time, validated_time = _best_of([lambda: to_json_bytes(result), validated])
+    record_property("direct_seconds", direct_time)
+    record_property("validated_seconds", validated_time)
+    assert direct_time * MIN_SPEEDUP < validated_time
@@ -0,0 +1,106 @@
+"""PluginRoute writes results straight to JSON when their models serialize
+like the response model; the bytes must match FastAPI's own path (validate
+the dumped dict against the response model, then serialize)."""
+
+from typing import Union
+
+import pytest
+from fastapi import APIRouter, FastAPI
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+
+import tests.web.testdata.addresses as ad
+import tests.web.testdata.txs as txs
+from graphsenselib.web.models import (
+    Address,
+    Cluster,
+    Entity,
+    NeighborAddresses,
+    Rates,
+    TxAccount,
+    TxUtxo,
+)
+from graphsenselib.web.routes.base import PluginRoute, serializes_as
+
+CASES = [
+    ("/address", Address, ad.address),
+    ("/eth_address", Address, ad.eth_address),
+    ("/entity", Entity, ad.entityWithTags),
+    # routes returning an Entity for the Cluster response model
+    ("/cluster", Cluster, ad.entityWithTags),
+    ("/neighbors", NeighborAddresses, ad.addressWithTagsOutNeighbors),
+    ("/tx", Union[TxUtxo, TxAccount], txs.tx1_eth),
+    ("/txs", list[Union[TxUtxo, TxAccount]], [txs.tx1, txs.tx1_eth, txs.tx2]),
+    ("/token_txs", list[TxAccount], [txs.token_tx1_eth, txs.token_tx2_eth]),
+    ("/empty", list[TxAccount], []),
+    # floats json.dumps would format differently (1e-05, 1e+20)
+    (
+        "/rates",
+        Rates,
+        Rates(
+            height=1,
+            rates=[{"code": "eur", "value": 1e-5}, {"code": "usd", "value": 1e20}],
+        ),
+    ),
+]
+
+
+def _endpoint(result):
+    async def endpoint():
+        return result
+
+    return endpoint
+
+
+def _client(direct_json: bool) -> TestClient:
+    router = APIRouter(route_class=PluginRoute)
+    for path, model, result in CASES:
+        router.add_api_route(
+            path,
+            _endpoint(result),
+            response_model=model,
+            response_model_exclude_none=True,
+        )
+    app = FastAPI()
+    app.include_router(router)
+    for route in app.routes:
+        if isinstance(route, PluginRoute):
+            assert route.direct_json
+            route.direct_json = direct_json
+    return TestClient(app)
+
+
+@pytest.fixture(scope="module")
+def clients():
+    return _client(True), _client(False)
+
+
+@pytest.mark.parametrize("path,model,result", CASES, ids=[c[0] for c in CASES])
+def test_direct_json_matches_fastapi_serialization(clients, path, model, result):
+    assert serializes_as(model, result)
+    direct, validated = (client.get(path) for client in clients)
+    assert direct.status_code == validated.status_code == 200
+    assert direct.headers["content-type"] == validated.headers["content-type"]
+    assert direct.content == validated.content
+
+
+def test_explicit_response_class_is_left_to_fastapi():
+    # FastAPI serializes those with json.dumps, not with pydantic-core
+    router = APIRouter(route_class=PluginRoute)
+    router.add_api_route(
+        "/address",
+        _endpoint(ad.address),
+        response_model=Address,
+        response_model_exclude_none=True,
+        response_class=JSONResponse,
+    )
+    assert not router.routes[0].direct_json
+
+
+def test_mismatching_results_are_left_to_fastapi():
+    assert not serializes_as(Entity, ad.address)
+    assert not serializes_as(Address, [ad.address])
+    assert not serializes_as(list[Address], ad.address)
+    assert not serializes_as(list[TxAccount], [txs.tx1_eth, txs.tx1])
+    assert not serializes_as(Address, ad.address.to_dict())
+    assert not serializes_as(None, ad.address)
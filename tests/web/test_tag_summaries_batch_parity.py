@@ -133,6 +133,16 @@ class FakeDB:
         # fresh clustering inactive: tag lookups fall back to the legacy id
         return None
 
+    async def get_address_cluster_ids(self, currency: str, addresses: List[str]):
+        return {
+            a: (self.cluster_id_by_address[a], self.cluster_id_by_address[a])
+            for a in addresses
+            if self.cluster_id_by_address.get(a) is not None
+        }
+
+    async def get_fresh_cluster_ids(self, currency: str, address_ids: List[int]):
+        return {address_id: None for address_id in address_ids}
+
 
 def _build_service(
     tags_by_subject: Dict[str, List[TagPublic]],